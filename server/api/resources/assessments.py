@@ -29,7 +29,7 @@ api_assessments = APIBlueprint(
 def get_all_assessments():
     """Get All Assessments"""
     assessments = crud.read_all(AssessmentOrm)
-    return [orm_serializer.marshal(assessment) for assessment in assessments], 200
+    return orm_serializer.marshal_many(assessments), 200
 
 
 # /api/assessments [POST]
@@ -32,7 +32,7 @@ api_facilities = APIBlueprint(
 def get_all_facilities():
     """Get All Health Facilities"""
     facilities = crud.read_all(HealthFacilityOrm)
-    return [orm_serializer.marshal(f) for f in facilities]
+    return orm_serializer.marshal_many(facilities)
 
 
 # /api/facilities/names [GET]
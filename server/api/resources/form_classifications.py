@@ -8,6 +8,7 @@ from common.api_utils import (
     FormClassificationIdPath,
 )
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import RoleEnum
 from models import FormClassificationOrm, FormTemplateOrm
 from validation.formClassifications import (
@@ -31,7 +32,7 @@ api_form_classifications = APIBlueprint(
 def get_all_form_classifications():
     """Get All Form Classifications"""
     form_classifications = crud.read_all(FormClassificationOrm)
-    return [orm_serializer.marshal(f, shallow=True) for f in form_classifications], 200
+    return orm_serializer.marshal_many(form_classifications, shallow=True), 200
 
 
 # /api/forms/classifications [POST]
@@ -97,7 +98,7 @@ def edit_form_classification_name(
         )
 
     form_classification.name = body.name
-    crud.db_session.commit()
+    unit_of_work.commit()
     crud.db_session.refresh(form_classification)
 
     return orm_serializer.marshal(form_classification, True), 201
@@ -161,4 +162,4 @@ def get_form_classification_templates(path: FormClassificationIdPath):
         FormTemplateOrm,
         form_classification_id=path.form_classification_id,
     )
-    return [orm_serializer.marshal(f, shallow=True) for f in form_templates], 200
+    return orm_serializer.marshal_many(form_templates, shallow=True), 200
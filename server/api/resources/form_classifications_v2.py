@@ -10,6 +10,7 @@ from common.api_utils import (
 )
 from common.commonUtil import get_uuid
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import RoleEnum
 from models import FormClassificationOrmV2, FormTemplateOrmV2, LangVersionOrmV2
 from validation.formsV2_models import (
@@ -33,11 +34,14 @@ api_form_classifications_v2 = APIBlueprint(
 def get_all_form_classifications():
     """Get All Form Classifications"""
     form_classifications = crud.read_all(FormClassificationOrmV2)
+    names = form_utils.resolve_string_texts(
+        [fc.name_string_id for fc in form_classifications], ["English"]
+    )
     out = []
 
     for fc in form_classifications:
         d = orm_serializer.marshal(fc, shallow=True)
-        d["name"] = {"english": form_utils.resolve_string_text(d.get("name_string_id"))}
+        d["name"] = {"english": names.get((d.get("name_string_id"), "English"))}
 
         out.append(d)
 
@@ -122,7 +126,7 @@ def edit_form_classification_name(
         abort(409, f"Form Classification with name=({english_name}) already exists.")
     form_utils.upsert_multilang_versions(fc_orm.name_string_id, name_map)
 
-    crud.db_session.commit()
+    unit_of_work.commit()
     crud.db_session.refresh(fc_orm)
 
     result = orm_serializer.marshal(fc_orm, shallow=True)
@@ -14,6 +14,7 @@ from common.api_utils import (
     FormTemplateIdPath,
 )
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import ContentTypeEnum, RoleEnum
 from models import FormClassificationOrm, FormTemplateOrm
 from service import serialize
@@ -53,7 +54,7 @@ def get_all_form_templates(query: GetAllFormTemplatesQuery):
 
     form_templates = crud.read_all(FormTemplateOrm, **filters)
 
-    return [orm_serializer.marshal(f, shallow=True) for f in form_templates]
+    return orm_serializer.marshal_many(form_templates, shallow=True)
 
 
 def handle_form_template_upload(form_template: FormTemplateUpload):
@@ -95,7 +96,7 @@ def handle_form_template_upload(form_template: FormTemplateUpload):
         )
         if previous_template is not None:
             previous_template.archived = True
-            crud.db_session.commit()
+            unit_of_work.commit()
 
     # Insert the new form template
     form_template_dict["form_classification_id"] = form_classification_orm.id
@@ -278,7 +279,7 @@ def archive_form_template(path: FormTemplateIdPath, body: ArchiveFormTemplateBod
         )
 
     form_template.archived = body.archived
-    crud.db_session.commit()
+    unit_of_work.commit()
     crud.db_session.refresh(form_template)
 
     return orm_serializer.marshal(form_template, shallow=True), 201
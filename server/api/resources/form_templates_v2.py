@@ -1,6 +1,7 @@
 import json
+from typing import Optional
 
-from flask import abort, make_response
+from flask import Response, abort, make_response, request
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag
 from pydantic import ValidationError
@@ -10,6 +11,7 @@ from api.decorator import roles_required
 from common import form_utils
 from common.workflow_utils import update_workflow_version_with_new_form
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import ContentTypeEnum, RoleEnum
 from models import (
     FormClassificationOrmV2,
@@ -59,13 +61,21 @@ def get_all_form_templates_v2(query: GetAllFormTemplatesV2Query):
     filters["archived"] = 1 if query.include_archived else 0
 
     form_templates = crud.read_all(FormTemplateOrmV2, **filters)
+    names = form_utils.resolve_string_texts(
+        [
+            ft.classification.name_string_id
+            for ft in form_templates
+            if ft.classification
+        ],
+        [query.lang],
+    )
 
     templates_list = []
 
     for ft in form_templates:
         template_dict = orm_serializer.marshal(ft, shallow=True)
         template_dict["name"] = (
-            form_utils.resolve_string_text(ft.classification.name_string_id, query.lang)
+            names.get((ft.classification.name_string_id, query.lang))
             if ft.classification
             else None
         )
@@ -102,7 +112,7 @@ def get_languages_for_form_template_v2(path: FormTemplateIdPath):
     filters["string_id"] = classification.name_string_id
 
     translations = crud.read_all(LangVersionOrmV2, **filters)
-    translations = [orm_serializer.marshal(lang) for lang in translations]
+    translations = orm_serializer.marshal_many(translations)
     response = {
         "langVersions": [lang.get("lang") for lang in translations],
     }
@@ -143,15 +153,39 @@ def get_form_template_version_as_csv_v2(path: FormTemplateVersionPath):
 # /api/forms/templates/<string:form_template_id> [GET]
 @api_form_templates_v2.get("/<string:form_template_id>", responses={200: FormTemplate})
 def get_form_template_v2(path: FormTemplateIdPath, query: GetFormTemplateV2Query):
-    """Get a single-language or full form template (V2)"""
-    form_template = crud.read(FormTemplateOrmV2, id=path.form_template_id)
-    if form_template is None:
-        abort(
-            404, description=form_template_not_found_msg.format(path.form_template_id)
-        )
+    """
+    Get a single-language or full form template (V2)
 
+    Responses carry an ETag; clients sending it back in If-None-Match receive a
+    304 Not Modified response if the template is unchanged.
+    """
     lang = query.lang.capitalize() if query.lang else None
 
+    rendered = form_utils.read_rendered_form_template(path.form_template_id, lang)
+    if rendered is None:
+        rendered = form_utils.cache_rendered_form_template(
+            path.form_template_id,
+            lang,
+            _render_form_template_v2(path.form_template_id, lang),
+        )
+
+    if request.if_none_match.contains(rendered.etag):
+        response = Response(status=304)
+    else:
+        response = make_response(rendered.body, 200)
+    response.set_etag(rendered.etag)
+    return response
+
+
+def _render_form_template_v2(form_template_id: str, lang: Optional[str]) -> dict:
+    """
+    Render a form template in one language, or in every language if lang is None.
+    Aborts with 404 if the template or language version does not exist.
+    """
+    form_template = crud.read(FormTemplateOrmV2, id=form_template_id)
+    if form_template is None:
+        abort(404, description=form_template_not_found_msg.format(form_template_id))
+
     available_langs = crud.read_form_template_language_versions_v2(
         form_template,
         refresh=True,
@@ -162,20 +196,19 @@ def get_form_template_v2(path: FormTemplateIdPath, query: GetFormTemplateV2Query
             form_template,
             shallow=False,
         )
-        full_template = form_utils.format_template(full_template, available_langs)
-        return full_template, 200
+        return form_utils.format_template(full_template, available_langs)
 
     if lang not in available_langs:
         abort(
             404,
-            description=f"FormTemplate(id={path.form_template_id}) doesn't have language version = {lang}",
+            description=f"FormTemplate(id={form_template_id}) doesn't have language version = {lang}",
         )
 
     single_lang_template = orm_serializer.marshal(form_template, shallow=False)
     single_lang_template = form_utils.format_template(single_lang_template, [lang])
     single_lang_template["questions"].sort(key=lambda q: q["order"])
 
-    return FormTemplate(**single_lang_template).model_dump(), 200
+    return FormTemplate(**single_lang_template).model_dump()
 
 
 # /api/forms/v2/templates/<string:form_template_id> [PUT]
@@ -192,8 +225,12 @@ def archive_form_template_v2(path: FormTemplateIdPath, query: ArchiveFormTemplat
         )
 
     form_template.archived = query.archived
-    crud.db_session.commit()
+    unit_of_work.commit()
     crud.db_session.refresh(form_template)
+    form_template_id = form_template.id
+    unit_of_work.after_commit(
+        lambda: form_utils.invalidate_rendered_form_templates(form_template_id)
+    )
 
     result = orm_serializer.marshal(form_template, shallow=True)
     result["name"] = (
@@ -250,7 +287,7 @@ def handle_form_template_upload(
     form_template_dict["form_classification_id"] = form_classification_dict.get("id")
     form_template_orm = orm_serializer.unmarshal(FormTemplateOrmV2, form_template_dict)
 
-    crud.db_session.commit()
+    unit_of_work.commit()
     try:
         crud.create_all(new_lang_versions, autocommit=False)
 
@@ -278,7 +315,9 @@ def handle_form_template_upload(
         created_form_template = orm_serializer.marshal(form_template_orm, shallow=True)
         created_form_template["name"] = english_name
 
-        crud.db_session.commit()
+        unit_of_work.commit()
+        # Translations shared with other versions may have changed too
+        unit_of_work.after_commit(form_utils.invalidate_rendered_form_templates)
 
         # update the workflow steps usng this form to the latest version
         if previous_template_id:
@@ -11,6 +11,7 @@ from common.api_utils import (
 )
 from common.commonUtil import get_current_time
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from models import FormOrm, FormTemplateOrm, PatientOrm, UserOrm
 from validation.forms import FormModel, UpdateFormRequestBody
 
@@ -110,7 +111,7 @@ def update_form(path: FormIdPath, body: UpdateFormRequestBody):
     form.last_edited_by = user_id
     form.last_edited = get_current_time()
 
-    crud.db_session.commit()
+    unit_of_work.commit()
     crud.db_session.refresh(form)
 
     return orm_serializer.marshal(form, True), 201
@@ -8,6 +8,7 @@ import data.db_operations as crud
 from common import form_utils, user_utils
 from common.commonUtil import get_current_time
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from models import (
     FormSubmissionOrmV2,
     FormTemplateOrmV2,
@@ -96,7 +97,10 @@ def submit_form(body: CreateFormSubmissionRequest):
     form.last_edited = form.date_submitted
     form.archived = False
 
-    crud.create(form, refresh=True)
+    crud.create(form, autocommit=False)
+    crud.refresh_form_answer_values([form.id])
+    unit_of_work.commit()
+    crud.db_session.refresh(form)
     result = orm_serializer.marshal(form, shallow=True)
 
     return FormSubmission(**result).model_dump(), 201
@@ -168,7 +172,8 @@ def update_form(path: FormIdPath, body: UpdateFormRequestBody):
     form.user_id = user_id
     form.last_edited = get_current_time()
 
-    crud.db_session.commit()
+    crud.refresh_form_answer_values([form.id])
+    unit_of_work.commit()
     crud.db_session.refresh(form)
 
     result = orm_serializer.marshal(form, shallow=True)
@@ -16,8 +16,8 @@ from common.api_utils import (
 )
 from common.commonUtil import get_current_time
 from common.patient_utils import assign_patient_id
-from config import db
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import RoleEnum, TrafficLightEnum
 from models import (
     AssessmentOrm,
@@ -179,16 +179,26 @@ def update_patient_info(path: PatientIdPath, body: UpdatePatientRequestBody):
     # `last_edited` value which is present in the request.
     if not base:
         patient.last_edited = get_current_time()
-        crud.db_session.commit()
+        unit_of_work.commit()
         crud.db_session.refresh(patient)  # Need to refresh the patient after commit
 
     return orm_serializer.marshal(patient)
 
 
+class PatientStatsQueryParams(CradleBaseModel):
+    aggregate: bool = Field(
+        False,
+        description=(
+            "If true, each month holds the count, mean, min and max of its readings "
+            "(or null if it has none) instead of the list of their values."
+        ),
+    )
+
+
 # /api/patients/<string:patient_id>/stats [GET]
 @patient_association_required()
 @api_patients.get("/<string:patient_id>/stats", responses={200: PatientStats})
-def get_patient_stats(path: PatientIdPath):
+def get_patient_stats(path: PatientIdPath, query: PatientStatsQueryParams):
     """Get Patient Stats"""
     patient = crud.read(PatientOrm, id=path.patient_id)
     if patient is None:
@@ -197,74 +207,30 @@ def get_patient_stats(path: PatientIdPath):
     today = date.today()
     current_year = today.year
     current_month = today.month
-
-    # getting all systolic_blood_pressure readings for each month
-    bp_systolic = statsCalculation.get_stats_data(
-        "systolic_blood_pressure",
-        patient.readings,
-        current_year,
-        current_month,
-    )
-
-    # getting all bpDiastolic readings for each month
-    bp_diastolic = statsCalculation.get_stats_data(
-        "diastolic_blood_pressure",
-        patient.readings,
-        current_year,
-        current_month,
-    )
-
-    # getting all heart rate readings for each month
-    heart_rate = statsCalculation.get_stats_data(
-        "heart_rate",
-        patient.readings,
-        current_year,
-        current_month,
-    )
-
-    # getting all bpSystolic readings for each month dated from 12 months before the current month
-    bp_systolic_last_twelve_months = statsCalculation.get_stats_data(
-        "bp_systolic_last_twelve_months",
-        patient.readings,
-        current_year,
-        current_month,
-        True,
-    )
-
-    # getting all bpDiastolic readings for each month dated from 12 months before the current month
-    bp_diastolic_last_twelve_months = statsCalculation.get_stats_data(
-        "bp_diastolic_last_twelve_months",
-        patient.readings,
-        current_year,
-        current_month,
-        True,
-    )
-
-    # getting all heart rate readings for each month dated from 12 months before the current month
-    heart_rate_last_twelve_months = statsCalculation.get_stats_data(
-        "heart_rate_last_twelve_months",
-        patient.readings,
-        current_year,
-        current_month,
-        True,
-    )
-
-    # getting all traffic lights from day 1 for this patient
-    traffic_light_statuses = statsCalculation.get_stats_data(
-        "traffic_light_status",
-        patient.readings,
-        current_year,
-        current_month,
-    )
-
-    # putting data into one object now
-    data = {
-        "bp_systolic_readings_monthly": bp_systolic,
-        "bp_diastolic_readings_monthly": bp_diastolic,
-        "heart_rate_readings_monthly": heart_rate,
-        "bp_systolic_readings_last_twelve_months": bp_systolic_last_twelve_months,
-        "bp_diastolic_readings_last_twelve_months": bp_diastolic_last_twelve_months,
-        "heart_rate_readings_last_twelve_months": heart_rate_last_twelve_months,
+    aggregate = query.aggregate
+
+    stats = statsCalculation.ReadingStats(crud.read_reading_vitals(path.patient_id))
+    traffic_light_statuses = stats.traffic_light_counts()
+
+    return {
+        "bp_systolic_readings_monthly": stats.monthly(
+            "systolic_blood_pressure", current_year, aggregate
+        ),
+        "bp_diastolic_readings_monthly": stats.monthly(
+            "diastolic_blood_pressure", current_year, aggregate
+        ),
+        "heart_rate_readings_monthly": stats.monthly(
+            "heart_rate", current_year, aggregate
+        ),
+        "bp_systolic_readings_last_twelve_months": stats.last_twelve_months(
+            "systolic_blood_pressure", current_year, current_month, aggregate
+        ),
+        "bp_diastolic_readings_last_twelve_months": stats.last_twelve_months(
+            "diastolic_blood_pressure", current_year, current_month, aggregate
+        ),
+        "heart_rate_readings_last_twelve_months": stats.last_twelve_months(
+            "heart_rate", current_year, current_month, aggregate
+        ),
         "traffic_light_counts_from_day_1": {
             "green": traffic_light_statuses[0],
             "yellow_up": traffic_light_statuses[1],
@@ -274,7 +240,6 @@ def get_patient_stats(path: PatientIdPath):
         },
         "current_month": current_month,
     }
-    return data
 
 
 # /api/patients/<string:patient_id>/readings
@@ -284,7 +249,7 @@ def get_patient_readings(path: PatientIdPath):
     patient = crud.read(PatientOrm, id=path.patient_id)
     if patient is None:
         return abort(404, description=patient_not_found_message.format(path.patient_id))
-    return [orm_serializer.marshal(r) for r in patient.readings]
+    return orm_serializer.marshal_many(patient.readings)
 
 
 # /api/patients/<string:patient_id>/most_recent_reading [GET]
@@ -296,7 +261,7 @@ def get_patient_most_recent_reading(path: PatientIdPath):
     patient = crud.read(PatientOrm, id=path.patient_id)
     if patient is None:
         return abort(404, description=patient_not_found_message.format(path.patient_id))
-    readings = [orm_serializer.marshal(r) for r in patient.readings]
+    readings = orm_serializer.marshal_many(patient.readings)
     if len(readings) == 0:
         return []
 
@@ -317,7 +282,7 @@ def get_patient_referrals(path: PatientIdPath):
     patient = crud.read(PatientOrm, id=path.patient_id)
     if patient is None:
         return abort(404, description=patient_not_found_message.format(path.patient_id))
-    return [orm_serializer.marshal(ref) for ref in patient.referrals]
+    return orm_serializer.marshal_many(patient.referrals)
 
 
 # /api/patients/<string:patient_id>/forms [GET]
@@ -327,7 +292,7 @@ def get_patient_forms(path: PatientIdPath):
     patient = crud.read(PatientOrm, id=path.patient_id)
     if patient is None:
         return abort(404, description=patient_not_found_message.format(path.patient_id))
-    return [orm_serializer.marshal(form, True) for form in patient.forms]
+    return orm_serializer.marshal_many(patient.forms, True)
 
 
 class PatientPregnancySummary(CradleBaseModel):
@@ -411,7 +376,8 @@ def create_reading_with_assessment(body: NewReadingAndAssessment):
     if crud.read(ReadingOrm, id=new_reading.id):
         return abort(409, description=f"A reading already exists with id: {reading.id}")
 
-    invariant.resolve_reading_invariants(new_reading)
+    # The reading is committed with the assessment below
+    invariant.resolve_reading_invariants(new_reading, autocommit=False)
 
     new_assessment = orm_serializer.unmarshal(AssessmentOrm, assessment.model_dump())
 
@@ -521,7 +487,7 @@ def archive_patient(path: PatientIdPath, query: ArchivePatientQuery):
     if patient is None:
         return abort(404, description=patient_not_found_message.format(path.patient_id))
     patient.is_archived = bool(query.archive)
-    db.session.commit()
+    unit_of_work.commit()
     return Response(status=200)
 
 
@@ -3,7 +3,7 @@ from typing import Optional
 from flask import abort
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag
-from pydantic import RootModel
+from pydantic import Field, RootModel
 
 import data.db_operations as crud
 import service.FilterHelper as filter
@@ -12,11 +12,9 @@ from common import user_utils
 from data import orm_serializer
 from enums import TrafficLightEnum
 from models import (
+    AssessmentOrm,
     FormOrm,
-    PatientOrm,
-    PatientSchema,
-    ReadingOrm,
-    ReadingSchema,
+    ReferralOrm,
     UserOrm,
 )
 from service import serialize, view
@@ -32,63 +30,44 @@ from validation.referrals import ReferralModel
 # TODO: Add type annotations and error checking to this file.
 
 
-def to_global_search_patient(patient):
-    """Format a patient dict into the shape expected by the mobile global search response."""
-    global_search_patient = {
-        "name": patient["name"],
-        "id": patient["id"],
-        "village_number": patient["village_number"],
-        "readings": patient["readings"],
-        "state": patient["state"],
-    }
-
-    if global_search_patient["readings"]:
-        readings_arr = []
-        for reading in global_search_patient["readings"]:
-            # build the reading json to add to array
-            reading_json: dict[str, Optional[str]] = {
+def to_global_search_patient(patient, readings) -> dict:
+    """Format a patient row and its reading summaries into the shape expected by the mobile global search response."""
+    return {
+        "name": patient.name,
+        "id": patient.id,
+        "village_number": patient.village_number,
+        "readings": [
+            {
                 "date_referred": None,
+                "date_taken": reading.date_taken,
+                "traffic_light_status": str(reading.traffic_light_status),
             }
-
-            reading_data = orm_serializer.model_to_dict(
-                crud.read(ReadingOrm, id=reading),
-                ReadingSchema,
-            )
-            if reading_data is None:
-                return abort(404, "No Reading found.")
-            reading_json["date_taken"] = reading_data["date_taken"]
-            reading_json["traffic_light_status"] = str(
-                reading_data["traffic_light_status"]
-            )
-
-            # add reading date_referred data to array
-            readings_arr.append(reading_json)
-
-        # add reading key to global_search_patient key
-        global_search_patient["readings"] = readings_arr
-
-    return global_search_patient
+            for reading in readings
+        ],
+        "state": "Added" if patient.is_added else "Add",
+    }
 
 
-def get_global_search_patients(current_user, search):
+def get_global_search_patients(current_user, search, **kwargs):
     """Return a list of global search patients matching the search string for the current user."""
-
-    def __make_gs_patient_dict(p: PatientOrm, is_added: bool) -> dict:
-        """Build a patient dict with an 'Added' or 'Add' state label."""
-        patient_dict = orm_serializer.model_to_dict(p, PatientSchema)
-        patient_dict["state"] = "Added" if is_added else "Add"
-        return patient_dict
-
     user = crud.read(UserOrm, id=current_user["id"])
-    pairs = filter.annotated_global_patient_list(user, search)
-    patients_query = [__make_gs_patient_dict(p, state) for (p, state) in pairs]
-    return [to_global_search_patient(p) for p in patients_query]
+    patients = filter.annotated_global_patient_list(user, search, **kwargs)
+    readings = crud.read_patient_reading_summaries([p.id for p in patients])
+    return [to_global_search_patient(p, readings[p.id]) for p in patients]
 
 
 class SearchPath(CradleBaseModel):
     search: str
 
 
+class GlobalSearchQueryParams(CradleBaseModel):
+    limit: Optional[int] = Field(
+        default=None,
+        description="The maximum number of patients per page; all matching patients are returned if omitted.",
+    )
+    page: Optional[int] = Field(default=1, description="The page number to return.")
+
+
 mobile_patient_tag = Tag(name="Mobile Patients", description="")
 
 
@@ -116,7 +95,7 @@ class MobileGlobalSearchPatientsList(RootModel):
     tags=[mobile_patient_tag],
     responses={200: MobileGlobalSearchPatientsList},
 )
-def search_patient_list_mobile(path: SearchPath):
+def search_patient_list_mobile(path: SearchPath, query: GlobalSearchQueryParams):
     """
     Search Patient List (Mobile)
     Get a list of ALL patients and their basic information
@@ -125,6 +104,8 @@ def search_patient_list_mobile(path: SearchPath):
         - A portion/full match of the patient's ID.
         - A portion/full match of the patient's initials.
 
+    Results can be paged with the optional `limit` and `page` query parameters.
+
     Returns info for Patient and their Readings.
     """
     # TODO: Use query params for "search"
@@ -133,6 +114,7 @@ def search_patient_list_mobile(path: SearchPath):
     patients_readings_referrals = get_global_search_patients(
         current_user,
         path.search.upper(),
+        **query.model_dump(),
     )
 
     if patients_readings_referrals is None:
@@ -172,9 +154,9 @@ def get_patients_mobile():
 def get_readings_mobile():
     """Get Readings (Mobile)"""
     current_user = user_utils.get_current_user_from_jwt()
-    readings = view.reading_view(current_user)
+    readings = view.reading_view(current_user, as_rows=True)
 
-    return [serialize.serialize_reading(r) for r in readings]
+    return orm_serializer.marshal_reading_rows(readings)
 
 
 # /api/mobile/referrals [GET]
@@ -184,8 +166,8 @@ def get_readings_mobile():
 def get_referrals_mobile():
     """Get Referrals (Mobile)"""
     current_user = user_utils.get_current_user_from_jwt()
-    referrals = view.referral_view(current_user)
-    return [serialize.serialize_referral_or_assessment(r) for r in referrals]
+    referrals = view.referral_view(current_user, as_rows=True)
+    return orm_serializer.marshal_rows(ReferralOrm, referrals)
 
 
 # /api/mobile/assessments
@@ -197,8 +179,8 @@ def get_referrals_mobile():
 def get_assessments_mobile():
     """Get Assessments (Mobile)"""
     current_user = user_utils.get_current_user_from_jwt()
-    assessments = view.assessment_view(current_user)
-    return [serialize.serialize_referral_or_assessment(a) for a in assessments]
+    assessments = view.assessment_view(current_user, as_rows=True)
+    return orm_serializer.marshal_rows(AssessmentOrm, assessments)
 
 
 class GetFormMobilePath(CradleBaseModel):
@@ -24,7 +24,7 @@ def get_patient_pregnancies(path: PatientIdPath, query: SearchFilterQueryParams)
     """Get Patient's Pregnancies"""
     params = query.model_dump()
     pregnancies = view.pregnancy_view(path.patient_id, **params)
-    return [orm_serializer.marshal(p) for p in pregnancies]
+    return orm_serializer.marshal_many(pregnancies)
 
 
 # /api/patients/<string:patient_id>/pregnancies [POST]
@@ -13,6 +13,7 @@ from common.api_utils import (
 )
 from common.commonUtil import get_current_time
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from models import HealthFacilityOrm, PatientOrm, ReferralOrm
 from service import assoc, serialize, view
 from validation.referrals import (
@@ -122,7 +123,7 @@ def update_referral_assessed(path: ReferralIdPath):
     if not referral.is_assessed:
         referral.is_assessed = True
         referral.date_assessed = get_current_time()
-        crud.db_session.commit()
+        unit_of_work.commit()
         crud.db_session.refresh(referral)
 
     return orm_serializer.marshal(referral), 200
@@ -148,7 +149,7 @@ def update_referral_cancel_status(path: ReferralIdPath, body: CancelStatus):
     crud.update(ReferralOrm, cancel_status_model_dump, id=path.referral_id)
 
     referral = crud.read(ReferralOrm, id=path.referral_id)
-    crud.db_session.commit()
+    unit_of_work.commit()
     crud.db_session.refresh(referral)
 
     return orm_serializer.marshal(referral)
@@ -167,7 +168,7 @@ def update_referral_not_attend(path: ReferralIdPath, body: NotAttendReason):
         referral.not_attended = True
         referral.not_attend_reason = not_attend_model_dump["not_attend_reason"]
         referral.date_not_attended = get_current_time()
-        crud.db_session.commit()
+        unit_of_work.commit()
         crud.db_session.refresh(referral)
 
     return orm_serializer.marshal(referral)
@@ -38,7 +38,7 @@ class RelayServerPhoneNumberList(RootModel):
 def get_all_relay_phone_numbers():
     """Get All SMS Relay Server Phone Numbers"""
     phone_numbers = crud.read_all(RelayServerPhoneNumberOrm)
-    return [orm_serializer.marshal(f, shallow=True) for f in phone_numbers]
+    return orm_serializer.marshal_many(phone_numbers, shallow=True)
 
 
 # /api/relay/server/phone [POST]
@@ -1,15 +1,15 @@
 import json
 
-import requests
-from flask import Response, abort, make_response
+from flask import Response, abort, current_app, make_response
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag
 from humps import decamelize
 from pydantic import ValidationError
 
-from authentication import sms_auth
+from authentication import set_access_token_claims, sms_auth
 from common import phone_number_utils, user_utils
 from common.constants import MAX_SMS_RELAY_REQUEST_NUMBER
+from models import UserOrm
 from service import compressor, encryptor
 from validation.sms_relay import (
     SmsRelayDecryptedBody,
@@ -32,22 +32,39 @@ error_messages = {
 
 
 def _send_request_to_endpoint(
-    user_id: int,
+    user: UserOrm,
     method: str,
     endpoint: str,
     headers: dict,
     body: str,
-) -> requests.Response:
-    """Forward a decrypted SMS relay request to the local API and return the response."""
-    api_url = "http://localhost:5000/{endpoint}"
-    sms_access_token = sms_auth.create_sms_access_token(user_id)
-    headers["Authorization"] = f"bearer {sms_access_token}"
-    return requests.request(
+) -> Response:
+    """
+    Dispatch a decrypted SMS relay request to the API within this worker and return
+    the response.
+
+    The request runs in its own application and request contexts, so it has its own
+    ``flask.g`` and database session, and is authenticated as the SMS user directly
+    rather than with an access token sent over a loopback HTTP call.
+    """
+    app = current_app._get_current_object()  # noqa: SLF001
+    # A new application context gives the request a fresh ``flask.g`` and session
+    request_context = app.test_request_context(
+        "/" + endpoint.lstrip("/"),
         method=method,
-        url=api_url.format(endpoint=endpoint),
         headers=headers,
         json=json.loads(body),
     )
+    with app.app_context(), request_context:
+        set_access_token_claims(
+            sms_auth.create_sms_access_claims(user.id, user.username)
+        )
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            response = app.handle_exception(e)
+        # Read the body before the contexts are torn down
+        response.get_data()
+    return response
 
 
 def _make_encrypted_response(
@@ -223,14 +240,14 @@ def relay_sms_request(body: SmsRelayRequestBody):
     # Sending request to endpoint
     method = str(decrypted_data.method)
     endpoint = decrypted_data.endpoint
-    response = _send_request_to_endpoint(user.id, method, endpoint, headers, json_body)
+    response = _send_request_to_endpoint(user, method, endpoint, headers, json_body)
 
     # Update expected request number from user
     user_utils.update_expected_request_number(phone_number, request_number)
 
     # Creating Response
     response_code = response.status_code
-    response_body = json.dumps(response.json())
+    response_body = response.get_data(as_text=True)
     return _create_success_response(
         response_code,
         response_body,
@@ -1,3 +1,5 @@
+import copy
+import os
 from datetime import date
 from typing import Optional
 
@@ -10,11 +12,20 @@ import data.db_operations as crud
 from api.decorator import roles_required
 from common import user_utils
 from common.api_utils import FacilityNamePath, UserIdPath
-from enums import RoleEnum, TrafficLightEnum
+from common.cache_utils import TTLCache
+from common.commonUtil import get_current_time
+from enums import RoleEnum
 from models import UserOrm
 from validation import CradleBaseModel
 from validation.readings import ColorReadingStats
-from validation.stats import Timeframe
+from validation.stats import MYSQL_BIGINT_MAX, Timeframe
+
+# Time-to-live in seconds of cached stats for date ranges which have ended; 0
+# disables the cache
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "300"))
+
+# (from, to, facility, user ID) -> stats data
+stats_cache = TTLCache(maxsize=256, ttl=STATS_CACHE_TTL)
 
 
 class StatsData(CradleBaseModel):
@@ -26,70 +37,34 @@ class StatsData(CradleBaseModel):
     color_readings: ColorReadingStats
 
 
-def _query_stats_data(args, facility_id="%", user_id="%"):
-    """Query and aggregate stats data for a given facility and user filter."""
-    patients = crud.get_unique_patients_with_readings(
-        facility=facility_id,
-        user=user_id,
-        filter=args,
-    )[0][0]
-    total_readings = crud.get_total_readings_completed(
-        facility=facility_id,
-        user=user_id,
-        filter=args,
-    )[0][0]
-    color_readings_q = crud.get_total_color_readings(
-        facility=facility_id,
-        user=user_id,
-        filter=args,
-    )
-    total_referrals = crud.get_sent_referrals(
-        facility=facility_id,
-        user=user_id,
-        filter=args,
-    )[0][0]
+def _query_stats_data(args, facility_id=None, user_id=None):
+    """
+    Query and aggregate stats data for a given facility and user filter.
 
-    days_with_readings = crud.get_days_with_readings(
-        facility=facility_id,
-        user=user_id,
-        filter=args,
-    )[0][0]
-
-    color_readings = _create_color_readings(color_readings_q)
-
-    response_json = {
-        "sent_referrals": total_referrals,
-        "days_with_readings": days_with_readings,
-        "unique_patient_readings": patients,
-        "total_readings": total_readings,
-        "color_readings": color_readings,
-    }
-
-    if user_id == "%":
-        referred_patients = crud.get_referred_patients(
-            facility=facility_id,
-            filter=args,
-        )[0][0]
-        response_json["patients_referred"] = referred_patients
-
-    return response_json
+    Stats for date ranges which have already ended are cached for a short time, as
+    they only change when older records are synced or edited.
+    """
+    from_ = int(args.get("from_") or 0)
+    to = int(args.get("to") or MYSQL_BIGINT_MAX)
+    is_closed_range = to < get_current_time()
 
+    cache_key = (from_, to, facility_id, user_id)
+    if is_closed_range:
+        cached = stats_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
 
-def _create_color_readings(color_readings_q):
-    """Convert a color readings query result into a dict keyed by traffic light status."""
-    color_readings = {
-        TrafficLightEnum.GREEN.value: 0,
-        TrafficLightEnum.YELLOW_UP.value: 0,
-        TrafficLightEnum.YELLOW_DOWN.value: 0,
-        TrafficLightEnum.RED_UP.value: 0,
-        TrafficLightEnum.RED_DOWN.value: 0,
-    }
-
-    for reading in color_readings_q:
-        if color_readings.get(reading[0]) is not None:
-            color_readings[reading[0]] = reading[1]
+    response_json = crud.read_stats_summary(
+        from_,
+        to,
+        facility=facility_id,
+        user_id=user_id,
+        include_referred_patients=user_id is None,
+    )
 
-    return color_readings
+    if is_closed_range:
+        stats_cache.set(cache_key, copy.deepcopy(response_json))
+    return response_json
 
 
 # api/stats
@@ -143,10 +118,7 @@ def _has_permission_to_view_user(user_id):
         return False
     if role == RoleEnum.CHO.value:
         supervised = crud.get_supervised_vhts(current_user["id"])
-        if supervised is None:
-            return False
-        supervised = [user[0] for user in supervised]
-        if user_id not in supervised:
+        if supervised is None or user_id not in supervised:
             return False
     if role == RoleEnum.HCW.value:
         user = crud.read(UserOrm, id=user_id)
@@ -166,7 +138,7 @@ def get_user_stats(path: UserIdPath, query: Timeframe):
     if not _has_permission_to_view_user(path.user_id):
         return abort(401, "Unauthorized to view this endpoint")
     filter = query.model_dump()
-    response = _query_stats_data(filter, user_id=str(path.user_id))
+    response = _query_stats_data(filter, user_id=path.user_id)
     return response, 200
 
 
@@ -1,4 +1,4 @@
-from typing import Any, NamedTuple, Union, cast
+from typing import Any, NamedTuple, Optional, Union, cast
 
 from flask import abort
 from flask_openapi3.blueprint import APIBlueprint
@@ -8,8 +8,12 @@ from pydantic import Field, RootModel
 
 import data.db_operations as crud
 from common import user_utils
+from common.commonUtil import decode_sync_cursor, encode_sync_cursor
 from data import orm_serializer
+from data.db_operations import unit_of_work
+from data.db_operations.helper_utils import SyncPage
 from models import (
+    AssessmentOrm,
     MedicalRecordOrm,
     PatientAssociationsOrm,
     PatientOrm,
@@ -17,7 +21,7 @@ from models import (
     ReadingOrm,
     ReferralOrm,
 )
-from service import invariant, serialize, view
+from service import serialize, view
 from validation import CradleBaseModel
 from validation.assessments import AssessmentModel
 from validation.patients import PatientWithHistory
@@ -43,6 +47,23 @@ class LastSyncQueryParam(CradleBaseModel):
     since: int = Field(..., description="Timestamp of last sync.")
 
 
+# Bounds on the number of items returned per page of the sync changes feed
+SYNC_CHANGES_DEFAULT_LIMIT = 500
+SYNC_CHANGES_MAX_LIMIT = 1000
+
+
+class SyncChangesQueryParams(LastSyncQueryParam):
+    cursor: Optional[str] = Field(
+        None, description="Cursor returned with the previous page of changes."
+    )
+    limit: int = Field(
+        SYNC_CHANGES_DEFAULT_LIMIT,
+        ge=1,
+        le=SYNC_CHANGES_MAX_LIMIT,
+        description="Maximum number of items to return.",
+    )
+
+
 class SyncPatientsBody(RootModel[list[PatientWithHistory]]):
     model_config = dict(openapi_extra={"description": "List of Patient objects."})  # type: ignore[reportAssignmentType]
 
@@ -67,6 +88,18 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
     last_sync = query.since
 
     mobile_patients = body.root
+
+    # Prefetch everything the uploaded patients reference so that classifying them
+    # below does not need a query per patient.
+    patient_ids = [mobile_patient.id for mobile_patient in mobile_patients]
+    server_patients = crud.read_models_by_ids(PatientOrm, patient_ids)
+    server_pregnancies = crud.read_pregnancies_by_patient(server_patients.keys())
+    associated_patient_ids = crud.read_associated_patient_ids(
+        patient_ids,
+        current_user["id"],
+        current_user.get("health_facility_name"),
+    )
+
     status_code = 200
     errors: list[dict] = list()
     patients_to_create: list[PatientOrm] = list()
@@ -97,7 +130,7 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
         pregnancy_to_update = None
         mobile_patient_dict = mobile_patient.model_dump()
         try:
-            server_patient = crud.read(PatientOrm, id=patient_id)
+            server_patient = server_patients.get(patient_id)
             if server_patient is None:
                 """
                 TODO: Why are these functions called `deserialize`?
@@ -146,10 +179,15 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
                     values = serialize.deserialize_pregnancy(
                         mobile_patient_dict, partial=True
                     )
-                    pregnancy = crud.read(
-                        PregnancyOrm, id=mobile_patient_dict.get("pregnancy_id")
+                    pregnancy = next(
+                        (
+                            p
+                            for p in server_pregnancies[patient_id]
+                            if p.id == mobile_patient_dict.get("pregnancy_id")
+                        ),
+                        None,
                     )
-                    if pregnancy is None or pregnancy.patient_id != patient_id:
+                    if pregnancy is None:
                         err = _to_string("pregnancy_id", "invalid")
                         raise ValidationError(err)
                     pregnancy_id = pregnancy.id
@@ -160,8 +198,8 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
                         pregnancy_end_date = values["end_date"]
                         if (
                             pregnancy.start_date >= pregnancy_end_date
-                            or crud.has_conflicting_pregnancy_record(
-                                patient_id,
+                            or crud.has_conflicting_pregnancy(
+                                server_pregnancies[patient_id],
                                 pregnancy.start_date,
                                 pregnancy_end_date,
                                 pregnancy_id,
@@ -184,8 +222,8 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
 
                     if (
                         pregnancy_end_date and model.start_date <= pregnancy_end_date
-                    ) or crud.has_conflicting_pregnancy_record(
-                        patient_id,
+                    ) or crud.has_conflicting_pregnancy(
+                        server_pregnancies[patient_id],
                         model.start_date,
                         pregnancy_id=pregnancy_id,
                     ):
@@ -200,7 +238,7 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
             }
             # Why is a PatientAssociation being assigned to a variable called
             # assessment_to_create
-            if crud.read(PatientAssociationsOrm, **association) is None:
+            if patient_id not in associated_patient_ids:
                 assessment_to_create = orm_serializer.unmarshal(
                     PatientAssociationsOrm, association
                 )
@@ -225,22 +263,20 @@ def sync_patients(query: LastSyncQueryParam, body: SyncPatientsBody):
             status_code = 207
 
     with crud.db_session.begin_nested():
-        # Create and update patients in the database
-        for models in models_list[:5]:
-            if models:
-                crud.create_all(models, autocommit=False)
-        for data in patients_to_update:
-            print("data:")
-            print(data)
-            crud.update(
-                PatientOrm,
-                data.values,
-                autocommit=False,
-                id=data.key_value,
-            )
-        for data in pregnancies_to_update:
-            crud.update(PregnancyOrm, data.values, autocommit=False, id=data.key_value)
-    crud.db_session.commit()
+        # Create and update patients in the database as batches in one transaction
+        crud.create_all(
+            [model for models in models_list[:5] for model in models],
+            autocommit=False,
+        )
+        crud.bulk_update(
+            PatientOrm,
+            [dict(data.values, id=data.key_value) for data in patients_to_update],
+        )
+        crud.bulk_update(
+            PregnancyOrm,
+            [dict(data.values, id=data.key_value) for data in pregnancies_to_update],
+        )
+    unit_of_work.commit()
 
     # Read all patients that have been created or updated since last sync
     current_user = cast("dict[Any, Any]", current_user)
@@ -258,40 +294,54 @@ class SyncReadingsResponse(CradleBaseModel):
 @api_sync.post("/readings", responses={200: SyncReadingsResponse})
 def sync_readings(query: LastSyncQueryParam, body: SyncReadingsBody):
     """Sync Readings"""
-    patients_on_server_cache = set()
-    mobile_readings = body.root
-    for mobile_reading in mobile_readings:
-        mobile_reading_dict = mobile_reading.model_dump()
-        if mobile_reading_dict.get("patient_id") not in patients_on_server_cache:
-            patient_on_server = crud.read(
-                PatientOrm, id=mobile_reading_dict.get("patient_id")
-            )
-            if patient_on_server is None:
-                continue
-            patients_on_server_cache.add(patient_on_server.id)
-
-        if crud.read(ReadingOrm, id=mobile_reading_dict.get("id")):
-            crud.update(
-                ReadingOrm,
-                {"date_retest_needed": mobile_reading_dict.get("date_retest_needed")},
-                id=mobile_reading_dict.get("id"),
-            )
+    mobile_readings = [r.model_dump() for r in body.root]
+
+    # Prefetch which patients and readings already exist on the server
+    patients_on_server = crud.read_existing_ids(
+        PatientOrm, (r.get("patient_id") for r in mobile_readings)
+    )
+    readings_on_server = crud.read_existing_ids(
+        ReadingOrm, (r.get("id") for r in mobile_readings)
+    )
+
+    readings_to_create: dict[str, ReadingOrm] = dict()
+    readings_to_update: dict[str, dict] = dict()
+    for mobile_reading_dict in mobile_readings:
+        if mobile_reading_dict.get("patient_id") not in patients_on_server:
+            continue
+
+        reading_id = mobile_reading_dict.get("id")
+        date_retest_needed = mobile_reading_dict.get("date_retest_needed")
+        if reading_id in readings_on_server:
+            readings_to_update[reading_id] = {
+                "id": reading_id,
+                "date_retest_needed": date_retest_needed,
+            }
+        elif reading_id in readings_to_create:
+            # Repeated upload of a reading created earlier in this batch
+            readings_to_create[reading_id].date_retest_needed = date_retest_needed
         else:
             try:
                 ReadingModel(**mobile_reading_dict)
             except ValidationError as e:
                 return abort(422, description=str(e))
+            # Unmarshalling a reading also resolves its invariants
             reading = orm_serializer.unmarshal(ReadingOrm, mobile_reading_dict)
-            invariant.resolve_reading_invariants(reading)
-            crud.create(reading, refresh=True)
+            readings_to_create[reading.id] = reading
+
+    crud.create_all(list(readings_to_create.values()), autocommit=False)
+    crud.bulk_update(ReadingOrm, list(readings_to_update.values()))
+    unit_of_work.commit()
 
     # Read all readings that have been created or updated since last sync
     current_user = user_utils.get_current_user_from_jwt()
     last_sync = query.since
-    new_readings = view.reading_view(cast("dict[Any, Any]", current_user), last_sync)
+    new_readings = view.reading_view(
+        cast("dict[Any, Any]", current_user), last_sync, as_rows=True
+    )
 
     return {
-        "readings": [serialize.serialize_reading(r) for r in new_readings],
+        "readings": orm_serializer.marshal_reading_rows(new_readings),
     }
 
 
@@ -303,35 +353,41 @@ class SyncReferralsResponse(CradleBaseModel):
 @api_sync.post("/referrals", responses={200: SyncReferralsResponse})
 def sync_referrals(query: LastSyncQueryParam, body: SyncReferralsBody):
     """Sync Referrals"""
-    patients_on_server_cache = set()
-    mobile_referrals = body.root
-    for mobile_referral in mobile_referrals:
-        mobile_referral_dict = mobile_referral.model_dump()
-        if mobile_referral_dict.get("patient_id") not in patients_on_server_cache:
-            patient_on_server = crud.read(
-                PatientOrm, id=mobile_referral_dict.get("patient_id")
-            )
-            if patient_on_server is None:
-                continue
-            patients_on_server_cache.add(patient_on_server.id)
-
-        if crud.read(ReferralOrm, id=mobile_referral_dict.get("id")):
+    mobile_referrals = [r.model_dump() for r in body.root]
+
+    # Prefetch which patients and referrals already exist on the server
+    patients_on_server = crud.read_existing_ids(
+        PatientOrm, (r.get("patient_id") for r in mobile_referrals)
+    )
+    referrals_on_server = crud.read_existing_ids(
+        ReferralOrm, (r.get("id") for r in mobile_referrals)
+    )
+
+    referrals_to_create: dict[str, ReferralOrm] = dict()
+    for mobile_referral_dict in mobile_referrals:
+        if mobile_referral_dict.get("patient_id") not in patients_on_server:
+            continue
+
+        referral_id = mobile_referral_dict.get("id")
+        if referral_id in referrals_on_server or referral_id in referrals_to_create:
             # currently, for referrals that exist in server already we will skip them
             continue
         ReferralModel(**mobile_referral_dict)
 
         referral = orm_serializer.unmarshal(ReferralOrm, mobile_referral_dict)
-        crud.create(referral, refresh=True)
+        referrals_to_create[referral.id] = referral
+
+    crud.create_all(list(referrals_to_create.values()))
 
     # Read all referrals that have been created or updated since last sync
     current_user = user_utils.get_current_user_from_jwt()
     last_sync = query.since
-    new_referrals = view.referral_view(cast("dict[Any, Any]", current_user), last_sync)
+    new_referrals = view.referral_view(
+        cast("dict[Any, Any]", current_user), last_sync, as_rows=True
+    )
 
     return {
-        "referrals": [
-            serialize.serialize_referral_or_assessment(r) for r in new_referrals
-        ],
+        "referrals": orm_serializer.marshal_rows(ReferralOrm, new_referrals),
     }
 
 
@@ -348,16 +404,123 @@ def sync_assessments(query: LastSyncQueryParam):
     # Read all assessments that have been updated since last sync
     current_user = user_utils.get_current_user_from_jwt()
     new_assessments = view.assessment_view(
-        cast("dict[Any, Any]", current_user), last_sync
+        cast("dict[Any, Any]", current_user), last_sync, as_rows=True
+    )
+
+    return {
+        "assessments": orm_serializer.marshal_rows(AssessmentOrm, new_assessments),
+    }, 200
+
+
+class SyncPatientChangesResponse(CradleBaseModel):
+    patients: list[PatientWithHistory]
+    next_cursor: Optional[str] = None
+
+
+# /api/sync/patients/changes [GET]
+@api_sync.get("/patients/changes", responses={200: SyncPatientChangesResponse})
+def get_patient_changes(query: SyncChangesQueryParams):
+    """Get a Page of Patients Changed Since Last Sync"""
+    current_user = cast("dict[Any, Any]", user_utils.get_current_user_from_jwt())
+    page = view.patient_changes_view(
+        current_user, query.since, _decode_cursor(query.cursor), query.limit
+    )
+
+    return {
+        "patients": [serialize.serialize_patient(p) for p in page.items],
+        "next_cursor": _encode_cursor(page),
+    }, 200
+
+
+class SyncReadingChangesResponse(CradleBaseModel):
+    readings: list[ReadingModel]
+    next_cursor: Optional[str] = None
+
+
+# /api/sync/readings/changes [GET]
+@api_sync.get("/readings/changes", responses={200: SyncReadingChangesResponse})
+def get_reading_changes(query: SyncChangesQueryParams):
+    """Get a Page of Readings Changed Since Last Sync"""
+    current_user = cast("dict[Any, Any]", user_utils.get_current_user_from_jwt())
+    page = view.reading_changes_view(
+        current_user,
+        query.since,
+        _decode_cursor(query.cursor),
+        query.limit,
+        as_rows=True,
+    )
+
+    return {
+        "readings": orm_serializer.marshal_reading_rows(page.items),
+        "next_cursor": _encode_cursor(page),
+    }, 200
+
+
+class SyncReferralChangesResponse(CradleBaseModel):
+    referrals: list[ReferralModel]
+    next_cursor: Optional[str] = None
+
+
+# /api/sync/referrals/changes [GET]
+@api_sync.get("/referrals/changes", responses={200: SyncReferralChangesResponse})
+def get_referral_changes(query: SyncChangesQueryParams):
+    """Get a Page of Referrals Changed Since Last Sync"""
+    current_user = cast("dict[Any, Any]", user_utils.get_current_user_from_jwt())
+    page = view.referral_changes_view(
+        current_user,
+        query.since,
+        _decode_cursor(query.cursor),
+        query.limit,
+        as_rows=True,
     )
 
     return {
-        "assessments": [
-            serialize.serialize_referral_or_assessment(a) for a in new_assessments
-        ],
+        "referrals": orm_serializer.marshal_rows(ReferralOrm, page.items),
+        "next_cursor": _encode_cursor(page),
     }, 200
 
 
+class SyncAssessmentChangesResponse(CradleBaseModel):
+    assessments: list[AssessmentModel]
+    next_cursor: Optional[str] = None
+
+
+# /api/sync/assessments/changes [GET]
+@api_sync.get("/assessments/changes", responses={200: SyncAssessmentChangesResponse})
+def get_assessment_changes(query: SyncChangesQueryParams):
+    """Get a Page of Assessments Made Since Last Sync"""
+    current_user = cast("dict[Any, Any]", user_utils.get_current_user_from_jwt())
+    page = view.assessment_changes_view(
+        current_user,
+        query.since,
+        _decode_cursor(query.cursor),
+        query.limit,
+        as_rows=True,
+    )
+
+    return {
+        "assessments": orm_serializer.marshal_rows(AssessmentOrm, page.items),
+        "next_cursor": _encode_cursor(page),
+    }, 200
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple[int, Any]]:
+    """Decode the cursor query parameter, aborting with 400 if it is malformed."""
+    if cursor is None:
+        return None
+    try:
+        return decode_sync_cursor(cursor)
+    except ValueError as err:
+        return abort(400, description=str(err))
+
+
+def _encode_cursor(page: SyncPage) -> Optional[str]:
+    """Encode the position of the next page of changes, if there is one."""
+    if page.next_cursor is None:
+        return None
+    return encode_sync_cursor(*page.next_cursor)
+
+
 ERROR_MESSAGES = {
     "conflict": "Pregnancy conflicts with existing records.",
     "invalid": "Value is invalid.",
@@ -121,7 +121,7 @@ def get_workflow_collections():
     """Get all workflow collections"""
     data = crud.read_all(WorkflowCollectionModel)
 
-    workflow_collections = [orm_serializer.marshal(collection) for collection in data]
+    workflow_collections = orm_serializer.marshal_many(data)
 
     return {"items": workflow_collections}, 200
 
@@ -2,17 +2,21 @@ from flask import abort, request
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag
 
+from api.decorator import roles_required
 from common import patient_utils, user_utils, workflow_utils
 from common.api_utils import (
     WorkflowInstanceIdPath,
     convert_query_parameter_to_bool,
 )
+from enums import RoleEnum
 from service.workflow.workflow_errors import InvalidWorkflowActionError
 from service.workflow.workflow_service import WorkflowService, WorkflowView
 from validation.workflow_api_models import (
     AdvanceWorkflowRequest,
     ApplyActionRequest,
     CreateWorkflowInstanceRequest,
+    EvaluateWorkflowInstancesRequest,
+    EvaluateWorkflowInstancesResponse,
     GetAvailableActionsResponse,
     GetWorkflowInstanceDataResponse,
     GetWorkflowInstancesResponse,
@@ -62,6 +66,27 @@ def create_workflow_instance(body: CreateWorkflowInstanceRequest):
     return workflow_instance.model_dump(), 201
 
 
+# /api/workflow/instances/evaluate [POST]
+@api_workflow_instances.post(
+    "/evaluate", responses={200: EvaluateWorkflowInstancesResponse}
+)
+@roles_required([RoleEnum.ADMIN])
+def evaluate_workflow_instances(body: EvaluateWorkflowInstancesRequest):
+    """Evaluate the Current Step of Active Workflow Instances in Bulk"""
+    if body.workflow_template_id is not None:
+        workflow_utils.fetch_workflow_template_or_404(body.workflow_template_id)
+
+    current_user = user_utils.get_current_user_from_jwt()
+    evaluations = WorkflowService.evaluate_workflow_instances(
+        workflow_template_id=body.workflow_template_id,
+        workflow_instance_ids=body.workflow_instance_ids,
+        current_user=current_user,
+    )
+
+    response = EvaluateWorkflowInstancesResponse(items=evaluations)
+    return response.model_dump(), 200
+
+
 # /api/workflow/instances?patient_id=<str>&status=<str>&workflow_template_id=<str>&with_steps=<bool> [GET]
 @api_workflow_instances.get("", responses={200: GetWorkflowInstancesResponse})
 def get_workflow_instances():
@@ -50,9 +50,7 @@ def create_workflow_template_step(body: WorkflowTemplateStepUploadModel):
 def get_workflow_template_steps():
     """Get All Workflow Template Steps"""
     template_steps = crud.read_template_steps()
-    template_steps = [
-        orm_serializer.marshal(template_step) for template_step in template_steps
-    ]
+    template_steps = orm_serializer.marshal_many(template_steps)
 
     return {"items": template_steps}, 200
 
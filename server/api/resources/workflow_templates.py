@@ -296,9 +296,7 @@ def get_workflow_template_steps_by_template(path: WorkflowTemplateIdPath):
     template_steps = crud.read_template_steps(
         workflow_template_id=path.workflow_template_id
     )
-    template_steps = [
-        orm_serializer.marshal(template_step) for template_step in template_steps
-    ]
+    template_steps = orm_serializer.marshal_many(template_steps)
 
     return {"items": template_steps}, 200
 
@@ -20,15 +20,16 @@ import json
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
 import logging
-from config import Config
 import config
-from logging.config import dictConfig
 from flask import Response, request
 from werkzeug.exceptions import HTTPException
-from humps import camelize
+from common.json_utils import camelize_keys, is_camel_case_exempt_path
 from api.resources import api
+from data.db_operations import unit_of_work
+
+# Registers the flush listener keeping the patient_latest projection current
+from data.db_operations import patient_latest  # noqa: F401
 
-dictConfig(Config.LOGGING)
 LOGGER = logging.getLogger(__name__)
 
 app = config.app
@@ -36,6 +37,9 @@ app = config.app
 # Register Blueprints
 app.register_api(api)
 
+if app.config["DB_UNIT_OF_WORK"]:
+    unit_of_work.init_app(app)
+
 host = "0.0.0.0"
 port = os.environ.get("PORT")
 
@@ -69,14 +73,17 @@ def handle_http_exception(e):
 @app.after_request
 def convert_response_body_to_camel_case(response: Response):
     """
-    Intercepts responses and converts keys to camel case.
+    Intercepts JSON responses which were not serialized by the app's JSON provider,
+    such as request validation errors, and converts their keys to camel case.
     """
-    if request.path.startswith(("/openapi", "/apidocs")):
+    if getattr(response, "is_camel_case", False) or is_camel_case_exempt_path(
+        request.path
+    ):
         return response
 
     if response.mimetype == "application/json":
-        response_body = camelize(json.loads(response.data))
-        response.data = json.dumps(response_body)
+        response_body = camelize_keys(json.loads(response.data))
+        response.data = app.json.encode(response_body)
     return response
 
 
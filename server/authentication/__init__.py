@@ -1,15 +1,18 @@
+import hashlib
 import logging
 import os
+import time
 
 import boto3
 import jwt
 from dotenv import load_dotenv
-from flask import Request, Response, request
+from flask import Request, Response, g, request
 from werkzeug.exceptions import Unauthorized
 
 import config
 from authentication import sms_auth
 from authentication.CognitoClientWrapper import CognitoClientWrapper
+from common.cache_utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +42,13 @@ cognito = CognitoClientWrapper(
 
 app = config.app
 
+# Time-to-live in seconds of verified access token claims; 0 disables the cache
+ACCESS_TOKEN_CLAIMS_CACHE_TTL = int(os.getenv("ACCESS_TOKEN_CLAIMS_CACHE_TTL", "60"))
+
+# SHA-256 of an access token -> its verified claims, so that a client sending many
+# requests with the same token only has it verified once per time-to-live
+access_token_claims_cache = TTLCache(maxsize=4096, ttl=ACCESS_TOKEN_CLAIMS_CACHE_TTL)
+
 
 def is_public_endpoint(request: Request):
     """Return True if the request path is a public endpoint that does not require authentication."""
@@ -90,7 +100,7 @@ def _get_access_token() -> str:
     return access_token
 
 
-def _decode_access_token() -> dict:
+def _verify_access_token(access_token: str) -> dict:
     """
     Checks the 'iss' claim of the access token and uses this claim to determine whether the token is a
     Cognito issued access token, or a token issued internally for authenticating requests relayed from the SMS relay
@@ -98,7 +108,6 @@ def _decode_access_token() -> dict:
 
     Decoding the access token also verifies it in the process. If verification fails, an exception is thrown.
     """
-    access_token = _get_access_token()
     payload: dict = jwt.decode(access_token, options={"verify_signature": False})
     issuer_claim = payload.get("iss")
 
@@ -115,6 +124,55 @@ def _decode_access_token() -> dict:
     return payload
 
 
+def _decode_access_token() -> dict:
+    """
+    Returns the verified claims of the access token in the request authorization
+    header.
+
+    The claims are verified once per request and then kept on ``flask.g``. Across
+    requests, verified claims are cached by token hash until the cache's time-to-live
+    or the token's expiry, whichever comes first.
+    """
+    claims = g.get("access_token_claims")
+    if claims is not None:
+        return claims
+
+    access_token = _get_access_token()
+    token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+    claims = access_token_claims_cache.get(token_hash)
+    if claims is None:
+        claims = _verify_access_token(access_token)
+        expiry = claims.get("exp")
+        ttl = None if expiry is None else expiry - time.time()
+        access_token_claims_cache.set(token_hash, claims, ttl=ttl)
+
+    g.access_token_claims = claims
+    return claims
+
+
+def set_access_token_claims(claims: dict):
+    """
+    Authenticates the current request with claims the server has already verified,
+    so that no access token is needed. Used to dispatch the requests relayed by the
+    SMS relay endpoint within the server.
+
+    :param claims: Claims of the user the request is made as
+    """
+    g.access_token_claims = claims
+
+
+def invalidate_access_tokens(username: str):
+    """
+    Drops the cached claims of every access token issued to a user, so that their
+    tokens are verified again on their next request.
+
+    :param username: Username of the user
+    """
+    access_token_claims_cache.remove_where(
+        lambda _, claims: claims.get("username") == username
+    )
+
+
 def get_username_from_jwt() -> str:
     """
     Verifies access token in request authorization header and retrieves
@@ -34,25 +34,27 @@ def create_sms_access_token(user_id: int):
 
     sms_secret_key = _get_sms_secret_key(user_id)
 
-    username: str = user_orm.username
-
-    issued_at = datetime.datetime.now(tz=datetime.timezone.utc)
-    expires_at = issued_at + datetime.timedelta(seconds=30)
-
     sms_access_token = jwt.encode(
-        payload={
-            "iss": CRADLE_SMS_ISSUER,
-            "iat": issued_at,
-            "exp": expires_at,
-            "sub": str(user_id),
-            "username": username,
-        },
+        payload=create_sms_access_claims(user_id, user_orm.username),
         key=sms_secret_key,
         algorithm=ALGORITHM,
     )
     return sms_access_token
 
 
+def create_sms_access_claims(user_id: int, username: str) -> dict:
+    """Create the claims of a short-lived SMS access token for the given user."""
+    issued_at = datetime.datetime.now(tz=datetime.timezone.utc)
+    expires_at = issued_at + datetime.timedelta(seconds=30)
+    return {
+        "iss": CRADLE_SMS_ISSUER,
+        "iat": int(issued_at.timestamp()),
+        "exp": int(expires_at.timestamp()),
+        "sub": str(user_id),
+        "username": username,
+    }
+
+
 def decode_sms_access_token(access_token: str) -> dict:
     """Decode and verify an SMS access token, returning its payload or raising ValueError if invalid."""
     payload: dict = jwt.decode(access_token, options={"verify_signature": False})
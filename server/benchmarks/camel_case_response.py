@@ -0,0 +1,138 @@
+"""
+camel_case_response.py
+
+Compares the cost of producing a camelCase JSON response for a large sync payload
+with the previous approach (serialize with the default provider, then parse, camelize
+and re-serialize the body in an ``after_request`` hook) against
+``CamelCaseJSONProvider``, which converts keys once while serializing.
+
+USAGE: python benchmarks/camel_case_response.py [--patients N] [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from flask import Flask
+from humps import camelize
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from common.json_utils import CamelCaseJSONProvider
+
+
+def make_sync_payload(patient_count: int) -> dict:
+    """Build a body shaped like a ``/api/sync/patients`` response."""
+    patients = []
+    for i in range(patient_count):
+        patient_id = str(100000 + i)
+        patients.append(
+            {
+                "id": patient_id,
+                "name": f"Patient {i}",
+                "sex": "FEMALE",
+                "is_pregnant": i % 2 == 0,
+                "pregnancy_start_date": 1_700_000_000 + i,
+                "date_of_birth": "1990-01-01",
+                "is_exact_date_of_birth": False,
+                "village_number": "1001",
+                "household_number": None,
+                "zone": "7",
+                "medical_history": "None",
+                "drug_history": "Aspirin 75mg",
+                "allergy": None,
+                "is_archived": False,
+                "last_edited": 1_700_000_000 + i,
+                "readings": [
+                    {
+                        "id": f"{patient_id}-{r}",
+                        "patient_id": patient_id,
+                        "systolic_blood_pressure": 110 + r,
+                        "diastolic_blood_pressure": 70 + r,
+                        "heart_rate": 80,
+                        "symptoms": ["HEADACHE", "BLURRED VISION"],
+                        "traffic_light_status": "GREEN",
+                        "date_taken": 1_700_000_000 + r,
+                        "date_retest_needed": None,
+                        "retest_of_previous_reading_ids": "",
+                        "is_flagged_for_follow_up": False,
+                        "last_edited": 1_700_000_000 + r,
+                        "user_id": 1,
+                        "urine_test": {
+                            "leukocytes": "NAD",
+                            "nitrites": "NAD",
+                            "glucose": "NAD",
+                            "protein": "+",
+                            "blood": "NAD",
+                        },
+                    }
+                    for r in range(5)
+                ],
+            }
+        )
+    return {"patients": patients, "next_cursor": None}
+
+
+def make_apps() -> tuple[Flask, Flask]:
+    """Return an app using the previous re-parse hook and one using the provider."""
+    previous = Flask("previous")
+
+    @previous.after_request
+    def convert_response_body_to_camel_case(response):
+        if response.mimetype == "application/json":
+            response.data = json.dumps(camelize(json.loads(response.data)))
+        return response
+
+    current = Flask("current")
+    current.json = CamelCaseJSONProvider(current)
+    return previous, current
+
+
+def measure(app: Flask, body: dict, repeat: int) -> tuple[float, int, int]:
+    """
+    Build responses for ``body`` through ``app``.
+
+    :return: Best time in seconds, peak traced memory in bytes, and response size
+    """
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        with app.test_request_context("/api/sync/patients"):
+            start = time.perf_counter()
+            response = app.process_response(app.make_response(body))
+            best = min(best, time.perf_counter() - start)
+            size = len(response.data)
+
+    with app.test_request_context("/api/sync/patients"):
+        tracemalloc.start()
+        app.process_response(app.make_response(body))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--patients", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = make_sync_payload(args.patients)
+    previous, current = make_apps()
+
+    results = {
+        "re-parse hook": measure(previous, body, args.repeat),
+        "camelCase provider": measure(current, body, args.repeat),
+    }
+    for name, (seconds, peak, size) in results.items():
+        print(
+            f"{name:>20}: {seconds * 1000:8.1f} ms, "
+            f"peak {peak / 2**20:6.1f} MiB, body {size / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+load_test.py
+
+Measures the throughput of a running server under mixed mobile sync and SMS relay
+traffic, to compare the gunicorn concurrency profiles of ``prod/gunicorn.conf.py``
+(``GUNICORN_WORKER_CLASS`` sync, gthread or gevent) and the database pool settings of
+``config.Config``.
+
+Each client thread repeatedly sends either a sync request (``GET
+/api/sync/readings/changes``) or, with probability ``--sms-ratio``, the same request
+relayed through ``POST /api/sms_relay``. A relayed request holds a server worker while
+the server calls itself back, so a sync worker model serves it much more slowly than
+a threaded or gevent one.
+
+The user must have a phone number and an SMS key (the seeded admin user does).
+
+USAGE: python benchmarks/load_test.py [--url URL] [--username NAME] [--password PW]
+                                      [--clients N] [--duration SECONDS]
+                                      [--sms-ratio RATIO]
+"""
+
+import argparse
+import ast
+import gzip
+import io
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import requests
+from humps import decamelize
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from common.constants import MAX_SMS_RELAY_REQUEST_NUMBER as MAX_REQUEST_NUMBER
+from service import compressor, encryptor
+
+SYNC_ENDPOINT = "/api/sync/readings/changes?since=0&limit=100"
+IV = "00112233445566778899aabbccddeeff"
+
+
+class SmsRelayClient:
+    """Builds encrypted SMS relay requests, sharing request numbers across threads."""
+
+    def __init__(self, url: str, phone_number: str, sms_key: str, token: str):
+        self.url = url
+        self.phone_number = phone_number
+        self.sms_key = sms_key
+        self.token = token
+        self.request_number = 0
+        self.lock = threading.Lock()
+
+    def next_request_number(self) -> int:
+        with self.lock:
+            self.request_number = (self.request_number + 1) % (MAX_REQUEST_NUMBER + 1)
+            return self.request_number
+
+    def encrypt(self, request_number: int, endpoint: str) -> dict:
+        data = {
+            "request_number": request_number,
+            "method": "GET",
+            "endpoint": endpoint,
+        }
+        compressed_data = compressor.compress_from_string(json.dumps(data))
+        encrypted_data = encryptor.encrypt(compressed_data, IV, self.sms_key)
+        return {"phone_number": self.phone_number, "encrypted_data": encrypted_data}
+
+    def decrypt(self, response: requests.Response) -> dict:
+        decrypted_data = encryptor.decrypt(response.text, self.sms_key)
+        decoded_string = (
+            gzip.GzipFile(fileobj=io.BytesIO(decrypted_data), mode="r").read().decode()
+        )
+        return json.loads(decoded_string)
+
+    def send(self, session: requests.Session, endpoint: str) -> requests.Response:
+        return session.post(
+            f"{self.url}/api/sms_relay",
+            json=self.encrypt(self.next_request_number(), endpoint),
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+    def synchronize(self, session: requests.Session):
+        """Start from the server's expected request number, found from a 425 reply."""
+        response = session.post(
+            f"{self.url}/api/sms_relay",
+            # Outside the accepted window of any expected request number
+            json=self.encrypt(random.randrange(MAX_REQUEST_NUMBER), "/api/version"),
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        if response.status_code != 425:
+            self.request_number = 0
+            return
+        # The error body is the string form of a dict
+        body = ast.literal_eval(self.decrypt(response)["body"])
+        self.request_number = body["expected_request_number"]
+
+
+def authenticate(url: str, username: str, password: str) -> dict:
+    response = requests.post(
+        f"{url}/api/user/auth", json={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return decamelize(response.json())
+
+
+def run_client(
+    url: str,
+    token: str,
+    relay: SmsRelayClient,
+    sms_ratio: float,
+    deadline: float,
+    results: list,
+):
+    session = requests.Session()
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        kind = "sms_relay" if random.random() < sms_ratio else "sync"
+        start = time.perf_counter()
+        try:
+            if kind == "sms_relay":
+                response = relay.send(session, SYNC_ENDPOINT)
+            else:
+                response = session.get(f"{url}{SYNC_ENDPOINT}", headers=headers)
+            status = response.status_code
+        except requests.RequestException:
+            status = "error"
+        results.append((kind, status, time.perf_counter() - start))
+
+
+def report(results: list, duration: float):
+    print(f"{'traffic':<10} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for kind in ("sync", "sms_relay", "all"):
+        latencies = sorted(latency for k, _, latency in results if kind in ("all", k))
+        if not latencies:
+            continue
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] * 1000
+        rate = len(latencies) / duration
+        print(f"{kind:<10} {len(latencies):>9} {rate:>8.1f} {p50:>8.1f} {p95:>8.1f}")
+
+    statuses = Counter((kind, status) for kind, status, _ in results)
+    print("\nResponses:")
+    for (kind, status), count in sorted(statuses.items(), key=str):
+        print(f"  {kind:<10} {status!s:<6} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--username", default="admin@email.com")
+    parser.add_argument("--password", default="cradle-admin")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--sms-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    auth = authenticate(args.url, args.username, args.password)
+    user = auth["user"]
+    token = auth["access_token"]
+    relay = SmsRelayClient(
+        args.url, user["phone_numbers"][0], user["sms_key"]["key"], token
+    )
+    relay.synchronize(requests.Session())
+
+    results: list = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(args.url, token, relay, args.sms_ratio, deadline, results),
+        )
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(
+        f"{args.clients} clients for {args.duration:.0f} s, "
+        f"{args.sms_ratio:.0%} SMS relay traffic\n"
+    )
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
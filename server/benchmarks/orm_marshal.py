@@ -0,0 +1,139 @@
+"""
+orm_marshal.py
+
+Compares the cost of marshalling lists of transient ``ReadingOrm`` and ``PatientOrm``
+objects with the previous dispatch (a chain of ``isinstance`` checks in registration
+order, evaluated for every object) against ``orm_serializer.marshal`` and
+``orm_serializer.marshal_many``, which look the marshaller up by class. For readings
+it also times ``orm_serializer.marshal_reading_rows`` on the equivalent plain rows, as
+returned by the ``as_rows`` queries.
+
+USAGE: python benchmarks/orm_marshal.py [--objects N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import inspect
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# orm_serializer must be imported before the models to avoid a circular import
+from data import orm_serializer
+from data.orm_serializer import api
+from models import PatientOrm, ReadingOrm, UrineTestOrm
+
+# The registry lists the models in the order the previous isinstance chain checked
+MARSHALLERS = list(api.__MARSHALLERS.items())  # noqa: SLF001
+
+
+def marshal_with_isinstance_chain(obj, shallow=False, if_include_versions=False):
+    """Dispatch as ``marshal`` did before the registry was introduced."""
+    for cls, marshaller in MARSHALLERS:
+        if isinstance(obj, cls):
+            return marshaller(obj, shallow, if_include_versions)
+    return orm_serializer.marshal(obj, shallow, if_include_versions)
+
+
+def make_readings(count: int) -> list[ReadingOrm]:
+    readings = []
+    for i in range(count):
+        reading = ReadingOrm(
+            id=f"reading-{i}",
+            patient_id=str(100000 + i),
+            systolic_blood_pressure=110 + i % 30,
+            diastolic_blood_pressure=70 + i % 20,
+            heart_rate=80,
+            symptoms="HEADACHE,BLURRED VISION",
+            date_taken=1_700_000_000 + i,
+            last_edited=1_700_000_000 + i,
+            user_id=1,
+        )
+        reading.urine_tests = UrineTestOrm(
+            id=i, leukocytes="NAD", nitrites="NAD", glucose="NAD", protein="+"
+        )
+        readings.append(reading)
+    return readings
+
+
+def make_patients(count: int) -> list[PatientOrm]:
+    return [
+        PatientOrm(
+            id=str(100000 + i),
+            name=f"Patient {i}",
+            sex="FEMALE",
+            is_pregnant=i % 2 == 0,
+            date_of_birth="1990-01-01",
+            is_exact_date_of_birth=False,
+            village_number="1001",
+            zone="7",
+            last_edited=1_700_000_000 + i,
+            is_archived=False,
+        )
+        for i in range(count)
+    ]
+
+
+def as_rows(readings: list[ReadingOrm]) -> list[tuple]:
+    """Return the rows of reading and urine test columns matching ``readings``."""
+    reading_keys = [attr.key for attr in inspect(ReadingOrm).column_attrs]
+    urine_test_keys = [attr.key for attr in inspect(UrineTestOrm).column_attrs]
+    return [
+        tuple(getattr(r, key) for key in reading_keys)
+        + tuple(getattr(r.urine_tests, key) for key in urine_test_keys)
+        for r in readings
+    ]
+
+
+def measure(fn: Callable[[list], list], objs: list, repeat: int) -> float:
+    """:return: Best time in seconds of ``fn(objs)`` over ``repeat`` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(objs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    approaches = {
+        "isinstance chain": lambda objs: [
+            marshal_with_isinstance_chain(obj) for obj in objs
+        ],
+        "marshal": lambda objs: [orm_serializer.marshal(obj) for obj in objs],
+        "marshal_many": orm_serializer.marshal_many,
+    }
+    datasets = {
+        "readings": make_readings(args.objects),
+        "patients": make_patients(args.objects),
+    }
+    results = [
+        (dataset, name, measure(fn, objs, args.repeat))
+        for dataset, objs in datasets.items()
+        for name, fn in approaches.items()
+    ]
+    rows = as_rows(datasets["readings"])
+    results.append(
+        (
+            "readings",
+            "reading rows",
+            measure(orm_serializer.marshal_reading_rows, rows, args.repeat),
+        )
+    )
+    for dataset, name, seconds in results:
+        print(
+            f"{dataset:>8} {name:>16}: {seconds * 1000:8.1f} ms, "
+            f"{seconds / args.objects * 1e6:6.2f} us/object"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+cache_utils.py
+
+This module provides small in-process caches for data which is read on every request
+but changes rarely, such as the authenticated user's record and the VHTs supervised
+by each CHO.
+
+Each server worker process holds its own copy of these caches, so entries expire
+after a short time-to-live to bound how stale another worker's copy can become. Code
+which changes the cached data must also invalidate it.
+
+Classes included:
+- TTLCache: A thread-safe mapping whose entries expire after a time-to-live.
+
+Functions included:
+- get_cached_user_data: Returns a copy of a user's cached data, if any.
+- invalidate_user_data: Drops a user's cached data in this process and request.
+- invalidate_supervised_vhts: Drops the cached IDs of the VHTs supervised by a CHO.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Callable, Optional
+
+import flask
+
+# Time-to-live in seconds of the cached data of authenticated users; 0 disables it
+USER_DATA_CACHE_TTL = int(os.getenv("USER_DATA_CACHE_TTL", "60"))
+# Time-to-live in seconds of the cached supervision relationships; 0 disables it
+SUPERVISION_CACHE_TTL = int(os.getenv("SUPERVISION_CACHE_TTL", "60"))
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after a time-to-live.
+
+    When the cache is full, the least recently used entry is evicted. Values are
+    stored and returned as-is, so callers sharing mutable values between requests
+    should copy them.
+
+    Every removal increments ``generation``. A caller which reads ``generation``
+    before loading a value and passes it to ``set`` does not store the value if an
+    entry was removed in the meantime, as the value may predate the removal.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        :param maxsize: Maximum number of entries held at once
+        :param ttl: Default time-to-live of entries in seconds; 0 disables caching
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """The number of removals from the cache so far."""
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value stored for a key, or ``default`` if there is no unexpired
+        entry for it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ):
+        """
+        Stores a value for a key.
+
+        :param ttl: Time-to-live of this entry in seconds, capped at the cache's
+            default time-to-live
+        :param generation: ``generation`` read before the value was loaded; the value
+            is not stored if an entry has been removed since
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def pop(self, key: Hashable):
+        """Removes the entry for a key, if any."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def remove_where(self, predicate: Callable[[Hashable, Any], bool]):
+        """Removes every entry whose key and value satisfy a predicate."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, (_, v) in self._entries.items() if predicate(k, v)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Removes all entries."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Username -> data of the user (see ``user_utils.get_current_user_from_jwt``)
+user_data_cache = TTLCache(maxsize=1024, ttl=USER_DATA_CACHE_TTL)
+
+# CHO ID -> frozenset of the IDs of the VHTs they supervise (see
+# ``supervision.get_supervised_vht_ids``)
+supervision_cache = TTLCache(maxsize=1024, ttl=SUPERVISION_CACHE_TTL)
+
+
+def get_cached_user_data(username: str) -> Optional[dict]:
+    """
+    Returns a copy of the cached data of a user, or None if it is not cached.
+
+    :param username: Username of the user
+    """
+    user_data = user_data_cache.get(username)
+    return copy.deepcopy(user_data) if user_data is not None else None
+
+
+def invalidate_user_data(user_id: Optional[int] = None):
+    """
+    Drops the cached data of a user, both from this process's cache and from the
+    current request. Must be called whenever a user's record, phone numbers or SMS
+    key change.
+
+    :param user_id: ID of the user whose data changed; None to drop every user
+    """
+    if user_id is None:
+        user_data_cache.clear()
+    else:
+        user_data_cache.remove_where(lambda _, user_data: user_data["id"] == user_id)
+
+    if flask.has_request_context():
+        current_user = flask.g.get("current_user")
+        if current_user is not None and user_id in (None, current_user["id"]):
+            flask.g.pop("current_user")
+
+
+def invalidate_supervised_vhts(cho_id: Optional[int] = None):
+    """
+    Drops the cached IDs of the VHTs supervised by a CHO from this process's cache.
+    Must be called whenever rows of the supervises table are added or removed.
+
+    :param cho_id: ID of the CHO whose supervised VHTs changed; None to drop every CHO,
+        such as when a user is deleted
+    """
+    if cho_id is None:
+        supervision_cache.clear()
+    else:
+        supervision_cache.pop(cho_id)
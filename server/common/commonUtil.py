@@ -1,3 +1,5 @@
+import base64
+import binascii
 import json
 import re
 import time
@@ -164,6 +166,34 @@ def filterPairsWithNone(payload: dict) -> dict:
     return updated_data
 
 
+def encode_sync_cursor(last_edited: int, id: Any) -> str:
+    """
+    Encode a position in a sync changes feed as an opaque, URL-safe cursor string.
+
+    :param last_edited: Last-edited timestamp of the last item returned
+    :param id: ID of the last item returned; breaks ties between equal timestamps
+    """
+    payload = json.dumps([last_edited, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_sync_cursor(cursor: str) -> tuple[int, Any]:
+    """
+    Decode a cursor produced by ``encode_sync_cursor``.
+
+    :param cursor: The opaque cursor string
+    :return: A tuple of the last-edited timestamp and ID encoded in the cursor
+    :raises ValueError: If the cursor is malformed
+    """
+    try:
+        last_edited, id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as err:
+        raise ValueError(f"Invalid sync cursor: {cursor}") from err
+    if not isinstance(last_edited, int) or isinstance(last_edited, bool):
+        raise ValueError(f"Invalid sync cursor: {cursor}")
+    return last_edited, id
+
+
 def hex2bytes(key):
     """Convert a hex string to bytes."""
     return bytes.fromhex(key)
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Literal, NamedTuple, Optional
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 
 import data.db_operations as crud
 from common import commonUtil
+from common.cache_utils import TTLCache
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import QuestionTypeEnum
 from models import (
     FormClassificationOrm,
@@ -27,8 +37,50 @@ from validation.formsV2_models import (
     MultiLangText,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 FORM_NOT_FOUND_MSG = "Form with ID: ({}) not found."
 
+logger = logging.getLogger(__name__)
+
+# Time-to-live in seconds of cached translations; 0 disables the cache. Writes in
+# this process invalidate entries once committed, other workers see them after this.
+TRANSLATION_CACHE_TTL = int(os.getenv("TRANSLATION_CACHE_TTL", "300"))
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "20000"))
+
+# (string_id, lang) -> translated text, or None if there is no such translation
+translation_cache = TTLCache(maxsize=TRANSLATION_CACHE_SIZE, ttl=TRANSLATION_CACHE_TTL)
+
+_NOT_CACHED = object()
+
+# Key of the string ids written in a session's transaction in Session.info
+_WRITTEN_STRING_IDS = "written_string_ids"
+
+# Rendered form templates only change when a template is archived or uploaded, or a
+# translation changes. FORM_TEMPLATE_CACHE_DIR optionally keeps them on disk as well,
+# shared by the workers of a host and kept across restarts; clear it when the
+# database is reset or seeded. Invalidating deletes the files, and each worker checks
+# its in-memory copy against its file on every read, so the workers of a host see an
+# invalidation at once. Without the directory, a worker only sees the invalidations
+# of other workers once its copies expire, so they are kept for a few seconds.
+FORM_TEMPLATE_CACHE_DIR = os.getenv("FORM_TEMPLATE_CACHE_DIR")
+FORM_TEMPLATE_CACHE_TTL = int(
+    os.getenv("FORM_TEMPLATE_CACHE_TTL", "3600" if FORM_TEMPLATE_CACHE_DIR else "10")
+)
+FORM_TEMPLATE_CACHE_SIZE = int(os.getenv("FORM_TEMPLATE_CACHE_SIZE", "256"))
+
+# (form_template_id, lang or None for all languages) ->
+# (RenderedFormTemplate, modification time of its file in ns or None if not on disk)
+rendered_template_cache = TTLCache(
+    maxsize=FORM_TEMPLATE_CACHE_SIZE, ttl=FORM_TEMPLATE_CACHE_TTL
+)
+
+
+class RenderedFormTemplate(NamedTuple):
+    body: dict
+    etag: str
+
 
 def filter_template_questions_dict(form_template: dict):
     """Filter a form template dict to only include blank (non-submitted) questions."""
@@ -320,6 +372,33 @@ def read_all_translations(string_id: str) -> list[LangVersionOrmV2]:
     return crud.read_all(LangVersionOrmV2, string_id=string_id) or []
 
 
+def read_all_translations_by_string_id(
+    string_ids: Iterable[str],
+) -> dict[str, list[LangVersionOrmV2]]:
+    """
+    Return all LangVersionOrmV2 entries for many string_ids with one query.
+
+    :param string_ids: String ids to look up
+    :return: Dict of string_id -> its entries ordered by language; string_ids
+        without any translation map to an empty list
+    """
+    translations: dict[str, list[LangVersionOrmV2]] = {
+        string_id: [] for string_id in string_ids if string_id
+    }
+    if not translations:
+        return translations
+
+    rows = (
+        crud.db_session.query(LangVersionOrmV2)
+        .filter(LangVersionOrmV2.string_id.in_(list(translations)))
+        .order_by(LangVersionOrmV2.string_id, LangVersionOrmV2.lang)
+        .all()
+    )
+    for row in rows:
+        translations.setdefault(row.string_id, []).append(row)
+    return translations
+
+
 def getCsvFromFormTemplateV2(form_template: FormTemplateOrmV2) -> str:
     """
     Returns a CSV string for a FormTemplateOrmV2, including all language versions,
@@ -346,7 +425,7 @@ def getCsvFromFormTemplateV2(form_template: FormTemplateOrmV2) -> str:
 
         lang_map = {}
         for opt_id in option_ids:
-            versions = read_all_translations(opt_id)
+            versions = translations.get(opt_id, [])
             for v in versions:
                 lang_map.setdefault(v.lang, []).append(v.text)
 
@@ -366,14 +445,34 @@ def getCsvFromFormTemplateV2(form_template: FormTemplateOrmV2) -> str:
         """Aggregate all languages across all questions."""
         langs = set()
         for q in form_template.questions:
-            for lv in read_all_translations(q.question_string_id):
+            for lv in translations.get(q.question_string_id, []):
                 langs.add(lv.lang)
         return sorted(langs)
 
+    def get_mc_option_ids(mc_options_json: str) -> list[str]:
+        """Return the option string ids of a question, or [] if they cannot be read."""
+        try:
+            return list(json.loads(mc_options_json or "[]"))
+        except Exception:
+            return []
+
+    # Load every translation used by the template at once
+    translations = read_all_translations_by_string_id(
+        [
+            form_template.classification.name_string_id,
+            *(q.question_string_id for q in form_template.questions),
+            *(
+                opt_id
+                for q in form_template.questions
+                for opt_id in get_mc_option_ids(q.mc_options)
+            ),
+        ]
+    )
+
     # Build CSV
     questions = sorted(form_template.questions, key=lambda q: q.order)
-    classification_translations = read_all_translations(
-        form_template.classification.name_string_id
+    classification_translations = translations.get(
+        form_template.classification.name_string_id, []
     )
     all_langs = get_all_languages()
 
@@ -407,7 +506,7 @@ def getCsvFromFormTemplateV2(form_template: FormTemplateOrmV2) -> str:
     ]
 
     for q in questions:
-        question_langs = read_all_translations(q.question_string_id)
+        question_langs = translations.get(q.question_string_id, [])
         choices_by_lang = get_mc_options_text(q.mc_options)
         visible_if_text = get_visible_if_text(q.visible_condition)
 
@@ -456,6 +555,55 @@ def getCsvFromFormTemplateV2(form_template: FormTemplateOrmV2) -> str:
     return list_to_csv(rows)
 
 
+def resolve_string_texts(
+    string_ids: Iterable[str], langs: Iterable[str]
+) -> dict[tuple[str, str], str | None]:
+    """
+    Resolve the text of many string ids in many languages.
+
+    Translations are served from an in-process cache; the ones not cached are
+    looked up together with one query.
+
+    :param string_ids: String ids to look up the text of
+    :param langs: Languages for translation
+    :return: Dict of (string_id, lang) -> translated text, or None if not found
+    """
+    langs = list(langs)
+    resolved: dict[tuple[str, str], str | None] = {}
+    missing: list[tuple[str, str]] = []
+    for string_id in string_ids:
+        if not string_id:
+            continue
+        for lang in langs:
+            key = (string_id, lang)
+            if key in resolved:
+                continue
+            text = translation_cache.get(key, _NOT_CACHED)
+            if text is _NOT_CACHED:
+                missing.append(key)
+                resolved[key] = None
+            else:
+                resolved[key] = text
+
+    if missing:
+        rows = (
+            crud.db_session.query(LangVersionOrmV2)
+            .filter(
+                LangVersionOrmV2.string_id.in_({string_id for string_id, _ in missing}),
+                LangVersionOrmV2.lang.in_({lang for _, lang in missing}),
+            )
+            .all()
+        )
+        # Languages are compared case-insensitively, as by the database
+        found = {(row.string_id, row.lang.lower()): row.text for row in rows}
+        for string_id, lang in missing:
+            text = found.get((string_id, lang.lower()))
+            translation_cache.set((string_id, lang), text)
+            resolved[(string_id, lang)] = text
+
+    return resolved
+
+
 def resolve_string_text(string_id: str, lang: str = "English") -> str | None:
     """
     Resolve the string name by looking up the the string_id and lang.
@@ -464,9 +612,158 @@ def resolve_string_text(string_id: str, lang: str = "English") -> str | None:
     :param lang: Language for translation
     :return: Translated name or None if not found
     """
-    translation = crud.read(LangVersionOrmV2, string_id=string_id, lang=lang)
+    if not string_id:
+        return None
+    return resolve_string_texts([string_id], [lang])[(string_id, lang)]
 
-    return translation.text if translation else None
+
+def invalidate_translations(string_id: str):
+    """
+    Drop the cached translations of a string id in every language. Writes to
+    LangVersionOrmV2 through the ORM call this once their transaction ends.
+
+    :param string_id: String id whose translations changed
+    """
+    translation_cache.remove_where(lambda key, _: key[0] == string_id)
+
+
+@event.listens_for(LangVersionOrmV2, "after_insert")
+@event.listens_for(LangVersionOrmV2, "after_update")
+@event.listens_for(LangVersionOrmV2, "after_delete")
+def _invalidate_translations_after_commit(_mapper, _connection, target):
+    """
+    Invalidate the cached translations of a written string id, and the rendered
+    templates, once the transaction writing it ends. Invalidating earlier would let a
+    concurrent request re-cache the previous text until the entry expires.
+    """
+    session = object_session(target)
+    string_ids = session.info.get(_WRITTEN_STRING_IDS)
+    if string_ids is None:
+        string_ids = session.info[_WRITTEN_STRING_IDS] = set()
+
+        def invalidate():
+            for string_id in session.info.pop(_WRITTEN_STRING_IDS, ()):
+                invalidate_translations(string_id)
+            # Translations, such as classification names, are part of the rendered
+            # templates using them
+            invalidate_rendered_form_templates()
+
+        unit_of_work.after_commit(invalidate, session)
+    string_ids.add(target.string_id)
+
+
+def _rendered_template_path(form_template_id: str, lang: str | None) -> Path | None:
+    """Return the file a rendered template is kept in on disk, if enabled."""
+    if not FORM_TEMPLATE_CACHE_DIR:
+        return None
+    template_digest = hashlib.sha256(form_template_id.encode()).hexdigest()
+    lang_digest = hashlib.sha256((lang or "").encode()).hexdigest()[:16]
+    return Path(FORM_TEMPLATE_CACHE_DIR) / f"{template_digest}.{lang_digest}.json"
+
+
+def _file_version(path: Path | None) -> int | None:
+    """Return the modification time of a cached template's file, or None if absent."""
+    if path is None:
+        return None
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_rendered_form_template(
+    form_template_id: str, lang: str | None
+) -> RenderedFormTemplate | None:
+    """
+    Return a cached rendered form template, from memory or else from disk.
+
+    When templates are kept on disk, the in-memory copy is only used while its file
+    is unchanged, so that invalidations by other workers are seen at once.
+
+    :param form_template_id: ID of the form template
+    :param lang: Language the template was rendered in; None for all languages
+    :return: The rendered template, or None if it is not cached
+    """
+    key = (form_template_id, lang)
+    path = _rendered_template_path(form_template_id, lang)
+    version = _file_version(path)
+    cached = rendered_template_cache.get(key)
+    if cached is not None:
+        rendered, cached_version = cached
+        if cached_version == version:
+            return rendered
+        rendered_template_cache.pop(key)
+
+    if version is None:
+        return None
+    try:
+        rendered = RenderedFormTemplate(**json.loads(path.read_text("utf-8")))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError):
+        logger.warning("Ignoring unreadable cached form template %s", path)
+        return None
+
+    rendered_template_cache.set(key, (rendered, version))
+    return rendered
+
+
+def cache_rendered_form_template(
+    form_template_id: str, lang: str | None, body: dict
+) -> RenderedFormTemplate:
+    """
+    Cache a rendered form template along with an ETag computed from its content.
+
+    :param form_template_id: ID of the form template
+    :param lang: Language the template was rendered in; None for all languages
+    :param body: Rendered template, which must not be modified afterwards
+    :return: The cached template
+    """
+    content = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    rendered = RenderedFormTemplate(
+        body=body, etag=hashlib.sha256(content.encode()).hexdigest()
+    )
+
+    path = _rendered_template_path(form_template_id, lang)
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see partial content
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"body": body, "etag": rendered.etag}, file, default=str)
+            Path(temp_path).replace(path)
+        except OSError:
+            logger.warning("Could not write cached form template %s", path)
+
+    rendered_template_cache.set(
+        (form_template_id, lang), (rendered, _file_version(path))
+    )
+    return rendered
+
+
+def invalidate_rendered_form_templates(form_template_id: str | None = None):
+    """
+    Drop cached rendered form templates in every language, from memory and disk.
+    Must be called whenever a template is archived or uploaded, or a translation
+    used by templates changes.
+
+    :param form_template_id: ID of the template which changed; None for all
+    """
+    if form_template_id is None:
+        rendered_template_cache.clear()
+    else:
+        rendered_template_cache.remove_where(lambda key, _: key[0] == form_template_id)
+
+    if not FORM_TEMPLATE_CACHE_DIR or not Path(FORM_TEMPLATE_CACHE_DIR).is_dir():
+        return
+    prefix = (
+        "*"
+        if form_template_id is None
+        else hashlib.sha256(form_template_id.encode()).hexdigest()
+    )
+    for path in Path(FORM_TEMPLATE_CACHE_DIR).glob(f"{prefix}.*.json"):
+        path.unlink(missing_ok=True)
 
 
 def _get_mc_list(q: dict) -> list[str]:
@@ -486,13 +783,21 @@ def format_template(template: dict, available_langs: list[str]) -> dict:
 
     questions = template.get("questions", [])
     formatted = template.copy()
+    classification = formatted.get("classification")
+
+    # resolve every string of the template in every language at once
+    string_ids = [
+        classification.get("name_string_id") if classification else None,
+        *(q.get("question_string_id") for q in questions),
+        *(opt for q in questions for opt in _get_mc_list(q)),
+    ]
+    texts = resolve_string_texts(string_ids, available_langs)
 
     # resolve different classification language versions
-    classification = formatted.get("classification")
     if classification and classification.get("name_string_id"):
         sid = classification["name_string_id"]
         classification["name"] = {
-            lang: resolve_string_text(sid, lang) for lang in available_langs
+            lang: texts.get((sid, lang)) for lang in available_langs
         }
 
     # remove unneeded FK
@@ -507,7 +812,7 @@ def format_template(template: dict, available_langs: list[str]) -> dict:
         sid = q.get("question_string_id", None)
         if sid:
             q["question_text"] = {
-                lang: resolve_string_text(sid, lang) for lang in available_langs
+                lang: texts.get((sid, lang)) for lang in available_langs
             }
 
         # MC options
@@ -520,7 +825,7 @@ def format_template(template: dict, available_langs: list[str]) -> dict:
                 {
                     "string_id": opt,
                     "translations": {
-                        lang: resolve_string_text(opt, lang) for lang in available_langs
+                        lang: texts.get((opt, lang)) for lang in available_langs
                     },
                 }
                 for opt in mc_list
@@ -821,6 +1126,19 @@ def attach_questions(submission: FormSubmissionOrmV2) -> list[AnswerWithQuestion
     form_template = crud.read(FormTemplateOrmV2, id=submission.form_template_id)
     questions = {question.id: question for question in form_template.questions}
 
+    lang = submission.lang or "English"
+    texts = resolve_string_texts(
+        [
+            string_id
+            for question in questions.values()
+            for string_id in [
+                question.question_string_id,
+                *json.loads(question.mc_options or "[]"),
+            ]
+        ],
+        [lang],
+    )
+
     answers_list: list[AnswerWithQuestion] = []
     for answer in answers:
         question = questions.get(answer.question_id)
@@ -838,14 +1156,11 @@ def attach_questions(submission: FormSubmissionOrmV2) -> list[AnswerWithQuestion
             answer=answer.answer,
             question_type=question.question_type,
             order=question.order,
-            question_text=resolve_string_text(
-                question.question_string_id, submission.lang or "English"
-            ),
+            question_text=texts.get((question.question_string_id, lang)),
             mc_options=[
                 resolved
                 for mc in mc_ids
-                if (resolved := resolve_string_text(mc, submission.lang or "English"))
-                is not None
+                if (resolved := texts.get((mc, lang))) is not None
             ],
         )
 
@@ -0,0 +1,138 @@
+"""
+json_utils.py
+
+This module serializes API responses as camelCase JSON.
+
+Response bodies are built from snake_case dicts (marshalled models, pydantic
+``model_dump`` output). Rather than encoding a body, parsing it back and re-encoding
+it with camelCase keys, keys are converted while the body is walked once before
+encoding, and the result is encoded with orjson.
+
+Functions included:
+- camelize_key: Converts a single snake_case key to camelCase, with caching.
+- camelize_keys: Converts the keys of every dict in a JSON-like structure.
+- is_camel_case_exempt_path: Returns whether a request path is served unconverted.
+
+Classes included:
+- CamelCaseJSONProvider: Flask JSON provider producing camelCase responses.
+"""
+
+import dataclasses
+import datetime
+import functools
+from typing import Any
+
+import orjson
+from flask import Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from humps import camelize
+
+# Paths serving the OpenAPI documentation, whose keys must be returned as-is
+CAMEL_CASE_EXEMPT_PATH_PREFIXES = ("/openapi", "/apidocs")
+
+# Response bodies reuse a small set of keys, so conversions are cached
+CAMEL_CASE_KEY_CACHE_SIZE = 4096
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_APPEND_NEWLINE
+)
+
+
+@functools.lru_cache(maxsize=CAMEL_CASE_KEY_CACHE_SIZE)
+def camelize_key(key: str) -> str:
+    """
+    Converts a snake_case key to camelCase, following the rules of ``humps.camelize``.
+
+    :param key: Key to convert
+    :return: The converted key
+    """
+    return camelize(key)
+
+
+def camelize_keys(obj: Any) -> Any:
+    """
+    Returns a copy of a JSON-like structure with the keys of every dict converted to
+    camelCase. Values which are not dicts, lists or tuples are returned unchanged.
+
+    :param obj: Structure to convert, e.g. a response body
+    :return: The converted structure
+    """
+    if isinstance(obj, dict):
+        return {
+            camelize_key(key) if isinstance(key, str) else key: camelize_keys(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [camelize_keys(item) for item in obj]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return camelize_keys(dataclasses.asdict(obj))
+    return obj
+
+
+def is_camel_case_exempt_path(path: str) -> bool:
+    """
+    Returns whether responses for the given request path keep their original keys.
+
+    :param path: Request path
+    """
+    return path.startswith(CAMEL_CASE_EXEMPT_PATH_PREFIXES)
+
+
+class CamelCaseJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider which converts the keys of response bodies to camelCase as they are
+    serialized and encodes them with orjson.
+
+    Responses built by this provider are marked with ``is_camel_case`` so that they
+    are not converted again after the request.
+    """
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        """Serialize sets to lists and datetimes to strings, then Flask's defaults."""
+        if isinstance(o, set):
+            return list(o)
+        if isinstance(o, datetime.datetime):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+    def encode(self, obj: Any, indent: bool = False) -> bytes:
+        """
+        Encodes an object as UTF-8 JSON followed by a newline.
+
+        :param obj: Object to encode
+        :param indent: If true, the output is indented for readability
+        :return: The encoded JSON
+        """
+        option = _ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            # orjson rejects some values the json module accepts, such as integers
+            # wider than 64 bits
+            kwargs = {"indent": 2} if indent else {"separators": (",", ":")}
+            return f"{self.dumps(obj, **kwargs)}\n".encode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        Serializes the given arguments as camelCase JSON and returns a response with
+        it; see :meth:`DefaultJSONProvider.response`.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        if not (has_request_context() and is_camel_case_exempt_path(request.path)):
+            obj = camelize_keys(obj)
+
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        response = self._app.response_class(
+            self.encode(obj, indent=indent), mimetype=self.mimetype
+        )
+        response.is_camel_case = True
+        return response
@@ -0,0 +1,149 @@
+"""
+logging_utils.py
+
+This module keeps log handling off the request path. The root logger's only handler
+puts records on an in-memory queue, and a listener thread formats them as JSON and
+writes them to the console and log file, so a request never waits on log I/O.
+
+Filters which need the request context, such as ``RequestIdFilter``, or which drop
+records, such as ``SamplingFilter``, run on the thread which logs the record, before
+it is queued; the handlers behind the queue only format and write records.
+
+Classes included:
+- FormattedQueueHandler: Queues records with their traceback formatted separately.
+- SamplingFilter: Keeps a fraction of the records of noisy loggers below WARNING.
+- ProcessFileHandler: A daily rotating log file of its own for each process.
+
+Functions included:
+- configure_logging: Configures logging from a dictConfig dictionary behind a queue.
+"""
+
+import atexit
+import copy
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+from collections.abc import Iterable
+
+# Listener writing the queued records of this process, once logging is configured
+# (a list, so that configuring logging again can stop and replace it)
+_listeners: list[logging.handlers.QueueListener] = []
+
+_exception_formatter = logging.Formatter()
+
+
+class FormattedQueueHandler(logging.handlers.QueueHandler):
+    """
+    A ``QueueHandler`` which keeps a record's traceback apart from its message. The
+    base class merges the traceback into ``msg``, so formatters behind the queue, such
+    as pythonjsonlogger's, could no longer write it to a field of its own.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Return a copy of the record with its message merged with its arguments and
+        its traceback formatted into ``exc_text``, so that it holds no unpicklable
+        arguments or traceback objects.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a random fraction of the records below WARNING of some loggers and of their
+    children. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        """
+        :param rates: Logger name -> fraction of its records to keep, from 0 to 1
+        """
+        super().__init__()
+        self.rates = rates
+        # Logger name -> rate of the closest logger in ``rates``, found once per name
+        self._rate_of_logger: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return True if the record should be logged."""
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+    def _rate(self, name: str) -> float:
+        """Return the sampling rate of a logger, that of its closest listed ancestor."""
+        rate = self._rate_of_logger.get(name)
+        if rate is None:
+            rate = 1.0
+            logger_name = name
+            while logger_name:
+                if logger_name in self.rates:
+                    rate = self.rates[logger_name]
+                    break
+                logger_name = logger_name.rpartition(".")[0]
+            self._rate_of_logger[name] = rate
+        return rate
+
+
+class ProcessFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    A ``TimedRotatingFileHandler`` whose filename may contain ``{pid}``, replaced by
+    the ID of the process, so that each server worker appends to its own file.
+    """
+
+    def __init__(self, filename: str, *args, **kwargs):
+        super().__init__(filename.format(pid=os.getpid()), *args, **kwargs)
+
+
+def _stop_listeners():
+    """Write the records still queued and stop the listener thread, if any."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def configure_logging(
+    config: dict, queue_filters: Iterable[logging.Filter] = ()
+) -> logging.handlers.QueueListener:
+    """
+    Configures logging with ``logging.config.dictConfig``, then moves the handlers of
+    the root logger behind a queue served by a listener thread. Configuring logging
+    again replaces the previous listener.
+
+    :param config: Logging configuration dictionary
+    :param queue_filters: Filters run before records are queued, on the thread which
+        logs them
+    :return: The listener writing the queued records
+    """
+    _stop_listeners()
+
+    logging.config.dictConfig(config)
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    log_queue: queue.Queue = queue.Queue()
+    queue_handler = FormattedQueueHandler(log_queue)
+    for queue_filter in queue_filters:
+        queue_handler.addFilter(queue_filter)
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    _listeners.append(listener)
+    return listener
+
+
+atexit.register(_stop_listeners)
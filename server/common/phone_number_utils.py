@@ -1,6 +1,8 @@
 import phonenumbers
 
 import data.db_operations as crud
+from common.cache_utils import invalidate_user_data
+from data.db_operations import unit_of_work
 from models import (
     HealthFacilityOrm,
     RelayServerPhoneNumberOrm,
@@ -167,6 +169,7 @@ def add_user_phone_number(user_id: int, phone_number: str):
     # Add row to database.
     user_model = crud.read(UserOrm, id=user_id)
     crud.create(UserPhoneNumberOrm(phone_number=phone_number, user=user_model))
+    unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
 
 
 def delete_user_phone_number(user_id: int, phone_number: str):
@@ -183,6 +186,7 @@ def delete_user_phone_number(user_id: int, phone_number: str):
         raise ValueError(f"No user with id ({user_id}) was found.")
     # Delete row from database.
     crud.delete(UserPhoneNumberOrm(phone_number=phone_number, user=user_orm_model))
+    unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
 
 
 def get_users_phone_numbers(user_id: int) -> list[str]:
@@ -210,5 +214,6 @@ def replace_phoneNumber_for_user(current_phone_number, new_phone_number, user_id
             phone_number=current_phone_number,
             user_id=user_id,
         )
+        unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
         return True
     return False
@@ -1,18 +1,27 @@
+import copy
 import logging
 import os
 import re
 import secrets
 from typing import Any, Optional, TypedDict, cast
 
+import flask
 from botocore.exceptions import ClientError
 
 import data.db_operations as crud
-from authentication import cognito, get_username_from_jwt
+from authentication import cognito, get_username_from_jwt, invalidate_access_tokens
 from common import commonUtil, health_facility_utils, phone_number_utils
+from common.cache_utils import (
+    get_cached_user_data,
+    invalidate_supervised_vhts,
+    invalidate_user_data,
+    user_data_cache,
+)
 from common.constants import EMAIL_REGEX_PATTERN, MAX_SMS_RELAY_REQUEST_NUMBER
 from common.date_utils import get_future_date, is_date_passed
 from config import db
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import RoleEnum
 from models import (
     SmsSecretKeyOrm,
@@ -166,10 +175,27 @@ def get_current_user_from_jwt():
     Verifies access token in request authorization header and retrieves
     the user's info from the database.
 
+    The user's info is looked up once per request and kept on ``flask.g``, and is
+    shared between requests through a short-lived cache which is invalidated when
+    the user, their phone numbers or their SMS key change.
+
     :return user_data: Dict containing user's info.
     """
+    user_data = flask.g.get("current_user")
+    if user_data is not None:
+        return user_data
+
     username = get_username_from_jwt()
-    user_data = get_user_data_from_username(username)
+    user_data = get_cached_user_data(username)
+    if user_data is None:
+        # Data read before another request's write commits must not be cached once
+        # that write has invalidated the cache
+        generation = user_data_cache.generation
+        user_data = get_user_data_from_username(username)
+        user_data_cache.set(username, user_data, generation=generation)
+        user_data = copy.deepcopy(user_data)
+
+    flask.g.current_user = user_data
     return user_data
 
 
@@ -272,7 +298,7 @@ def register_user(
         user_orm.sms_secret_keys.append(sms_secret_key_orm)
 
         db.session.add(user_orm)
-        db.session.commit()
+        unit_of_work.commit()
 
     except Exception as err:
         print(err)
@@ -349,6 +375,11 @@ def delete_user(username: str):
     if user_orm is not None:
         # Delete from database.
         crud.delete(user_orm)
+        user_id = user_orm.id
+        unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
+        # The user may have supervised, or been supervised by, other users
+        unit_of_work.after_commit(invalidate_supervised_vhts)
+    unit_of_work.after_commit(lambda: invalidate_access_tokens(username))
 
 
 def get_user_orm_list():
@@ -437,7 +468,8 @@ def update_user_phone_numbers(user_id: int, phone_numbers: set[str]):
 
     _update_user_phone_numbers(user_orm, phone_numbers)
 
-    db.session.commit()
+    unit_of_work.commit()
+    unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
 
 
 def update_user(user_id: int, user_update_dict: dict[str, Any]):
@@ -484,16 +516,15 @@ def update_user(user_id: int, user_update_dict: dict[str, Any]):
     # Update supervises list.
     if user_update_dict["role"] == RoleEnum.CHO.value:
         supervises = user_update_dict.get("supervises", [])
-        for vht_id in supervises:
-            vht = crud.read(UserOrm, id=vht_id)
-            if vht not in user_orm.vht_list:
-                user_orm.vht_list.append(vht)
+        crud.add_supervised_vhts(user_id, supervises, autocommit=False)
 
     try:
-        db.session.commit()
+        unit_of_work.commit()
     except Exception as e:
         db.session.rollback()
         raise ValueError(e)
+    finally:
+        unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
 
 
 def create_new_sms_secret_key_orm():
@@ -517,7 +548,8 @@ def create_sms_secret_key_for_user(user_id):
         raise ValueError(f"No user with id ({user_id}) found.")
     sms_secret_key_orm.user = user_orm
     db.session.add(sms_secret_key_orm)
-    db.session.commit()
+    unit_of_work.commit()
+    unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
     return get_user_sms_secret_key_formatted(user_id)
 
 
@@ -532,6 +564,7 @@ def update_sms_secret_key_for_user(user_id):
         "stale_date": str(stale_date),
     }
     crud.update(SmsSecretKeyOrm, new_key, user_id=user_id)
+    unit_of_work.after_commit(lambda: invalidate_user_data(user_id))
     return get_user_sms_secret_key_formatted(user_id)
 
 
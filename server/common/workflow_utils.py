@@ -10,6 +10,7 @@ import data.db_operations as crud
 from common.commonUtil import abort_not_found, get_uuid
 from common.form_utils import assign_form_or_template_ids
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from models import (
     FormSubmissionOrmV2,
     FormTemplateOrmV2,
@@ -541,7 +542,7 @@ def update_workflow_version_with_new_form(old_form_id: str, new_form_id: str):
         )
         if not compatible:
             workflow_orm.has_branching_issues = True
-            crud.db_session.commit()
+            unit_of_work.commit()
             continue
 
         template_dict = orm_serializer.marshal(workflow_orm)
@@ -1,6 +1,6 @@
 import datetime
 import json
-import logging.config
+import logging
 from typing import ClassVar
 
 import environs
@@ -13,6 +13,11 @@ from flask_openapi3.openapi import OpenAPI as FlaskOpenAPI
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import MetaData
 
+from common import logging_utils
+from common.json_utils import CamelCaseJSONProvider
+from common.logging_utils import SamplingFilter
+from common.request_id_utils import RequestIdFilter
+
 # Versioning system follows : https://semver.org/
 app_version = "1.0.0"
 
@@ -46,14 +51,61 @@ class Config:
 
     print(f"SQLALCHEMY_DATABASE_URI: {SQLALCHEMY_DATABASE_URI}")
 
+    # Connection pool of each server worker process. With threaded or gevent workers
+    # (see prod/gunicorn.conf.py), pool_size + max_overflow bounds how many requests
+    # of a worker can use the database at once; the others wait up to pool_timeout
+    # seconds for a connection.
+    SQLALCHEMY_ENGINE_OPTIONS: ClassVar = {
+        "pool_size": env.int("DB_POOL_SIZE", 5),
+        "max_overflow": env.int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": env.int("DB_POOL_TIMEOUT", 30),
+        # Replace connections before MySQL's wait_timeout closes them
+        "pool_recycle": env.int("DB_POOL_RECYCLE", 3600),
+        # Check connections before use, so that one dropped by MySQL is replaced
+        # rather than failing the request
+        "pool_pre_ping": env.bool("DB_POOL_PRE_PING", True),
+    }
+    # Commit the writes of an API request once, at its end, rather than after each write
+    DB_UNIT_OF_WORK = env.bool("DB_UNIT_OF_WORK", True)
+
+    # Logging profile, set with LOG_PROFILE:
+    #  - "development" (default): logs everything at DEBUG, including SQL statements.
+    #  - "production": logs at INFO without SQL statements, samples the records of
+    #    noisy loggers and gives each worker process its own log file, which fluentbit
+    #    tails like the other files in /var/log.
+    LOG_PROFILES: ClassVar = {
+        "development": {
+            "level": "DEBUG",
+            "loggers": {"flask": "INFO", "sqlalchemy": "INFO", "werkzeug": "INFO"},
+            "sample_rates": {},
+            "filename": "/var/log/application.log",
+        },
+        "production": {
+            "level": "INFO",
+            "loggers": {
+                "botocore": "WARNING",
+                "flask": "INFO",
+                "sqlalchemy": "WARNING",
+                "werkzeug": "INFO",
+            },
+            "sample_rates": {"service.workflow": 0.1, "werkzeug": 0.1},
+            "filename": "/var/log/application-{pid}.log",
+        },
+    }
+    LOG_PROFILE = env("LOG_PROFILE", "development")
+    log_profile = LOG_PROFILES[LOG_PROFILE]
+
+    # Logger name -> fraction of its records below WARNING which are kept, such as
+    # "service.workflow=0.1,werkzeug=0.5"; defaults to the rates of the profile
+    LOG_SAMPLE_RATES: ClassVar = env.dict(
+        "LOG_SAMPLE_RATES", log_profile["sample_rates"], subcast_values=float
+    )
+
     LOGGING: ClassVar = {
         "version": 1,
         "disable_existing_loggers": False,
         "filters": {
             "backend_filter": {"backend_module": "backend"},
-            "request_id": {
-                "()": "common.request_id_utils.RequestIdFilter",
-            },
         },
         "formatters": {
             "json_formatter": {
@@ -66,26 +118,29 @@ class Config:
                 "class": "logging.StreamHandler",
                 "level": "DEBUG",
                 "formatter": "json_formatter",
-                "filters": ["request_id"],
                 "stream": "ext://sys.stdout",  # print to CLI
             },
             "file": {
-                "class": "logging.handlers.TimedRotatingFileHandler",
+                "class": "common.logging_utils.ProcessFileHandler",
                 "level": "DEBUG",
                 "formatter": "json_formatter",
-                "filename": "/var/log/application.log",  # print to file
+                "filename": log_profile["filename"],  # print to file
                 "when": "D",
                 "interval": 1,
             },
         },
         "loggers": {
-            "": {"handlers": ["console", "file"], "level": "DEBUG"},
-            "flask": {"level": "INFO"},
-            "sqlalchemy": {"level": "INFO"},
-            "werkzeug": {"level": "INFO"},
+            "": {"handlers": ["console", "file"], "level": log_profile["level"]},
+            **{
+                name: {"level": level} for name, level in log_profile["loggers"].items()
+            },
         },
     }
-    logging.config.dictConfig(LOGGING)
+    # The handlers above write from a listener thread; the request ID is added and
+    # records are sampled before they are queued, on the thread which logs them
+    logging_utils.configure_logging(
+        LOGGING, [RequestIdFilter(), SamplingFilter(LOG_SAMPLE_RATES)]
+    )
     logger = logging.getLogger(__name__)
 
 
@@ -152,7 +207,7 @@ app.config["UPLOAD_FOLDER"] = "/uploads"
 app.config["MAX_CONTENT_LENGTH"] = 64 * 1e6
 CORS(app, supports_credentials=True)
 app.config.from_object(Config)
-app.json_encoder = JSONEncoder
+app.json = CamelCaseJSONProvider(app)
 db.init_app(app)
 migrate.init_app(app, db, compare_type=True)
 ma.init_app(app)
@@ -62,25 +62,40 @@ __all__ = [
     "delete",
     "delete_by",
     "delete_all",
+    # form_answer_values
+    "read_form_answer_values",
+    "rebuild_form_answer_values",
+    "refresh_form_answer_values",
     # form_queries
     "read_form_template_language_versions",
     "read_form_template_language_versions_v2",
     "read_questions",
     # patient_queries
     "read_admin_patient",
+    "read_global_patient_search",
     "read_patient_all_records",
     "read_patient_current_medical_record",
+    "read_patient_changes",
     "read_patient_list",
     "read_patients",
+    "read_patient_reading_summaries",
     "read_patient_timeline",
+    "read_reading_changes",
+    "read_reading_vitals",
     "read_readings",
     "read_medical_records",
+    # patient_latest
+    "rebuild_patient_latest",
+    "refresh_patient_latest",
     # phone_utils
     "get_all_relay_phone_numbers",
     "is_phone_number_relay",
     # pregnancy_medical_utils
+    "has_conflicting_pregnancy",
     "has_conflicting_pregnancy_record",
     # referral_queries
+    "read_assessment_changes",
+    "read_referral_changes",
     "read_referral_list",
     "read_referrals_or_assessments",
     # stats_queries
@@ -91,8 +106,17 @@ __all__ = [
     "get_total_color_readings",
     "get_total_readings_completed",
     "get_unique_patients_with_readings",
+    "read_stats_summary",
+    # sync_queries
+    "bulk_update",
+    "read_associated_patient_ids",
+    "read_existing_ids",
+    "read_models_by_ids",
+    "read_pregnancies_by_patient",
     # supervision
     "add_vht_to_supervise",
+    "add_supervised_vhts",
+    "get_supervised_vht_ids",
     "get_supervised_vhts",
     # workflow_management
     "read_workflow_classifications",
@@ -102,10 +126,13 @@ __all__ = [
     "read_workflow_instance_data_for_instance",
     "read_workflow_instance_data_by_field_tag",
     "upsert_workflow_instance_data_row",
+    "upsert_workflow_instance_data_rows",
+    "update_workflow_instance_changes",
     "read_workflows_in_collection",
     "read_rule_group",
     "read_instance_steps",
     "read_template_steps",
+    "delete_workflows",
     "delete_workflow_step_branch",
     "delete_workflow_step",
     "delete_workflow",
@@ -114,10 +141,13 @@ __all__ = [
     "db_session",
     # Optional: expose submodules for advanced/namespaced access
     "common_crud",
+    "form_answer_values",
     "form_queries",
     "patient_queries",
+    "patient_latest",
     "referral_queries",
     "stats_queries",
+    "sync_queries",
     "workflow_management",
     "supervision",
     "phone_utils",
@@ -141,6 +171,16 @@ _EXPORTS: dict[str, tuple[str, str | None]] = {
     "delete_by": ("common_crud", "delete_by"),
     "delete_all": ("common_crud", "delete_all"),
     "merge": ("common_crud", "merge"),
+    # ------- form_answer_values -------
+    "read_form_answer_values": ("form_answer_values", "read_form_answer_values"),
+    "rebuild_form_answer_values": (
+        "form_answer_values",
+        "rebuild_form_answer_values",
+    ),
+    "refresh_form_answer_values": (
+        "form_answer_values",
+        "refresh_form_answer_values",
+    ),
     # ------- form_queries -------
     "read_form_template_language_versions": (
         "form_queries",
@@ -153,25 +193,42 @@ _EXPORTS: dict[str, tuple[str, str | None]] = {
     "read_questions": ("form_queries", "read_questions"),
     # ------- patient_queries -------
     "read_admin_patient": ("patient_queries", "read_admin_patient"),
+    "read_global_patient_search": ("patient_queries", "read_global_patient_search"),
     "read_patient_all_records": ("patient_queries", "read_patient_all_records"),
     "read_patient_current_medical_record": (
         "patient_queries",
         "read_patient_current_medical_record",
     ),
+    "read_patient_changes": ("patient_queries", "read_patient_changes"),
     "read_patient_list": ("patient_queries", "read_patient_list"),
     "read_patients": ("patient_queries", "read_patients"),
+    "read_patient_reading_summaries": (
+        "patient_queries",
+        "read_patient_reading_summaries",
+    ),
     "read_patient_timeline": ("patient_queries", "read_patient_timeline"),
+    "read_reading_changes": ("patient_queries", "read_reading_changes"),
+    "read_reading_vitals": ("patient_queries", "read_reading_vitals"),
     "read_readings": ("patient_queries", "read_readings"),
     "read_medical_records": ("patient_queries", "read_medical_records"),
+    # ------- patient_latest -------
+    "rebuild_patient_latest": ("patient_latest", "rebuild_patient_latest"),
+    "refresh_patient_latest": ("patient_latest", "refresh_patient_latest"),
     # ------- phone_utils -------
     "get_all_relay_phone_numbers": ("phone_utils", "get_all_relay_phone_numbers"),
     "is_phone_number_relay": ("phone_utils", "is_phone_number_relay"),
     # ------- pregnancy_medical_utils -------
+    "has_conflicting_pregnancy": (
+        "pregnancy_medical_utils",
+        "has_conflicting_pregnancy",
+    ),
     "has_conflicting_pregnancy_record": (
         "pregnancy_medical_utils",
         "has_conflicting_pregnancy_record",
     ),
     # ------- referral_queries -------
+    "read_assessment_changes": ("referral_queries", "read_assessment_changes"),
+    "read_referral_changes": ("referral_queries", "read_referral_changes"),
     "read_referral_list": ("referral_queries", "read_referral_list"),
     "read_referrals_or_assessments": (
         "referral_queries",
@@ -188,8 +245,17 @@ _EXPORTS: dict[str, tuple[str, str | None]] = {
         "stats_queries",
         "get_unique_patients_with_readings",
     ),
+    "read_stats_summary": ("stats_queries", "read_stats_summary"),
+    # ------- sync_queries -------
+    "bulk_update": ("sync_queries", "bulk_update"),
+    "read_associated_patient_ids": ("sync_queries", "read_associated_patient_ids"),
+    "read_existing_ids": ("sync_queries", "read_existing_ids"),
+    "read_models_by_ids": ("sync_queries", "read_models_by_ids"),
+    "read_pregnancies_by_patient": ("sync_queries", "read_pregnancies_by_patient"),
     # ------- supervision -------
     "add_vht_to_supervise": ("supervision", "add_vht_to_supervise"),
+    "add_supervised_vhts": ("supervision", "add_supervised_vhts"),
+    "get_supervised_vht_ids": ("supervision", "get_supervised_vht_ids"),
     "get_supervised_vhts": ("supervision", "get_supervised_vhts"),
     # ------- workflow_management -------
     "read_workflow_classifications": (
@@ -211,6 +277,14 @@ _EXPORTS: dict[str, tuple[str, str | None]] = {
         "workflow_management",
         "upsert_workflow_instance_data_row",
     ),
+    "upsert_workflow_instance_data_rows": (
+        "workflow_management",
+        "upsert_workflow_instance_data_rows",
+    ),
+    "update_workflow_instance_changes": (
+        "workflow_management",
+        "update_workflow_instance_changes",
+    ),
     "read_workflows_in_collection": (
         "workflow_management",
         "read_workflows_in_collection",
@@ -218,6 +292,7 @@ _EXPORTS: dict[str, tuple[str, str | None]] = {
     "read_rule_group": ("workflow_management", "read_rule_group"),
     "read_instance_steps": ("workflow_management", "read_instance_steps"),
     "read_template_steps": ("workflow_management", "read_template_steps"),
+    "delete_workflows": ("workflow_management", "delete_workflows"),
     "delete_workflow_step_branch": (
         "workflow_management",
         "delete_workflow_step_branch",
@@ -230,10 +305,13 @@ _EXPORTS: dict[str, tuple[str, str | None]] = {
     ),
     # ------- submodule escape hatch (return module objects) -------
     "common_crud": ("common_crud", None),
+    "form_answer_values": ("form_answer_values", None),
     "form_queries": ("form_queries", None),
     "patient_queries": ("patient_queries", None),
+    "patient_latest": ("patient_latest", None),
     "referral_queries": ("referral_queries", None),
     "stats_queries": ("stats_queries", None),
+    "sync_queries": ("sync_queries", None),
     "workflow_management": ("workflow_management", None),
     "supervision": ("supervision", None),
     "phone_utils": ("phone_utils", None),
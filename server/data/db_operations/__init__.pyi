@@ -5,9 +5,15 @@ from typing import Any
 from . import (
     common_crud as common_crud,
 )
+from . import (
+    form_answer_values as form_answer_values,
+)
 from . import (
     form_queries as form_queries,
 )
+from . import (
+    patient_latest as patient_latest,
+)
 from . import (
     patient_queries as patient_queries,
 )
@@ -26,6 +32,9 @@ from . import (
 from . import (
     supervision as supervision,
 )
+from . import (
+    sync_queries as sync_queries,
+)
 from . import (
     workflow_management as workflow_management,
 )
@@ -43,19 +52,33 @@ from .common_crud import (
     read_by_filter,
     update,
 )
+from .form_answer_values import (
+    read_form_answer_values,
+    rebuild_form_answer_values,
+    refresh_form_answer_values,
+)
 from .form_queries import (
     read_form_template_language_versions,
     read_form_template_language_versions_v2,
     read_questions,
 )
+from .patient_latest import (
+    rebuild_patient_latest,
+    refresh_patient_latest,
+)
 from .patient_queries import (
     read_admin_patient,
+    read_global_patient_search,
     read_medical_records,
     read_patient_all_records,
+    read_patient_changes,
     read_patient_current_medical_record,
     read_patient_list,
+    read_patient_reading_summaries,
     read_patient_timeline,
     read_patients,
+    read_reading_changes,
+    read_reading_vitals,
     read_readings,
 )
 from .phone_utils import (
@@ -63,9 +86,12 @@ from .phone_utils import (
     is_phone_number_relay,
 )
 from .pregnancy_medical_utils import (
+    has_conflicting_pregnancy,
     has_conflicting_pregnancy_record,
 )
 from .referral_queries import (
+    read_assessment_changes,
+    read_referral_changes,
     read_referral_list,
     read_referrals_or_assessments,
 )
@@ -77,16 +103,27 @@ from .stats_queries import (
     get_total_color_readings,
     get_total_readings_completed,
     get_unique_patients_with_readings,
+    read_stats_summary,
 )
 from .supervision import (
+    add_supervised_vhts,
     add_vht_to_supervise,
+    get_supervised_vht_ids,
     get_supervised_vhts,
 )
+from .sync_queries import (
+    bulk_update,
+    read_associated_patient_ids,
+    read_existing_ids,
+    read_models_by_ids,
+    read_pregnancies_by_patient,
+)
 from .workflow_management import (
     delete_workflow,
     delete_workflow_classification,
     delete_workflow_step,
     delete_workflow_step_branch,
+    delete_workflows,
     read_instance_steps,
     read_rule_group,
     read_template_steps,
@@ -97,7 +134,9 @@ from .workflow_management import (
     read_workflow_instances,
     read_workflow_templates,
     read_workflows_in_collection,
+    update_workflow_instance_changes,
     upsert_workflow_instance_data_row,
+    upsert_workflow_instance_data_rows,
 )
 
 # Expose db_session type (runtime value comes from data package)
@@ -117,25 +156,40 @@ __all__ = [
     "read_by_filter",
     "update",
     "merge",
+    # form_answer_values
+    "read_form_answer_values",
+    "rebuild_form_answer_values",
+    "refresh_form_answer_values",
     # form_queries
     "read_form_template_language_versions",
     "read_form_template_language_versions_v2",
     "read_questions",
     # patient_queries
     "read_admin_patient",
+    "read_global_patient_search",
     "read_medical_records",
     "read_patient_all_records",
     "read_patient_current_medical_record",
+    "read_patient_changes",
     "read_patient_list",
+    "read_patient_reading_summaries",
     "read_patient_timeline",
     "read_patients",
+    "read_reading_changes",
+    "read_reading_vitals",
     "read_readings",
+    # patient_latest
+    "rebuild_patient_latest",
+    "refresh_patient_latest",
     # phone_utils
     "get_all_relay_phone_numbers",
     "is_phone_number_relay",
     # pregnancy_medical_utils
+    "has_conflicting_pregnancy",
     "has_conflicting_pregnancy_record",
     # referral_queries
+    "read_assessment_changes",
+    "read_referral_changes",
     "read_referral_list",
     "read_referrals_or_assessments",
     # stats_queries
@@ -146,13 +200,23 @@ __all__ = [
     "get_total_color_readings",
     "get_total_readings_completed",
     "get_unique_patients_with_readings",
+    "read_stats_summary",
     # supervision
     "add_vht_to_supervise",
+    "add_supervised_vhts",
+    "get_supervised_vht_ids",
     "get_supervised_vhts",
+    # sync_queries
+    "bulk_update",
+    "read_associated_patient_ids",
+    "read_existing_ids",
+    "read_models_by_ids",
+    "read_pregnancies_by_patient",
     # workflow_management
     "delete_workflow",
     "delete_workflow_classification",
     "delete_workflow_step",
+    "delete_workflows",
     "delete_workflow_step_branch",
     "read_instance_steps",
     "read_rule_group",
@@ -164,6 +228,8 @@ __all__ = [
     "read_workflow_instances",
     "read_workflow_templates",
     "upsert_workflow_instance_data_row",
+    "upsert_workflow_instance_data_rows",
+    "update_workflow_instance_changes",
     "read_workflows_in_collection",
     # misc
     "db_session",
@@ -11,12 +11,27 @@ Functions included here cover:
 - Reading single or multiple records (`read`, `read_all`, `find`)
 - Updating model fields (`update`)
 - Deleting records in several ways (`delete`, `delete_by`, `delete_all`)
+
+Writes which touch patients, readings, pregnancies or medical records refresh the
+affected rows of the `patient_latest` projection when they are flushed; `delete_all`,
+which deletes without loading the rows, refreshes them itself.
+
+Writes which commit by default only flush during an API request, whose transaction is
+committed once at its end (see `unit_of_work`). Reads by primary key, including those
+done by `update` and `delete_by`, are served from the session when the object is
+already loaded.
 """
 
+import functools
 from typing import Any, Optional
 
-from data.db_operations import M, S, db_session
+from sqlalchemy import inspect
+
+from data.db_operations import M, S, db_session, unit_of_work
+from data.db_operations.patient_latest import refresh_patient_latest
 from models import (
+    MedicalRecordOrm,
+    PregnancyOrm,
     ReadingOrm,
 )
 from service import invariant
@@ -36,9 +51,9 @@ def create(model: M, refresh=False, autocommit: bool = True):
     :param refresh: If true, immediately refresh ``model`` populating it with data from
                     the database; this involves an additional query so only use it if
                     necessary
-    :param autocommit: If true, the current transaction is committed before return. Use
-                       False when doing multiple atomic creates and then manually commit;
-                       the default is true
+    :param autocommit: If true, the current transaction is committed before return (in a
+                       unit of work, flushed). Use False when doing multiple atomic
+                       creates and then manually commit; the default is true
     """
     # Ensures that any reading that is entered into the DB is correctly formatted
     if isinstance(model, ReadingOrm):
@@ -46,7 +61,7 @@ def create(model: M, refresh=False, autocommit: bool = True):
 
     db_session.add(model)
     if autocommit:
-        db_session.commit()
+        unit_of_work.commit()
     else:
         db_session.flush()
 
@@ -88,7 +103,7 @@ def create_all(models: list[M], autocommit: bool = True):
     """
     db_session.add_all(models)
     if autocommit:
-        db_session.commit()
+        unit_of_work.commit()
     else:
         db_session.flush()
 
@@ -105,19 +120,45 @@ def read(m: type[M], **kwargs) -> Optional[M]:
     :except sqlalchemy.orm.exc.MultipleResultsFound: If multiple models are found
     :return: A model from the database or ``None`` if no model was found
     """
+    identity = _primary_key_identity(m, kwargs)
+    if identity is not None:
+        # Served from the session's identity map when the model is already loaded
+        return db_session.get(m, identity)
     return m.query.filter_by(**kwargs).one_or_none()
 
 
+@functools.cache
+def _primary_key_attributes(m: type[M]) -> tuple[str, ...]:
+    """Return the names of the attributes mapped to the primary key columns of a model."""
+    mapper = inspect(m)
+    return tuple(
+        mapper.get_property_by_column(column).key for column in mapper.primary_key
+    )
+
+
+def _primary_key_identity(m: type[M], kwargs: dict) -> Optional[dict[str, Any]]:
+    """
+    Return the query parameters as a primary key identity for ``Session.get`` if they
+    are exactly the model's primary key attributes, none of them ``None``.
+    """
+    attributes = _primary_key_attributes(m)
+    if len(kwargs) != len(attributes) or any(
+        kwargs.get(attribute) is None for attribute in attributes
+    ):
+        return None
+    return kwargs
+
+
 def update(m: type[M], changes: dict, autocommit: bool = True, **kwargs):
     """
     Applies a series of changes to a model in the database.
 
     The process for updating a model is as follows:
 
-    * Retrieve the model by querying the database using the supplied ``kwargs`` as
-      query parameters
+    * Retrieve the model with ``read`` using the supplied ``kwargs`` as query
+      parameters; a model already loaded by primary key is not queried again
     * Iterate through ``changes`` and update the fields of the model
-    * Commit the changes to the database
+    * Commit the changes to the database (in a unit of work, flush them)
     * Return the model
 
     :param m: Type of model to update
@@ -143,7 +184,7 @@ def update(m: type[M], changes: dict, autocommit: bool = True, **kwargs):
         invariant.resolve_reading_invariants(model, autocommit=False)
 
     if autocommit:
-        db_session.commit()
+        unit_of_work.commit()
     return model
 
 
@@ -162,7 +203,7 @@ def merge(model: M, autocommit: bool = True):
     db_session.merge(model)
 
     if autocommit:
-        db_session.commit()
+        unit_of_work.commit()
 
 
 def delete(model: M):
@@ -172,7 +213,7 @@ def delete(model: M):
     :param model: The model to delete
     """
     db_session.delete(model)
-    db_session.commit()
+    unit_of_work.commit()
 
 
 def delete_by(m: type[M], **kwargs):
@@ -201,8 +242,15 @@ def delete_all(m: type[M], **kwargs):
     :param kwargs: Keyword arguments mapping column names to values to parameterize the
                    query (e.g., ``patient_id="abc"``)
     """
-    db_session.query(m).filter_by(**kwargs).delete()
-    db_session.commit()
+    query = db_session.query(m).filter_by(**kwargs)
+    patient_ids = []
+    if m in (ReadingOrm, PregnancyOrm, MedicalRecordOrm):
+        patient_ids = [row.patient_id for row in query.with_entities(m.patient_id)]
+
+    query.delete()
+    if patient_ids:
+        refresh_patient_latest(patient_ids)
+    unit_of_work.commit()
 
 
 def find(m: type[M], *args) -> list[M]:
@@ -0,0 +1,282 @@
+"""
+form_answer_values.py
+
+This module maintains the ``form_answer_value_v2`` projection, which holds the answers
+of each form submission decoded into typed columns and keyed by the submission and the
+question's ``user_question_id``.
+
+Answers are stored as JSON text whose format depends on the question type, and
+multiple-choice answers hold indices into the question's option string ids. Reading an
+answer therefore requires decoding it and looking up its question and the English text
+of its options; the projection does this once when a submission is written, so that the
+workflow ``forms`` collection and reports read scalar columns instead.
+
+Functions included:
+- decode_form_answer_values: Decodes the answers of submissions into projection rows.
+- flatten_form_answer_values: Groups projection rows into dicts keyed by question.
+- read_form_answer_values: Reads the flattened answers of the given submissions.
+- refresh_form_answer_values: Recomputes the projection rows of the given submissions.
+- rebuild_form_answer_values: Recomputes the projection for every submission.
+
+``submit_form``, ``update_form`` and the ``WorkflowService`` methods saving workflow
+instance steps call ``refresh_form_answer_values`` so that the projection stays
+current; ``rebuild_form_answer_values`` is exposed as a management command to
+repopulate the table after bulk imports or direct database edits.
+"""
+
+import contextlib
+import json
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from sqlalchemy.orm import selectinload
+
+from data.db_operations import db_session, unit_of_work
+from enums import QuestionTypeEnum
+from models import (
+    FormQuestionTemplateOrmV2,
+    FormSubmissionOrmV2,
+    LangVersionOrmV2,
+)
+from models.formsV2 import FormAnswerValueOrmV2
+
+# Number of submissions whose answers are decoded and written at once
+__BATCH_SIZE = 500
+
+__MULTIPLE_CHOICE_TYPES = (
+    QuestionTypeEnum.MULTIPLE_CHOICE,
+    QuestionTypeEnum.MULTIPLE_SELECT,
+)
+
+
+def __read_questions_and_options(
+    question_ids: set[str],
+) -> tuple[dict[str, FormQuestionTemplateOrmV2], dict[str, list[str]], dict[str, str]]:
+    """
+    Looks up the given questions, the option string ids of the multiple-choice ones
+    and the English text of those options, each with a single query.
+
+    :return: Questions by ID, option string ids by question ID, and option texts by
+        string id
+    """
+    questions = (
+        db_session.query(FormQuestionTemplateOrmV2)
+        .filter(FormQuestionTemplateOrmV2.id.in_(question_ids))
+        .all()
+    )
+
+    options: dict[str, list[str]] = {}
+    for question in questions:
+        if question.question_type in __MULTIPLE_CHOICE_TYPES and question.mc_options:
+            with contextlib.suppress(ValueError, TypeError):
+                options[question.id] = json.loads(question.mc_options)
+
+    option_texts: dict[str, str] = {}
+    string_ids = {string_id for ids in options.values() for string_id in ids}
+    if string_ids:
+        lang_versions = (
+            db_session.query(LangVersionOrmV2)
+            .filter(
+                LangVersionOrmV2.string_id.in_(string_ids),
+                LangVersionOrmV2.lang == "English",
+            )
+            .all()
+        )
+        option_texts = {lv.string_id: lv.text for lv in lang_versions}
+
+    return {question.id: question for question in questions}, options, option_texts
+
+
+def decode_form_answer_values(
+    submissions: list[FormSubmissionOrmV2],
+) -> list[dict[str, Any]]:
+    """
+    Decodes the answers of form submissions into rows of the projection. Answers to
+    questions without a ``user_question_id``, of unsupported types or whose JSON
+    cannot be parsed are skipped. The questions and option translations referenced
+    by all of the submissions are looked up together.
+
+    :param submissions: Submissions with their answers
+    :return: A list of column name -> value dicts, one per answered question
+    """
+    question_ids = {
+        answer.question_id
+        for submission in submissions
+        for answer in submission.answers
+    }
+    if not question_ids:
+        return []
+    questions, options, option_texts = __read_questions_and_options(question_ids)
+
+    # Keyed by the primary key so a question answered twice yields a single row
+    rows: dict[tuple[str, str], dict[str, Any]] = {}
+    for submission in submissions:
+        for answer in submission.answers:
+            question = questions.get(answer.question_id)
+            if question is None or not question.user_question_id:
+                continue
+            try:
+                raw: dict[str, Any] = json.loads(answer.answer)
+            except (ValueError, TypeError):
+                continue
+
+            row = {
+                "form_submission_id": submission.id,
+                "user_question_id": question.user_question_id,
+                "question_id": question.id,
+                "question_type": question.question_type,
+                "number_value": None,
+                "text_value": None,
+                "date_value": None,
+                "option_text": None,
+                "selected_options": None,
+            }
+            q_type = question.question_type
+            if q_type in (QuestionTypeEnum.INTEGER, QuestionTypeEnum.DECIMAL):
+                row["number_value"] = raw.get("number")
+            elif q_type == QuestionTypeEnum.STRING:
+                row["text_value"] = raw.get("text")
+            elif q_type in (QuestionTypeEnum.DATE, QuestionTypeEnum.DATETIME):
+                row["date_value"] = raw.get("date")
+            elif q_type in __MULTIPLE_CHOICE_TYPES:
+                option_ids = options.get(question.id, [])
+                selected = [
+                    option_texts.get(option_ids[index])
+                    for index in raw.get("mc_id_array", [])
+                    if index < len(option_ids)
+                ]
+                if q_type == QuestionTypeEnum.MULTIPLE_CHOICE:
+                    row["option_text"] = selected[0] if selected else None
+                else:
+                    row["selected_options"] = json.dumps(
+                        [text for text in selected if text is not None]
+                    )
+            else:
+                continue
+            rows[(submission.id, question.user_question_id)] = row
+
+    return list(rows.values())
+
+
+def flatten_form_answer_values(
+    rows: Iterable[FormAnswerValueOrmV2], submission_ids: Iterable[str]
+) -> dict[str, dict[str, Any]]:
+    """
+    Groups projection rows into one dict per submission keyed by user_question_id,
+    holding the value of the column matching the question type, with the numbers
+    of INTEGER questions as ints. Each selected option of a multiple-select question
+    is instead keyed as ``{user_question_id}_{option text}`` with the value True.
+    Missing values are omitted.
+
+    :param rows: Projection rows
+    :param submission_ids: IDs of the submissions to return, including those with no
+        rows
+    :return: A dict of submission ID -> flattened answers
+    """
+    flattened: dict[str, dict[str, Any]] = {
+        submission_id: {} for submission_id in submission_ids
+    }
+    for row in rows:
+        flat = flattened.get(row.form_submission_id)
+        if flat is None:
+            continue
+        if row.question_type == QuestionTypeEnum.MULTIPLE_SELECT:
+            for text in json.loads(row.selected_options or "[]"):
+                flat[f"{row.user_question_id}_{text}"] = True
+            continue
+        number_value = row.number_value
+        if (
+            row.question_type == QuestionTypeEnum.INTEGER
+            and number_value is not None
+            and float(number_value).is_integer()
+        ):
+            # Stored in a floating point column, but submitted as an integer
+            number_value = int(number_value)
+        for value in (
+            number_value,
+            row.text_value,
+            row.date_value,
+            row.option_text,
+        ):
+            if value is not None:
+                flat[row.user_question_id] = value
+                break
+    return flattened
+
+
+def read_form_answer_values(
+    submission_ids: Iterable[str],
+) -> dict[str, dict[str, Any]]:
+    """
+    Reads the answers of the given submissions from the projection with a single
+    query, flattened as by ``flatten_form_answer_values``.
+
+    :param submission_ids: IDs of the submissions to read
+    :return: A dict of submission ID -> flattened answers
+    """
+    submission_ids = list(submission_ids)
+    if not submission_ids:
+        return {}
+    rows = (
+        db_session.query(FormAnswerValueOrmV2)
+        .filter(FormAnswerValueOrmV2.form_submission_id.in_(submission_ids))
+        .all()
+    )
+    return flatten_form_answer_values(rows, submission_ids)
+
+
+def refresh_form_answer_values(submission_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recomputes the projection rows of the given submissions in batches. Pending
+    changes in the session are flushed first so they are reflected in the projection.
+    The current transaction is not committed.
+
+    :param submission_ids: IDs of the submissions to refresh; None to refresh every
+        submission
+    :return: The number of projection rows written
+    """
+    table = FormAnswerValueOrmV2.__table__
+    db_session.flush()
+
+    if submission_ids is None:
+        db_session.execute(table.delete())
+        submission_ids = [
+            submission_id
+            for (submission_id,) in db_session.query(FormSubmissionOrmV2.id)
+            .order_by(FormSubmissionOrmV2.id)
+            .all()
+        ]
+    else:
+        submission_ids = sorted({sid for sid in submission_ids if sid})
+        if not submission_ids:
+            return 0
+        db_session.execute(
+            table.delete().where(table.c.form_submission_id.in_(submission_ids))
+        )
+
+    count = 0
+    for start in range(0, len(submission_ids), __BATCH_SIZE):
+        submissions = (
+            db_session.query(FormSubmissionOrmV2)
+            .options(selectinload(FormSubmissionOrmV2.answers))
+            .filter(
+                FormSubmissionOrmV2.id.in_(submission_ids[start : start + __BATCH_SIZE])
+            )
+            .all()
+        )
+        rows = decode_form_answer_values(submissions)
+        if rows:
+            db_session.execute(table.insert(), rows)
+            count += len(rows)
+    return count
+
+
+def rebuild_form_answer_values() -> int:
+    """
+    Recomputes the projection for every submission and commits the result.
+
+    :return: The number of projection rows written
+    """
+    count = refresh_form_answer_values()
+    unit_of_work.commit()
+    return count
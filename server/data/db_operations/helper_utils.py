@@ -6,41 +6,56 @@ purpose:
 
 Functions included:
 - __filter_by_patient_association: Restricts queries based on user-patient associations,
-  including CHO-VHT supervision relationships.
+  including the cached CHO-VHT supervision relationships.
 - __filter_by_patient_search: Applies free-text search filters on patient identifiers,
   names, or village numbers.
 - __order_by_column: Dynamically orders query results by a specified column in ascending
   or descending order.
 - __get_slice_indexes: Computes pagination slice indexes (start, stop) given page and
   limit parameters.
+- __read_sync_page: Reads one page of a sync changes feed using keyset pagination on a
+  (last-edited, id) cursor.
+- __model_columns: Lists the column attributes of a model, for queries returning plain
+  rows instead of model instances.
 
 These helpers reduce code duplication across CRUD modules such as patient, referral,
 and workflow queries.
 """
 
-from typing import Any, Optional
+from typing import Any, Callable, NamedTuple, Optional
 
-from sqlalchemy import or_
+from sqlalchemy import inspect, or_
 from sqlalchemy.orm import Query
-from sqlalchemy.sql.expression import asc, desc
+from sqlalchemy.sql.expression import and_, asc, desc
 
-from data.db_operations import db_session
+from data.db_operations.supervision import get_supervised_vht_ids
 from models import (
     PatientAssociationsOrm,
     PatientOrm,
-    SupervisesTable,
 )
 
 
+class SyncPage(NamedTuple):
+    """
+    One page of a sync changes feed.
+
+    ``next_cursor`` is the (last-edited, id) position of the last item in the page, or
+    None when there are no further changes to read.
+    """
+
+    items: list[Any]
+    next_cursor: Optional[tuple[int, Any]]
+
+
 def __filter_by_patient_association(
     query: Query,
     model: Any,
     user_id: Optional[int],
     is_cho,
 ) -> Query:
-    """Filter a query to only include records associated with the given user, using CHO supervision subquery if applicable."""
+    """Filter a query to only include records associated with the given user, or with the VHTs they supervise if they are a CHO."""
     if user_id is not None:
-        if hasattr(model, model.patient_id):
+        if hasattr(model, "patient_id"):
             join_column = model.patient_id
         else:
             join_column = model.id
@@ -49,12 +64,10 @@ def __filter_by_patient_association(
             join_column == PatientAssociationsOrm.patient_id,
         )
         if is_cho:
-            sub = (
-                db_session.query(SupervisesTable.c.vht_id)
-                .filter(SupervisesTable.c.cho_id == user_id)
-                .subquery()
-            )
-            query = query.filter(PatientAssociationsOrm.user_id.in_(sub))
+            # The supervised VHTs are cached, so their IDs are inlined rather than
+            # selected by a subquery on every request
+            vht_ids = get_supervised_vht_ids(user_id)
+            query = query.filter(PatientAssociationsOrm.user_id.in_(vht_ids))
         else:
             query = query.filter(PatientAssociationsOrm.user_id == user_id)
 
@@ -99,3 +112,69 @@ def __get_slice_indexes(page: str, limit: str) -> tuple[int, int]:
     start = (int(page) - 1) * int(limit)
     stop = start + int(limit)
     return start, stop
+
+
+def __read_sync_page(
+    query: Query,
+    change_key: Any,
+    id_column: Any,
+    key_of: Callable[[Any], tuple[int, Any]],
+    since: Optional[int],
+    cursor: Optional[tuple[int, Any]],
+    limit: int,
+    distinct: bool = False,
+) -> SyncPage:
+    """
+    Read one page of changes ordered by (change_key, id_column), starting strictly after
+    the cursor position. Where change_key is a column, as for readings, referrals and
+    assessments, its (change_key, id) index lets the database seek straight to the
+    cursor rather than scanning every change since the last sync. The patients feed
+    keys on an expression over the patient and its records, which no index can serve,
+    so its changes are sorted before each page is cut.
+
+    :param query: Query selecting the items, already filtered by patient association
+    :param change_key: Column or expression holding the item's last-edited timestamp
+    :param id_column: Primary key column used to break ties between equal timestamps
+    :param key_of: Function returning the (change_key, id) values of a result row
+    :param since: Timestamp to only include changes after; None to include everything
+    :param cursor: Position returned by the previous page; None to read the first page
+    :param limit: Maximum number of items in the page
+    :param distinct: If true, duplicate rows are removed; needed when the query joins
+        rows that can match an item more than once, such as patient associations
+    :return: The items of the page and the cursor for the next page
+    """
+    if since:
+        query = query.filter(change_key > since)
+    if cursor is not None:
+        last_key, last_id = cursor
+        query = query.filter(
+            or_(
+                change_key > last_key,
+                and_(change_key == last_key, id_column > last_id),
+            ),
+        )
+
+    # Fetch one extra row to find out whether another page follows
+    if distinct:
+        query = query.distinct()
+    rows = query.order_by(change_key, id_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return SyncPage(rows, None)
+    rows = rows[:limit]
+    return SyncPage(rows, key_of(rows[-1]))
+
+
+def __model_columns(model: Any, prefix: str = "") -> list[Any]:
+    """
+    List the column attributes of a model in mapper order, which is the order
+    ``orm_serializer.marshal_rows`` expects the values of a row in.
+
+    :param model: Model class to list the columns of
+    :param prefix: Prefix added to the column labels, to tell apart columns of joined
+        models sharing a name
+    :return: A list of column attributes, labelled with the prefix if one is given
+    """
+    columns = [getattr(model, attr.key) for attr in inspect(model).column_attrs]
+    if prefix:
+        columns = [column.label(f"{prefix}{column.key}") for column in columns]
+    return columns
@@ -0,0 +1,223 @@
+"""
+patient_latest.py
+
+This module maintains the ``patient_latest`` projection, a denormalized table holding
+each patient's latest reading (with its traffic light status and date taken), their
+open pregnancy, and their current medical and drug records.
+
+Queries which previously found the newest row of each table by outer-joining the
+table to itself (quadratic in the number of records per patient) read from this
+projection instead.
+
+Functions included:
+- refresh_patient_latest: Recomputes the projection rows of the given patients.
+- refresh_patient_latest_by_record: Recomputes the projection rows of the patients
+  owning the given records.
+- rebuild_patient_latest: Recomputes the projection for every patient.
+
+Every flush of the app's session that writes patients, readings, pregnancies or medical
+records refreshes the rows of the affected patients, whichever code path made the
+writes.
+Statements which bypass the session's unit of work, such as bulk updates and bulk
+deletes, must call ``refresh_patient_latest`` or ``refresh_patient_latest_by_record``
+themselves; ``rebuild_patient_latest`` is exposed as a management command to
+repopulate the table after bulk imports or direct database edits.
+"""
+
+import itertools
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql.expression import and_
+
+from data.db_operations import db_session
+from models import (
+    MedicalRecordOrm,
+    PatientOrm,
+    PregnancyOrm,
+    ReadingOrm,
+)
+from models.patients import PatientLatestOrm
+
+# Models of the records a patient's projection row is computed from
+__RECORD_MODELS = (ReadingOrm, PregnancyOrm, MedicalRecordOrm)
+
+__PROJECTION_COLUMNS = [
+    "patient_id",
+    "reading_id",
+    "traffic_light_status",
+    "date_taken",
+    "pregnancy_id",
+    "medical_record_id",
+    "drug_record_id",
+]
+
+
+def __latest_projection_query():
+    """
+    Builds a query selecting the projection columns for every patient.
+
+    Each latest record is found with a correlated ``ORDER BY ... LIMIT 1`` subquery
+    which is satisfied by the per-patient foreign key indexes, rather than with a
+    self-anti-join.
+    """
+    rd = aliased(ReadingOrm)
+    latest_reading = (
+        db_session.query(rd.id)
+        .filter(rd.patient_id == PatientOrm.id)
+        .order_by(rd.date_taken.desc(), rd.id.desc())
+        .limit(1)
+        .correlate(PatientOrm)
+        .scalar_subquery()
+    )
+
+    pr = aliased(PregnancyOrm)
+    latest_pregnancy = (
+        db_session.query(pr.id)
+        .filter(pr.patient_id == PatientOrm.id)
+        .order_by(pr.start_date.desc(), pr.id.desc())
+        .limit(1)
+        .correlate(PatientOrm)
+        .scalar_subquery()
+    )
+
+    def __latest_record(is_drug_record: bool):
+        """Return a subquery selecting the ID of the latest medical or drug record."""
+        md = aliased(MedicalRecordOrm)
+        return (
+            db_session.query(md.id)
+            .filter(md.patient_id == PatientOrm.id, md.is_drug_record == is_drug_record)
+            .order_by(md.date_created.desc(), md.id.desc())
+            .limit(1)
+            .correlate(PatientOrm)
+            .scalar_subquery()
+        )
+
+    MedicalHistory = aliased(MedicalRecordOrm)
+    DrugHistory = aliased(MedicalRecordOrm)
+
+    return (
+        db_session.query(
+            PatientOrm.id,
+            ReadingOrm.id,
+            ReadingOrm.traffic_light_status,
+            ReadingOrm.date_taken,
+            PregnancyOrm.id,
+            MedicalHistory.id,
+            DrugHistory.id,
+        )
+        .select_from(PatientOrm)
+        .outerjoin(ReadingOrm, ReadingOrm.id == latest_reading)
+        .outerjoin(
+            PregnancyOrm,
+            and_(
+                PregnancyOrm.id == latest_pregnancy,
+                PregnancyOrm.end_date.is_(None),
+            ),
+        )
+        .outerjoin(MedicalHistory, MedicalHistory.id == __latest_record(False))
+        .outerjoin(DrugHistory, DrugHistory.id == __latest_record(True))
+    )
+
+
+def __refresh_statement(patient_ids: Iterable[str]):
+    """
+    Builds a single ``INSERT ... SELECT ... ON DUPLICATE KEY UPDATE`` recomputing the
+    projection rows of the given patients in place.
+    """
+    query = __latest_projection_query().filter(PatientOrm.id.in_(patient_ids))
+    statement = mysql_insert(PatientLatestOrm.__table__).from_select(
+        __PROJECTION_COLUMNS, query.statement
+    )
+    return statement.on_duplicate_key_update(
+        {
+            column: statement.inserted[column]
+            for column in __PROJECTION_COLUMNS
+            if column != "patient_id"
+        }
+    )
+
+
+def refresh_patient_latest(patient_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recomputes the projection rows for the given patients. Pending changes in the
+    session are flushed first so they are reflected in the projection. The current
+    transaction is not committed.
+
+    :param patient_ids: IDs of the patients to refresh; None to refresh every patient
+    :return: The number of projection rows written
+    """
+    db_session.flush()
+
+    if patient_ids is None:
+        table = PatientLatestOrm.__table__
+        db_session.execute(table.delete())
+        result = db_session.execute(
+            table.insert().from_select(
+                __PROJECTION_COLUMNS, __latest_projection_query().statement
+            ),
+        )
+        return result.rowcount
+
+    patient_ids = {patient_id for patient_id in patient_ids if patient_id}
+    if not patient_ids:
+        return 0
+    return db_session.execute(__refresh_statement(patient_ids)).rowcount
+
+
+def refresh_patient_latest_by_record(m: type[Any], record_ids: Iterable[Any]) -> int:
+    """
+    Recomputes the projection rows of the patients owning the given records, for
+    writes made without the session's unit of work. The current transaction is not
+    committed.
+
+    :param m: Type of the records; other models than readings, pregnancies and
+        medical records do not affect the projection
+    :param record_ids: Primary keys of the records
+    :return: The number of projection rows written
+    """
+    record_ids = list(record_ids)
+    if m not in __RECORD_MODELS or not record_ids:
+        return 0
+    patient_ids = [
+        patient_id
+        for (patient_id,) in db_session.query(m.patient_id).filter(m.id.in_(record_ids))
+    ]
+    return refresh_patient_latest(patient_ids)
+
+
+# Registered on the app's session rather than on every ``Session``, as the refresh
+# statement is MySQL-specific
+@event.listens_for(db_session, "after_flush")
+def __refresh_after_flush(session: Session, _flush_context) -> None:
+    """
+    Recomputes, with one statement, the projection rows of the patients created or
+    whose records were written by the flush, including the patients records were
+    moved away from.
+    """
+    patient_ids = {
+        patient.id for patient in session.new if isinstance(patient, PatientOrm)
+    }
+    for model in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(model, __RECORD_MODELS):
+            patient_ids.add(model.patient_id)
+            # Attribute history still holds the pre-flush values in after_flush
+            patient_ids.update(inspect(model).attrs.patient_id.history.deleted)
+    patient_ids.discard(None)
+    if patient_ids:
+        # Through the flush's connection: the session cannot be flushed again here
+        session.connection().execute(__refresh_statement(patient_ids))
+
+
+def rebuild_patient_latest() -> int:
+    """
+    Recomputes the projection for every patient and commits the result.
+
+    :return: The number of projection rows written
+    """
+    count = refresh_patient_latest()
+    db_session.commit()
+    return count
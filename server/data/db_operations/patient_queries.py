@@ -13,6 +13,16 @@ Functions included:
 - read_patient_all_records: merge readings, referrals, assessments, and forms.
 - read_patients: retrieve patients with their latest related records.
 - read_readings: return readings with associated urine tests.
+- read_reading_vitals: return the dates, vitals and traffic lights of a patient's
+  readings for the stats endpoint.
+- read_patient_changes / read_reading_changes: page through patients and readings
+  changed since the last sync using a (last-edited, id) cursor.
+- read_global_patient_search / read_patient_reading_summaries: back the mobile
+  global patient search without loading every patient into memory.
+
+``read_readings`` and ``read_reading_changes`` can also return plain rows of the
+reading and urine test columns (``as_rows=True``), which skip building model instances
+and are marshalled with ``orm_serializer.marshal_reading_rows``.
 
 These functions encapsulate patient-centric database access, keeping query
 logic organized and reusable across the application.
@@ -20,21 +30,25 @@ logic organized and reusable across the application.
 
 from typing import Any, NamedTuple, Optional, Union
 
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import and_, asc, desc, literal, null, text
 
 from data.db_operations import M, db_session
 from data.db_operations.helper_utils import (
+    SyncPage,
     __filter_by_patient_association,
     __filter_by_patient_search,
     __get_slice_indexes,
+    __model_columns,
     __order_by_column,
+    __read_sync_page,
 )
 from models import (
     AssessmentOrm,
     FormSubmissionOrmV2,
     MedicalRecordOrm,
+    PatientAssociationsOrm,
     PatientOrm,
     PregnancyOrm,
     ReadingOrm,
@@ -42,6 +56,7 @@ from models import (
     UrineTestOrm,
     get_schema_for_model,
 )
+from models.patients import PatientLatestOrm
 
 
 def read_patient_list(
@@ -58,32 +73,23 @@ def read_patient_list(
 
     :return: A list of patients
     """
-    rd = aliased(ReadingOrm)
     query = (
         db_session.query(
             PatientOrm.id,
             PatientOrm.name,
             PatientOrm.village_number,
-            ReadingOrm.traffic_light_status,
-            ReadingOrm.date_taken,
-        )
-        .outerjoin(ReadingOrm, PatientOrm.readings)
-        .outerjoin(
-            rd,
-            and_(
-                PatientOrm.id == rd.patient_id,
-                ReadingOrm.date_taken < rd.date_taken,
-            ),
+            PatientLatestOrm.traffic_light_status,
+            PatientLatestOrm.date_taken,
         )
+        .outerjoin(PatientLatestOrm, PatientOrm.id == PatientLatestOrm.patient_id)
         .filter(
-            rd.date_taken.is_(None),
             or_(PatientOrm.is_archived == False, PatientOrm.is_archived.is_(None)),
         )
     )
 
     query = __filter_by_patient_association(query, PatientOrm, user_id, is_cho)
     query = __filter_by_patient_search(query, **kwargs)
-    query = __order_by_column(query, [PatientOrm, ReadingOrm], **kwargs)
+    query = __order_by_column(query, [PatientOrm, PatientLatestOrm], **kwargs)
 
     limit = kwargs.get("limit")
     if limit:
@@ -353,35 +359,18 @@ def read_patient_all_records(patient_id: str, **kwargs) -> list[Any]:
     return final_list
 
 
-def read_patients(
-    patient_id: Optional[str] = None,
-    user_id: Optional[int] = None,
-    is_cho: bool = False,
-    last_edited: Optional[int] = None,
-) -> Union[Any, list[Any]]:
+def __patients_with_latest_records_query():
     """
-    Queries the database for patient(s) each with the latest pregnancy, medical and drug
-    records.
+    Build the query used by the sync endpoints to select patients alongside their
+    current pregnancy, medical and drug records.
 
-    :param patient_id: ID of patient to filter patients; by default this filter is not
-    applied
-    :param user_id: ID of user to filter patients wrt patient associations; by default
-    this filter is not applied
-    :param last_edited: Timestamp to filter patients by last-edited time greater than the
-    timestamp; by default this filter is not applied
-
-    :return: A patient if patient ID is specified; a list of patients otherwise
+    :return: A tuple of the query and the aliased medical and drug record classes it
+    joins, so callers can filter on them
     """
-    # TODO: Why does this function return either a single object or a list of objects?
-    #  This should really be split into two different functions.
-
-    # Aliased classes to be used in join clauses for getting the latest pregnancy, medical
-    # and drug records.
-    pregnancy = aliased(PregnancyOrm)
+    # Aliased classes to be used in join clauses for the current medical and drug
+    # records referenced by the patient's latest-record projection.
     MedicalHistory = aliased(MedicalRecordOrm)
-    md = aliased(MedicalRecordOrm)
     DrugHistory = aliased(MedicalRecordOrm)
-    dr = aliased(MedicalRecordOrm)
 
     query = (
         db_session.query(
@@ -403,57 +392,41 @@ def read_patients(
             DrugHistory.information.label("drug_history"),
             PatientOrm.is_archived,
         )
-        .outerjoin(
-            PregnancyOrm,
-            and_(
-                PatientOrm.id == PregnancyOrm.patient_id,
-                PregnancyOrm.end_date.is_(None),
-            ),
-        )
-        .outerjoin(
-            pregnancy,
-            and_(
-                PregnancyOrm.patient_id == pregnancy.patient_id,
-                PregnancyOrm.start_date < pregnancy.start_date,
-            ),
-        )
+        .outerjoin(PatientLatestOrm, PatientOrm.id == PatientLatestOrm.patient_id)
+        .outerjoin(PregnancyOrm, PregnancyOrm.id == PatientLatestOrm.pregnancy_id)
         .outerjoin(
             MedicalHistory,
-            and_(
-                PatientOrm.id == MedicalHistory.patient_id,
-                MedicalHistory.is_drug_record == False,
-            ),
-        )
-        .outerjoin(
-            md,
-            and_(
-                MedicalHistory.patient_id == md.patient_id,
-                MedicalHistory.date_created < md.date_created,
-                md.is_drug_record == False,
-            ),
-        )
-        .outerjoin(
-            DrugHistory,
-            and_(
-                PatientOrm.id == DrugHistory.patient_id,
-                DrugHistory.is_drug_record == True,
-            ),
-        )
-        .outerjoin(
-            dr,
-            and_(
-                DrugHistory.patient_id == dr.patient_id,
-                DrugHistory.date_created < dr.date_created,
-                dr.is_drug_record == True,
-            ),
-        )
-        .filter(
-            pregnancy.start_date.is_(None),
-            md.date_created.is_(None),
-            dr.date_created.is_(None),
+            MedicalHistory.id == PatientLatestOrm.medical_record_id,
         )
+        .outerjoin(DrugHistory, DrugHistory.id == PatientLatestOrm.drug_record_id)
     )
 
+    return query, MedicalHistory, DrugHistory
+
+
+def read_patients(
+    patient_id: Optional[str] = None,
+    user_id: Optional[int] = None,
+    is_cho: bool = False,
+    last_edited: Optional[int] = None,
+) -> Union[Any, list[Any]]:
+    """
+    Queries the database for patient(s) each with the latest pregnancy, medical and drug
+    records.
+
+    :param patient_id: ID of patient to filter patients; by default this filter is not
+    applied
+    :param user_id: ID of user to filter patients wrt patient associations; by default
+    this filter is not applied
+    :param last_edited: Timestamp to filter patients by last-edited time greater than the
+    timestamp; by default this filter is not applied
+
+    :return: A patient if patient ID is specified; a list of patients otherwise
+    """
+    # TODO: Why does this function return either a single object or a list of objects?
+    #  This should really be split into two different functions.
+    query, MedicalHistory, DrugHistory = __patients_with_latest_records_query()
+
     query = __filter_by_patient_association(query, PatientOrm, user_id, is_cho)
 
     if last_edited:
@@ -481,12 +454,30 @@ def read_patients(
     return query.distinct().all()
 
 
+def __readings_with_urine_tests_query(as_rows: bool) -> Any:
+    """
+    Build a query for readings outer joined with their urine tests.
+
+    :param as_rows: If True, select the reading columns followed by the urine test
+    columns (labelled ``urine_tests_*``) instead of the models
+    """
+    if as_rows:
+        query = db_session.query(
+            *__model_columns(ReadingOrm),
+            *__model_columns(UrineTestOrm, prefix="urine_tests_"),
+        )
+    else:
+        query = db_session.query(ReadingOrm, UrineTestOrm)
+    return query.outerjoin(UrineTestOrm, ReadingOrm.urine_tests)
+
+
 def read_readings(
     patient_id: Optional[str] = None,
     user_id: Optional[int] = None,
     is_cho: bool = False,
     last_edited: Optional[int] = None,
-) -> list[tuple[ReadingOrm, UrineTestOrm]]:
+    as_rows: bool = False,
+) -> list[Any]:
     """
     Queries the database for readings each with corresponding referral, assessment, and
     urine test.
@@ -497,13 +488,12 @@ def read_readings(
     this filter is not applied
     :param last_edited: Timestamp to filter readings by last-edited time greater than the
     timestamp; by default this filter is not applied
+    :param as_rows: If True, return rows of the reading columns followed by the urine
+    test columns instead of model instances
 
-    :return: A list of tuples of reading, referral, assessment, urine test
+    :return: A list of tuples of reading, urine test; or a list of rows if as_rows
     """
-    query = db_session.query(ReadingOrm, UrineTestOrm).outerjoin(
-        UrineTestOrm,
-        ReadingOrm.urine_tests,
-    )
+    query = __readings_with_urine_tests_query(as_rows)
 
     query = __filter_by_patient_association(query, ReadingOrm, user_id, is_cho)
 
@@ -514,3 +504,206 @@ def read_readings(
         query = query.filter(ReadingOrm.patient_id == patient_id)
 
     return query.all()
+
+
+def read_reading_vitals(patient_id: str) -> list[Any]:
+    """
+    Queries the database for the columns of a patient's readings used to compute their
+    vitals statistics (see ``statsCalculation.ReadingStats``).
+
+    :param patient_id: ID of the patient
+
+    :return: A list of rows with the fields: date_taken, systolic_blood_pressure,
+    diastolic_blood_pressure, heart_rate, traffic_light_status
+    """
+    return (
+        db_session.query(
+            ReadingOrm.date_taken,
+            ReadingOrm.systolic_blood_pressure,
+            ReadingOrm.diastolic_blood_pressure,
+            ReadingOrm.heart_rate,
+            ReadingOrm.traffic_light_status,
+        )
+        .filter(ReadingOrm.patient_id == patient_id)
+        .order_by(ReadingOrm.date_taken, ReadingOrm.id)
+        .all()
+    )
+
+
+def read_patient_changes(
+    since: Optional[int],
+    cursor: Optional[tuple[int, str]] = None,
+    limit: int = 500,
+    user_id: Optional[int] = None,
+    is_cho: bool = False,
+) -> SyncPage:
+    """
+    Queries the database for one page of patients, each with the latest pregnancy,
+    medical and drug records, which changed since the last sync.
+
+    A patient counts as changed when the patient, their current pregnancy, medical or
+    drug record, or any closed pregnancy was edited. The most recent of these edits is
+    the patient's position in the feed and is returned as ``last_changed``.
+
+    :param since: Timestamp of the last sync; None to include every patient
+    :param cursor: (last_changed, patient ID) position returned by the previous page
+    :param limit: Maximum number of patients in the page
+    :param user_id: ID of user to filter patients wrt patient associations; by default
+    this filter is not applied
+
+    :return: A page of patients and the cursor for the next page
+    """
+    query, MedicalHistory, DrugHistory = __patients_with_latest_records_query()
+
+    # Latest edit of the patient's closed pregnancies
+    pr2 = aliased(PregnancyOrm)
+    closed_pregnancy_edited = (
+        db_session.query(func.max(pr2.last_edited))
+        .filter(pr2.patient_id == PatientOrm.id, pr2.end_date.isnot(None))
+        .correlate(PatientOrm)
+        .scalar_subquery()
+    )
+    last_changed = func.greatest(
+        PatientOrm.last_edited,
+        func.coalesce(PregnancyOrm.last_edited, 0),
+        func.coalesce(MedicalHistory.last_edited, 0),
+        func.coalesce(DrugHistory.last_edited, 0),
+        func.coalesce(closed_pregnancy_edited, 0),
+    ).label("last_changed")
+
+    query = query.add_columns(last_changed)
+    query = __filter_by_patient_association(query, PatientOrm, user_id, is_cho)
+
+    return __read_sync_page(
+        query,
+        last_changed,
+        PatientOrm.id,
+        lambda row: (row.last_changed, row.patient_id),
+        since,
+        cursor,
+        limit,
+        distinct=user_id is not None,
+    )
+
+
+def read_reading_changes(
+    since: Optional[int],
+    cursor: Optional[tuple[int, str]] = None,
+    limit: int = 500,
+    user_id: Optional[int] = None,
+    is_cho: bool = False,
+    as_rows: bool = False,
+) -> SyncPage:
+    """
+    Queries the database for one page of readings, each with corresponding urine test,
+    which changed since the last sync.
+
+    :param since: Timestamp of the last sync; None to include every reading
+    :param cursor: (last_edited, reading ID) position returned by the previous page
+    :param limit: Maximum number of readings in the page
+    :param user_id: ID of user to filter patients wrt patient associations; by default
+    this filter is not applied
+    :param as_rows: If True, the page holds rows of the reading columns followed by the
+    urine test columns instead of model instances
+
+    :return: A page of tuples of reading, urine test (or rows) and the cursor for the
+    next page
+    """
+    query = __readings_with_urine_tests_query(as_rows)
+    query = __filter_by_patient_association(query, ReadingOrm, user_id, is_cho)
+
+    return __read_sync_page(
+        query,
+        ReadingOrm.last_edited,
+        ReadingOrm.id,
+        (
+            (lambda row: (row.last_edited, row.id))
+            if as_rows
+            else (lambda row: (row[0].last_edited, row[0].id))
+        ),
+        since,
+        cursor,
+        limit,
+        distinct=user_id is not None,
+    )
+
+
+def read_global_patient_search(
+    search: str,
+    facility_name: Optional[str] = None,
+    **kwargs,
+) -> list[Any]:
+    """
+    Queries the database for all patients whose ID or name contains the search string,
+    each annotated with whether the patient is associated with the given facility.
+
+    The association state is computed with a single LEFT JOIN against the patient
+    association table rather than one query per matching patient.
+
+    :param search: Substring to match against patient ID and name
+    :param facility_name: Name of the facility to check associations against; if None,
+    any association with the patient counts
+    :param kwargs: Query params including limit, page
+
+    :return: A list of rows with the fields: id, name, village_number, is_added
+    """
+    join_condition = PatientOrm.id == PatientAssociationsOrm.patient_id
+    if facility_name:
+        join_condition = and_(
+            join_condition,
+            PatientAssociationsOrm.health_facility_name == facility_name,
+        )
+
+    safe_search_text = f"%{search}%"
+    query = (
+        db_session.query(
+            PatientOrm.id,
+            PatientOrm.name,
+            PatientOrm.village_number,
+            (func.count(PatientAssociationsOrm.id) > 0).label("is_added"),
+        )
+        .outerjoin(PatientAssociationsOrm, join_condition)
+        .filter(
+            or_(
+                PatientOrm.id.like(safe_search_text),
+                PatientOrm.name.like(safe_search_text),
+            ),
+        )
+        .group_by(PatientOrm.id)
+        .order_by(PatientOrm.id)
+    )
+
+    limit = kwargs.get("limit")
+    if limit:
+        page = kwargs.get("page", 1)
+        return query.slice(*__get_slice_indexes(page, limit)).all()
+    return query.all()
+
+
+def read_patient_reading_summaries(patient_ids: list[str]) -> dict[str, list[Any]]:
+    """
+    Queries the database for a summary of every reading belonging to the given patients
+    in a single batched query.
+
+    :param patient_ids: IDs of the patients to fetch reading summaries for
+
+    :return: A dict mapping each patient ID to a list of rows with the fields:
+    date_taken, traffic_light_status; readings are in descending date taken order
+    """
+    summaries: dict[str, list[Any]] = {patient_id: [] for patient_id in patient_ids}
+    if not patient_ids:
+        return summaries
+
+    rows = (
+        db_session.query(
+            ReadingOrm.patient_id,
+            ReadingOrm.date_taken,
+            ReadingOrm.traffic_light_status,
+        )
+        .filter(ReadingOrm.patient_id.in_(patient_ids))
+        .order_by(ReadingOrm.patient_id, ReadingOrm.date_taken.desc())
+        .all()
+    )
+    for row in rows:
+        summaries[row.patient_id].append(row)
+    return summaries
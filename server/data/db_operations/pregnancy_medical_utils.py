@@ -7,11 +7,13 @@ inconsistent or overlapping entries when creating or updating pregnancy data.
 
 Functions:
     has_conflicting_pregnancy_record(patient_id, start_date, end_date=None, pregnancy_id=None):
+    has_conflicting_pregnancy(pregnancies, start_date, end_date=None, pregnancy_id=None):
 Usage:
     Use these functions in services or APIs that manage pregnancy data
     to ensure no overlapping pregnancies are stored in the system.
 """
 
+from collections.abc import Iterable
 from typing import Optional
 
 from sqlalchemy import or_
@@ -67,3 +69,36 @@ def has_conflicting_pregnancy_record(
         )
 
     return db_session.query(query.exists()).scalar()
+
+
+def has_conflicting_pregnancy(
+    pregnancies: Iterable[PregnancyOrm],
+    start_date: int,
+    end_date: Optional[int] = None,
+    pregnancy_id: Optional[int] = None,
+) -> bool:
+    """
+    Return True if any of the given pregnancies overlaps the given date range, excluding
+    the given pregnancy ID if provided.
+
+    This is the in-memory equivalent of ``has_conflicting_pregnancy_record`` for callers
+    which have already fetched a patient's pregnancies, such as bulk sync.
+    """
+    for pregnancy in pregnancies:
+        if pregnancy_id and pregnancy.id == pregnancy_id:
+            continue
+
+        other_start, other_end = pregnancy.start_date, pregnancy.end_date
+        if not end_date:
+            if other_end is None or other_end >= start_date:
+                return True
+        elif other_end is None:
+            if other_start <= start_date or start_date <= other_start <= end_date:
+                return True
+        elif (
+            (other_start <= start_date <= other_end)
+            or (other_start >= start_date and other_end <= end_date)
+            or (other_start <= end_date <= other_end)
+        ):
+            return True
+    return False
@@ -10,6 +10,12 @@ Functions included:
 - read_referrals_or_assessments: Generic query to fetch either referrals or
   assessments linked to patients, supporting filters for user association,
   patient ID, and last-edited timestamps.
+- read_referral_changes / read_assessment_changes: Page through referrals and
+  assessments changed since the last sync using a (last-edited, id) cursor.
+
+The last three can also return plain rows of the model's columns (``as_rows=True``),
+which skip building model instances and are marshalled with
+``orm_serializer.marshal_rows``.
 
 This file separates referral and assessment query logic from the broader CRUD
 operations (previously bundled in `crud.py`) to improve modularity and maintainability.
@@ -19,25 +25,27 @@ import operator
 from typing import Any, Optional, Union
 
 from sqlalchemy import or_
-from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import and_
 from sqlalchemy.sql.functions import coalesce
 
 from data.db_operations import db_session
 from data.db_operations.helper_utils import (
+    SyncPage,
     __filter_by_patient_association,
     __filter_by_patient_search,
     __get_slice_indexes,
+    __model_columns,
     __order_by_column,
+    __read_sync_page,
 )
 from enums import TrafficLightEnum
 from models import (
     AssessmentOrm,
     PatientOrm,
-    PregnancyOrm,
     ReadingOrm,
     ReferralOrm,
 )
+from models.patients import PatientLatestOrm
 
 
 def read_referral_list(
@@ -127,24 +135,10 @@ def read_referral_list(
     # Filter by pregnancy status
     if is_pregnant in ["1", "0"]:
         eq_op = operator.ne if is_pregnant == "1" else operator.eq
-        pr = aliased(PregnancyOrm)
-        query = (
-            query.outerjoin(
-                PregnancyOrm,
-                and_(
-                    PatientOrm.id == PregnancyOrm.patient_id,
-                    PregnancyOrm.end_date.is_(None),
-                ),
-            )
-            .outerjoin(
-                pr,
-                and_(
-                    PatientOrm.id == pr.patient_id,
-                    PregnancyOrm.start_date < pr.start_date,
-                ),
-            )
-            .filter(eq_op(PregnancyOrm.start_date, None), pr.start_date.is_(None))
-        )
+        query = query.outerjoin(
+            PatientLatestOrm,
+            PatientOrm.id == PatientLatestOrm.patient_id,
+        ).filter(eq_op(PatientLatestOrm.pregnancy_id, None))
 
     # Filter by vital signs
     if vital_signs is not None and len(vital_signs) > 0:
@@ -163,7 +157,8 @@ def read_referrals_or_assessments(
     user_id: Optional[int] = None,
     is_cho: bool = False,
     last_edited: Optional[int] = None,
-) -> Union[list[ReferralOrm], list[AssessmentOrm]]:
+    as_rows: bool = False,
+) -> Union[list[ReferralOrm], list[AssessmentOrm], list[Any]]:
     """
     Queries the database for referrals or assessments
 
@@ -173,13 +168,15 @@ def read_referrals_or_assessments(
     this filter is not applied
     :param last_edited: Timestamp to filter referrals or assessments by last-edited time
     greater than the timestamp; by default this filter is not applied
+    :param as_rows: If True, return rows of the model's columns instead of model
+    instances
 
     :return: A list of referrals or assessments
     """
     model_last_edited = (
-        model.last_edited if isinstance(model, ReferralOrm) else model.date_assessed
+        model.last_edited if model is ReferralOrm else model.date_assessed
     )
-    query = db_session.query(model)
+    query = db_session.query(*__model_columns(model) if as_rows else (model,))
 
     query = __filter_by_patient_association(query, model, user_id, is_cho)
 
@@ -190,3 +187,81 @@ def read_referrals_or_assessments(
         query = query.filter(model.patient_id == patient_id)
 
     return query.all()
+
+
+def read_referral_changes(
+    since: Optional[int],
+    cursor: Optional[tuple[int, str]] = None,
+    limit: int = 500,
+    user_id: Optional[int] = None,
+    is_cho: bool = False,
+    as_rows: bool = False,
+) -> SyncPage:
+    """
+    Queries the database for one page of referrals which changed since the last sync.
+
+    :param since: Timestamp of the last sync; None to include every referral
+    :param cursor: (last_edited, referral ID) position returned by the previous page
+    :param limit: Maximum number of referrals in the page
+    :param user_id: ID of user to filter patients wrt patient associations; by default
+    this filter is not applied
+    :param as_rows: If True, the page holds rows of the referral columns instead of
+    model instances
+
+    :return: A page of referrals and the cursor for the next page
+    """
+    query = db_session.query(
+        *__model_columns(ReferralOrm) if as_rows else (ReferralOrm,)
+    )
+    query = __filter_by_patient_association(query, ReferralOrm, user_id, is_cho)
+
+    return __read_sync_page(
+        query,
+        ReferralOrm.last_edited,
+        ReferralOrm.id,
+        lambda referral: (referral.last_edited, referral.id),
+        since,
+        cursor,
+        limit,
+        distinct=user_id is not None,
+    )
+
+
+def read_assessment_changes(
+    since: Optional[int],
+    cursor: Optional[tuple[int, str]] = None,
+    limit: int = 500,
+    user_id: Optional[int] = None,
+    is_cho: bool = False,
+    as_rows: bool = False,
+) -> SyncPage:
+    """
+    Queries the database for one page of assessments made since the last sync.
+    Assessments have no last-edited column, so as in ``read_referrals_or_assessments``
+    their assessment date is used in its place.
+
+    :param since: Timestamp of the last sync; None to include every assessment
+    :param cursor: (date_assessed, assessment ID) position returned by the previous page
+    :param limit: Maximum number of assessments in the page
+    :param user_id: ID of user to filter patients wrt patient associations; by default
+    this filter is not applied
+    :param as_rows: If True, the page holds rows of the assessment columns instead of
+    model instances
+
+    :return: A page of assessments and the cursor for the next page
+    """
+    query = db_session.query(
+        *__model_columns(AssessmentOrm) if as_rows else (AssessmentOrm,)
+    )
+    query = __filter_by_patient_association(query, AssessmentOrm, user_id, is_cho)
+
+    return __read_sync_page(
+        query,
+        AssessmentOrm.date_assessed,
+        AssessmentOrm.id,
+        lambda assessment: (assessment.date_assessed, assessment.id),
+        since,
+        cursor,
+        limit,
+        distinct=user_id is not None,
+    )
@@ -11,17 +11,35 @@ Functions include:
 - Measuring referral statistics (sent referrals, referred patients).
 - Computing daily activity (days with readings).
 - Exporting structured datasets combining patient, referral, and reading info.
+- Computing all of the above for the stats endpoints in two grouped passes
+  (read_stats_summary).
 """
 
+from typing import Optional
+
+from sqlalchemy import case, distinct, func, or_
 from sqlalchemy.sql.expression import and_
 
 from data.db_operations import LOGGER, M, db_session
+from enums import TrafficLightEnum
 from models import (
     PatientOrm,
     ReadingOrm,
     ReferralOrm,
+    UserOrm,
 )
 
+SECONDS_IN_DAY = 86400
+
+# Traffic light statuses reported by the stats endpoints
+STATS_TRAFFIC_LIGHTS = [
+    TrafficLightEnum.GREEN,
+    TrafficLightEnum.YELLOW_UP,
+    TrafficLightEnum.YELLOW_DOWN,
+    TrafficLightEnum.RED_UP,
+    TrafficLightEnum.RED_DOWN,
+]
+
 
 def get_unique_patients_with_readings(facility="%", user="%", filter={}) -> list[M]:
     """
@@ -281,3 +299,108 @@ def get_export_data(user_id, filter):
     except Exception as e:
         LOGGER.error(e)
         return None
+
+
+def _submitted_by(model, facility: Optional[str], user_id: Optional[int]):
+    """
+    Returns a predicate matching records of a model submitted by a user, or by the
+    users of a facility. ``UserOrm`` must be joined when a facility is given.
+
+    Records whose user was deleted are never matched, and users without a facility
+    count towards every facility, as in the raw queries above.
+    """
+    conditions = [
+        model.user_id.isnot(None) if user_id is None else model.user_id == user_id
+    ]
+    if facility is not None:
+        conditions.append(
+            or_(
+                UserOrm.health_facility_name == facility,
+                UserOrm.health_facility_name.is_(None),
+            )
+        )
+    return and_(*conditions)
+
+
+def read_stats_summary(
+    from_: int,
+    to: int,
+    facility: Optional[str] = None,
+    user_id: Optional[int] = None,
+    include_referred_patients: bool = True,
+) -> dict:
+    """
+    Computes the statistics shown by the stats endpoints in two grouped passes: one
+    over the readings and one over the referrals within a date range.
+
+    The date range is compared against the BIGINT timestamp columns directly and
+    records are filtered by equality rather than ``LIKE`` patterns, so both passes
+    can use the ``(date_taken)``/``(date_referred)`` and ``(user_id, ...)`` indexes.
+
+    :param from_: Start of the date range, as a Unix timestamp (inclusive)
+    :param to: End of the date range, as a Unix timestamp (inclusive)
+    :param facility: Name of a facility to restrict the stats to its users; None
+        for every facility
+    :param user_id: ID of a user to restrict the stats to; None for every user
+    :param include_referred_patients: If true, also count the distinct patients
+        referred to the facility (or to any facility)
+    :return: A dict with ``total_readings``, ``unique_patient_readings``,
+        ``days_with_readings``, ``color_readings`` (keyed by traffic light status),
+        ``sent_referrals`` and, if requested, ``patients_referred``
+    """
+    readings_query = db_session.query(
+        func.count(ReadingOrm.id),
+        func.count(distinct(ReadingOrm.patient_id)),
+        func.count(distinct(func.floor(ReadingOrm.date_taken / SECONDS_IN_DAY))),
+        *(
+            func.sum(case((ReadingOrm.traffic_light_status == status, 1), else_=0))
+            for status in STATS_TRAFFIC_LIGHTS
+        ),
+    ).select_from(ReadingOrm)
+    if facility is not None:
+        readings_query = readings_query.join(UserOrm, UserOrm.id == ReadingOrm.user_id)
+    readings = readings_query.filter(
+        ReadingOrm.date_taken.between(from_, to),
+        _submitted_by(ReadingOrm, facility, user_id),
+    ).one()
+
+    # Referrals sent by the selected users and patients referred to the selected
+    # facility have different filters, so each is counted conditionally
+    sent = _submitted_by(ReferralOrm, facility, user_id)
+    referral_columns = [func.sum(case((sent, 1), else_=0))]
+    referral_filters = [ReferralOrm.date_referred.between(from_, to)]
+    if not include_referred_patients:
+        referral_filters.append(sent)
+    elif facility is None:
+        referral_columns.append(func.count(distinct(ReferralOrm.patient_id)))
+    else:
+        referred = or_(
+            ReferralOrm.health_facility_name == facility,
+            ReferralOrm.health_facility_name.is_(None),
+        )
+        referral_columns.append(
+            func.count(distinct(case((referred, ReferralOrm.patient_id))))
+        )
+        referral_filters.append(or_(sent, referred))
+
+    referrals_query = db_session.query(*referral_columns).select_from(ReferralOrm)
+    if facility is not None:
+        referrals_query = referrals_query.outerjoin(
+            UserOrm, UserOrm.id == ReferralOrm.user_id
+        )
+    referrals = referrals_query.filter(*referral_filters).one()
+
+    total_readings, unique_patients, days_with_readings, *color_counts = readings
+    summary = {
+        "sent_referrals": int(referrals[0] or 0),
+        "days_with_readings": days_with_readings,
+        "unique_patient_readings": unique_patients,
+        "total_readings": total_readings,
+        "color_readings": {
+            status.value: int(count or 0)
+            for status, count in zip(STATS_TRAFFIC_LIGHTS, color_counts)
+        },
+    }
+    if include_referred_patients:
+        summary["patients_referred"] = referrals[1]
+    return summary
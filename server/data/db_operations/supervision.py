@@ -2,53 +2,130 @@
 supervision.py
 
 This module provides functions for managing supervision relationships between
-CHOs and VHTs. It includes functions to add VHTs to a CHO's supervision list
-and retrieve the list of VHTs supervised by a CHO.
+CHOs and VHTs. It includes functions to set the VHTs a CHO supervises and retrieve
+the list of VHTs supervised by a CHO.
+
+The IDs of the VHTs supervised by each CHO are cached in-process (see
+``common.cache_utils.supervision_cache``); writes to the supervises table made
+through this module invalidate the cache when their transaction commits.
 
 Functions:
-- add_vht_to_supervise(cho_id, vht_ids): Adds VHTs to a CHO's supervision list.
+- add_vht_to_supervise(cho_id, vht_ids): Replaces a CHO's supervision list.
+- add_supervised_vhts(cho_id, vht_ids): Adds VHTs to a CHO's supervision list.
+- get_supervised_vht_ids(cho_id): Returns the cached IDs of the VHTs a CHO supervises.
 - get_supervised_vhts(user_id): Retrieves the list of VHTs supervised by a CHO.
 """
 
-from data.db_operations import LOGGER, db_session
+from collections.abc import Iterable
+from typing import Optional
+
+from common.cache_utils import invalidate_supervised_vhts, supervision_cache
+from data.db_operations import LOGGER, db_session, unit_of_work
 from models import (
     SupervisesTable,
     UserOrm,
 )
 
 
-def add_vht_to_supervise(cho_id: int, vht_ids: list):
-    """Replace the CHO's supervised VHT list with the given VHT IDs."""
-    # find the cho
-    cho = UserOrm.query.filter_by(id=cho_id).first()
+def __update_supervised_vhts(
+    cho_id: int, vht_ids: Iterable[int], remove_others: bool, autocommit: bool
+):
+    """
+    Brings the supervises rows of a CHO in line with the given VHT IDs, inserting
+    the missing rows with one statement and, if ``remove_others`` is true, deleting
+    the rows of the other VHTs with another.
+    """
+    vht_ids = set(vht_ids)
+    current_vht_ids = {
+        vht_id
+        for (vht_id,) in db_session.query(SupervisesTable.c.vht_id).filter(
+            SupervisesTable.c.cho_id == cho_id
+        )
+    }
 
-    cho.vht_list = []
-    db_session.commit()
+    removed_vht_ids = current_vht_ids - vht_ids if remove_others else set()
+    if removed_vht_ids:
+        db_session.execute(
+            SupervisesTable.delete().where(
+                SupervisesTable.c.cho_id == cho_id,
+                SupervisesTable.c.vht_id.in_(removed_vht_ids),
+            )
+        )
 
-    # Allows for removing all vhts from supervisee list
-    if vht_ids is None:
-        return
+    added_vht_ids = vht_ids - current_vht_ids
+    if added_vht_ids:
+        db_session.execute(
+            SupervisesTable.insert(),
+            [{"cho_id": cho_id, "vht_id": vht_id} for vht_id in sorted(added_vht_ids)],
+        )
+
+    if removed_vht_ids or added_vht_ids:
+        # The CHO's vht_list, if loaded in this session, no longer matches the table
+        cho = db_session.identity_map.get(db_session.identity_key(UserOrm, cho_id))
+        if cho is not None:
+            db_session.expire(cho, ["vht_list"])
+
+    # Invalidated once committed, so that no request caches the rows before then
+    unit_of_work.after_commit(lambda: invalidate_supervised_vhts(cho_id))
+    if autocommit:
+        unit_of_work.commit()
+
+
+def add_vht_to_supervise(cho_id: int, vht_ids: Optional[list], autocommit: bool = True):
+    """
+    Replace the CHO's supervised VHT list with the given VHT IDs.
 
-    # add vhts to CHO's vhtList
-    for vht_id in vht_ids:
-        vht = UserOrm.query.filter_by(id=vht_id).first()
-        cho.vht_list.append(vht)
-        db_session.add(cho)
+    Only the difference with the current list is written: rows for new VHTs are
+    inserted and rows for VHTs no longer in the list are deleted.
 
-    db_session.commit()
+    :param cho_id: ID of the CHO
+    :param vht_ids: IDs of the VHTs the CHO supervises; None removes them all
+    :param autocommit: If true, the transaction is committed before return
+    """
+    __update_supervised_vhts(
+        cho_id, vht_ids or [], remove_others=True, autocommit=autocommit
+    )
+
+
+def add_supervised_vhts(cho_id: int, vht_ids: Iterable[int], autocommit: bool = True):
+    """
+    Add VHTs to the CHO's supervised VHT list, keeping those already in it.
+
+    :param cho_id: ID of the CHO
+    :param vht_ids: IDs of the VHTs to add
+    :param autocommit: If true, the transaction is committed before return
+    """
+    __update_supervised_vhts(
+        cho_id, vht_ids, remove_others=False, autocommit=autocommit
+    )
+
+
+def get_supervised_vht_ids(cho_id: int) -> frozenset[int]:
+    """
+    Return the IDs of the VHTs supervised by a CHO, from the in-process cache when
+    they were read recently.
+
+    :param cho_id: ID of the CHO
+    """
+    vht_ids = supervision_cache.get(cho_id)
+    if vht_ids is None:
+        # Rows read before another request's write commits must not be cached once
+        # that write has invalidated the cache
+        generation = supervision_cache.generation
+        vht_ids = frozenset(
+            vht_id
+            for (vht_id,) in db_session.query(SupervisesTable.c.vht_id).filter(
+                SupervisesTable.c.cho_id == cho_id
+            )
+        )
+        supervision_cache.set(cho_id, vht_ids, generation=generation)
+    return vht_ids
 
 
 def get_supervised_vhts(user_id):
     """Queries db for the list of VHTs supervised by this CHO"""
     try:
-        query = (
-            db_session.query(SupervisesTable.c.vht_id)
-            .join(UserOrm, UserOrm.id == SupervisesTable.c.cho_id)
-            .filter(UserOrm.id == user_id)
-        )
-
-        result = query.all()
-        return [row[0] for row in result]  # Extract VHT IDs from tuples
+        return sorted(get_supervised_vht_ids(user_id))
     except Exception as e:
         LOGGER.error(e)
         return None
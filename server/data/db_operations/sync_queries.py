@@ -0,0 +1,129 @@
+"""
+sync_queries.py
+
+This module provides set-based query and write helpers for the mobile sync endpoints.
+
+A device returning online may upload thousands of patients, readings or referrals at
+once. Rather than issuing one query per uploaded item, the sync endpoints prefetch
+everything they reference with a handful of ``IN (...)`` queries, classify the items in
+memory and then write the results in batches within a single transaction.
+
+Functions included:
+- read_existing_ids: Return which of the given primary keys exist for a model.
+- read_models_by_ids: Return models keyed by primary key for the given IDs.
+- read_pregnancies_by_patient: Return all pregnancies of the given patients.
+- read_associated_patient_ids: Return which patients are already associated with a
+  user and facility.
+- bulk_update: Apply a batch of per-row updates with executemany, refreshing the
+  affected rows of the ``patient_latest`` projection.
+"""
+
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from data.db_operations import M, db_session, unit_of_work
+from data.db_operations.patient_latest import refresh_patient_latest_by_record
+from models import PatientAssociationsOrm, PregnancyOrm
+
+
+def read_existing_ids(m: type[M], ids: Iterable[Any]) -> set[Any]:
+    """
+    Queries the database for which of the given primary keys exist for a model.
+
+    :param m: Type of the model to query for; must have an ``id`` primary key
+    :param ids: Primary keys to look up
+    :return: The subset of ``ids`` which exist in the database
+    """
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    rows = db_session.query(m.id).filter(m.id.in_(ids)).all()
+    return {row.id for row in rows}
+
+
+def read_models_by_ids(m: type[M], ids: Iterable[Any]) -> dict[Any, M]:
+    """
+    Queries the database for all models with the given primary keys.
+
+    :param m: Type of the model to query for; must have an ``id`` primary key
+    :param ids: Primary keys to look up
+    :return: A dict mapping each found primary key to its model
+    """
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    return {model.id: model for model in db_session.query(m).filter(m.id.in_(ids))}
+
+
+def read_pregnancies_by_patient(
+    patient_ids: Iterable[str],
+) -> dict[str, list[PregnancyOrm]]:
+    """
+    Queries the database for all pregnancies belonging to the given patients.
+
+    :param patient_ids: IDs of the patients to fetch pregnancies for
+    :return: A dict mapping each patient ID to the list of their pregnancies
+    """
+    patient_ids = set(patient_ids)
+    pregnancies: dict[str, list[PregnancyOrm]] = {pid: [] for pid in patient_ids}
+    if not patient_ids:
+        return pregnancies
+
+    query = db_session.query(PregnancyOrm).filter(
+        PregnancyOrm.patient_id.in_(patient_ids),
+    )
+    for pregnancy in query:
+        pregnancies[pregnancy.patient_id].append(pregnancy)
+    return pregnancies
+
+
+def read_associated_patient_ids(
+    patient_ids: Iterable[str],
+    user_id: int,
+    health_facility_name: Optional[str],
+) -> set[str]:
+    """
+    Queries the database for which of the given patients already have an association
+    with exactly the given user and health facility.
+
+    :param patient_ids: IDs of the patients to check
+    :param user_id: ID of the user in the association
+    :param health_facility_name: Name of the facility in the association; None matches
+    associations without a facility
+    :return: The subset of ``patient_ids`` which are already associated
+    """
+    patient_ids = set(patient_ids)
+    if not patient_ids:
+        return set()
+
+    rows = (
+        db_session.query(PatientAssociationsOrm.patient_id)
+        .filter(
+            PatientAssociationsOrm.patient_id.in_(patient_ids),
+            PatientAssociationsOrm.user_id == user_id,
+            PatientAssociationsOrm.health_facility_name == health_facility_name,
+        )
+        .all()
+    )
+    return {row.patient_id for row in rows}
+
+
+def bulk_update(m: type[M], rows: list[dict], autocommit: bool = False):
+    """
+    Applies a batch of updates to a model's table. Each row must contain the model's
+    primary key alongside the columns to change. Rows are grouped by the set of columns
+    they change and sent as executemany ``UPDATE`` statements rather than one
+    SELECT/UPDATE pair per row. These statements bypass the session's flush, so the
+    ``patient_latest`` rows of the patients whose records were updated are refreshed
+    here.
+
+    :param m: Type of the model to update
+    :param rows: Dictionaries mapping column names to new values, including the key
+    :param autocommit: If true, the current transaction is committed before return; the
+    default is false
+    """
+    if rows:
+        db_session.bulk_update_mappings(m, rows)
+        refresh_patient_latest_by_record(m, (row["id"] for row in rows))
+    if autocommit:
+        unit_of_work.commit()
@@ -0,0 +1,107 @@
+"""
+unit_of_work.py
+---------------
+
+Request-scoped unit of work for database writes.
+
+While a unit of work is active, which is for the duration of an API request once
+``init_app`` has registered its hooks, CRUD writes which would commit only flush their
+changes. The transaction is then committed once, when the request's response is ready,
+or rolled back if the request failed with a client or server error. This saves a commit per
+write on requests which write several times.
+
+Outside of a request, such as in ``manage.py`` commands and tests, writes commit as
+they always have.
+
+Since a write may only be flushed, in-process caches of the written data must be
+invalidated with ``after_commit``, once the data is visible to other sessions, rather
+than right after the write.
+
+Functions included:
+- in_unit_of_work: Returns True if commits are deferred to the end of the request.
+- commit: Commits the current transaction, or only flushes it in a unit of work.
+- after_commit: Runs a callback once the current transaction has ended.
+- init_app: Registers the request hooks which begin and end units of work.
+"""
+
+from typing import Callable, Optional
+
+import flask
+from flask import Flask, Response, g
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+from data.db_operations import db_session
+
+# Key of the callbacks waiting for the end of a session's transaction in Session.info
+_AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+
+def in_unit_of_work() -> bool:
+    """Return True if the current request commits its writes once, at its end."""
+    return flask.has_request_context() and g.get("unit_of_work", False)
+
+
+def commit() -> None:
+    """
+    Commit the current transaction or, in a unit of work, flush it so that its changes
+    are visible to the rest of the request and committed at the end of the request.
+    """
+    if in_unit_of_work():
+        db_session.flush()
+    else:
+        db_session.commit()
+
+
+def after_commit(
+    callback: Callable[[], None], session: Optional[Session] = None
+) -> None:
+    """
+    Run a callback once the current transaction has been committed, or right away if
+    no transaction is in progress. Callbacks also run if the transaction is rolled
+    back, so that invalidating a cache never depends on the outcome of the write.
+
+    :param callback: Function called without arguments
+    :param session: Session whose transaction to wait for; the current request's
+                    session by default
+    """
+    if session is None:
+        session = db_session()
+    if not session.in_transaction():
+        callback()
+        return
+    session.info.setdefault(_AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _run_after_commit_callbacks(session: Session, transaction: SessionTransaction):
+    # Savepoints ending within the transaction do not make its writes visible
+    if transaction.parent is not None:
+        return
+    for callback in session.info.pop(_AFTER_COMMIT_CALLBACKS, []):
+        callback()
+
+
+def init_app(app: Flask) -> None:
+    """
+    Run each request of the app in a unit of work.
+
+    :param app: The Flask app
+    """
+
+    @app.before_request
+    def _begin_unit_of_work():
+        g.unit_of_work = True
+
+    @app.after_request
+    def _end_unit_of_work(response: Response) -> Response:
+        # If committing fails, the error response is made without a unit of work
+        if not g.pop("unit_of_work", False):
+            return response
+
+        # A request aborted part way through must not persist what it staged so far
+        if response.status_code >= 400:
+            db_session.rollback()
+        else:
+            db_session.commit()
+        return response
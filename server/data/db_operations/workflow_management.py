@@ -6,7 +6,9 @@ Purpose
     This module provides helpers for deleting and reading workflow entities.
 
 What this module provides
-    - Deletion helpers for workflow structures:
+    - Deletion helpers for workflow structures, which collect the rows to delete with
+      a few queries and remove them with one ``DELETE ... WHERE id IN`` per table:
+        * delete_workflows(...)
         * delete_workflow_step_branch(...)
         * delete_workflow_step(...)
         * delete_workflow(...)
@@ -24,17 +26,25 @@ What this module provides
         * read_rule_group(...)
     - Upsert for workflow instance dynamic data:
         * upsert_workflow_instance_data_row(...)
+        * upsert_workflow_instance_data_rows(...)
+    - Delta update of a workflow instance and its steps:
+        * update_workflow_instance_changes(...)
 """
 
 import json
+from collections.abc import Iterable
 from typing import Any, Optional
 
+from sqlalchemy import update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import selectinload
+
 from common.commonUtil import get_current_time, get_uuid
-from data.db_operations import M, db_session
-from data.db_operations.common_crud import delete, delete_by, read, read_by_filter
+from data.db_operations import M, db_session, unit_of_work
+from data.db_operations.common_crud import read, read_by_filter
 from enums import WorkflowInstanceDataFieldTypeEnum, WorkflowStatusEnum
 from models import (
-    FormOrm,
+    FormSubmissionOrmV2,
     RuleGroupOrm,
     WorkflowClassificationOrm,
     WorkflowInstanceDataOrm,
@@ -46,6 +56,151 @@ from models import (
 )
 
 
+def _workflow_delete_plan(
+    classification_ids: Iterable[str] = (),
+    template_ids: Iterable[str] = (),
+    template_step_ids: Iterable[str] = (),
+    branch_ids: Iterable[str] = (),
+    instance_ids: Iterable[str] = (),
+    instance_step_ids: Iterable[str] = (),
+) -> list[tuple[type[M], Any]]:
+    """
+    Collects, with one query per level of the workflow structures, the rows which
+    deleting the given entities also deletes, and returns the criterion selecting the
+    rows to delete from each table, children before their parents.
+
+    Deleting a template step deletes its branches and their rule groups; deleting an
+    instance step deletes its form submission. Deleting a classification does not
+    delete its templates.
+    """
+    classification_ids = set(classification_ids)
+    template_ids = set(template_ids)
+    instance_ids = set(instance_ids)
+
+    template_step_ids = set(template_step_ids)
+    if template_ids:
+        template_step_ids.update(
+            step_id
+            for (step_id,) in db_session.query(WorkflowTemplateStepOrm.id).filter(
+                WorkflowTemplateStepOrm.workflow_template_id.in_(template_ids)
+            )
+        )
+
+    branch_ids = set(branch_ids)
+    rule_group_ids = set()
+    if branch_ids or template_step_ids:
+        branches = db_session.query(
+            WorkflowTemplateStepBranchOrm.id, WorkflowTemplateStepBranchOrm.condition_id
+        ).filter(
+            WorkflowTemplateStepBranchOrm.id.in_(branch_ids)
+            | WorkflowTemplateStepBranchOrm.step_id.in_(template_step_ids)
+        )
+        for branch_id, condition_id in branches:
+            branch_ids.add(branch_id)
+            if condition_id is not None:
+                rule_group_ids.add(condition_id)
+
+    instance_step_ids = set(instance_step_ids)
+    form_ids = set()
+    if instance_step_ids or instance_ids:
+        steps = db_session.query(
+            WorkflowInstanceStepOrm.id, WorkflowInstanceStepOrm.form_id
+        ).filter(
+            WorkflowInstanceStepOrm.id.in_(instance_step_ids)
+            | WorkflowInstanceStepOrm.workflow_instance_id.in_(instance_ids)
+        )
+        for step_id, form_id in steps:
+            instance_step_ids.add(step_id)
+            if form_id is not None:
+                form_ids.add(form_id)
+
+    plan = [
+        (
+            WorkflowInstanceDataOrm,
+            WorkflowInstanceDataOrm.workflow_instance_id.in_(instance_ids),
+            instance_ids,
+        ),
+        (
+            WorkflowInstanceStepOrm,
+            WorkflowInstanceStepOrm.id.in_(instance_step_ids),
+            instance_step_ids,
+        ),
+        # Their answers and answer projection rows are deleted by the database
+        (FormSubmissionOrmV2, FormSubmissionOrmV2.id.in_(form_ids), form_ids),
+        (WorkflowInstanceOrm, WorkflowInstanceOrm.id.in_(instance_ids), instance_ids),
+        (
+            WorkflowTemplateStepBranchOrm,
+            WorkflowTemplateStepBranchOrm.id.in_(branch_ids),
+            branch_ids,
+        ),
+        (RuleGroupOrm, RuleGroupOrm.id.in_(rule_group_ids), rule_group_ids),
+        (
+            WorkflowTemplateStepOrm,
+            WorkflowTemplateStepOrm.id.in_(template_step_ids),
+            template_step_ids,
+        ),
+        (WorkflowTemplateOrm, WorkflowTemplateOrm.id.in_(template_ids), template_ids),
+        (
+            WorkflowClassificationOrm,
+            WorkflowClassificationOrm.id.in_(classification_ids),
+            classification_ids,
+        ),
+    ]
+    # Tables with nothing to delete are skipped rather than queried with ``IN ()``
+    return [(m, criterion) for m, criterion, ids in plan if ids]
+
+
+def _execute_workflow_delete_plan(
+    plan: list[tuple[type[M], Any]], dry_run: bool, autocommit: bool = True
+) -> dict[str, int]:
+    """
+    Deletes the rows selected by a plan from ``_workflow_delete_plan`` with one
+    ``DELETE ... WHERE id IN`` statement per table, in a single transaction.
+
+    :param plan: Criterion selecting the rows to delete from each table, in order
+    :param dry_run: If true, only counts the rows which would be deleted
+    :param autocommit: If true, the transaction is committed before return
+    :return: Number of rows deleted, or which would be deleted, keyed by table name
+    """
+    counts = {}
+    for m, criterion in plan:
+        query = db_session.query(m).filter(criterion)
+        counts[m.__tablename__] = query.count() if dry_run else query.delete()
+
+    if autocommit and not dry_run:
+        unit_of_work.commit()
+    return counts
+
+
+def delete_workflows(
+    template_ids: Iterable[str] = (),
+    instance_ids: Iterable[str] = (),
+    classification_ids: Iterable[str] = (),
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """
+    Deletes workflow templates, instances and classifications in bulk, with all of the
+    steps, branches, rule groups, forms and instance data which belong to them.
+
+    The rows to delete are collected with a few queries and removed with one
+    ``DELETE ... WHERE id IN`` statement per table, in a single transaction. Deleting a
+    classification does not delete its templates; pass their IDs as well to do so.
+
+    :param template_ids: IDs of the workflow templates to delete
+    :param instance_ids: IDs of the workflow instances to delete
+    :param classification_ids: IDs of the workflow classifications to delete
+    :param dry_run: If true, nothing is deleted and the counts are of the rows which
+                    would be deleted
+    :return: Number of rows deleted, or which would be deleted, keyed by table name
+    """
+    plan = _workflow_delete_plan(
+        classification_ids=classification_ids,
+        template_ids=template_ids,
+        instance_ids=instance_ids,
+    )
+    return _execute_workflow_delete_plan(plan, dry_run)
+
+
 def delete_workflow_step_branch(**kwargs):
     """
     Deletes a branch from a workflow step including all associated rule groups
@@ -56,9 +211,9 @@ def delete_workflow_step_branch(**kwargs):
     branch = read(WorkflowTemplateStepBranchOrm, **kwargs)
 
     if branch:
-        delete_by(RuleGroupOrm, id=branch.condition_id)
-
-        delete(branch)
+        _execute_workflow_delete_plan(
+            _workflow_delete_plan(branch_ids=[branch.id]), dry_run=False
+        )
 
 
 def delete_workflow_step(m: type[M], **kwargs) -> None:
@@ -75,14 +230,10 @@ def delete_workflow_step(m: type[M], **kwargs) -> None:
         return
 
     if isinstance(step, WorkflowTemplateStepOrm):
-        # Delete each branch in the step
-        for branch in step.branches:
-            delete_workflow_step_branch(id=branch.id)
-
-    elif isinstance(step, WorkflowInstanceStepOrm):
-        delete_by(FormOrm, id=step.form_id)
-
-    delete(step)
+        plan = _workflow_delete_plan(template_step_ids=[step.id])
+    else:
+        plan = _workflow_delete_plan(instance_step_ids=[step.id])
+    _execute_workflow_delete_plan(plan, dry_run=False)
 
 
 def delete_workflow(m: type[M], delete_classification: bool = False, **kwargs) -> None:
@@ -100,14 +251,14 @@ def delete_workflow(m: type[M], delete_classification: bool = False, **kwargs) -
         return
 
     if isinstance(workflow, WorkflowTemplateOrm):
-        if delete_classification:
-            delete_by(m=WorkflowClassificationOrm, id=workflow.classification_id)
-            db_session.commit()
-
-    for step in workflow.steps:
-        delete_workflow_step(m=type(step), id=step.id)
-
-    delete(workflow)
+        classification_ids = []
+        if delete_classification and workflow.classification_id is not None:
+            classification_ids.append(workflow.classification_id)
+        delete_workflows(
+            template_ids=[workflow.id], classification_ids=classification_ids
+        )
+    else:
+        delete_workflows(instance_ids=[workflow.id])
 
 
 def delete_workflow_classification(delete_templates: bool = False, **kwargs) -> None:
@@ -122,17 +273,16 @@ def delete_workflow_classification(delete_templates: bool = False, **kwargs) ->
     if classification is None:
         return
 
+    template_ids = []
     if delete_templates:
-        # Delete all workflow templates associated with this classification
-        templates = read_workflow_templates(
-            workflow_classification_id=classification.id
-        )
-        for template in templates:
-            delete_workflow(
-                WorkflowTemplateOrm, delete_classification=False, id=template.id
+        # Archived templates are kept, with their classification set to NULL
+        template_ids = [
+            template_id
+            for (template_id,) in db_session.query(WorkflowTemplateOrm.id).filter_by(
+                classification_id=classification.id, archived=False
             )
-
-    delete(classification)
+        ]
+    delete_workflows(template_ids=template_ids, classification_ids=[classification.id])
 
 
 def read_instance_steps(
@@ -158,6 +308,8 @@ def read_workflow_instances(
     patient_id: Optional[str] = None,
     status: Optional[WorkflowStatusEnum] = None,
     workflow_template_id: Optional[str] = None,
+    workflow_instance_ids: Optional[Iterable[str]] = None,
+    with_steps: bool = False,
 ) -> list[WorkflowInstanceOrm]:
     """
     Queries the database for all workflow instances that have either been assigned by a specific user or all instances in total
@@ -166,10 +318,23 @@ def read_workflow_instances(
     :param patient_id: ID of the patient which the workflows were assigned to
     :param status: Query for workflows based on status
     :param workflow_template_id: ID of workflow template the instances are based on
+    :param workflow_instance_ids: IDs of the instances to restrict the query to
+    :param with_steps: If true, the steps of all instances (and their forms) are
+        loaded with the instances rather than lazily per instance
     :return: A list of workflow instances
     """
     query = db_session.query(WorkflowInstanceOrm)
 
+    if with_steps:
+        query = query.options(
+            selectinload(WorkflowInstanceOrm.steps).selectinload(
+                WorkflowInstanceStepOrm.form
+            )
+        )
+
+    if workflow_instance_ids is not None:
+        query = query.filter(WorkflowInstanceOrm.id.in_(set(workflow_instance_ids)))
+
     # user_id filter removed: workflow_instance no longer has last_edited_by.
 
     if patient_id:
@@ -333,7 +498,7 @@ def upsert_workflow_instance_data_row(
         existing.field_value = encoded
         existing.field_type = field_type
         existing.last_edited = now
-        db_session.commit()
+        unit_of_work.commit()
         db_session.refresh(existing)
         return existing
 
@@ -347,6 +512,88 @@ def upsert_workflow_instance_data_row(
         last_edited=now,
     )
     db_session.add(row)
-    db_session.commit()
+    unit_of_work.commit()
     db_session.refresh(row)
     return row
+
+
+def upsert_workflow_instance_data_rows(
+    workflow_instance_id: str,
+    items: Iterable[tuple[str, WorkflowInstanceDataFieldTypeEnum, Any]],
+) -> None:
+    """
+    Insert or update many workflow_instance_data rows of an instance with a single
+    multi-row ``INSERT ... ON DUPLICATE KEY UPDATE`` (rows are unique per instance +
+    tag).
+
+    Each value is JSON-serialized to ``field_value``; ``None`` is stored as JSON null.
+    If a field tag is given more than once, its last value is stored.
+
+    :param workflow_instance_id: ID of the workflow instance the rows belong to
+    :param items: ``(field_tag, field_type, value)`` tuples to store
+    """
+    now = get_current_time()
+    rows = {
+        field_tag: {
+            "id": get_uuid(),
+            "workflow_instance_id": workflow_instance_id,
+            "field_tag": field_tag,
+            "field_value": json.dumps(value),
+            "field_type": field_type,
+            "date_created": now,
+            "last_edited": now,
+        }
+        for field_tag, field_type, value in items
+    }
+    if not rows:
+        return
+
+    statement = mysql_insert(WorkflowInstanceDataOrm.__table__).values(
+        list(rows.values())
+    )
+    statement = statement.on_duplicate_key_update(
+        field_value=statement.inserted.field_value,
+        field_type=statement.inserted.field_type,
+        last_edited=statement.inserted.last_edited,
+    )
+    db_session.execute(statement)
+    unit_of_work.commit()
+
+
+def update_workflow_instance_changes(
+    workflow_instance_id: str,
+    instance_changes: dict[str, Any],
+    step_rows: list[dict[str, Any]],
+    autocommit: bool = True,
+) -> None:
+    """
+    Write the changes made to a workflow instance since it was loaded: an ``UPDATE``
+    of the instance's changed columns, then a single multi-row ``INSERT ... ON
+    DUPLICATE KEY UPDATE`` of its new and changed steps. Unchanged steps are not
+    written.
+
+    :param workflow_instance_id: ID of the workflow instance
+    :param instance_changes: Changed columns of the instance and their new values
+    :param step_rows: Every column of each new or changed step
+    :param autocommit: If true, the transaction is committed before return
+    """
+    if instance_changes:
+        db_session.execute(
+            update(WorkflowInstanceOrm.__table__)
+            .where(WorkflowInstanceOrm.__table__.c.id == workflow_instance_id)
+            .values(**instance_changes)
+        )
+
+    if step_rows:
+        statement = mysql_insert(WorkflowInstanceStepOrm.__table__).values(step_rows)
+        statement = statement.on_duplicate_key_update(
+            {
+                column: statement.inserted[column]
+                for column in step_rows[0]
+                if column != "id"
+            }
+        )
+        db_session.execute(statement)
+
+    if autocommit:
+        unit_of_work.commit()
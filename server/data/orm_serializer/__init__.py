@@ -2,7 +2,7 @@ from data import db_session
 from models import get_schema_for_model
 from service import invariant
 
-from .api import marshal, marshal_with_type, unmarshal
+from .api import marshal, marshal_many, marshal_with_type, unmarshal
 from .forms import marshal_template_to_single_version, unmarshal_question_list
 from .patients import (
     make_medical_record_from_patient,
@@ -11,6 +11,7 @@ from .patients import (
     marshal_patient_pregnancy_summary,
 )
 from .questions import marshal_question_to_single_version
+from .rows import marshal_reading_rows, marshal_rows
 from .utils import model_to_dict, models_to_list
 
 __all__ = [
@@ -20,9 +21,12 @@ __all__ = [
     "makePregnancyFromPatient",
     "make_medical_record_from_patient",
     "marshal",
+    "marshal_many",
     "marshal_patient_medical_history",
     "marshal_patient_pregnancy_summary",
     "marshal_question_to_single_version",
+    "marshal_reading_rows",
+    "marshal_rows",
     "marshal_template_to_single_version",
     "marshal_template_to_single_version",
     "marshal_with_type",
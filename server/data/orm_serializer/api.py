@@ -1,4 +1,6 @@
-from typing import Any
+import functools
+from collections.abc import Iterable
+from typing import Any, Callable
 
 from common import commonUtil
 from data.db_operations import M
@@ -89,74 +91,162 @@ from .workflows import (
     __unmarshal_workflow_template_step_branch,
 )
 
+# Marshaller signature: (obj, shallow, if_include_versions) -> dict
+Marshaller = Callable[[Any, bool, bool], dict]
+
+# Model class -> marshaller. Lookups go through ``__resolve_marshaller``, which also
+# finds the marshaller of a registered base class and caches the result per class.
+__MARSHALLERS: dict[type, Marshaller] = {
+    LangVersionOrmV2: lambda obj, *_: __marshal_lang_version_v2(obj),
+    FormTemplateOrmV2: lambda obj, shallow, _: __marshal_form_template_v2(obj, shallow),
+    FormClassificationOrmV2: (
+        lambda obj, shallow, _: __marshal_form_classification_v2(obj, shallow)
+    ),
+    FormQuestionTemplateOrmV2: lambda obj, *_: __marshal_form_question_template_v2(obj),
+    FormSubmissionOrmV2: lambda obj, shallow, _: __marshal_form_submission_v2(
+        obj, shallow
+    ),
+    FormAnswerOrmV2: lambda obj, *_: __marshal_form_answer_v2(obj),
+    PatientOrm: lambda obj, shallow, _: __marshal_patient(obj, shallow),
+    ReadingOrm: lambda obj, shallow, _: __marshal_reading(obj, shallow),
+    ReferralOrm: lambda obj, *_: __marshal_referral(obj),
+    AssessmentOrm: lambda obj, *_: __marshal_assessment(obj),
+    PregnancyOrm: lambda obj, *_: __marshal_pregnancy(obj),
+    MedicalRecordOrm: lambda obj, *_: __marshal_medical_record(obj),
+    FormTemplateOrm: __marshal_form_template,
+    FormOrm: lambda obj, shallow, _: __marshal_form(obj, shallow),
+    QuestionOrm: lambda obj, _, versions: __marshal_question(obj, versions),
+    QuestionLangVersionOrm: lambda obj, *_: __marshal_lang_version(obj),
+    SmsSecretKeyOrm: lambda obj, *_: __marshal_SmsSecretKey(obj),
+    RuleGroupOrm: lambda obj, *_: __marshal_rule_group(obj),
+    WorkflowTemplateStepBranchOrm: (
+        lambda obj, *_: __marshal_workflow_template_step_branch(obj)
+    ),
+    WorkflowTemplateStepOrm: (
+        lambda obj, shallow, _: __marshal_workflow_template_step(obj, shallow)
+    ),
+    WorkflowTemplateOrm: lambda obj, shallow, _: __marshal_workflow_template(
+        obj, shallow
+    ),
+    WorkflowClassificationOrm: (
+        lambda obj, shallow, versions: __marshal_workflow_classification(
+            obj, versions, shallow
+        )
+    ),
+    WorkflowInstanceStepOrm: lambda obj, *_: __marshal_workflow_instance_step(obj),
+    WorkflowInstanceOrm: lambda obj, shallow, _: __marshal_workflow_instance(
+        obj, shallow
+    ),
+    WorkflowCollectionOrm: (
+        lambda obj, shallow, _: __marshal_workflow_collection(obj, shallow)
+    ),
+}
+
+# Model class -> (marshaller, value of the ``type`` field) for ``marshal_with_type``
+__TYPED_MARSHALLERS: dict[type, tuple[Marshaller, str]] = {
+    PatientOrm: (__MARSHALLERS[PatientOrm], "patient"),
+    ReadingOrm: (__MARSHALLERS[ReadingOrm], "reading"),
+    ReferralOrm: (__MARSHALLERS[ReferralOrm], "referral"),
+    AssessmentOrm: (__MARSHALLERS[AssessmentOrm], "assessment"),
+    PregnancyOrm: (__MARSHALLERS[PregnancyOrm], "pregnancy"),
+    MedicalRecordOrm: (__MARSHALLERS[MedicalRecordOrm], "medical_record"),
+    # Forms are always summarized without their answers
+    FormSubmissionOrmV2: (
+        lambda obj, *_: __marshal_form_submission_v2(obj, True),
+        "form",
+    ),
+    FormOrm: (lambda obj, *_: __marshal_form(obj, True), "form"),
+}
+
+# Model class -> unmarshaller; other classes are loaded with their schema
+__UNMARSHALLERS: dict[type, Callable[[dict], Any]] = {
+    LangVersionOrmV2: __unmarshal_lang_version_v2,
+    FormClassificationOrmV2: __unmarshal_form_classification_v2,
+    FormTemplateOrmV2: __unmarshal_form_template_v2,
+    FormQuestionTemplateOrmV2: __unmarshal_form_question_template_v2,
+    FormSubmissionOrmV2: __unmarshal_form_submission_v2,
+    FormAnswerOrmV2: __unmarshal_form_answer_v2,
+    PatientOrm: __unmarshal_patient,
+    ReadingOrm: __unmarshal_reading,
+    FormOrm: __unmarshal_form,
+    FormTemplateOrm: __unmarshal_form_template,
+    QuestionOrm: __unmarshal_question,
+    QuestionLangVersionOrm: __unmarshal_lang_version,
+    SmsSecretKeyOrm: __unmarshal_SmsSecretKey,
+    RelayServerPhoneNumberOrm: __unmarshal_RelayServerPhoneNumber,
+    WorkflowTemplateStepBranchOrm: __unmarshal_workflow_template_step_branch,
+    WorkflowTemplateStepOrm: __unmarshal_workflow_template_step,
+    WorkflowTemplateOrm: __unmarshal_workflow_template,
+    WorkflowInstanceStepOrm: __unmarshal_workflow_instance_step,
+    WorkflowInstanceOrm: __unmarshal_workflow_instance,
+}
+
+
+def __marshal_object(obj: Any, shallow: bool, if_include_versions: bool) -> dict:
+    """Copy the public attributes of an object without a registered marshaller."""
+    d = vars(obj).copy()
+    __pre_process(d)
+    return d
+
+
+def __find_in_mro(registry: dict[type, Any], cls: type) -> Any:
+    """Return the entry of the closest class in ``cls``'s MRO, or None."""
+    for base in cls.__mro__:
+        entry = registry.get(base)
+        if entry is not None:
+            return entry
+    return None
+
+
+@functools.cache
+def __resolve_marshaller(cls: type) -> Marshaller:
+    """Return the marshaller for instances of a class."""
+    return __find_in_mro(__MARSHALLERS, cls) or __marshal_object
+
+
+@functools.cache
+def __resolve_typed_marshaller(cls: type) -> tuple[Marshaller, str]:
+    """Return the marshaller and ``type`` field value for instances of a class."""
+    return __find_in_mro(__TYPED_MARSHALLERS, cls) or (__marshal_object, "other")
+
 
 def marshal(obj: Any, shallow: bool = False, if_include_versions: bool = False) -> dict:
     r"""
     Serialize an ORM model or plain object to a JSON-ready ``dict``.
 
-    The function inspects ``obj`` and dispatches to a model-specific marshaller
-    when available; otherwise it copies public attributes, drops ``None``/private
-    fields, and coerces ``Enum`` values to ``.value``.
+    The function looks up the model-specific marshaller registered for the class of
+    ``obj``; otherwise it copies public attributes, drops ``None``/private fields,
+    and coerces ``Enum`` values to ``.value``.
 
     :param obj: Object to serialize (e.g., ``PatientOrm``, ``ReadingOrm``).
     :param shallow: If ``True``, omit nested relationships for a lightweight view.
     :param if_include_versions: For question models, include language versions.
     :return: JSON-serializable dictionary for ``obj``.
     """
-    if isinstance(obj, LangVersionOrmV2):
-        return __marshal_lang_version_v2(obj)
-    if isinstance(obj, FormTemplateOrmV2):
-        return __marshal_form_template_v2(obj, shallow)
-    if isinstance(obj, FormClassificationOrmV2):
-        return __marshal_form_classification_v2(obj, shallow)
-    if isinstance(obj, FormQuestionTemplateOrmV2):
-        return __marshal_form_question_template_v2(obj)
-    if isinstance(obj, FormSubmissionOrmV2):
-        return __marshal_form_submission_v2(obj, shallow)
-    if isinstance(obj, FormAnswerOrmV2):
-        return __marshal_form_answer_v2(obj)
-    if isinstance(obj, PatientOrm):
-        return __marshal_patient(obj, shallow)
-    if isinstance(obj, ReadingOrm):
-        return __marshal_reading(obj, shallow)
-    if isinstance(obj, ReferralOrm):
-        return __marshal_referral(obj)
-    if isinstance(obj, AssessmentOrm):
-        return __marshal_assessment(obj)
-    if isinstance(obj, PregnancyOrm):
-        return __marshal_pregnancy(obj)
-    if isinstance(obj, MedicalRecordOrm):
-        return __marshal_medical_record(obj)
-    if isinstance(obj, FormTemplateOrm):
-        return __marshal_form_template(obj, shallow, if_include_versions)
-    if isinstance(obj, FormOrm):
-        return __marshal_form(obj, shallow)
-    if isinstance(obj, QuestionOrm):
-        return __marshal_question(obj, if_include_versions)
-    if isinstance(obj, QuestionLangVersionOrm):
-        return __marshal_lang_version(obj)
-    if isinstance(obj, SmsSecretKeyOrm):
-        return __marshal_SmsSecretKey(obj)
-    if isinstance(obj, RuleGroupOrm):
-        return __marshal_rule_group(obj)
-    if isinstance(obj, WorkflowTemplateStepBranchOrm):
-        return __marshal_workflow_template_step_branch(obj)
-    if isinstance(obj, WorkflowTemplateStepOrm):
-        return __marshal_workflow_template_step(obj, shallow)
-    if isinstance(obj, WorkflowTemplateOrm):
-        return __marshal_workflow_template(obj, shallow)
-    if isinstance(obj, WorkflowClassificationOrm):
-        return __marshal_workflow_classification(obj, if_include_versions, shallow)
-    if isinstance(obj, WorkflowInstanceStepOrm):
-        return __marshal_workflow_instance_step(obj)
-    if isinstance(obj, WorkflowInstanceOrm):
-        return __marshal_workflow_instance(obj, shallow)
-    if isinstance(obj, WorkflowCollectionOrm):
-        return __marshal_workflow_collection(obj, shallow)
+    return __resolve_marshaller(type(obj))(obj, shallow, if_include_versions)
 
-    d = vars(obj).copy()
-    __pre_process(d)
-    return d
+
+def marshal_many(
+    objs: Iterable[Any], shallow: bool = False, if_include_versions: bool = False
+) -> list[dict]:
+    """
+    Serialize a list of objects as ``marshal`` does. The marshaller is only looked
+    up again when the class changes from one object to the next, so homogeneous
+    lists such as query results are dispatched once.
+
+    :param objs: Objects to serialize.
+    :param shallow: If ``True``, omit nested relationships for a lightweight view.
+    :param if_include_versions: For question models, include language versions.
+    :return: List of JSON-serializable dictionaries, in the order of ``objs``.
+    """
+    result = []
+    cls = marshaller = None
+    for obj in objs:
+        if type(obj) is not cls:
+            cls = type(obj)
+            marshaller = __resolve_marshaller(cls)
+        result.append(marshaller(obj, shallow, if_include_versions))
+    return result
 
 
 def unmarshal(m: type[M], d: dict) -> M:
@@ -180,45 +270,9 @@ def unmarshal(m: type[M], d: dict) -> M:
     # if the field is absent entirely.
     d = commonUtil.filterNestedAttributeWithValueNone(d)
 
-    if m is LangVersionOrmV2:
-        return __unmarshal_lang_version_v2(d)
-    if m is FormClassificationOrmV2:
-        return __unmarshal_form_classification_v2(d)
-    if m is FormTemplateOrmV2:
-        return __unmarshal_form_template_v2(d)
-    if m is FormQuestionTemplateOrmV2:
-        return __unmarshal_form_question_template_v2(d)
-    if m is FormSubmissionOrmV2:
-        return __unmarshal_form_submission_v2(d)
-    if m is FormAnswerOrmV2:
-        return __unmarshal_form_answer_v2(d)
-    if m is PatientOrm:
-        return __unmarshal_patient(d)
-    if m is ReadingOrm:
-        return __unmarshal_reading(d)
-    if m is FormOrm:
-        return __unmarshal_form(d)
-    if m is FormTemplateOrm:
-        return __unmarshal_form_template(d)
-    if m is QuestionOrm:
-        return __unmarshal_question(d)
-    if m is QuestionLangVersionOrm:
-        return __unmarshal_lang_version(d)
-    if m is SmsSecretKeyOrm:
-        return __unmarshal_SmsSecretKey(d)
-    if m is RelayServerPhoneNumberOrm:
-        return __unmarshal_RelayServerPhoneNumber(d)
-    if m is WorkflowTemplateStepBranchOrm:
-        return __unmarshal_workflow_template_step_branch(d)
-    if m is WorkflowTemplateStepOrm:
-        return __unmarshal_workflow_template_step(d)
-    if m is WorkflowTemplateOrm:
-        return __unmarshal_workflow_template(d)
-    if m is WorkflowInstanceStepOrm:
-        return __unmarshal_workflow_instance_step(d)
-    if m is WorkflowInstanceOrm:
-        return __unmarshal_workflow_instance(d)
-
+    unmarshaller = __UNMARSHALLERS.get(m)
+    if unmarshaller is not None:
+        return unmarshaller(d)
     return __load(m, d)
 
 
@@ -230,39 +284,7 @@ def marshal_with_type(obj: Any, shallow: bool = False) -> dict:
     :param shallow: If ``True``, omit nested relationships.
     :return: Dictionary representation with an added ``type`` field.
     """
-    if isinstance(obj, PatientOrm):
-        patient_dict = __marshal_patient(obj, shallow)
-        patient_dict["type"] = "patient"
-        return patient_dict
-    if isinstance(obj, ReadingOrm):
-        reading_dict = __marshal_reading(obj, shallow)
-        reading_dict["type"] = "reading"
-        return reading_dict
-    if isinstance(obj, ReferralOrm):
-        referral_dict = __marshal_referral(obj)
-        referral_dict["type"] = "referral"
-        return referral_dict
-    if isinstance(obj, AssessmentOrm):
-        assessment_dict = __marshal_assessment(obj)
-        assessment_dict["type"] = "assessment"
-        return assessment_dict
-    if isinstance(obj, PregnancyOrm):
-        pregnancy_dict = __marshal_pregnancy(obj)
-        pregnancy_dict["type"] = "pregnancy"
-        return pregnancy_dict
-    if isinstance(obj, MedicalRecordOrm):
-        medical_record_dict = __marshal_medical_record(obj)
-        medical_record_dict["type"] = "medical_record"
-        return medical_record_dict
-    if isinstance(obj, FormSubmissionOrmV2):
-        form_dict = __marshal_form_submission_v2(obj, True)
-        form_dict["type"] = "form"
-        return form_dict
-    if isinstance(obj, FormOrm):
-        form_dict = __marshal_form(obj, True)
-        form_dict["type"] = "form"
-        return form_dict
-    d = vars(obj).copy()
-    __pre_process(d)
-    d["type"] = "other"
+    marshaller, type_name = __resolve_typed_marshaller(type(obj))
+    d = marshaller(obj, shallow, False)
+    d["type"] = type_name
     return d
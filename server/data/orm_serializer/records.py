@@ -51,7 +51,9 @@ def __unmarshal_reading(d: dict) -> ReadingOrm:
 
     reading = __load(ReadingOrm, d)
 
-    invariant.resolve_reading_invariants(reading)
+    # Not committed here: the caller writes the reading, often along with others
+    # (such as a sync upload) in a single transaction
+    invariant.resolve_reading_invariants(reading, autocommit=False)
 
     return reading
 
@@ -0,0 +1,92 @@
+"""
+Marshal plain query rows, rather than model instances, to JSON-ready dicts.
+
+List endpoints returning thousands of records can select just the columns of a model
+(see the ``as_rows`` option of ``crud.read_readings`` and the sync queries). This
+skips building model instances and registering them in the session's identity map.
+The rows are converted by functions compiled once per model, which produce the same
+dicts as ``marshal`` does for the equivalent instances.
+"""
+
+import functools
+from collections.abc import Iterable, Sequence
+from enum import Enum
+from typing import Any, Callable
+
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy import inspect
+
+from models import ReadingOrm, UrineTestOrm
+
+RowConverter = Callable[[Sequence[Any]], dict]
+
+
+@functools.cache
+def __row_converter(model: type, start: int = 0) -> RowConverter:
+    """
+    Compile a function converting the values of a model's columns, found in a row
+    from position ``start`` in mapper order, to a dict as ``marshal`` would: ``None``
+    values are omitted and ``Enum`` values are replaced by their value.
+
+    :param model: Model class whose columns are in the row
+    :param start: Position of the model's first column in the row
+    :return: Function converting a row to a dict
+    """
+    column_attrs = inspect(model).column_attrs
+    keys = tuple(attr.key for attr in column_attrs)
+    stop = start + len(keys)
+    enum_keys = tuple(
+        attr.key
+        for attr in column_attrs
+        if isinstance(attr.columns[0].type, SqlEnum)
+        and attr.columns[0].type.enum_class is not None
+    )
+
+    def convert(row: Sequence[Any]) -> dict:
+        d = {
+            key: value for key, value in zip(keys, row[start:stop]) if value is not None
+        }
+        for key in enum_keys:
+            value = d.get(key)
+            if isinstance(value, Enum):
+                d[key] = value.value
+        return d
+
+    return convert
+
+
+def marshal_rows(model: type, rows: Iterable[Sequence[Any]]) -> list[dict]:
+    """
+    Marshal rows holding the columns of a model with no nested relationships in its
+    marshalled form, such as ``ReferralOrm`` and ``AssessmentOrm``.
+
+    :param model: Model class whose columns were selected
+    :param rows: Rows of the model's columns in mapper order
+    :return: List of dictionaries, as ``marshal`` returns for the model's instances
+    """
+    convert = __row_converter(model)
+    return [convert(row) for row in rows]
+
+
+def marshal_reading_rows(rows: Iterable[Sequence[Any]]) -> list[dict]:
+    """
+    Marshal rows of the reading columns followed by the urine test columns, as
+    ``serialize.serialize_reading`` does for (reading, urine test) tuples.
+
+    :param rows: Rows of reading and outer joined urine test columns in mapper order
+    :return: List of reading dictionaries, each with its ``urine_tests`` or ``None``
+    """
+    convert_reading = __row_converter(ReadingOrm)
+    reading_columns = len(inspect(ReadingOrm).column_attrs)
+    convert_urine_test = __row_converter(UrineTestOrm, reading_columns)
+
+    readings = []
+    for row in rows:
+        reading = convert_reading(row)
+        symptoms = reading.get("symptoms")
+        reading["symptoms"] = symptoms.split(",") if symptoms else []
+        # The urine test columns are all NULL when the reading has none
+        urine_tests = convert_urine_test(row)
+        reading["urine_tests"] = urine_tests or None
+        readings.append(reading)
+    return readings
@@ -50,6 +50,7 @@ from seed_users import (
     seed_minimal_users,
     seed_test_users,
 )
+from service.workflow.workflow_service import WorkflowService
 
 # cli = FlaskGroup(app)
 cli = FlaskGroup()
@@ -355,6 +356,7 @@ def seed_test_patient():
     )
     create_pregnancy("4930004967", 1609840628)
     create_pregnancy("4930004967", 1549015028, 1573379828, "SVD. Baby weighed 3kg.")
+    db.session.commit()
 
 
 def seed():
@@ -469,6 +471,106 @@ def seed():
     print("Complete!")
 
 
+# USAGE: python manage.py rebuild_patient_latest
+@cli.command("rebuild_patient_latest")
+def rebuild_patient_latest_cli():
+    """
+    Repopulates the patient_latest projection from the reading, pregnancy and
+    medical_record tables. Run this after importing data directly into the database.
+    """
+    count = crud.rebuild_patient_latest()
+    print(f"Rebuilt latest-record projection for {count} patients")
+
+
+# USAGE: python manage.py rebuild_form_answer_values
+@cli.command("rebuild_form_answer_values")
+def rebuild_form_answer_values_cli():
+    """
+    Repopulates the form_answer_value_v2 projection by decoding the answers of every
+    form submission. Run this after importing data directly into the database.
+    """
+    count = crud.rebuild_form_answer_values()
+    print(f"Rebuilt decoded answer projection with {count} answers")
+
+
+# USAGE: python manage.py evaluate_workflows [--template-id <id>] [--instance-id <id> ...]
+@cli.command("evaluate_workflows")
+@click.option(
+    "--template-id", default=None, help="Only evaluate this template's instances"
+)
+@click.option(
+    "--instance-id",
+    "instance_ids",
+    multiple=True,
+    help="Only evaluate these instances; may be repeated",
+)
+def evaluate_workflows_cli(template_id, instance_ids):
+    """
+    Re-evaluates the current step of every active workflow instance, or of those of
+    one template or the given instances, and prints the branch each would select.
+    Run this after editing a template or importing data directly into the database.
+    """
+    start = time.time()
+    evaluations = WorkflowService.evaluate_workflow_instances(
+        workflow_template_id=template_id,
+        workflow_instance_ids=list(instance_ids) or None,
+    )
+    for evaluation in evaluations:
+        selected = evaluation.step_evaluation.selected_branch_id
+        print(
+            f"{evaluation.workflow_instance_id} "
+            f"step {evaluation.workflow_instance_step_id}: "
+            f"{selected if selected is not None else 'no branch selected'}"
+        )
+    end = time.time()
+    print(
+        f"Evaluated {len(evaluations)} workflow instances in "
+        f"{round(end - start, 3)} seconds"
+    )
+
+
+# USAGE: python manage.py delete_workflows [--template-id <id> ...] [--instance-id <id> ...]
+#                                         [--classification-id <id> ...] [--dry-run]
+@cli.command("delete_workflows")
+@click.option(
+    "--template-id",
+    "template_ids",
+    multiple=True,
+    help="Delete this template; may be repeated",
+)
+@click.option(
+    "--instance-id",
+    "instance_ids",
+    multiple=True,
+    help="Delete this instance; may be repeated",
+)
+@click.option(
+    "--classification-id",
+    "classification_ids",
+    multiple=True,
+    help="Delete this classification, but not its templates; may be repeated",
+)
+@click.option(
+    "--dry-run", is_flag=True, help="Only print how many rows would be deleted"
+)
+def delete_workflows_cli(template_ids, instance_ids, classification_ids, dry_run):
+    """
+    Deletes workflow templates, instances and classifications with all of their steps,
+    branches, rule groups, forms and instance data, and prints the number of rows
+    deleted from each table.
+    """
+    counts = crud.delete_workflows(
+        template_ids=template_ids,
+        instance_ids=instance_ids,
+        classification_ids=classification_ids,
+        dry_run=dry_run,
+    )
+    for table, count in counts.items():
+        print(f"{table}: {count} rows {'would be ' if dry_run else ''}deleted")
+    if not counts:
+        print("Nothing to delete")
+
+
 # USAGE: python manage.py seed
 @cli.command("seed")
 @click.pass_context
@@ -1520,6 +1622,7 @@ def create_form_submission_v2(patient_id: str, user_id: int):
             )
             db.session.add(answer)
 
+    crud.refresh_form_answer_values([submission.id])
     db.session.commit()
     print(f"Created form submission V2 for patient {patient_id}")
 
@@ -3203,6 +3306,7 @@ def create_workflow_instance_form_v2(
         workflow_instance_form_orm.answers.append(workflow_instance_form_question_orm)
 
         db.session.add(workflow_instance_form_orm)
+        crud.refresh_form_answer_values([form_id])
         db.session.commit()
 
 
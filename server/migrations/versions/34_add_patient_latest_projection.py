@@ -0,0 +1,125 @@
+"""
+Add patient_latest projection of each patient's most recent records
+
+Revision ID: 34_add_patient_latest
+Revises: 33_add_has_branching_issues
+Create Date: 2026-10-18
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "34_add_patient_latest"
+down_revision = "33_add_has_branching_issues"
+branch_labels = None
+depends_on = None
+
+# Populates the projection using the same rules as
+# data.db_operations.patient_latest.refresh_patient_latest.
+BACKFILL_SQL = """
+INSERT INTO patient_latest (
+    patient_id,
+    reading_id,
+    traffic_light_status,
+    date_taken,
+    pregnancy_id,
+    medical_record_id,
+    drug_record_id
+)
+SELECT
+    p.id,
+    r.id,
+    r.traffic_light_status,
+    r.date_taken,
+    pr.id,
+    md.id,
+    dr.id
+FROM patient p
+LEFT OUTER JOIN reading r ON r.id = (
+    SELECT r2.id FROM reading r2
+    WHERE r2.patient_id = p.id
+    ORDER BY r2.date_taken DESC, r2.id DESC
+    LIMIT 1
+)
+LEFT OUTER JOIN pregnancy pr ON pr.id = (
+    SELECT pr2.id FROM pregnancy pr2
+    WHERE pr2.patient_id = p.id
+    ORDER BY pr2.start_date DESC, pr2.id DESC
+    LIMIT 1
+) AND pr.end_date IS NULL
+LEFT OUTER JOIN medical_record md ON md.id = (
+    SELECT md2.id FROM medical_record md2
+    WHERE md2.patient_id = p.id AND md2.is_drug_record = 0
+    ORDER BY md2.date_created DESC, md2.id DESC
+    LIMIT 1
+)
+LEFT OUTER JOIN medical_record dr ON dr.id = (
+    SELECT dr2.id FROM medical_record dr2
+    WHERE dr2.patient_id = p.id AND dr2.is_drug_record = 1
+    ORDER BY dr2.date_created DESC, dr2.id DESC
+    LIMIT 1
+)
+"""
+
+
+def upgrade():
+    op.create_table(
+        "patient_latest",
+        sa.Column("patient_id", sa.String(length=50), nullable=False),
+        sa.Column("reading_id", sa.String(length=50), nullable=True),
+        sa.Column(
+            "traffic_light_status",
+            sa.Enum(
+                "NONE",
+                "GREEN",
+                "YELLOW_UP",
+                "YELLOW_DOWN",
+                "RED_UP",
+                "RED_DOWN",
+                name="trafficlightenum",
+            ),
+            nullable=True,
+        ),
+        sa.Column("date_taken", sa.BigInteger(), nullable=True),
+        sa.Column("pregnancy_id", sa.Integer(), nullable=True),
+        sa.Column("medical_record_id", sa.Integer(), nullable=True),
+        sa.Column("drug_record_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["patient_id"],
+            ["patient.id"],
+            name=op.f("fk_patient_latest_patient_id_patient"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["reading_id"],
+            ["reading.id"],
+            name=op.f("fk_patient_latest_reading_id_reading"),
+            ondelete="SET NULL",
+        ),
+        sa.ForeignKeyConstraint(
+            ["pregnancy_id"],
+            ["pregnancy.id"],
+            name=op.f("fk_patient_latest_pregnancy_id_pregnancy"),
+            ondelete="SET NULL",
+        ),
+        sa.ForeignKeyConstraint(
+            ["medical_record_id"],
+            ["medical_record.id"],
+            name=op.f("fk_patient_latest_medical_record_id_medical_record"),
+            ondelete="SET NULL",
+        ),
+        sa.ForeignKeyConstraint(
+            ["drug_record_id"],
+            ["medical_record.id"],
+            name=op.f("fk_patient_latest_drug_record_id_medical_record"),
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("patient_id", name=op.f("pk_patient_latest")),
+    )
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade():
+    op.drop_table("patient_latest")
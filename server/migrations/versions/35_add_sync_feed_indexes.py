@@ -0,0 +1,36 @@
+"""
+Add (last_edited, id) indexes backing the cursor-based sync changes feed of readings,
+referrals and assessments
+
+Revision ID: 35_add_sync_feed_indexes
+Revises: 34_add_patient_latest
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "35_add_sync_feed_indexes"
+down_revision = "34_add_patient_latest"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) for each table paged through by the sync feed. The
+# patients feed is keyed on the latest edit of a patient and its records, which an
+# index on a single table cannot serve.
+INDEXES = [
+    ("ix_reading_last_edited_id", "reading", ["last_edited", "id"]),
+    ("ix_referral_last_edited_id", "referral", ["last_edited", "id"]),
+    ("ix_assessment_date_assessed_id", "assessment", ["date_assessed", "id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
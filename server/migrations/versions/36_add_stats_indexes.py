@@ -0,0 +1,35 @@
+"""
+Add date indexes on reading and referral backing the stats endpoints
+
+Revision ID: 36_add_stats_indexes
+Revises: 35_add_sync_feed_indexes
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "36_add_stats_indexes"
+down_revision = "35_add_sync_feed_indexes"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) for each date range scanned by the stats queries,
+# both across all users and for a single user
+INDEXES = [
+    ("ix_reading_date_taken", "reading", ["date_taken"]),
+    ("ix_reading_user_id_date_taken", "reading", ["user_id", "date_taken"]),
+    ("ix_referral_date_referred", "referral", ["date_referred"]),
+    ("ix_referral_user_id_date_referred", "referral", ["user_id", "date_referred"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""
+Add per-patient date indexes backing single-item workflow collection lookups
+
+Revision ID: 37_add_collection_selector_indexes
+Revises: 36_add_stats_indexes
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "37_add_collection_selector_indexes"
+down_revision = "36_add_stats_indexes"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) for each collection read as vitals[latest], forms[-N]
+INDEXES = [
+    (
+        "ix_reading_patient_id_date_taken_id",
+        "reading",
+        ["patient_id", "date_taken", "id"],
+    ),
+    (
+        "ix_form_submission_v2_patient_id_date_submitted_id",
+        "form_submission_v2",
+        ["patient_id", "date_submitted", "id"],
+    ),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
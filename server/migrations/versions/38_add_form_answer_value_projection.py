@@ -0,0 +1,190 @@
+"""
+Add form_answer_value_v2 projection of decoded form answers
+
+Revision ID: 38_add_form_answer_values
+Revises: 37_add_collection_selector_indexes
+Create Date: 2026-10-18
+
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = "38_add_form_answer_values"
+down_revision = "37_add_collection_selector_indexes"
+branch_labels = None
+depends_on = None
+
+QUESTION_TYPES = (
+    "INTEGER",
+    "DECIMAL",
+    "STRING",
+    "MULTIPLE_CHOICE",
+    "MULTIPLE_SELECT",
+    "DATE",
+    "TIME",
+    "DATETIME",
+    "CATEGORY",
+)
+
+# Answer JSON key holding the value of each scalar question type
+SCALAR_ANSWER_KEYS = {
+    "INTEGER": ("number_value", "number"),
+    "DECIMAL": ("number_value", "number"),
+    "STRING": ("text_value", "text"),
+    "DATE": ("date_value", "date"),
+    "DATETIME": ("date_value", "date"),
+}
+
+COLUMNS = (
+    "form_submission_id",
+    "user_question_id",
+    "question_id",
+    "question_type",
+    "number_value",
+    "text_value",
+    "date_value",
+    "option_text",
+    "selected_options",
+)
+
+BATCH_SIZE = 1000
+
+
+def parse_json(text):
+    """Return the value encoded in a JSON string, or None if it is invalid."""
+    try:
+        return json.loads(text)
+    except (ValueError, TypeError):
+        return None
+
+
+def backfill(connection):
+    """
+    Decodes every existing answer using the same rules as
+    data.db_operations.form_answer_values.decode_form_answer_values. The decoding
+    needs JSON arrays to be indexed and translated, so it is done here rather than in
+    SQL.
+    """
+    option_ids = {
+        question_id: parse_json(mc_options) or []
+        for question_id, mc_options in connection.execute(
+            sa.text(
+                "SELECT id, mc_options FROM form_question_template_v2 "
+                "WHERE question_type IN ('MULTIPLE_CHOICE', 'MULTIPLE_SELECT') "
+                "AND mc_options IS NOT NULL"
+            )
+        )
+    }
+    option_texts = dict(
+        connection.execute(
+            sa.text(
+                "SELECT string_id, text FROM lang_version_v2 WHERE lang = 'English'"
+            )
+        ).fetchall()
+    )
+
+    answers = connection.execute(
+        sa.text(
+            "SELECT a.form_submission_id, q.user_question_id, q.id, q.question_type, "
+            "a.answer FROM form_answer_v2 a "
+            "JOIN form_question_template_v2 q ON q.id = a.question_id "
+            "WHERE q.user_question_id IS NOT NULL AND q.user_question_id != ''"
+        )
+    ).fetchall()
+
+    rows = {}
+    for submission_id, user_question_id, question_id, q_type, answer in answers:
+        raw = parse_json(answer)
+        if raw is None:
+            continue
+
+        row = dict.fromkeys(COLUMNS)
+        row.update(
+            form_submission_id=submission_id,
+            user_question_id=user_question_id,
+            question_id=question_id,
+            question_type=q_type,
+        )
+        if q_type in SCALAR_ANSWER_KEYS:
+            column, key = SCALAR_ANSWER_KEYS[q_type]
+            row[column] = raw.get(key)
+        elif q_type in ("MULTIPLE_CHOICE", "MULTIPLE_SELECT"):
+            options = option_ids.get(question_id, [])
+            selected = [
+                option_texts.get(options[index])
+                for index in raw.get("mc_id_array", [])
+                if index < len(options)
+            ]
+            if q_type == "MULTIPLE_CHOICE":
+                row["option_text"] = selected[0] if selected else None
+            else:
+                row["selected_options"] = json.dumps(
+                    [text for text in selected if text is not None]
+                )
+        else:
+            continue
+        rows[(submission_id, user_question_id)] = row
+
+    table = sa.table("form_answer_value_v2", *(sa.column(name) for name in COLUMNS))
+    rows = list(rows.values())
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(table.insert(), rows[start : start + BATCH_SIZE])
+
+
+def upgrade():
+    op.create_table(
+        "form_answer_value_v2",
+        sa.Column("form_submission_id", sa.String(length=50), nullable=False),
+        sa.Column("user_question_id", sa.String(length=50), nullable=False),
+        sa.Column("question_id", sa.String(length=50), nullable=False),
+        sa.Column(
+            "question_type",
+            sa.Enum(*QUESTION_TYPES, name="questiontypeenum"),
+            nullable=False,
+        ),
+        sa.Column("number_value", mysql.DOUBLE(asdecimal=False), nullable=True),
+        sa.Column("text_value", sa.Text(collation="utf8mb4_general_ci"), nullable=True),
+        sa.Column("date_value", sa.String(length=50), nullable=True),
+        sa.Column(
+            "option_text", sa.Text(collation="utf8mb4_general_ci"), nullable=True
+        ),
+        sa.Column(
+            "selected_options", sa.Text(collation="utf8mb4_general_ci"), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["form_submission_id"],
+            ["form_submission_v2.id"],
+            name=op.f("fk_form_answer_value_v2_form_submission_id_form_submission_v2"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["question_id"],
+            ["form_question_template_v2.id"],
+            name=op.f("fk_form_answer_value_v2_question_id_form_question_template_v2"),
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint(
+            "form_submission_id",
+            "user_question_id",
+            name=op.f("pk_form_answer_value_v2"),
+        ),
+    )
+    op.create_index(
+        op.f("ix_form_answer_value_v2_question_id"),
+        "form_answer_value_v2",
+        ["question_id"],
+        unique=False,
+    )
+    backfill(op.get_bind())
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_form_answer_value_v2_question_id"), table_name="form_answer_value_v2"
+    )
+    op.drop_table("form_answer_value_v2")
@@ -1,3 +1,5 @@
+from sqlalchemy.dialects.mysql import DOUBLE
+
 from common.commonUtil import get_current_time, get_uuid
 from enums import QuestionTypeEnum
 
@@ -213,6 +215,14 @@ class FormSubmissionOrmV2(db.Model):
     """
 
     __tablename__ = "form_submission_v2"
+    __table_args__ = (
+        db.Index(
+            "ix_form_submission_v2_patient_id_date_submitted_id",
+            "patient_id",
+            "date_submitted",
+            "id",
+        ),
+    )
     id = db.Column(db.String(50), primary_key=True, default=get_uuid)
     form_template_id = db.Column(
         db.String(50),
@@ -292,3 +302,46 @@ class FormAnswerOrmV2(db.Model):
         nullable=False,
     )
     answer = db.Column(db.Text(collation="utf8mb4_general_ci"), nullable=False)
+
+
+class FormAnswerValueOrmV2(db.Model):
+    """
+    Denormalized projection of form answers decoded into typed columns.
+
+    ``FormAnswerOrmV2.answer`` holds JSON whose format depends on the question type,
+    and multiple-choice answers hold indices into the question's option string ids.
+    This table holds one row per answered question of a submission, keyed by the
+    question's ``user_question_id``, with the value stored in the column matching
+    the question type:
+    - INTEGER/DECIMAL: number_value
+    - STRING: text_value
+    - DATE/DATETIME: date_value, as submitted
+    - MULTIPLE_CHOICE: option_text, the English text of the selected option
+    - MULTIPLE_SELECT: selected_options, a JSON array of the English texts of the
+      selected options
+
+    Rows are written when a submission is created or updated and can be rebuilt
+    from scratch with the ``rebuild_form_answer_values`` management command.
+    """
+
+    __tablename__ = "form_answer_value_v2"
+    form_submission_id = db.Column(
+        db.String(50),
+        db.ForeignKey("form_submission_v2.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_question_id = db.Column(db.String(50), primary_key=True)
+    question_id = db.Column(
+        db.String(50),
+        db.ForeignKey("form_question_template_v2.id", ondelete="RESTRICT"),
+        index=True,
+        nullable=False,
+    )
+    question_type = db.Column(db.Enum(QuestionTypeEnum), nullable=False)
+
+    # Double precision, so DECIMAL answers read back as they were submitted
+    number_value = db.Column(DOUBLE(asdecimal=False), nullable=True)
+    text_value = db.Column(db.Text(collation="utf8mb4_general_ci"), nullable=True)
+    date_value = db.Column(db.String(50), nullable=True)
+    option_text = db.Column(db.Text(collation="utf8mb4_general_ci"), nullable=True)
+    selected_options = db.Column(db.Text(collation="utf8mb4_general_ci"), nullable=True)
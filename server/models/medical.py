@@ -15,6 +15,11 @@ class ReferralOrm(db.Model):
     """
 
     __tablename__ = "referral"
+    __table_args__ = (
+        db.Index("ix_referral_last_edited_id", "last_edited", "id"),
+        db.Index("ix_referral_date_referred", "date_referred"),
+        db.Index("ix_referral_user_id_date_referred", "user_id", "date_referred"),
+    )
     id = db.Column(db.String(50), primary_key=True, default=get_uuid)
 
     # Initial referral
@@ -70,6 +75,14 @@ class ReadingOrm(db.Model):
     """
 
     __tablename__ = "reading"
+    __table_args__ = (
+        db.Index("ix_reading_last_edited_id", "last_edited", "id"),
+        db.Index("ix_reading_date_taken", "date_taken"),
+        db.Index("ix_reading_user_id_date_taken", "user_id", "date_taken"),
+        db.Index(
+            "ix_reading_patient_id_date_taken_id", "patient_id", "date_taken", "id"
+        ),
+    )
     id = db.Column(db.String(50), primary_key=True, default=get_uuid)
     systolic_blood_pressure = db.Column(db.Integer)
     diastolic_blood_pressure = db.Column(db.Integer)
@@ -169,6 +182,9 @@ class AssessmentOrm(db.Model):
     """
 
     __tablename__ = "assessment"
+    __table_args__ = (
+        db.Index("ix_assessment_date_assessed_id", "date_assessed", "id"),
+    )
     id = db.Column(db.String(50), primary_key=True, default=get_uuid)
 
     follow_up_instructions = db.Column(db.Text)
@@ -1,5 +1,5 @@
 from common.commonUtil import get_current_time, get_uuid
-from enums import SexEnum
+from enums import SexEnum, TrafficLightEnum
 
 from .base import db
 
@@ -152,3 +152,45 @@ class MedicalRecordOrm(db.Model):
         "PatientOrm",
         backref=db.backref("records", cascade="all, delete-orphan", lazy=True),
     )
+
+
+class PatientLatestOrm(db.Model):
+    """
+    Denormalized projection of each patient's most recent records.
+
+    Holds the latest reading (with its traffic light status and date taken), the
+    patient's open pregnancy, and their current medical and drug records so that list
+    and sync queries can avoid finding the newest row of each table on every request.
+    Rows are refreshed whenever a session flush writes a patient or their records (see
+    ``data.db_operations.patient_latest``) and can be rebuilt from scratch with the
+    ``rebuild_patient_latest`` management command.
+    """
+
+    __tablename__ = "patient_latest"
+    patient_id = db.Column(
+        db.String(50),
+        db.ForeignKey("patient.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    reading_id = db.Column(
+        db.String(50),
+        db.ForeignKey("reading.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    traffic_light_status = db.Column(db.Enum(TrafficLightEnum), nullable=True)
+    date_taken = db.Column(db.BigInteger, nullable=True)
+    pregnancy_id = db.Column(
+        db.Integer,
+        db.ForeignKey("pregnancy.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    medical_record_id = db.Column(
+        db.Integer,
+        db.ForeignKey("medical_record.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    drug_record_id = db.Column(
+        db.Integer,
+        db.ForeignKey("medical_record.id", ondelete="SET NULL"),
+        nullable=True,
+    )
@@ -21,9 +21,46 @@ _VAR = os.path.join(_ROOT, "var")
 loglevel = "info"
 errorlog = os.path.join(_VAR, "log/error.log")
 
-workers = multiprocessing.cpu_count() * 2 + 1
+# Concurrency profile, set with GUNICORN_WORKER_CLASS:
+#  - "sync" (default): each worker serves one request at a time, so a slow Cognito or
+#    SMS relay call blocks the whole worker.
+#  - "gthread": each worker serves up to GUNICORN_THREADS requests in threads.
+#  - "gevent": each worker serves up to GUNICORN_WORKER_CONNECTIONS requests in
+#    greenlets. The standard library is monkeypatched when the worker starts, which
+#    makes the pure-Python PyMySQL driver, requests and boto3 cooperative.
+# Each worker process has its own database connection pool, sized with the DB_POOL_*
+# variables read by ``config.Config``; its pool_size + max_overflow should cover the
+# threads or greenlets of a worker which use the database at once.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+if worker_class not in ("sync", "gthread", "gevent"):
+    raise ValueError(f"Unsupported GUNICORN_WORKER_CLASS: {worker_class}")
+print("Using worker class:", worker_class)
 
-timeout = 30  # 30 s
+workers = int(
+    os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1),
+)
+threads = int(
+    os.environ.get("GUNICORN_THREADS", 8 if worker_class == "gthread" else 1),
+)
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 100))
+
+# The application must be imported by each worker after it is forked, so that gevent
+# patches the standard library before PyMySQL, requests or boto3 are imported and
+# each worker creates its own connection pool
+preload_app = False
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))  # 30 s
 keepalive = 5  # 5 s
 
 capture_output = True
+
+
+def post_worker_init(worker):
+    """Fail fast if a gevent worker runs with blocking sockets."""
+    if worker_class != "gevent":
+        return
+    from gevent import monkey
+
+    if not monkey.is_module_patched("socket"):
+        worker.log.error("gevent worker started without a patched socket module")
+        raise SystemExit(1)
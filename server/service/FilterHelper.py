@@ -1,6 +1,8 @@
+from typing import Any
+
+import data.db_operations as crud
 from models import PatientOrm, UserOrm
 from service.assoc import (
-    has_association,
     patients_at_facility,
     patients_for_user,
 )
@@ -49,25 +51,23 @@ def patients_for_vht(user: UserOrm) -> list[PatientOrm]:
 def annotated_global_patient_list(
     user: UserOrm,
     search: str,
-) -> list[tuple[PatientOrm, bool]]:
+    **kwargs,
+) -> list[Any]:
     """
-    Returns the global list of patients where each patient is paired with a boolean that
-    is True if the patient is a member of the user's health facility and False if not.
+    Returns the global list of patients matching a search string where each patient is
+    annotated with ``is_added``: True if the patient is a member of the user's health
+    facility and False if not.
+
+    Matching and association checks are done by the database so that only matching
+    patients are ever loaded.
 
     :param user: A user model
     :param search: A search query
-    :return: A list of tuples
+    :param kwargs: Query params including limit, page
+    :return: A list of rows with the fields: id, name, village_number, is_added
     """
-
-    def __normalized_search(query: str, value: str) -> bool:
-        """Return True if query appears in value, case-insensitively."""
-        return query.upper() in value.upper()
-
-    facility = user.health_facility
-    all_patients = PatientOrm.query.all()
-    return [
-        (patient, has_association(patient=patient, facility=facility))
-        for patient in all_patients
-        if __normalized_search(search, patient.id)
-        or __normalized_search(search, patient.name)
-    ]
+    return crud.read_global_patient_search(
+        search,
+        user.health_facility_name,
+        **kwargs,
+    )
@@ -1,6 +1,6 @@
 from typing import Union
 
-from config import db
+from data.db_operations import unit_of_work
 from models import PatientOrm, ReadingOrm
 
 
@@ -22,13 +22,13 @@ def resolve_reading_invariants(obj: Union[PatientOrm, ReadingOrm], autocommit=Tr
     # Ensure that the reading's traffic light status is present and valid
     obj.traffic_light_status = obj.get_traffic_light()
 
-    # Commit any changes to the database
+    # Commit any changes to the database (in a unit of work, flush them)
     if autocommit:
-        db.session.commit()
+        unit_of_work.commit()
 
 
 def resolve_reading_invariants_mobile(
-    obj: Union[PatientOrm, ReadingOrm], autocommit=True
+    obj: Union[PatientOrm, ReadingOrm], autocommit=False
 ):
     """
     Resolves various invariants which must be held by reading objects.
@@ -37,6 +37,9 @@ def resolve_reading_invariants_mobile(
     order to ensure that said object is sound before inserting it into the database.
 
     :param obj:
+    :param autocommit: If true, the transaction is committed before return; mobile
+                       uploads are written in one transaction by the caller, so the
+                       default is false
     :return:
     """
     if isinstance(obj, PatientOrm):
@@ -52,4 +55,4 @@ def resolve_reading_invariants_mobile(
     if obj.referral and obj.followup:
         obj.referral.is_assessed = True
     if autocommit:
-        db.session.commit()
+        unit_of_work.commit()
@@ -1,80 +1,166 @@
-from datetime import date
+"""
+Statistics over the vitals of a set of readings, such as those of one patient.
+
+``ReadingStats`` loads the readings once into NumPy arrays and computes each statistic
+in vectorized passes: readings are grouped into calendar months by their date taken,
+then bucketed either by month of the current year or into the rolling window of the
+last twelve months. Buckets hold the raw values in reading order or, optionally, their
+count, mean, minimum and maximum.
+
+The class only needs the date taken, vitals and traffic light status of each reading,
+so it can be built from model instances or from rows selecting those columns (see
+``crud.read_reading_vitals``), for a patient or for a larger group of readings.
+"""
+
+import math
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Optional, Union
+
+import numpy as np
 
 from enums import TrafficLightEnum
-from models import ReadingOrm
-
-
-def get_stats_data(
-    data_needed,
-    readings: list[ReadingOrm],
-    current_year,
-    current_month,
-    is_from_last_twelve_months=False,
-):
-    """Aggregate reading data by the requested metric, returning monthly buckets or traffic light counts."""
-    if data_needed == "traffic_light_status":
-        data = [0, 0, 0, 0, 0]
-    else:
-        data = [[], [], [], [], [], [], [], [], [], [], [], []]
-
-    if data_needed == "traffic_light_status":
-        # do traffic light status stuff here
-        data = get_traffic_light(readings, data)
-
-    else:
-        # month_index is used for indexing purpose when is_from_last_twelve_months is True
-        month_index = 0
-        for reading in readings:
-            date_unix_ts = reading.date_taken
-            date_object = date.fromtimestamp(date_unix_ts)
-            item_month = date_object.month
-            item_year = date_object.year
-            if current_year == item_year or (
-                is_from_last_twelve_months
-                and current_year == item_year + 1
-                and (current_month + (12 - item_month)) < 12
-            ):
-                if is_from_last_twelve_months:
-                    month_index = get_month_index(
-                        item_year,
-                        item_month,
-                        current_year,
-                        current_month,
-                    )
-                if data_needed == "systolic_blood_pressure":
-                    data[item_month - 1].append(reading.systolic_blood_pressure)
-                elif data_needed == "diastolic_blood_pressure":
-                    data[item_month - 1].append(reading.diastolic_blood_pressure)
-                elif data_needed == "heart_rate":
-                    data[item_month - 1].append(reading.heart_rate)
-                elif data_needed == "bp_systolic_last_twelve_months":
-                    data[month_index].append(reading.systolic_blood_pressure)
-                elif data_needed == "bp_diastolic_last_twelve_months":
-                    data[month_index].append(reading.diastolic_blood_pressure)
-                elif data_needed == "heart_rate_last_twelve_months":
-                    data[month_index].append(reading.heart_rate)
-    return data
-
-
-def get_month_index(item_year, item_month, current_year, current_month):
-    """Return the 0-based index into a 12-month rolling window for the given reading month/year."""
-    if current_year == item_year:
-        return 12 - (current_month - item_month) - 1
-    return item_month - current_month - 1
-
-
-def get_traffic_light(readings: list[ReadingOrm], data):
-    """Count readings by traffic light status and return a list of 5 counts indexed by severity."""
-    traffic_light_indexes = {
-        TrafficLightEnum.GREEN: 0,
-        TrafficLightEnum.YELLOW_UP: 1,
-        TrafficLightEnum.YELLOW_DOWN: 2,
-        TrafficLightEnum.RED_UP: 3,
-        TrafficLightEnum.RED_DOWN: 4,
-    }
-
-    for reading in readings:
-        index = traffic_light_indexes[reading.traffic_light_status]
-        data[index] += 1
-
-    return data
+
+VITALS = ("systolic_blood_pressure", "diastolic_blood_pressure", "heart_rate")
+
+# Order of the counts returned by ``ReadingStats.traffic_light_counts``
+TRAFFIC_LIGHTS = (
+    TrafficLightEnum.GREEN,
+    TrafficLightEnum.YELLOW_UP,
+    TrafficLightEnum.YELLOW_DOWN,
+    TrafficLightEnum.RED_UP,
+    TrafficLightEnum.RED_DOWN,
+)
+
+MONTHS_IN_YEAR = 12
+
+# A bucket of raw values, or its summary (None if the bucket is empty)
+Bucket = Union[list[Optional[int]], Optional[dict[str, Any]]]
+
+
+def _month_number(year: int, month: int) -> int:
+    """Return the number of months between January 1970 and a month."""
+    return (year - 1970) * MONTHS_IN_YEAR + month - 1
+
+
+class ReadingStats:
+    """
+    Vitals statistics over a fixed set of readings.
+
+    Months are those of the server's local time, as when the readings were bucketed
+    with ``date.fromtimestamp``; the current UTC offset is applied to every reading.
+    """
+
+    def __init__(self, readings: Iterable[Any]):
+        """
+        :param readings: Readings, or rows, with the attributes ``date_taken``,
+            ``traffic_light_status`` and each of ``VITALS``
+        """
+        readings = list(readings)
+        utc_offset = datetime.now().astimezone().utcoffset()
+        offset = int(utc_offset.total_seconds()) if utc_offset else 0
+
+        date_taken = np.fromiter(
+            (r.date_taken or 0 for r in readings), dtype=np.int64, count=len(readings)
+        )
+        # Months since January 1970 in which each reading was taken
+        self.months = (
+            (date_taken + offset)
+            .astype("datetime64[s]")
+            .astype("datetime64[M]")
+            .astype(np.int64)
+        )
+        # Vitals as floats, with NaN for missing values
+        self.vitals = {
+            vital: np.array([getattr(r, vital) for r in readings], dtype=np.float64)
+            for vital in VITALS
+        }
+        traffic_light_index = {status: i for i, status in enumerate(TRAFFIC_LIGHTS)}
+        self.traffic_lights = np.fromiter(
+            (traffic_light_index.get(r.traffic_light_status, -1) for r in readings),
+            dtype=np.int64,
+            count=len(readings),
+        )
+
+    def monthly(
+        self, vital: str, current_year: int, aggregate: bool = False
+    ) -> list[Bucket]:
+        """
+        Bucket a vital by month of the current year.
+
+        :param vital: One of ``VITALS``
+        :param current_year: Year whose readings are included
+        :param aggregate: If True, summarize each bucket instead of listing its values
+        :return: 12 buckets, from January to December
+        """
+        buckets = self.months - _month_number(current_year, 1)
+        return self.__bucket(vital, buckets, aggregate)
+
+    def last_twelve_months(
+        self, vital: str, current_year: int, current_month: int, aggregate: bool = False
+    ) -> list[Bucket]:
+        """
+        Bucket a vital by month over the twelve months ending with the current month.
+
+        :param vital: One of ``VITALS``
+        :param current_year: Year of the current month
+        :param current_month: Current month, from 1 to 12
+        :param aggregate: If True, summarize each bucket instead of listing its values
+        :return: 12 buckets, the last of which is the current month
+        """
+        first_month = _month_number(current_year, current_month) - MONTHS_IN_YEAR + 1
+        return self.__bucket(vital, self.months - first_month, aggregate)
+
+    def traffic_light_counts(self) -> list[int]:
+        """Count the readings with each status, in the order of ``TRAFFIC_LIGHTS``."""
+        counts = np.bincount(
+            self.traffic_lights[self.traffic_lights >= 0],
+            minlength=len(TRAFFIC_LIGHTS),
+        )
+        return counts.tolist()
+
+    def __bucket(
+        self, vital: str, buckets: np.ndarray, aggregate: bool
+    ) -> list[Bucket]:
+        """
+        Group the values of a vital into 12 buckets.
+
+        :param buckets: Bucket index of each reading; readings outside 0-11 are skipped
+        """
+        values = self.vitals[vital]
+        in_range = (buckets >= 0) & (buckets < MONTHS_IN_YEAR)
+        if aggregate:
+            return self.__summarize(values[in_range], buckets[in_range])
+
+        # A stable sort keeps the readings of each bucket in their original order
+        indexes = np.flatnonzero(in_range)
+        indexes = indexes[np.argsort(buckets[indexes], kind="stable")]
+        counts = np.bincount(buckets[indexes], minlength=MONTHS_IN_YEAR)
+        raw = [None if math.isnan(v) else int(v) for v in values[indexes].tolist()]
+        bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+        return [raw[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    @staticmethod
+    def __summarize(values: np.ndarray, buckets: np.ndarray) -> list[Bucket]:
+        """Return the count, mean, min and max of the non-missing values per bucket."""
+        present = ~np.isnan(values)
+        values, buckets = values[present], buckets[present]
+
+        counts = np.bincount(buckets, minlength=MONTHS_IN_YEAR)
+        sums = np.bincount(buckets, weights=values, minlength=MONTHS_IN_YEAR)
+        minimums = np.full(MONTHS_IN_YEAR, np.inf)
+        maximums = np.full(MONTHS_IN_YEAR, -np.inf)
+        np.minimum.at(minimums, buckets, values)
+        np.maximum.at(maximums, buckets, values)
+
+        return [
+            {
+                "count": int(counts[i]),
+                "mean": float(sums[i] / counts[i]),
+                "min": int(minimums[i]),
+                "max": int(maximums[i]),
+            }
+            if counts[i]
+            else None
+            for i in range(MONTHS_IN_YEAR)
+        ]
@@ -8,6 +8,13 @@ The main function is ``patient_view_for_user`` which switches on the role of the
 user to provide an appropriate list of patients. It delegates the work of computing the
 actual lists to other functions to ease testing.
 
+The ``*_changes_view`` functions apply the same role-specific subsets to the paginated
+sync changes feed.
+
+The reading, referral and assessment views take an ``as_rows`` option returning plain
+rows of the model columns instead of model instances, for list endpoints which only
+marshal the results (see ``orm_serializer.marshal_rows``).
+
 The role-specific views are defined as follows:
 
 * ADMIN: can see all patients in the database
@@ -17,9 +24,10 @@ The role-specific views are defined as follows:
 * VHT: can see all patients created by them
 """
 
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 import data.db_operations as crud
+from data.db_operations.helper_utils import SyncPage
 from enums import RoleEnum
 from models import (
     AssessmentOrm,
@@ -107,43 +115,162 @@ def patient_view(user: dict, last_sync: Optional[int] = None) -> list[Any]:
 def reading_view(
     user: dict,
     last_sync: Optional[int] = None,
-) -> list[tuple[ReadingOrm, UrineTestOrm]]:
+    as_rows: bool = False,
+) -> list[Union[tuple[ReadingOrm, UrineTestOrm], Any]]:
     """
     Returns a list of readings each with corresponding urine test.
 
     :param user: JWT identity
-    :return: A list of tuples of reading, urine test
+    :param as_rows: If True, return rows of the reading and urine test columns
+    :return: A list of tuples of reading, urine test; or a list of rows if as_rows
     """
-    return __get_view(user, crud.read_readings, last_edited=last_sync)
+    return __get_view(user, crud.read_readings, last_edited=last_sync, as_rows=as_rows)
 
 
-def referral_view(user: dict, last_sync: Optional[int] = None) -> list[ReferralOrm]:
+def referral_view(
+    user: dict,
+    last_sync: Optional[int] = None,
+    as_rows: bool = False,
+) -> list[Union[ReferralOrm, Any]]:
     """
     Returns a list of referrals of readings associated with user.
 
     :param user: JWT identity
-    :return: A list of referrals
+    :param as_rows: If True, return rows of the referral columns
+    :return: A list of referrals; or a list of rows if as_rows
     """
     return __get_view(
         user,
         crud.read_referrals_or_assessments,
         model=ReferralOrm,
         last_edited=last_sync,
+        as_rows=as_rows,
     )
 
 
-def assessment_view(user: dict, last_sync: Optional[int] = None) -> list[AssessmentOrm]:
+def assessment_view(
+    user: dict,
+    last_sync: Optional[int] = None,
+    as_rows: bool = False,
+) -> list[Union[AssessmentOrm, Any]]:
     """
     Returns a list of assessments of readings associated with user.
 
     :param user: JWT identity
-    :return: A list of assessments
+    :param as_rows: If True, return rows of the assessment columns
+    :return: A list of assessments; or a list of rows if as_rows
     """
     return __get_view(
         user,
         crud.read_referrals_or_assessments,
         model=AssessmentOrm,
         last_edited=last_sync,
+        as_rows=as_rows,
+    )
+
+
+def patient_changes_view(
+    user: dict,
+    since: Optional[int],
+    cursor: Optional[tuple[int, Any]] = None,
+    limit: int = 500,
+) -> SyncPage:
+    """
+    Returns one page of patients, each with the latest pregnancy, medical and drug
+    records, which changed since the last sync.
+
+    :param user: JWT identity
+    :param since: Timestamp of the last sync
+    :param cursor: Position returned with the previous page; None for the first page
+    :param limit: Maximum number of patients in the page
+    :return: A page of patients and the cursor for the next page
+    """
+    return __get_view(
+        user, crud.read_patient_changes, since=since, cursor=cursor, limit=limit
+    )
+
+
+def reading_changes_view(
+    user: dict,
+    since: Optional[int],
+    cursor: Optional[tuple[int, Any]] = None,
+    limit: int = 500,
+    as_rows: bool = False,
+) -> SyncPage:
+    """
+    Returns one page of readings, each with corresponding urine test, which changed
+    since the last sync.
+
+    :param user: JWT identity
+    :param since: Timestamp of the last sync
+    :param cursor: Position returned with the previous page; None for the first page
+    :param limit: Maximum number of readings in the page
+    :param as_rows: If True, the page holds rows of the reading columns
+    :return: A page of tuples of reading, urine test and the cursor for the next page
+    """
+    return __get_view(
+        user,
+        crud.read_reading_changes,
+        since=since,
+        cursor=cursor,
+        limit=limit,
+        as_rows=as_rows,
+    )
+
+
+def referral_changes_view(
+    user: dict,
+    since: Optional[int],
+    cursor: Optional[tuple[int, Any]] = None,
+    limit: int = 500,
+    as_rows: bool = False,
+) -> SyncPage:
+    """
+    Returns one page of referrals associated with user which changed since the last
+    sync.
+
+    :param user: JWT identity
+    :param since: Timestamp of the last sync
+    :param cursor: Position returned with the previous page; None for the first page
+    :param limit: Maximum number of referrals in the page
+    :param as_rows: If True, the page holds rows of the referral columns
+    :return: A page of referrals and the cursor for the next page
+    """
+    return __get_view(
+        user,
+        crud.read_referral_changes,
+        since=since,
+        cursor=cursor,
+        limit=limit,
+        as_rows=as_rows,
+    )
+
+
+def assessment_changes_view(
+    user: dict,
+    since: Optional[int],
+    cursor: Optional[tuple[int, Any]] = None,
+    limit: int = 500,
+    as_rows: bool = False,
+) -> SyncPage:
+    """
+    Returns one page of assessments associated with user which were made since the
+    last sync.
+
+    :param user: JWT identity
+    :param since: Timestamp of the last sync
+    :param cursor: Position returned with the previous page; None for the first page
+    :param limit: Maximum number of assessments in the page
+    :param as_rows: If True, the page holds rows of the assessment columns
+    :return: A page of assessments and the cursor for the next page
+    """
+    return __get_view(
+        user,
+        crud.read_assessment_changes,
+        since=since,
+        cursor=cursor,
+        limit=limit,
+        as_rows=as_rows,
     )
 
 
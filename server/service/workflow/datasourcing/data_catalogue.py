@@ -1,20 +1,21 @@
-import json
+from collections.abc import Iterable
 from functools import partial
-from typing import Any, Callable, TypeAlias, TypeVar
+from typing import Any, Callable, Optional, TypeAlias, TypeVar
+
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Query, load_only, noload, selectinload
 
 import data.db_operations as crud
 from data import orm_serializer
-from enums import QuestionTypeEnum
 from models import (
     AssessmentOrm,
-    FormQuestionTemplateOrmV2,
     FormSubmissionOrmV2,
-    LangVersionOrmV2,
     MedicalRecordOrm,
     PatientOrm,
     PregnancyOrm,
     ReadingOrm,
     UrineTestOrm,
+    WorkflowInstanceOrm,
 )
 from service.workflow.datasourcing import custom_lookup as cl
 
@@ -23,35 +24,171 @@ M = TypeVar("M")
 ObjectResolver = Callable[[str, str], Any]
 CustomResolver = Callable[[dict], Any]
 
+# Columns ordering each collection from oldest to newest; ids break ties so that
+# single-item lookups agree with the order of the whole collection
+__VITALS_ORDER = [ReadingOrm.date_taken, ReadingOrm.id]
+__PREGNANCIES_ORDER = [PregnancyOrm.start_date, PregnancyOrm.id]
+__FORMS_ORDER = [FormSubmissionOrmV2.date_submitted, FormSubmissionOrmV2.id]
+__ALL_WORKFLOWS_ORDER = [
+    WorkflowInstanceOrm.start_date,
+    WorkflowInstanceOrm.last_edited,
+    WorkflowInstanceOrm.id,
+]
+
 # For object entries we use a dict with well-known keys like:
-#   {"query": <callable>, "custom": {...}, "collection": bool}
+#   {"query": <callable>, "custom": {...}, "collection": bool, "bulk_query": <callable>,
+#    "count_query": <callable>, "item_query": <callable>}
+# where, for collections only:
+# - "bulk_query" loads the collection for many patients at once and returns a dict of
+#   patient id -> items.
+# - "count_query" returns the number of items of a patient (for ``.size``).
+# - "item_query" loads a single item of a patient, given whether to count from the
+#   newest item, an offset from that end and the top-level fields referenced (None
+#   for the whole item), so ``[latest]`` and ``[-N]`` never load the whole collection.
 ObjectCatalogue: TypeAlias = dict[str, dict[str, Any]]
 
+# Catalogue keys which read a collection from the database item by item
+COLLECTION_SELECTOR_KEYS = ("count_query", "item_query")
 
-def __query_vitals_collection(patient_id: str) -> list[dict[str, Any]]:
+
+def __count_collection(model: type[M], patient_id: str) -> int:
     """
-    Query all readings (vitals) for a patient, ordered by date_taken (newest first).
+    Count the items of a patient's collection with ``COUNT(*)``.
+
+    :param model: the ORM model of the collection items, with a ``patient_id`` column
+    :param patient_id: id of the patient
+    """
+    return (
+        crud.db_session.query(func.count())
+        .select_from(model)
+        .filter(model.patient_id == patient_id)
+        .scalar()
+    )
+
+
+def __select_collection_item(
+    query: Query, order_by: list[Any], newest_first: bool, offset: int
+) -> Optional[M]:
+    """
+    Return the row at ``offset`` of a query ordered by ``order_by`` (newest first
+    when ``newest_first``, oldest first otherwise), using ``ORDER BY ... LIMIT 1``.
+
+    :param query: query filtered to the items of one patient
+    :param order_by: columns ordering the collection from oldest to newest
+    :param newest_first: whether ``offset`` counts from the newest item
+    :param offset: number of items to skip from that end
+    """
+    ordering = [column.desc() if newest_first else column.asc() for column in order_by]
+    return query.order_by(*ordering).offset(offset).limit(1).first()
+
+
+def __load_only_fields(model: type[M], fields: Optional[set[str]]) -> list[Any]:
+    """
+    Return loader options selecting only the columns of ``model`` named in
+    ``fields`` (plus ``id`` and ``patient_id``), or no options to load every column.
+    """
+    if fields is None:
+        return []
+    columns = [
+        getattr(model, attr.key)
+        for attr in inspect(model).column_attrs
+        if attr.key in fields or attr.key in ("id", "patient_id")
+    ]
+    return [load_only(*columns)]
+
+
+def __marshal_vital(reading: ReadingOrm) -> dict[str, Any]:
+    """
+    Marshal a reading to a dict, enriched with a nested "urine_test" dict if a urine
+    test exists.
+    """
+    reading_dict = orm_serializer.marshal(reading)
+
+    # Attach nested urine_test if present on the ORM relationship.
+    urine: UrineTestOrm | None = getattr(reading, "urine_tests", None)
+    if urine is not None:
+        urine_dict = orm_serializer.marshal(urine)
+        reading_dict["urine_test"] = urine_dict
+
+    return reading_dict
+
+
+def __bulk_query_vitals_collection(
+    patient_ids: Iterable[str],
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Query all readings (vitals) for a set of patients, ordered by date_taken (newest
+    first) within each patient.
 
     Each item is a plain dict produced via orm_serializer.marshal, optionally
-    enriched with a nested "urine_test" dict if a urine test exists.
+    enriched with a nested "urine_test" dict if a urine test exists. Urine tests are
+    loaded for all readings together rather than once per reading.
     """
-    # Reuse existing patient query that already orders readings by date.
-    readings: list[ReadingOrm] = crud.read_patient_all_records(
-        patient_id, readings=True
+    result: dict[str, list[dict[str, Any]]] = {pid: [] for pid in patient_ids}
+    if not result:
+        return result
+
+    readings: list[ReadingOrm] = (
+        crud.db_session.query(ReadingOrm)
+        .options(selectinload(ReadingOrm.urine_tests))
+        .filter(ReadingOrm.patient_id.in_(list(result)))
+        .order_by(*(column.desc() for column in __VITALS_ORDER))
+        .all()
     )
 
-    result: list[dict[str, Any]] = []
     for reading in readings:
-        reading_dict = orm_serializer.marshal(reading)
+        result[reading.patient_id].append(__marshal_vital(reading))
+
+    return result
 
-        # Attach nested urine_test if present on the ORM relationship.
-        urine: UrineTestOrm | None = getattr(reading, "urine_tests", None)
-        if urine is not None:
-            urine_dict = orm_serializer.marshal(urine)
-            reading_dict["urine_test"] = urine_dict
 
-        result.append(reading_dict)
+def __query_vitals_collection(patient_id: str) -> list[dict[str, Any]]:
+    """
+    Query all readings (vitals) for a patient, ordered by date_taken (newest first).
+    """
+    return __bulk_query_vitals_collection([patient_id])[patient_id]
+
+
+def __query_vitals_item(
+    patient_id: str, newest_first: bool, offset: int, fields: Optional[set[str]]
+) -> Optional[dict[str, Any]]:
+    """
+    Query a single reading (vital) of a patient, selecting only the referenced
+    columns and loading the urine test only if it is referenced.
+    """
+    if fields is None or fields & {"urine_test", "urine_tests"}:
+        urine_option = selectinload(ReadingOrm.urine_tests)
+    else:
+        urine_option = noload(ReadingOrm.urine_tests)
+
+    query = (
+        crud.db_session.query(ReadingOrm)
+        .options(*__load_only_fields(ReadingOrm, fields), urine_option)
+        .filter(ReadingOrm.patient_id == patient_id)
+    )
+    reading = __select_collection_item(query, __VITALS_ORDER, newest_first, offset)
+    return None if reading is None else __marshal_vital(reading)
+
 
+def __bulk_query_pregnancies_collection(
+    patient_ids: Iterable[str],
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Query all pregnancies for a set of patients, ordered by start_date (newest first)
+    within each patient.
+    """
+    result: dict[str, list[dict[str, Any]]] = {pid: [] for pid in patient_ids}
+    if not result:
+        return result
+
+    pregnancies = (
+        crud.db_session.query(PregnancyOrm)
+        .filter(PregnancyOrm.patient_id.in_(list(result)))
+        .order_by(*(column.desc() for column in __PREGNANCIES_ORDER))
+        .all()
+    )
+    for pregnancy in pregnancies:
+        result[pregnancy.patient_id].append(orm_serializer.marshal(pregnancy))
     return result
 
 
@@ -59,13 +196,23 @@ def __query_pregnancies_collection(patient_id: str) -> list[dict[str, Any]]:
     """
     Query all pregnancies for a patient, ordered by start_date (newest first).
     """
-    pregnancies = crud.read_all(PregnancyOrm, patient_id=patient_id) or []
-    pregnancies_sorted = sorted(
-        pregnancies,
-        key=lambda p: getattr(p, "start_date", 0) or 0,
-        reverse=True,
+    return __bulk_query_pregnancies_collection([patient_id])[patient_id]
+
+
+def __query_pregnancies_item(
+    patient_id: str, newest_first: bool, offset: int, fields: Optional[set[str]]
+) -> Optional[dict[str, Any]]:
+    """
+    Query a single pregnancy of a patient. Pregnancies have few columns, so whole
+    rows are loaded.
+    """
+    query = crud.db_session.query(PregnancyOrm).filter(
+        PregnancyOrm.patient_id == patient_id
     )
-    return [orm_serializer.marshal(p) for p in pregnancies_sorted]
+    pregnancy = __select_collection_item(
+        query, __PREGNANCIES_ORDER, newest_first, offset
+    )
+    return None if pregnancy is None else orm_serializer.marshal(pregnancy)
 
 
 def __query_referrals_collection(patient_id: str) -> list[dict[str, Any]]:
@@ -87,111 +234,87 @@ def __query_assessments_collection(patient_id: str) -> list[dict[str, Any]]:
     return []
 
 
-def __query_forms_collection(patient_id: str) -> list[dict[str, Any]]:
+def __bulk_query_forms_collection(
+    patient_ids: Iterable[str],
+) -> dict[str, list[dict[str, Any]]]:
     """
-    Query all form submissions for a patient, ordered newest-first.
+    Query all form submissions for a set of patients, ordered newest-first within
+    each patient.
 
     Each item is a flat dict keyed by user_question_id with the scalar answer
     value. This is how values are converted:
-    INTEGER/DECIMAL → float
+    INTEGER → int,
+    DECIMAL → float,
     STRING → str,
     DATE/DATETIME → str,
     MULTIPLE_CHOICE → English option text str
+
+    Answers are read pre-decoded from the ``form_answer_value_v2`` projection, for
+    the submissions of every patient together.
     """
+    result: dict[str, list[dict[str, Any]]] = {pid: [] for pid in patient_ids}
+    if not result:
+        return result
+
     submissions = (
-        crud.db_session.query(FormSubmissionOrmV2)
-        .filter(FormSubmissionOrmV2.patient_id == patient_id)
-        .order_by(FormSubmissionOrmV2.date_submitted.desc())
+        crud.db_session.query(FormSubmissionOrmV2.id, FormSubmissionOrmV2.patient_id)
+        .filter(FormSubmissionOrmV2.patient_id.in_(list(result)))
+        .order_by(*(column.desc() for column in __FORMS_ORDER))
         .all()
     )
+    answers = crud.read_form_answer_values(submission.id for submission in submissions)
+    for submission in submissions:
+        result[submission.patient_id].append(answers[submission.id])
 
-    if not submissions:
-        return []
+    return result
 
-    all_question_ids = {
-        answer.question_id
-        for submission in submissions
-        for answer in submission.answers
-    }
 
-    if not all_question_ids:
-        return [{} for _ in submissions]
+def __query_forms_collection(patient_id: str) -> list[dict[str, Any]]:
+    """
+    Query all form submissions for a patient, ordered newest-first, each flattened
+    to a dict keyed by user_question_id (see ``__bulk_query_forms_collection``).
+    """
+    return __bulk_query_forms_collection([patient_id])[patient_id]
 
-    questions = (
-        crud.db_session.query(FormQuestionTemplateOrmV2)
-        .filter(FormQuestionTemplateOrmV2.id.in_(all_question_ids))
-        .all()
+
+def __query_forms_item(
+    patient_id: str, newest_first: bool, offset: int, fields: Optional[set[str]]
+) -> Optional[dict[str, Any]]:
+    """
+    Query a single form submission of a patient, flattened as in
+    ``__bulk_query_forms_collection``. Only the submission's ID is selected; its
+    answers are read pre-decoded from the ``form_answer_value_v2`` projection.
+    """
+    query = crud.db_session.query(FormSubmissionOrmV2.id).filter(
+        FormSubmissionOrmV2.patient_id == patient_id
     )
-    question_map: dict[str, FormQuestionTemplateOrmV2] = {q.id: q for q in questions}
-
-    # fetch eng translations for all mc option string ids
-    mc_options_map: dict[str, list[str]] = {}
-    mc_string_ids: set[str] = set()
-    for q in questions:
-        if (
-            q.question_type
-            in (QuestionTypeEnum.MULTIPLE_CHOICE, QuestionTypeEnum.MULTIPLE_SELECT)
-            and q.mc_options
-        ):
-            try:
-                option_ids: list[str] = json.loads(q.mc_options)
-                mc_options_map[q.id] = option_ids
-                mc_string_ids.update(option_ids)
-            except (ValueError, TypeError):
-                pass
-
-    option_text_map: dict[str, str] = {}
-    if mc_string_ids:
-        lang_versions = (
-            crud.db_session.query(LangVersionOrmV2)
-            .filter(
-                LangVersionOrmV2.string_id.in_(mc_string_ids),
-                LangVersionOrmV2.lang == "English",
-            )
-            .all()
-        )
-        option_text_map = {lv.string_id: lv.text for lv in lang_versions}
+    submission = __select_collection_item(query, __FORMS_ORDER, newest_first, offset)
+    if submission is None:
+        return None
+    return crud.read_form_answer_values([submission.id])[submission.id]
 
-    result: list[dict[str, Any]] = []
-    for submission in submissions:
-        flat: dict[str, Any] = {}
-        for answer in submission.answers:
-            question = question_map.get(answer.question_id)
-            if question is None:
-                continue
-            try:
-                raw: dict[str, Any] = json.loads(answer.answer)
-            except (ValueError, TypeError):
-                continue
-            q_type = question.question_type
-            if q_type in (QuestionTypeEnum.INTEGER, QuestionTypeEnum.DECIMAL):
-                value = raw.get("number")
-            elif q_type == QuestionTypeEnum.STRING:
-                value = raw.get("text")
-            elif q_type in (QuestionTypeEnum.DATE, QuestionTypeEnum.DATETIME):
-                value = raw.get("date")
-            elif q_type == QuestionTypeEnum.MULTIPLE_CHOICE:
-                selected = raw.get("mc_id_array", [])
-                option_ids = mc_options_map.get(question.id, [])
-                if selected and option_ids and selected[0] < len(option_ids):
-                    value = option_text_map.get(option_ids[selected[0]])
-                else:
-                    value = None
-            elif q_type == QuestionTypeEnum.MULTIPLE_SELECT:
-                selected = raw.get("mc_id_array", [])
-                option_ids = mc_options_map.get(question.id, [])
-                for idx in selected:
-                    if idx < len(option_ids):
-                        text = option_text_map.get(option_ids[idx])
-                        if text is not None:
-                            flat[f"{question.user_question_id}_{text}"] = True
-                continue
-            else:
-                continue
-            if value is not None:
-                flat[question.user_question_id] = value
-        result.append(flat)
 
+def __bulk_query_all_workflows_collection(
+    patient_ids: Iterable[str],
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Query all workflow instances for a set of patients, ordered newest-first by
+    start_date (then ``last_edited``) within each patient.
+    """
+    result: dict[str, list[dict[str, Any]]] = {pid: [] for pid in patient_ids}
+    if not result:
+        return result
+
+    instances = (
+        crud.db_session.query(WorkflowInstanceOrm)
+        .filter(WorkflowInstanceOrm.patient_id.in_(list(result)))
+        .order_by(*(column.desc() for column in __ALL_WORKFLOWS_ORDER))
+        .all()
+    )
+    for instance in instances:
+        result[instance.patient_id].append(
+            orm_serializer.marshal(instance, shallow=True)
+        )
     return result
 
 
@@ -200,13 +323,25 @@ def __query_all_workflows_collection(patient_id: str) -> list[dict[str, Any]]:
     Query all workflow instances for a patient, ordered newest-first by start_date
     (then ``last_edited``), for ``all_wf[latest]`` and related rule variables.
     """
-    instances = crud.read_workflow_instances(patient_id=patient_id) or []
-    instances_sorted = sorted(
-        instances,
-        key=lambda wi: (wi.start_date or 0, wi.last_edited or 0),
-        reverse=True,
+    return __bulk_query_all_workflows_collection([patient_id])[patient_id]
+
+
+def __query_all_workflows_item(
+    patient_id: str, newest_first: bool, offset: int, fields: Optional[set[str]]
+) -> Optional[dict[str, Any]]:
+    """
+    Query a single workflow instance of a patient, selecting only the referenced
+    columns.
+    """
+    query = (
+        crud.db_session.query(WorkflowInstanceOrm)
+        .options(*__load_only_fields(WorkflowInstanceOrm, fields))
+        .filter(WorkflowInstanceOrm.patient_id == patient_id)
+    )
+    instance = __select_collection_item(
+        query, __ALL_WORKFLOWS_ORDER, newest_first, offset
     )
-    return [orm_serializer.marshal(wi, shallow=True) for wi in instances_sorted]
+    return None if instance is None else orm_serializer.marshal(instance, shallow=True)
 
 
 def __query_object(
@@ -243,6 +378,41 @@ def get_catalogue() -> dict[str, ObjectCatalogue]:
     return __data_catalogue
 
 
+def prefetch_collections(
+    namespaces: Iterable[str], patient_ids: Iterable[str]
+) -> dict[str, ObjectCatalogue]:
+    """
+    Load collections for many patients up front and return a catalogue which
+    resolves them from memory.
+
+    Each namespace with a "bulk_query" is loaded for every patient with one
+    set-based query, and its "query" in the returned catalogue looks the patient up
+    in the loaded results; its "count_query" and "item_query" are dropped so that the
+    loaded results are used instead. Other entries are shared with the default
+    catalogue.
+
+    :param namespaces: collection namespaces to load (e.g. "vitals", "forms")
+    :param patient_ids: ids of the patients to load the collections for
+    :returns: a data catalogue usable wherever get_catalogue() is
+    """
+    patient_ids = set(patient_ids)
+    catalogue = dict(__data_catalogue)
+    for namespace in set(namespaces):
+        entry = __data_catalogue.get(namespace)
+        if entry is None or entry.get("bulk_query") is None:
+            continue
+        loaded = entry["bulk_query"](patient_ids)
+        catalogue[namespace] = {
+            **{
+                key: value
+                for key, value in entry.items()
+                if key not in COLLECTION_SELECTOR_KEYS
+            },
+            "query": lambda patient_id, loaded=loaded: loaded.get(patient_id, []),
+        }
+    return catalogue
+
+
 """
     Maintaining a datastring lookup vs dynamic lookup means:
     - it will be easier to reason about and debug
@@ -295,10 +465,16 @@ __data_catalogue: dict[str, ObjectCatalogue] = {
     "vitals": {
         "query": __query_vitals_collection,
         "collection": True,
+        "bulk_query": __bulk_query_vitals_collection,
+        "count_query": partial(__count_collection, ReadingOrm),
+        "item_query": __query_vitals_item,
     },
     "pregnancies": {
         "query": __query_pregnancies_collection,
         "collection": True,
+        "bulk_query": __bulk_query_pregnancies_collection,
+        "count_query": partial(__count_collection, PregnancyOrm),
+        "item_query": __query_pregnancies_item,
     },
     "referrals": {
         "query": __query_referrals_collection,
@@ -311,9 +487,15 @@ __data_catalogue: dict[str, ObjectCatalogue] = {
     "forms": {
         "query": __query_forms_collection,
         "collection": True,
+        "bulk_query": __bulk_query_forms_collection,
+        "count_query": partial(__count_collection, FormSubmissionOrmV2),
+        "item_query": __query_forms_item,
     },
     "all_wf": {
         "query": __query_all_workflows_collection,
         "collection": True,
+        "bulk_query": __bulk_query_all_workflows_collection,
+        "count_query": partial(__count_collection, WorkflowInstanceOrm),
+        "item_query": __query_all_workflows_item,
     },
 }
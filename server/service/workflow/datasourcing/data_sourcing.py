@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from functools import reduce
 from typing import Any, Callable, Optional, TypeAlias, Union
 
+import flask
 from pydantic import BaseModel
 
 import data.db_operations as crud
@@ -43,6 +44,9 @@ DataModel = Union[
 # Namespace for workflow-scoped variables (metadata + workflow_instance_data).
 WORKFLOW_VARIABLE_NAMESPACE = "wf"
 
+# Attribute of ``flask.g`` holding the workflow instance snapshots of a request
+WORKFLOW_SNAPSHOTS_ATTRIBUTE = "workflow_instance_snapshots"
+
 MODEL_REGISTRY: dict[str, type[BaseModel]] = {
     "patient": PatientModel,
     "reading": ReadingModel,
@@ -608,6 +612,78 @@ def _decode_json_field_value(raw: Optional[str]) -> Any:
         return MISSING
 
 
+@dataclass
+class WorkflowInstanceSnapshot:
+    """
+    The data of a workflow instance read by ``wf.*`` rules: its metadata and every
+    ``workflow_instance_data`` value, decoded once.
+
+    Values are shared by every rule evaluated during a request and must not be
+    mutated.
+    """
+
+    patient_id: str
+    # Shape exposed as ``wf.info.*``
+    info: dict[str, Any]
+    # Field tag -> decoded value, or MISSING if the stored value is not valid JSON
+    data: dict[str, Any]
+
+
+def read_workflow_instance_snapshot(
+    workflow_instance_id: str,
+) -> Optional[WorkflowInstanceSnapshot]:
+    """
+    Load a workflow instance and all of its dynamic data rows (two queries) and
+    decode them. Within a request, snapshots are cached on ``flask.g`` until
+    :func:`invalidate_workflow_instance_snapshot` is called for the instance.
+
+    :param workflow_instance_id: ID of the workflow instance
+    :returns: The snapshot, or None if the instance does not exist
+    """
+    snapshots = (
+        flask.g.setdefault(WORKFLOW_SNAPSHOTS_ATTRIBUTE, {})
+        if flask.has_request_context()
+        else None
+    )
+    if snapshots is not None and workflow_instance_id in snapshots:
+        return snapshots[workflow_instance_id]
+
+    snapshot = None
+    instance = crud.read_workflow_instance(workflow_instance_id)
+    if instance is not None:
+        rows = crud.read_workflow_instance_data_for_instance(workflow_instance_id)
+        snapshot = WorkflowInstanceSnapshot(
+            patient_id=instance.patient_id,
+            info=_workflow_instance_info_dict(instance),
+            data={
+                row.field_tag: _decode_json_field_value(row.field_value) for row in rows
+            },
+        )
+
+    if snapshots is not None:
+        snapshots[workflow_instance_id] = snapshot
+    return snapshot
+
+
+def invalidate_workflow_instance_snapshot(workflow_instance_id: Optional[str] = None):
+    """
+    Drop the cached snapshot of a workflow instance from the current request. Must
+    be called whenever the instance or its dynamic data change.
+
+    :param workflow_instance_id: ID of the changed instance; None to drop every
+        snapshot
+    """
+    if not flask.has_request_context():
+        return
+    snapshots = flask.g.get(WORKFLOW_SNAPSHOTS_ATTRIBUTE)
+    if snapshots is None:
+        return
+    if workflow_instance_id is None:
+        snapshots.clear()
+    else:
+        snapshots.pop(workflow_instance_id, None)
+
+
 def resolve_workflow_namespace_variables(
     context: ResolverContext,
     variable_paths: list[VariablePath],
@@ -622,6 +698,10 @@ def resolve_workflow_namespace_variables(
     - ``wf.info.*`` — metadata from :class:`~models.workflows.WorkflowInstanceOrm`
     - ``wf.<field_tag>`` — values from ``workflow_instance_data`` (JSON-decoded);
       additional path segments navigate into object/array JSON values.
+
+    Both are read from the instance's snapshot (see
+    :func:`read_workflow_instance_snapshot`), so any number of ``wf.*`` paths cost
+    at most two queries per request.
     """
     logger = logging.getLogger(__name__)
     default_missing = MISSING if use_missing_sentinel else None
@@ -634,15 +714,15 @@ def resolve_workflow_namespace_variables(
         return {vp.to_string(): default_missing for vp in variable_paths}
 
     patient_id = context.get("patient_id")
-    instance = crud.read_workflow_instance(wf_id)
-    if instance is None:
+    snapshot = read_workflow_instance_snapshot(wf_id)
+    if snapshot is None:
         return {vp.to_string(): default_missing for vp in variable_paths}
 
-    if patient_id and instance.patient_id != patient_id:
+    if patient_id and snapshot.patient_id != patient_id:
         logger.warning(
             "Workflow instance %s patient mismatch: instance has %s, context has %s",
             wf_id,
-            instance.patient_id,
+            snapshot.patient_id,
             patient_id,
         )
         return {vp.to_string(): default_missing for vp in variable_paths}
@@ -665,20 +745,13 @@ def resolve_workflow_namespace_variables(
         head, *rest = vp.field_path
 
         if head == "info":
-            root = {"info": _workflow_instance_info_dict(instance)}
-            value = _navigate_field_path(root, vp.field_path)
+            value = _navigate_field_path({"info": snapshot.info}, vp.field_path)
         else:
-            row = crud.read_workflow_instance_data_by_field_tag(wf_id, head)
-            if row is None:
-                value = MISSING
+            parsed = snapshot.data.get(head, MISSING)
+            if parsed is MISSING or not rest:
+                value = parsed
             else:
-                parsed = _decode_json_field_value(row.field_value)
-                if parsed is MISSING:
-                    value = MISSING
-                elif not rest:
-                    value = parsed
-                else:
-                    value = _navigate_field_path(parsed, rest)
+                value = _navigate_field_path(parsed, rest)
 
         if value is MISSING:
             resolved[key] = default_missing
@@ -725,6 +798,84 @@ def _select_collection_item(
     return MISSING
 
 
+def _collection_item_position(
+    collection_index: Optional[Union[str, int]],
+) -> Optional[tuple[bool, int]]:
+    """
+    Translate a collection index into the position of the item it selects, following
+    the same rules as ``_select_collection_item``.
+
+    :returns: whether to count from the newest item and the offset from that end, or
+        None if the index selects no item
+    """
+    if collection_index == "latest":
+        return True, 0
+
+    if isinstance(collection_index, int):
+        if collection_index > 0:
+            return False, collection_index - 1
+        if collection_index == 0:
+            # Selects the oldest item, like items[-1] on a newest-first list
+            return False, 0
+        return True, abs(collection_index) - 1
+
+    return None
+
+
+def _resolve_collection_paths_by_item(
+    patient_id: str,
+    paths: list[VariablePath],
+    collection_entry: ObjectCatalogue,
+    use_missing_sentinel: bool,
+) -> dict[str, Any]:
+    """
+    Resolve collection variables through the entry's "count_query" and "item_query",
+    so that only the referenced items and fields are loaded instead of the whole
+    collection. Each referenced item is loaded once, with the union of the fields
+    referenced on it.
+    """
+    default_missing = MISSING if use_missing_sentinel else None
+
+    # Position -> top-level fields referenced on the item, or None for the whole item
+    fields_by_position: dict[tuple[bool, int], Optional[set[str]]] = {}
+    for vp in paths:
+        position = _collection_item_position(vp.collection_index)
+        if position is None:
+            continue
+        if not vp.field_path:
+            fields_by_position[position] = None
+        elif fields_by_position.get(position, set()) is not None:
+            fields_by_position.setdefault(position, set()).add(vp.field_path[0])
+
+    items = {
+        position: collection_entry["item_query"](patient_id, *position, fields)
+        for position, fields in fields_by_position.items()
+    }
+
+    size = None
+    resolved: dict[str, Any] = {}
+    for vp in paths:
+        key = vp.to_string()
+
+        # Special-case: collection.size
+        if vp.collection_index is None and vp.field_path == ["size"]:
+            if size is None:
+                size = collection_entry["count_query"](patient_id)
+            resolved[key] = size
+            continue
+
+        position = _collection_item_position(vp.collection_index)
+        item = items.get(position) if position is not None else None
+        if item is None:
+            resolved[key] = default_missing
+        elif not vp.field_path:
+            resolved[key] = item
+        else:
+            resolved[key] = _navigate_field_path(item, vp.field_path)
+
+    return resolved
+
+
 def resolve_collection_variables(
     context: ResolverContext,
     variable_paths: list[VariablePath],
@@ -739,6 +890,10 @@ def resolve_collection_variables(
             "query": callable(patient_id) -> list[BaseModel | dict],
             "collection": True,
         }
+
+    If the entry also has a "count_query" and an "item_query", ``.size`` is resolved
+    with a count and indexed items are loaded one at a time rather than loading the
+    whole collection.
     """
     logger = logging.getLogger(__name__)
 
@@ -768,6 +923,24 @@ def resolve_collection_variables(
                 resolved[vp.to_string()] = MISSING if use_missing_sentinel else None
             continue
 
+        if collection_entry.get("count_query") and collection_entry.get("item_query"):
+            try:
+                resolved.update(
+                    _resolve_collection_paths_by_item(
+                        patient_id, paths, collection_entry, use_missing_sentinel
+                    )
+                )
+            except Exception as exc:
+                logger.error(
+                    "Error querying collection '%s' for patient '%s': %s",
+                    namespace,
+                    patient_id,
+                    exc,
+                )
+                for vp in paths:
+                    resolved[vp.to_string()] = MISSING if use_missing_sentinel else None
+            continue
+
         query_fn = collection_entry.get("query")
         if query_fn is None:
             logger.debug(
@@ -1,7 +1,13 @@
 import logging
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, Optional
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
 from service.workflow.datasourcing.data_catalogue import get_catalogue
 from service.workflow.datasourcing.data_sourcing import (
     MISSING,
@@ -21,64 +27,170 @@ from service.workflow.datasourcing.variable_type_coercion import (
 from service.workflow.datasourcing.variable_type_registry import (
     get_expected_type_for_variable,
 )
-from service.workflow.evaluate.jsonlogic_parser import extract_variables_from_rule
-from service.workflow.evaluate.rules_engine import RulesEngineFacade, RuleStatus
+from service.workflow.evaluate.rules_engine import RuleStatus, compile_rule
 
 logger = logging.getLogger(__name__)
 
 
-class RuleEvaluator:
+# Namespaces resolved as collections of a patient's records rather than single objects
+COLLECTION_NAMESPACES = {
+    "vitals",
+    "pregnancies",
+    "referrals",
+    "assessments",
+    "forms",
+    "all_wf",
+}
+
+SYSTEM_LITERAL_VAR_NAMES = {"local-date", "local-time", "local-date-time"}
+CURRENT_USER_PREFIX = "current-user."
+
+# Number of SQL statements executed by the current thread or task while a
+# ``VariableResolutionContext`` is resolving, or None when nothing is counting
+_statement_count: ContextVar[Optional[list[int]]] = ContextVar(
+    "_statement_count", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(*_args) -> None:
+    counter = _statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def _navigate_dict_path(root: Any, path_parts: list[str]) -> Any:
+    """Navigate through dicts (and simple objects) for dotted paths."""
+    current: Any = root
+    for part in path_parts:
+        if isinstance(current, dict):
+            if part not in current:
+                return MISSING
+            current = current.get(part)
+        else:
+            if not hasattr(current, part):
+                return MISSING
+            current = getattr(current, part)
+
+        # Explicit nulls remain null even if there are more path parts.
+        if current is None:
+            return None
+    return current
+
+
+def get_collection_namespaces(rules: Iterable[Optional[str]]) -> set[str]:
     """
-    Evaluates workflow rules by:
-    1. Extracting variables from the rule (extractor)
-    2. Resolving variables to actual data (resolver)
-    3. Evaluating the rule with resolved data (rule engine)
+    Return the collection namespaces (e.g. ``vitals``) referenced by the given rules,
+    so that callers evaluating many rules can load those collections up front.
     """
+    namespaces: set[str] = set()
+    for rule in rules:
+        if not rule:
+            continue
+        for var_str in compile_rule(rule).variables:
+            vp = VariablePath.from_string(var_str)
+            if vp is not None and vp.namespace in COLLECTION_NAMESPACES:
+                namespaces.add(vp.namespace)
+    return namespaces
 
-    def __init__(self, catalogue: Optional[dict[str, Any]] = None):
-        """
-        Initialize the evaluator.
 
-        :param catalogue: Data catalogue to use for resolving variables.
-                         If None, uses the default catalogue.
-        """
-        self.catalogue = catalogue or get_catalogue()
+class VariableResolutionContext:
+    """
+    Resolves rule variables for one evaluation scope, such as the branches of a single
+    workflow step, and shares the results between every rule evaluated in that scope.
 
-    def evaluate_rule(
+    The variables of all rules given up front are resolved together on first use, so
+    each datasource object or collection is loaded once for the whole scope rather
+    than once per rule. Variables of other rules are resolved on demand and cached.
+    ``query_count`` reports the number of SQL statements executed while resolving.
+    """
+
+    def __init__(
         self,
-        rule: Optional[str],
         patient_id: str,
         workflow_instance_id: Optional[str] = None,
         current_user: Optional[dict[str, Any]] = None,
-    ) -> tuple[RuleStatus, list[VariableResolution]]:
+        catalogue: Optional[dict[str, Any]] = None,
+        rules: Iterable[Optional[str]] = (),
+    ):
         """
-        Evaluate a rule with a given context.
-
-        :param rule: JsonLogic rule string to evaluate
         :param patient_id: Patient ID for data resolution
-        :param workflow_instance_id: When set, enables ``wf.*`` and ties them to this instance
-        :param current_user: User context for ``current-user.*`` system variables.
-                             When omitted, ``current-user.*`` will resolve as missing.
-        :returns: Tuple of (RuleStatus, list of VariableResolution)
+        :param workflow_instance_id: When set, enables ``wf.*`` and ties them to this
+                                     instance
+        :param current_user: User context for ``current-user.*`` system variables
+        :param catalogue: Data catalogue to use for resolving variables.
+                          If None, uses the default catalogue.
+        :param rules: Rules which will be evaluated in this scope
         """
-        if rule is None or rule == "":
-            return (RuleStatus.TRUE, [])
-
-        variable_strings = extract_variables_from_rule(rule)
-        logger.debug(
-            "Variables to resolve: %s for patient %s", variable_strings, patient_id
-        )
+        self.patient_id = patient_id
+        self.workflow_instance_id = workflow_instance_id
+        self.current_user = current_user
+        self.catalogue = catalogue or get_catalogue()
+        self.query_count = 0
+
+        self._pending: set[str] = set()
+        for rule in rules:
+            if rule:
+                self._pending.update(compile_rule(rule).variables)
+
+        # Variable string -> key of its value in ``_resolved``, or None if the
+        # variable is not resolvable
+        self._keys: dict[str, Optional[str]] = {}
+        self._resolved: dict[str, Any] = {}
+
+    @property
+    def resolver_context(self) -> dict[str, Any]:
+        """The ID mapping passed to the datasource resolvers."""
+        context: dict[str, Any] = {"patient_id": self.patient_id}
+        if self.workflow_instance_id:
+            context["workflow_instance_id"] = self.workflow_instance_id
+        return context
+
+    def resolve(self, variable_strings: Iterable[str]) -> dict[str, Any]:
+        """
+        Resolve the given variables, reusing values already resolved in this scope.
 
+        :param variable_strings: Variables referenced by a rule
+        :returns: Dict mapping variable names to type-coerced values, or
+                  :data:`MISSING` when there is no data
+        """
+        variable_strings = set(variable_strings)
+        unresolved = (variable_strings | self._pending) - self._keys.keys()
+        self._pending.clear()
+        if unresolved:
+            with self._count_statements():
+                self._resolve_batch(unresolved)
+
+        resolved = {}
+        for var_str in variable_strings:
+            key = self._keys[var_str]
+            if key is not None:
+                # A resolver may leave out a variable it has no data for
+                resolved[key] = self._resolved.get(key, MISSING)
+        return resolved
+
+    @contextmanager
+    def _count_statements(self) -> Iterator[None]:
+        """
+        Adds the SQL statements executed within the block to ``query_count``. The
+        counter is a context variable, so statements of other threads and greenlets
+        running through the same engine are not counted.
+        """
+        counter = [0]
+        token = _statement_count.set(counter)
+        try:
+            yield
+        finally:
+            _statement_count.reset(token)
+            self.query_count += counter[0]
+            # An enclosing context also executed these statements
+            outer = _statement_count.get()
+            if outer is not None:
+                outer[0] += counter[0]
+
+    def _resolve_batch(self, variable_strings: set[str]) -> None:
+        """Resolve a set of not yet resolved variables with one lookup per datasource."""
         # Split variables into simple datasource variables and collection-based paths.
-        collection_namespaces = {
-            "vitals",
-            "pregnancies",
-            "referrals",
-            "assessments",
-            "forms",
-            "all_wf",
-        }
-
         collection_paths: list[VariablePath] = []
         wf_paths: list[VariablePath] = []
         object_paths: list[VariablePath] = []
@@ -86,20 +198,22 @@ class RuleEvaluator:
         system_literal_vars: set[str] = set()
         current_user_vars: set[str] = set()
 
-        system_literal_var_names = {"local-date", "local-time", "local-date-time"}
-        current_user_prefix = "current-user."
-
         for var_str in variable_strings:
-            if var_str in system_literal_var_names:
+            self._keys[var_str] = None
+
+            if var_str in SYSTEM_LITERAL_VAR_NAMES:
                 system_literal_vars.add(var_str)
+                self._keys[var_str] = var_str
                 continue
-            if var_str.startswith(current_user_prefix):
+            if var_str.startswith(CURRENT_USER_PREFIX):
                 current_user_vars.add(var_str)
+                self._keys[var_str] = var_str
                 continue
 
             vp = VariablePath.from_string(var_str)
-            if vp is not None and vp.namespace in collection_namespaces:
+            if vp is not None and vp.namespace in COLLECTION_NAMESPACES:
                 collection_paths.append(vp)
+                self._keys[var_str] = vp.to_string()
                 continue
             if (
                 vp is not None
@@ -107,20 +221,26 @@ class RuleEvaluator:
                 and vp.collection_index is None
             ):
                 wf_paths.append(vp)
+                self._keys[var_str] = vp.to_string()
                 continue
 
             if vp is not None and self._is_catalogue_object_namespace(vp.namespace):
                 object_paths.append(vp)
+                self._keys[var_str] = vp.to_string()
                 continue
 
             dv = DatasourceVariable.from_string(var_str)
             if dv is not None:
                 simple_variables.append(dv)
+                self._keys[var_str] = f"{dv.obj.name}.{dv.attr.name}"
 
-        context: dict[str, Any] = {"patient_id": patient_id}
-        if workflow_instance_id:
-            context["workflow_instance_id"] = workflow_instance_id
+        logger.debug(
+            "Variables to resolve: %s for patient %s",
+            variable_strings,
+            self.patient_id,
+        )
 
+        context = self.resolver_context
         resolved_data: dict[str, Any] = {}
         if simple_variables:
             resolved_data.update(
@@ -173,60 +293,20 @@ class RuleEvaluator:
                 resolved_data["local-date-time"] = now.isoformat()
 
         if current_user_vars:
-            if current_user is None:
+            if self.current_user is None:
                 for var_str in current_user_vars:
                     resolved_data[var_str] = MISSING
             else:
-
-                def _navigate_dict_path(root: Any, path_parts: list[str]) -> Any:
-                    """Navigate through dicts (and simple objects) for dotted paths."""
-                    current: Any = root
-                    for part in path_parts:
-                        if isinstance(current, dict):
-                            if part not in current:
-                                return MISSING
-                            current = current.get(part)
-                        else:
-                            if not hasattr(current, part):
-                                return MISSING
-                            current = getattr(current, part)
-
-                        # Explicit nulls remain null even if there are more path parts.
-                        if current is None:
-                            return None
-                    return current
-
                 for var_str in current_user_vars:
                     # e.g. "current-user.name" -> ["name"]
                     field_path = var_str.split(".")[1:]
                     resolved_data[var_str] = _navigate_dict_path(
-                        current_user, field_path
+                        self.current_user, field_path
                     )
 
         logger.debug("Resolved data for context %s: %s", context, resolved_data)
 
-        resolved_data = self._apply_type_coercion(resolved_data)
-
-        missing_vars = [k for k, v in resolved_data.items() if v is MISSING]
-        if missing_vars:
-            logger.info(
-                "Missing data for variables: %s for context %s", missing_vars, context
-            )
-            var_resolutions = self._create_variable_resolutions(resolved_data)
-            return (RuleStatus.NOT_ENOUGH_DATA, var_resolutions)
-
-        # Replace sentinel values before passing to JsonLogic (should be none after the
-        # missing-vars early return, but keep this defensive).
-        resolved_for_engine = {
-            k: (None if v is MISSING else v) for k, v in resolved_data.items()
-        }
-
-        rule_engine = RulesEngineFacade(rule=rule, args={})
-        evaluation_result = rule_engine.evaluate(input=resolved_for_engine)
-
-        var_resolutions = self._create_variable_resolutions(resolved_data)
-
-        return (evaluation_result.status, var_resolutions)
+        self._resolved.update(self._apply_type_coercion(resolved_data))
 
     def _apply_type_coercion(self, resolved_data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -246,6 +326,88 @@ class RuleEvaluator:
             out[key] = coerce_resolved_value_for_rule(value, expected, variable_tag=key)
         return out
 
+    def _is_catalogue_object_namespace(self, namespace: str) -> bool:
+        """True if ``namespace`` is a non-collection datasource object in the catalogue."""
+        entry = self.catalogue.get(namespace)
+        if not entry or entry.get("collection"):
+            return False
+        return callable(entry.get("query"))
+
+
+class RuleEvaluator:
+    """
+    Evaluates workflow rules by:
+    1. Extracting variables from the rule (extractor)
+    2. Resolving variables to actual data (resolver)
+    3. Evaluating the rule with resolved data (rule engine)
+    """
+
+    def __init__(self, catalogue: Optional[dict[str, Any]] = None):
+        """
+        Initialize the evaluator.
+
+        :param catalogue: Data catalogue to use for resolving variables.
+                         If None, uses the default catalogue.
+        """
+        self.catalogue = catalogue or get_catalogue()
+
+    def evaluate_rule(
+        self,
+        rule: Optional[str],
+        patient_id: str,
+        workflow_instance_id: Optional[str] = None,
+        current_user: Optional[dict[str, Any]] = None,
+        context: Optional[VariableResolutionContext] = None,
+    ) -> tuple[RuleStatus, list[VariableResolution]]:
+        """
+        Evaluate a rule with a given context.
+
+        :param rule: JsonLogic rule string to evaluate
+        :param patient_id: Patient ID for data resolution
+        :param workflow_instance_id: When set, enables ``wf.*`` and ties them to this instance
+        :param current_user: User context for ``current-user.*`` system variables.
+                             When omitted, ``current-user.*`` will resolve as missing.
+        :param context: Resolution context shared with other rules evaluated for the
+                        same patient and instance; when omitted, the rule's variables
+                        are resolved on their own
+        :returns: Tuple of (RuleStatus, list of VariableResolution)
+        """
+        if rule is None or rule == "":
+            return (RuleStatus.TRUE, [])
+
+        compiled_rule = compile_rule(rule)
+        if context is None:
+            context = VariableResolutionContext(
+                patient_id,
+                workflow_instance_id=workflow_instance_id,
+                current_user=current_user,
+                catalogue=self.catalogue,
+            )
+
+        resolved_data = context.resolve(compiled_rule.variables)
+
+        missing_vars = [k for k, v in resolved_data.items() if v is MISSING]
+        if missing_vars:
+            logger.info(
+                "Missing data for variables: %s for context %s",
+                missing_vars,
+                context.resolver_context,
+            )
+            var_resolutions = self._create_variable_resolutions(resolved_data)
+            return (RuleStatus.NOT_ENOUGH_DATA, var_resolutions)
+
+        # Replace sentinel values before passing to JsonLogic (should be none after the
+        # missing-vars early return, but keep this defensive).
+        resolved_for_engine = {
+            k: (None if v is MISSING else v) for k, v in resolved_data.items()
+        }
+
+        evaluation_result = compiled_rule.evaluate(resolved_for_engine)
+
+        var_resolutions = self._create_variable_resolutions(resolved_data)
+
+        return (evaluation_result.status, var_resolutions)
+
     def _create_variable_resolutions(
         self, resolved_data: dict[str, Any]
     ) -> list[VariableResolution]:
@@ -277,10 +439,3 @@ class RuleEvaluator:
                     )
                 )
         return var_resolutions
-
-    def _is_catalogue_object_namespace(self, namespace: str) -> bool:
-        """True if ``namespace`` is a non-collection datasource object in the catalogue."""
-        entry = self.catalogue.get(namespace)
-        if not entry or entry.get("collection"):
-            return False
-        return callable(entry.get("query"))
@@ -1,3 +1,4 @@
+import functools
 import json
 from enum import Enum
 from typing import Any
@@ -86,47 +87,10 @@ class RulesEngineImpl:
     """
 
     def __init__(self, rule: str, args: dict[str, Any]):
-        """Parse and store the rule for evaluation with the given resolved arguments."""
+        """Look up the compiled rule for evaluation with the given resolved arguments."""
         self.args: dict[str, Any] = args
-        self.rule = self._parse_rules(rule)
-
-    def _parse_rules(self, rule: str) -> dict[str, Any]:
-        """
-        Attempt to deserialize a rule string into a rule object ready for evaluation
-
-        :param rule: a string representing a rule
-        :returns: a dict representing a rule
-        :rtype: Dict
-        :raises: ValueError
-        """
-        try:
-            parsed = json.loads(rule)
-            if not isinstance(parsed, dict):
-                raise ValueError("Rule must be a JSON object")
-
-            # Support rules stored with additional metadata at the top level, e.g.:
-            # {"<=": [{"var": "patient.age"}, 17], "name": "isChild"}
-            #
-            # json-logic-py requires exactly one top-level operator key, so we
-            # strip known metadata keys and unwrap when a single operator remains.
-            if len(parsed) != 1:
-                metadata_keys = {
-                    "name",
-                    "label",
-                    "id",
-                    "description",
-                    "comment",
-                    "notes",
-                    "enabled",
-                    "version",
-                }
-                candidate = {k: v for k, v in parsed.items() if k not in metadata_keys}
-                if len(candidate) == 1:
-                    return normalize_rule_literals(candidate)
-
-            return normalize_rule_literals(parsed)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in rule: {e}")
+        self._compiled = compile_rule(rule)
+        self.rule = self._compiled.rule
 
     def evaluate(self, input: dict[str, Any]) -> RuleEvaluationResult:
         """
@@ -136,17 +100,89 @@ class RulesEngineImpl:
         :returns: RuleEvaluationResult with status TRUE/FALSE/NOT_ENOUGH_DATA
         :rtype: RuleEvaluationResult
         """
-        all_data = {**input, **self.args}
+        return self._compiled.evaluate({**input, **self.args})
 
-        cleaned_data = {k.lstrip("$"): v for k, v in all_data.items()}
 
-        nested_data = _flatten_to_nested(cleaned_data)
+# Rule metadata keys stripped from the top level of a rule before evaluation
+_RULE_METADATA_KEYS = {
+    "name",
+    "label",
+    "id",
+    "description",
+    "comment",
+    "notes",
+    "enabled",
+    "version",
+}
+
+# Maximum number of distinct rules kept compiled in memory by compile_rule
+RULE_CACHE_SIZE = 1024
+
+
+def _parse_rule(rule: str) -> dict[str, Any]:
+    """
+    Attempt to deserialize a rule string into a rule object ready for evaluation
+
+    :param rule: a string representing a rule
+    :returns: a dict representing a rule
+    :rtype: Dict
+    :raises: ValueError
+    """
+    try:
+        parsed = json.loads(rule)
+        if not isinstance(parsed, dict):
+            raise ValueError("Rule must be a JSON object")
+
+        # Support rules stored with additional metadata at the top level, e.g.:
+        # {"<=": [{"var": "patient.age"}, 17], "name": "isChild"}
+        #
+        # json-logic-py requires exactly one top-level operator key, so we
+        # strip known metadata keys and unwrap when a single operator remains.
+        if len(parsed) != 1:
+            candidate = {
+                k: v for k, v in parsed.items() if k not in _RULE_METADATA_KEYS
+            }
+            if len(candidate) == 1:
+                return normalize_rule_literals(candidate)
+
+        return normalize_rule_literals(parsed)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in rule: {e}")
+
+
+class CompiledRule:
+    """
+    A rule parsed once, together with everything about it which does not depend on
+    the data it is evaluated against.
+
+    Compiled rules are shared between evaluations through ``compile_rule``, so they
+    must be treated as immutable.
+    """
 
-        required_vars = extract_variables_from_rule(self.rule)
+    __slots__ = ("rule", "variables", "_variable_paths")
+
+    def __init__(self, rule: dict[str, Any]):
+        """
+        :param rule: a parsed and normalized rule
+        """
+        self.rule = rule
+        self.variables: frozenset[str] = frozenset(extract_variables_from_rule(rule))
+        self._variable_paths = tuple((var, var.split(".")) for var in self.variables)
+
+    def evaluate(self, data: dict[str, Any]) -> RuleEvaluationResult:
+        """
+        Evaluate the rule against the given data
+
+        :param data: flat dict of variable names, in dot notation, to values
+        :returns: RuleEvaluationResult with status TRUE/FALSE/NOT_ENOUGH_DATA
+        :rtype: RuleEvaluationResult
+        """
+        cleaned_data = {k.lstrip("$"): v for k, v in data.items()}
+
+        nested_data = _flatten_to_nested(cleaned_data)
 
         missing_vars = set()
-        for var in required_vars:
-            parts = var.split(".")
+        for var, parts in self._variable_paths:
             current = nested_data
             found = True
             for part in parts:
@@ -170,6 +206,21 @@ class RulesEngineImpl:
         return RuleEvaluationResult(status=status)
 
 
+@functools.lru_cache(maxsize=RULE_CACHE_SIZE)
+def compile_rule(rule: str) -> CompiledRule:
+    """
+    Parse a rule and precompute the variables it references. Results are cached by
+    rule text, so evaluating the same template branch for many workflow instances
+    parses its rule only once. Rules are keyed by their content, so an edited rule is
+    simply compiled again under its new text.
+
+    :param rule: a string representing a rule
+    :returns: the compiled rule
+    :raises: ValueError if the rule is invalid
+    """
+    return CompiledRule(_parse_rule(rule))
+
+
 def evaluate_branches(
     branches: list[dict[str, Any]],
     data: dict[str, Any],
@@ -184,13 +235,10 @@ def evaluate_branches(
     :param datasources: Optional datasources to merge with data
     :returns: Dict with 'status' and either 'branch' or 'missing_variables'
     """
-    datasources = datasources or {}
+    all_data = {**data, **(datasources or {})}
 
     for branch in branches:
-        rule = branch["rule"]
-
-        facade = RulesEngineFacade(rule, datasources)
-        result = facade.evaluate(data)
+        result = compile_rule(branch["rule"]).evaluate(all_data)
 
         if result.status == RuleStatus.NOT_ENOUGH_DATA:
             return {
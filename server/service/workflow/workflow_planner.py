@@ -1,8 +1,12 @@
+import logging
 from typing import Any, Optional
 
 from common.commonUtil import get_current_time
 from enums import WorkflowStatusEnum, WorkflowStepStatusEnum
-from service.workflow.evaluate.rule_evaluator import RuleEvaluator
+from service.workflow.evaluate.rule_evaluator import (
+    RuleEvaluator,
+    VariableResolutionContext,
+)
 from service.workflow.evaluate.rules_engine import RuleStatus
 from service.workflow.workflow_errors import InvalidWorkflowActionError
 from service.workflow.workflow_view import WorkflowView
@@ -19,6 +23,8 @@ from validation.workflow_models import (
     WorkflowTemplateStepBranchModel,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class WorkflowPlanner:
     """
@@ -68,6 +74,8 @@ class WorkflowPlanner:
         patient_id: str,
         workflow_instance_id: str,
         current_user: Optional[dict[str, Any]] = None,
+        evaluator: Optional[RuleEvaluator] = None,
+        context: Optional[VariableResolutionContext] = None,
     ) -> WorkflowBranchEvaluation:
         """
         Evaluates a single workflow branch condition.
@@ -75,15 +83,18 @@ class WorkflowPlanner:
         :param branch: Workflow template branch to evaluate
         :param patient_id: Patient ID for data resolution
         :param workflow_instance_id: Active instance ID for ``wf.*`` variables
+        :param evaluator: Rule evaluator to use; a new one is created if omitted
+        :param context: Variable resolution context shared by the step's branches
         :returns: Evaluation result for the branch
         """
         rule = branch.condition.rule if branch.condition else None
-        evaluator = RuleEvaluator()
+        evaluator = evaluator or RuleEvaluator()
         rule_status, var_resolutions = evaluator.evaluate_rule(
             rule,
             patient_id,
             workflow_instance_id=workflow_instance_id,
             current_user=current_user,
+            context=context,
         )
 
         branch_evaluation = WorkflowBranchEvaluation(
@@ -100,6 +111,7 @@ class WorkflowPlanner:
         ctx: WorkflowView,
         step: WorkflowInstanceStepModel,
         current_user: Optional[dict[str, Any]] = None,
+        catalogue: Optional[dict[str, Any]] = None,
     ) -> WorkflowStepEvaluation:
         """
         Evaluates all branches of a workflow step and determines which branch
@@ -107,6 +119,9 @@ class WorkflowPlanner:
 
         :param ctx: Workflow view
         :param step: Workflow instance step to evaluate
+        :param catalogue: Data catalogue to resolve rule variables with, such as
+                          one with prefetched collections; defaults to the
+                          standard catalogue
         :returns: Evaluation result for the step
         """
         branch_evaluations = []
@@ -123,15 +138,34 @@ class WorkflowPlanner:
 
         branches = ctx.get_template_step(step.workflow_template_step_id).branches
 
+        # Resolve the variables of all branches together so that datasources shared
+        # between branches are only looked up once for the step
+        evaluator = RuleEvaluator(catalogue)
+        context = VariableResolutionContext(
+            patient_id,
+            workflow_instance_id=ctx.instance.id,
+            current_user=current_user,
+            catalogue=evaluator.catalogue,
+            rules=(branch.condition.rule for branch in branches if branch.condition),
+        )
+
         branch_evaluations = [
             WorkflowPlanner._evaluate_branch(
                 branch,
                 patient_id,
                 ctx.instance.id,
                 current_user=current_user,
+                evaluator=evaluator,
+                context=context,
             )
             for branch in branches
         ]
+        logger.debug(
+            "Evaluated %d branches of step %s with %d SQL statements",
+            len(branches),
+            step.id,
+            context.query_count,
+        )
         selected_branch_id = WorkflowPlanner._select_branch_id(branch_evaluations)
 
         step_evaluation = WorkflowStepEvaluation(
@@ -1,9 +1,11 @@
 import json
+from collections import defaultdict
 from typing import Any, Optional
 
 import data.db_operations as crud
 from common.commonUtil import get_current_time, get_uuid
 from data import orm_serializer
+from data.db_operations import unit_of_work
 from enums import (
     WorkflowInstanceDataFieldTypeEnum,
     WorkflowStatusEnum,
@@ -15,6 +17,11 @@ from models.workflows import (
     WorkflowTemplateOrm,
     WorkflowTemplateStepOrm,
 )
+from service.workflow.datasourcing.data_catalogue import prefetch_collections
+from service.workflow.datasourcing.data_sourcing import (
+    invalidate_workflow_instance_snapshot,
+)
+from service.workflow.evaluate.rule_evaluator import get_collection_namespaces
 from service.workflow.workflow_planner import WorkflowPlanner
 from service.workflow.workflow_view import WorkflowView
 from validation.workflow_api_models import (
@@ -25,6 +32,7 @@ from validation.workflow_models import (
     StartStepActionModel,
     StartWorkflowActionModel,
     WorkflowActionModel,
+    WorkflowInstanceEvaluation,
     WorkflowInstanceModel,
     WorkflowInstanceStepModel,
     WorkflowStepEvaluation,
@@ -135,19 +143,69 @@ class WorkflowService:
     def upsert_workflow_instance(workflow_instance: WorkflowInstanceModel):
         """
         Insert or update a workflow instance in the database.
+
+        An instance loaded with ``get_workflow_instance`` or ``get_workflow_instances``
+        is saved by writing only what changed since it was loaded: the instance's
+        changed columns and, in one statement, its new and changed steps. Steps with a
+        new or changed form are instead merged along with it. Other instances are
+        merged whole with their steps. ``last_edited`` is set on the instance and on
+        each step written.
         """
-        workflow_instance.last_edited = get_current_time()
+        now = get_current_time()
+        workflow_instance.last_edited = now
 
-        for instance_step in workflow_instance.steps:
-            instance_step.last_edited = get_current_time()
+        if not workflow_instance.is_saved():
+            for instance_step in workflow_instance.steps:
+                instance_step.last_edited = now
 
-        WorkflowService._validate_workflow_instance_dates(workflow_instance)
+            WorkflowService._validate_workflow_instance_dates(workflow_instance)
 
-        workflow_instance_orm = orm_serializer.unmarshal(
-            WorkflowInstanceOrm, workflow_instance.model_dump()
-        )
+            workflow_instance_orm = orm_serializer.unmarshal(
+                WorkflowInstanceOrm, workflow_instance.model_dump()
+            )
+            crud.common_crud.merge(workflow_instance_orm, autocommit=False)
+            WorkflowService._refresh_step_form_answer_values(workflow_instance.steps)
+            unit_of_work.commit()
+        else:
+            changed_steps = [
+                step for step in workflow_instance.steps if step.get_changes()
+            ]
+            for instance_step in changed_steps:
+                instance_step.last_edited = now
+
+            WorkflowService._validate_workflow_instance_dates(workflow_instance)
+
+            # Forms are written through the step's relationship, so steps with a new
+            # or changed form are merged with it, whether or not the step itself is
+            # new, and left out of the statement writing the other steps
+            merged_steps = [
+                step
+                for step in changed_steps
+                if "form" in step.get_changes()
+                and (step.is_saved() or step.form is not None)
+            ]
+            merged_step_ids = {step.id for step in merged_steps}
+            for instance_step in merged_steps:
+                crud.common_crud.merge(
+                    orm_serializer.unmarshal(
+                        WorkflowInstanceStepOrm, instance_step.model_dump()
+                    ),
+                    autocommit=False,
+                )
+            WorkflowService._refresh_step_form_answer_values(merged_steps)
+
+            crud.update_workflow_instance_changes(
+                workflow_instance.id,
+                workflow_instance.get_changes(),
+                [
+                    step.model_dump(exclude={"form"})
+                    for step in changed_steps
+                    if step.id not in merged_step_ids
+                ],
+            )
 
-        crud.common_crud.merge(workflow_instance_orm)
+        workflow_instance.mark_saved()
+        invalidate_workflow_instance_snapshot(workflow_instance.id)
 
     @staticmethod
     def upsert_workflow_instance_step(
@@ -166,7 +224,23 @@ class WorkflowService:
             WorkflowInstanceStepOrm, workflow_instance_step.model_dump()
         )
 
-        crud.common_crud.merge(workflow_instance_step_orm)
+        crud.common_crud.merge(workflow_instance_step_orm, autocommit=False)
+        WorkflowService._refresh_step_form_answer_values([workflow_instance_step])
+        unit_of_work.commit()
+
+    @staticmethod
+    def _refresh_step_form_answer_values(
+        steps: list[WorkflowInstanceStepModel],
+    ) -> None:
+        """
+        Recompute the answer projection of the forms written with the given steps, so
+        that rules evaluated against the forms collection see their answers.
+        """
+        form_ids = [
+            step.form["id"] for step in steps if step.form and step.form.get("id")
+        ]
+        if form_ids:
+            crud.refresh_form_answer_values(form_ids)
 
     @staticmethod
     def upsert_workflow_template(workflow_template: WorkflowTemplateModel):
@@ -198,6 +272,7 @@ class WorkflowService:
 
         workflow_instance_dict = orm_serializer.marshal(workflow_instance_orm)
         workflow_instance = WorkflowInstanceModel(**workflow_instance_dict)
+        workflow_instance.mark_saved()
         return workflow_instance
 
     @staticmethod
@@ -219,10 +294,13 @@ class WorkflowService:
             for workflow_instance_orm in workflow_instance_orms
         ]
 
-        return [
+        workflow_instances = [
             WorkflowInstanceModel(**workflow_instance_dict)
             for workflow_instance_dict in workflow_instance_dicts
         ]
+        for workflow_instance in workflow_instances:
+            workflow_instance.mark_saved()
+        return workflow_instances
 
     @staticmethod
     def get_workflow_instance_step(
@@ -286,6 +364,7 @@ class WorkflowService:
         Delete a workflow instance from the database by its ID.
         """
         crud.delete_workflow(WorkflowInstanceOrm, id=workflow_instance_id)
+        invalidate_workflow_instance_snapshot(workflow_instance_id)
 
     @staticmethod
     def get_available_workflow_actions(
@@ -329,6 +408,94 @@ class WorkflowService:
         )
         return step_evaluation
 
+    @staticmethod
+    def evaluate_workflow_instances(
+        workflow_template_id: Optional[str] = None,
+        workflow_instance_ids: Optional[list[str]] = None,
+        current_user: Optional[dict[str, Any]] = None,
+    ) -> list[WorkflowInstanceEvaluation]:
+        """
+        Evaluate the current step of many active workflow instances at once, e.g.
+        after a template edit or a data import.
+
+        The patient data collections referenced by the branch rules of the current
+        steps are loaded for every patient involved with one query per collection
+        before any step is evaluated. Instances without a patient or current step are
+        skipped.
+
+        :param workflow_template_id: If given, only evaluate instances of this template
+        :param workflow_instance_ids: If given, only evaluate these instances
+        :param current_user: User context for ``current-user.*`` rule variables
+        :returns: Step evaluation of each instance, grouped by patient
+        """
+        workflow_instance_orms = crud.read_workflow_instances(
+            status=WorkflowStatusEnum.ACTIVE,
+            workflow_template_id=workflow_template_id,
+            workflow_instance_ids=workflow_instance_ids,
+            with_steps=True,
+        )
+
+        templates: dict[str, Optional[WorkflowTemplateModel]] = {}
+        views_by_patient: dict[str, list[WorkflowView]] = defaultdict(list)
+        for workflow_instance_orm in workflow_instance_orms:
+            if (
+                not workflow_instance_orm.patient_id
+                or not workflow_instance_orm.current_step_id
+            ):
+                continue
+
+            template_id = workflow_instance_orm.workflow_template_id
+            if template_id not in templates:
+                templates[template_id] = WorkflowService.get_workflow_template(
+                    template_id
+                )
+            if templates[template_id] is None:
+                continue
+
+            workflow_instance = WorkflowInstanceModel(
+                **orm_serializer.marshal(workflow_instance_orm)
+            )
+            workflow_view = WorkflowView(templates[template_id], workflow_instance)
+            if workflow_view.has_instance_step(workflow_instance.current_step_id):
+                views_by_patient[workflow_instance.patient_id].append(workflow_view)
+
+        def current_step(workflow_view: WorkflowView) -> WorkflowInstanceStepModel:
+            return workflow_view.get_instance_step(
+                workflow_view.instance.current_step_id
+            )
+
+        rules = (
+            branch.condition.rule
+            for workflow_views in views_by_patient.values()
+            for workflow_view in workflow_views
+            for branch in workflow_view.get_template_step(
+                current_step(workflow_view).workflow_template_step_id
+            ).branches
+            if branch.condition
+        )
+        catalogue = prefetch_collections(
+            get_collection_namespaces(rules), views_by_patient.keys()
+        )
+
+        evaluations = []
+        for workflow_views in views_by_patient.values():
+            for workflow_view in workflow_views:
+                step = current_step(workflow_view)
+                step_evaluation = WorkflowPlanner.evaluate_step(
+                    ctx=workflow_view,
+                    step=step,
+                    current_user=current_user,
+                    catalogue=catalogue,
+                )
+                evaluations.append(
+                    WorkflowInstanceEvaluation(
+                        workflow_instance_id=workflow_view.instance.id,
+                        workflow_instance_step_id=step.id,
+                        step_evaluation=step_evaluation,
+                    )
+                )
+        return evaluations
+
     @staticmethod
     def advance_workflow(
         workflow_view: WorkflowView, current_user: Optional[dict[str, Any]] = None
@@ -481,11 +648,12 @@ class WorkflowService:
         workflow_instance_id: str,
         items: list[tuple[str, WorkflowInstanceDataFieldTypeEnum, Any]],
     ) -> None:
-        """Persist one or more ``workflow_instance_data`` rows (upsert per field_tag)."""
-        for field_tag, field_type, value in items:
-            crud.upsert_workflow_instance_data_row(
-                workflow_instance_id, field_tag, field_type, value
-            )
+        """
+        Persist one or more ``workflow_instance_data`` rows (upsert per field_tag) with
+        a single statement.
+        """
+        crud.upsert_workflow_instance_data_rows(workflow_instance_id, items)
+        invalidate_workflow_instance_snapshot(workflow_instance_id)
 
     @staticmethod
     def _validate_start_date_and_last_edited(
@@ -545,3 +545,39 @@ def test_get_patient_form(
     # this v1 form is no longer created in data seeding -> refactor when mobile endpoints are updated
     # response = api_get(endpoint="/api/mobile/forms/49300028162/dt9")
     # assert response.status_code == 200
+
+
+def test_sync_reading_changes_pages_through_feed(
+    patient_factory, reading_factory, api_get
+):
+    since = int(time.time()) - 1
+    patient_factory.create(id="49300028170")
+    reading_ids = [f"49300028170-changes-{i}" for i in range(3)]
+    for reading_id in reading_ids:
+        reading_factory.create(id=reading_id, patient_id="49300028170")
+
+    seen = []
+    cursor = None
+    while True:
+        endpoint = f"/api/sync/readings/changes?since={since}&limit=2"
+        if cursor:
+            endpoint += f"&cursor={cursor}"
+        response = api_get(endpoint=endpoint)
+        assert response.status_code == 200
+
+        response_body = decamelize(response.json())
+        assert len(response_body["readings"]) <= 2
+        seen += [r["id"] for r in response_body["readings"]]
+
+        cursor = response_body["next_cursor"]
+        if cursor is None:
+            break
+
+    # Every changed reading is returned exactly once across the pages
+    assert len(seen) == len(set(seen))
+    assert set(reading_ids) <= set(seen)
+
+
+def test_sync_changes_rejects_malformed_cursor(api_get):
+    response = api_get(endpoint="/api/sync/patients/changes?since=0&cursor=garbage")
+    assert response.status_code == 400
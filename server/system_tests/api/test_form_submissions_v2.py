@@ -14,6 +14,7 @@ from models import (
     FormTemplateOrmV2,
     LangVersionOrmV2,
 )
+from models.formsV2 import FormAnswerValueOrmV2
 
 # TODO: Refactor to use fixtures for setup/teardown
 #   Create fixtures to handle:
@@ -240,6 +241,9 @@ def test_update_form_submission_v2(
         submission_obj = crud.read(FormSubmissionOrmV2, id=submission["id"])
         answer_id = submission_obj.answers[0].id
         created_submission_ids.append(submission_id)
+        assert crud.read_form_answer_values([submission_id]) == {
+            submission_id: {"heart_rate": 90}
+        }
 
         # Patch update answer
         patch_payload = {
@@ -266,6 +270,18 @@ def test_update_form_submission_v2(
         assert submission_obj.answers[0].form_submission_id == submission["id"]
         actual = json.loads(submission_obj.answers[0].answer)
         assert actual["number"] == 22
+        assert crud.read_form_answer_values([submission_id]) == {
+            submission_id: {"heart_rate": 22}
+        }
+
+        # The decoded answers can be rebuilt from the submissions
+        crud.db_session.query(FormAnswerValueOrmV2).delete()
+        crud.db_session.commit()
+        assert crud.read_form_answer_values([submission_id]) == {submission_id: {}}
+        crud.rebuild_form_answer_values()
+        assert crud.read_form_answer_values([submission_id]) == {
+            submission_id: {"heart_rate": 22}
+        }
 
     finally:
         _clean_up(
@@ -0,0 +1,99 @@
+import json
+
+from sqlalchemy import event
+
+import app as server  # noqa: F401 (registers the API and the unit of work hooks)
+import data.db_operations as crud
+from authentication import set_access_token_claims, sms_auth
+from common.commonUtil import get_uuid
+from models import AssessmentOrm, PatientOrm, ReadingOrm, UserOrm
+
+
+def _dispatch(app, user: UserOrm, method: str, endpoint: str, body: dict):
+    """Dispatch a request to the API in this process, authenticated as the user."""
+    request_context = app.test_request_context(
+        endpoint, method=method, json=json.loads(json.dumps(body))
+    )
+    with app.app_context(), request_context:
+        set_access_token_claims(
+            sms_auth.create_sms_access_claims(user.id, user.username)
+        )
+        response = app.full_dispatch_request()
+        response.get_data()
+    return response
+
+
+def _count_commits(database, dispatch):
+    """Return the response of a dispatched request and the number of its commits."""
+    commits = []
+
+    def count_commit(connection):
+        commits.append(connection)
+
+    event.listen(database.engine, "commit", count_commit)
+    try:
+        response = dispatch()
+    finally:
+        event.remove(database.engine, "commit", count_commit)
+    return response, len(commits)
+
+
+def test_reading_with_assessment_is_committed_once(app, database, patient_factory):
+    patient_id = "49300028160"
+    patient_factory.create(id=patient_id)
+    user = crud.read(UserOrm, email="admin@email.com")
+    reading_id = get_uuid()
+    assessment_id = get_uuid()
+    body = {
+        "reading": {
+            "id": reading_id,
+            "patient_id": patient_id,
+            "systolic_blood_pressure": 110,
+            "diastolic_blood_pressure": 80,
+            "heart_rate": 70,
+        },
+        "assessment": {
+            "id": assessment_id,
+            "patient_id": patient_id,
+            "follow_up_needed": False,
+        },
+    }
+
+    response, commits = _count_commits(
+        database,
+        lambda: _dispatch(app, user, "POST", "/api/patients/reading-assessment", body),
+    )
+
+    try:
+        assert response.status_code == 201
+        # The reading, its invariants, the assessment and the patient_latest refresh
+        # are all written in the request's single transaction
+        assert commits == 1
+        assert crud.read(ReadingOrm, id=reading_id) is not None
+        assert crud.read(AssessmentOrm, id=assessment_id) is not None
+    finally:
+        crud.delete_by(AssessmentOrm, id=assessment_id)
+        crud.delete_by(ReadingOrm, id=reading_id)
+
+
+def test_patient_info_update_is_committed_once(app, database, patient_factory):
+    patient_id = "49300028161"
+    patient_factory.create(id=patient_id, name="AB")
+    user = crud.read(UserOrm, email="admin@email.com")
+    body = {
+        "name": "CD",
+        "sex": "FEMALE",
+        "date_of_birth": "1990-05-30",
+        "is_exact_date_of_birth": False,
+    }
+
+    response, commits = _count_commits(
+        database,
+        lambda: _dispatch(app, user, "PUT", f"/api/patients/{patient_id}/info", body),
+    )
+
+    assert response.status_code == 200
+    # The update and the new last_edited timestamp are written in one transaction
+    assert commits == 1
+    patient = crud.read(PatientOrm, id=patient_id)
+    assert patient.name == "CD"
@@ -471,6 +471,29 @@ def test_override_current_step(api_post, sequential_workflow_view_with_db):
     )
 
 
+def test_evaluate_workflow_instances(api_post, sequential_workflow_view_with_db):
+    workflow_view = sequential_workflow_view_with_db
+
+    WorkflowService.start_workflow(workflow_view)
+    WorkflowService.upsert_workflow_instance(workflow_view.instance)
+
+    response = api_post(
+        endpoint="/api/workflow/instances/evaluate",
+        json={"workflow_instance_ids": [workflow_view.instance.id]},
+    )
+    assert response.status_code == 200
+
+    items = decamelize(response.json())["items"]
+    assert len(items) == 1
+    assert items[0]["workflow_instance_id"] == workflow_view.instance.id
+    assert items[0]["workflow_instance_step_id"] == "si-1"
+    assert items[0]["step_evaluation"]["selected_branch_id"] == "b-1"
+
+    # Exactly one of the selectors must be given
+    response = api_post(endpoint="/api/workflow/instances/evaluate", json={})
+    assert response.status_code == 422
+
+
 @pytest.fixture
 def workflow_instance1(vht_user_id, patient_id, workflow_template1):
     instance_id = get_uuid()
@@ -0,0 +1,67 @@
+import json
+
+import data.db_operations as crud
+from common.commonUtil import get_uuid
+from enums import QuestionTypeEnum
+from models import (
+    FormAnswerOrmV2,
+    FormClassificationOrmV2,
+    FormQuestionTemplateOrmV2,
+    FormSubmissionOrmV2,
+    FormTemplateOrmV2,
+)
+from models.formsV2 import FormAnswerValueOrmV2
+
+
+def test_number_answers_round_trip_through_the_projection(patient_factory):
+    patient_id = "49300028162"
+    patient_factory.create(id=patient_id)
+    template = FormTemplateOrmV2(
+        id=get_uuid(),
+        classification=FormClassificationOrmV2(
+            id=get_uuid(), name_string_id=get_uuid()
+        ),
+    )
+    heart_rate = FormQuestionTemplateOrmV2(
+        id=get_uuid(),
+        template=template,
+        order=0,
+        question_type=QuestionTypeEnum.INTEGER,
+        user_question_id="heart_rate",
+    )
+    temperature = FormQuestionTemplateOrmV2(
+        id=get_uuid(),
+        template=template,
+        order=1,
+        question_type=QuestionTypeEnum.DECIMAL,
+        user_question_id="temperature",
+    )
+    submission = FormSubmissionOrmV2(
+        id=get_uuid(), form_template_id=template.id, patient_id=patient_id
+    )
+    submission.answers = [
+        FormAnswerOrmV2(question_id=heart_rate.id, answer=json.dumps({"number": 72})),
+        FormAnswerOrmV2(
+            question_id=temperature.id, answer=json.dumps({"number": 98.6})
+        ),
+    ]
+    crud.create(template)
+    crud.create(submission)
+
+    try:
+        assert crud.refresh_form_answer_values([submission.id]) == 2
+        crud.db_session.commit()
+        # Read the values back from the database rather than the identity map
+        crud.db_session.expire_all()
+
+        answers = crud.read_form_answer_values([submission.id])[submission.id]
+
+        assert answers == {"heart_rate": 72, "temperature": 98.6}
+        assert isinstance(answers["heart_rate"], int)
+    finally:
+        crud.delete_all(FormAnswerValueOrmV2, form_submission_id=submission.id)
+        crud.delete_all(FormAnswerOrmV2, form_submission_id=submission.id)
+        crud.delete_all(FormSubmissionOrmV2, id=submission.id)
+        crud.delete_all(FormQuestionTemplateOrmV2, form_template_id=template.id)
+        crud.delete_all(FormTemplateOrmV2, id=template.id)
+        crud.delete_all(FormClassificationOrmV2, id=template.form_classification_id)
@@ -0,0 +1,98 @@
+import data.db_operations as crud
+import models
+from models.patients import PatientLatestOrm
+
+
+def _read_latest(patient_id):
+    crud.db_session.expire_all()
+    return crud.read(PatientLatestOrm, patient_id=patient_id)
+
+
+def test_create_reading_updates_latest_reading(patient_factory, reading_factory):
+    patient_factory.create(id="9001")
+    reading_factory.create(id="9001-r1", patient_id="9001", date_taken=1000)
+    reading_factory.create(id="9001-r2", patient_id="9001", date_taken=3000)
+    reading_factory.create(id="9001-r3", patient_id="9001", date_taken=2000)
+
+    latest = _read_latest("9001")
+    assert latest.reading_id == "9001-r2"
+    assert latest.date_taken == 3000
+
+
+def test_open_pregnancy_and_records(
+    patient_factory, pregnancy_factory, medical_record_factory
+):
+    patient_factory.create(id="9002")
+    pregnancy_factory.create(patient_id="9002", start_date=1000, end_date=2000)
+    open_pregnancy = pregnancy_factory.create(patient_id="9002", start_date=3000)
+    medical_record_factory.create(
+        patient_id="9002", information="old", is_drug_record=False, date_created=10
+    )
+    medical = medical_record_factory.create(
+        patient_id="9002", information="new", is_drug_record=False, date_created=20
+    )
+    drug = medical_record_factory.create(
+        patient_id="9002", information="drug", is_drug_record=True, date_created=5
+    )
+
+    latest = _read_latest("9002")
+    assert latest.pregnancy_id == open_pregnancy.id
+    assert latest.medical_record_id == medical.id
+    assert latest.drug_record_id == drug.id
+
+    # Closing the pregnancy through an update clears it from the projection
+    crud.update(models.PregnancyOrm, dict(end_date=4000), id=open_pregnancy.id)
+    assert _read_latest("9002").pregnancy_id is None
+
+
+def test_delete_falls_back_to_previous_record(patient_factory, medical_record_factory):
+    patient_factory.create(id="9003")
+    older = medical_record_factory.create(
+        patient_id="9003", information="older", is_drug_record=True, date_created=10
+    )
+    newer = models.MedicalRecordOrm(
+        patient_id="9003", information="newer", is_drug_record=True, date_created=20
+    )
+    crud.create(newer)
+    assert _read_latest("9003").drug_record_id == newer.id
+
+    crud.delete(newer)
+    assert _read_latest("9003").drug_record_id == older.id
+
+
+def test_rebuild_patient_latest(patient_factory, reading_factory):
+    patient_factory.create(id="9004")
+    reading_factory.create(id="9004-r1", patient_id="9004", date_taken=1000)
+
+    crud.db_session.query(PatientLatestOrm).delete()
+    crud.db_session.commit()
+    assert _read_latest("9004") is None
+
+    crud.rebuild_patient_latest()
+    assert _read_latest("9004").reading_id == "9004-r1"
+
+
+def test_session_writes_outside_common_crud_refresh_latest(patient_factory):
+    patient_factory.create(id="9005")
+    pregnancy = models.PregnancyOrm(patient_id="9005", start_date=1000)
+    crud.db_session.add(pregnancy)
+    crud.db_session.commit()
+    assert _read_latest("9005").pregnancy_id == pregnancy.id
+
+    # Bulk updates bypass the session's flush and refresh the projection themselves
+    crud.bulk_update(models.PregnancyOrm, [{"id": pregnancy.id, "end_date": 2000}])
+    crud.db_session.commit()
+    assert _read_latest("9005").pregnancy_id is None
+
+    crud.delete_all(models.PregnancyOrm, id=pregnancy.id)
+
+
+def test_moving_record_refreshes_previous_patient(patient_factory, reading_factory):
+    patient_factory.create(id="9006")
+    patient_factory.create(id="9007")
+    reading_factory.create(id="9006-r1", patient_id="9006", date_taken=1000)
+    assert _read_latest("9006").reading_id == "9006-r1"
+
+    crud.update(models.ReadingOrm, dict(patient_id="9007"), id="9006-r1")
+    assert _read_latest("9006").reading_id is None
+    assert _read_latest("9007").reading_id == "9006-r1"
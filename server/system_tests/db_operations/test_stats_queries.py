@@ -0,0 +1,84 @@
+import pytest
+
+import data.db_operations as crud
+from enums import TrafficLightEnum
+
+FROM, TO = 1_600_000_000, 1_600_500_000
+
+
+def _legacy_stats(facility="%", user="%"):
+    """Compute the stats with the per-metric raw SQL queries."""
+    filter = {"from": FROM, "to": TO}
+    colors = dict(crud.get_total_color_readings(facility, user, filter))
+    stats = {
+        "sent_referrals": crud.get_sent_referrals(facility, user, filter)[0][0],
+        "days_with_readings": crud.get_days_with_readings(facility, user, filter)[0][0],
+        "unique_patient_readings": crud.get_unique_patients_with_readings(
+            facility, user, filter
+        )[0][0],
+        "total_readings": crud.get_total_readings_completed(facility, user, filter)[0][
+            0
+        ],
+        "color_readings": {
+            status.value: colors.get(status.name, 0)
+            for status in crud.stats_queries.STATS_TRAFFIC_LIGHTS
+        },
+    }
+    if user == "%":
+        stats["patients_referred"] = crud.get_referred_patients(facility, filter)[0][0]
+    return stats
+
+
+@pytest.fixture
+def records(patient_factory, reading_factory, referral_factory):
+    patient_factory.create(id="9101")
+    patient_factory.create(id="9102")
+    reading_factory.create(
+        id="9101-r1",
+        patient_id="9101",
+        date_taken=FROM + 10,
+        traffic_light_status=TrafficLightEnum.RED_UP,
+    )
+    reading_factory.create(
+        id="9101-r2",
+        patient_id="9101",
+        date_taken=FROM + 20,
+        traffic_light_status=TrafficLightEnum.GREEN,
+    )
+    reading_factory.create(
+        id="9102-r1",
+        patient_id="9102",
+        date_taken=FROM + 200_000,
+        traffic_light_status=TrafficLightEnum.GREEN,
+    )
+    # Outside of the date range
+    reading_factory.create(id="9102-r2", patient_id="9102", date_taken=TO + 1)
+    referral_factory.create(patient_id="9101", date_referred=FROM + 30)
+    referral_factory.create(patient_id="9102", date_referred=FROM + 40)
+
+
+@pytest.mark.parametrize(
+    "facility, user_id",
+    [(None, None), ("H0000", None), (None, 1), ("H1000", None)],
+)
+def test_read_stats_summary_matches_individual_queries(records, facility, user_id):
+    summary = crud.read_stats_summary(
+        FROM,
+        TO,
+        facility=facility,
+        user_id=user_id,
+        include_referred_patients=user_id is None,
+    )
+    assert summary == _legacy_stats(
+        facility=facility or "%", user=str(user_id) if user_id else "%"
+    )
+
+
+def test_read_stats_summary(records):
+    summary = crud.read_stats_summary(FROM, TO, user_id=1)
+    assert summary["total_readings"] == 3
+    assert summary["unique_patient_readings"] == 2
+    assert summary["days_with_readings"] == 2
+    assert summary["sent_referrals"] == 2
+    assert summary["color_readings"][TrafficLightEnum.GREEN.value] == 2
+    assert summary["color_readings"][TrafficLightEnum.RED_UP.value] == 1
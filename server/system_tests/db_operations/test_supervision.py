@@ -0,0 +1,22 @@
+import data.db_operations as crud
+
+
+def test_add_vht_to_supervise_replaces_supervised_vhts(user_factory):
+    cho = user_factory.create(email="cho@supervision", role="CHO")
+    vht1 = user_factory.create(email="vht1@supervision")
+    vht2 = user_factory.create(email="vht2@supervision")
+    vht3 = user_factory.create(email="vht3@supervision")
+
+    crud.add_vht_to_supervise(cho.id, [vht1.id, vht2.id])
+    assert crud.get_supervised_vht_ids(cho.id) == {vht1.id, vht2.id}
+
+    crud.add_vht_to_supervise(cho.id, [vht2.id, vht3.id])
+    assert crud.get_supervised_vht_ids(cho.id) == {vht2.id, vht3.id}
+    assert {vht.id for vht in cho.vht_list} == {vht2.id, vht3.id}
+
+    crud.add_supervised_vhts(cho.id, [vht1.id])
+    assert crud.get_supervised_vhts(cho.id) == sorted([vht1.id, vht2.id, vht3.id])
+
+    # Clean up the supervises rows so that the factories can delete the users
+    crud.add_vht_to_supervise(cho.id, None)
+    assert crud.get_supervised_vht_ids(cho.id) == frozenset()
@@ -0,0 +1,123 @@
+import data.db_operations as crud
+from common.commonUtil import get_uuid
+from models import (
+    FormClassificationOrmV2,
+    FormSubmissionOrmV2,
+    FormTemplateOrmV2,
+    RuleGroupOrm,
+    WorkflowClassificationOrm,
+    WorkflowInstanceOrm,
+    WorkflowInstanceStepOrm,
+    WorkflowTemplateOrm,
+    WorkflowTemplateStepBranchOrm,
+    WorkflowTemplateStepOrm,
+)
+
+
+def _create_template(steps: int, branches_per_step: int) -> WorkflowTemplateOrm:
+    classification = WorkflowClassificationOrm(id=get_uuid(), name="Bulk delete")
+    template = WorkflowTemplateOrm(
+        id=get_uuid(),
+        description="Bulk delete",
+        version="1",
+        classification=classification,
+    )
+    for _ in range(steps):
+        step = WorkflowTemplateStepOrm(
+            id=get_uuid(), name="Step", description="Step", workflow_template=template
+        )
+        for _ in range(branches_per_step):
+            WorkflowTemplateStepBranchOrm(
+                id=get_uuid(), step=step, condition=RuleGroupOrm(id=get_uuid())
+            )
+    crud.create(template)
+    return template
+
+
+def test_delete_workflows_dry_run_counts_rows_without_deleting(get_row_count):
+    template = _create_template(steps=3, branches_per_step=2)
+    branch_count = get_row_count(WorkflowTemplateStepBranchOrm)
+
+    counts = crud.delete_workflows(
+        template_ids=[template.id],
+        classification_ids=[template.classification_id],
+        dry_run=True,
+    )
+
+    assert counts == {
+        "workflow_template_step_branch": 6,
+        "rule_group": 6,
+        "workflow_template_step": 3,
+        "workflow_template": 1,
+        "workflow_classification": 1,
+    }
+    assert get_row_count(WorkflowTemplateStepBranchOrm) == branch_count
+
+    crud.delete_workflows(
+        template_ids=[template.id], classification_ids=[template.classification_id]
+    )
+
+
+def test_delete_workflow_deletes_steps_branches_and_rule_groups(get_row_count):
+    template = _create_template(steps=2, branches_per_step=2)
+    rule_group_ids = [
+        branch.condition_id for step in template.steps for branch in step.branches
+    ]
+    rule_group_count = get_row_count(RuleGroupOrm)
+
+    crud.delete_workflow(
+        WorkflowTemplateOrm, delete_classification=True, id=template.id
+    )
+
+    assert crud.read(WorkflowTemplateOrm, id=template.id) is None
+    assert crud.read_template_steps(workflow_template_id=template.id) == []
+    assert get_row_count(RuleGroupOrm) == rule_group_count - len(rule_group_ids)
+    assert all(crud.read(RuleGroupOrm, id=id) is None for id in rule_group_ids)
+
+
+def test_delete_workflow_instance_deletes_step_form_submissions(patient_factory):
+    patient_id = "49300028163"
+    patient_factory.create(id=patient_id)
+    form_template = FormTemplateOrmV2(
+        id=get_uuid(),
+        classification=FormClassificationOrmV2(
+            id=get_uuid(), name_string_id=get_uuid()
+        ),
+    )
+    crud.create(form_template)
+    form = FormSubmissionOrmV2(
+        id=get_uuid(), form_template_id=form_template.id, patient_id=patient_id
+    )
+    instance = WorkflowInstanceOrm(
+        id=get_uuid(),
+        name="Bulk delete",
+        description="Bulk delete",
+        patient_id=patient_id,
+    )
+    WorkflowInstanceStepOrm(
+        id=get_uuid(),
+        name="Step",
+        description="Step",
+        workflow_instance=instance,
+        form=form,
+    )
+    crud.create(instance)
+
+    try:
+        counts = crud.delete_workflows(instance_ids=[instance.id], dry_run=True)
+        assert counts == {
+            "workflow_instance_step": 1,
+            "form_submission_v2": 1,
+            "workflow_instance": 1,
+        }
+
+        crud.delete_workflow(WorkflowInstanceOrm, id=instance.id)
+
+        assert crud.read(WorkflowInstanceOrm, id=instance.id) is None
+        assert crud.read(FormSubmissionOrmV2, id=form.id) is None
+    finally:
+        crud.delete_all(FormSubmissionOrmV2, id=form.id)
+        crud.delete_all(FormTemplateOrmV2, id=form_template.id)
+        crud.delete_all(
+            FormClassificationOrmV2, id=form_template.form_classification_id
+        )
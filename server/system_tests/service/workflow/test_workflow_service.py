@@ -7,7 +7,19 @@ from server.tests.helpers import (
     make_workflow_instance,
     make_workflow_instance_step,
 )
-
+from sqlalchemy import event
+
+import data.db_operations as crud
+from enums import QuestionTypeEnum
+from models import (
+    FormAnswerOrmV2,
+    FormClassificationOrmV2,
+    FormQuestionTemplateOrmV2,
+    FormSubmissionOrmV2,
+    FormTemplateOrmV2,
+    WorkflowInstanceOrm,
+)
+from models.formsV2 import FormAnswerValueOrmV2
 from service.workflow.workflow_service import WorkflowService
 from service.workflow.workflow_view import WorkflowView
 from validation.workflow_models import (
@@ -17,6 +29,7 @@ from validation.workflow_models import (
     StartStepActionModel,
     StartWorkflowActionModel,
     WorkflowInstanceModel,
+    WorkflowInstanceStepModel,
     WorkflowTemplateModel,
     WorkflowTemplateStepBranchModel,
     WorkflowTemplateStepModel,
@@ -60,6 +73,106 @@ def test_workflow_service__upsert_workflow_instance():
     assert upserted_workflow.steps[0].last_edited == TIMESTAMP_TOMORROW
 
 
+def test_workflow_service__upsert_loaded_workflow_instance_writes_changed_steps():
+    """
+    Checks that saving a loaded workflow instance writes only its changed and new
+    steps, and the form of a new step with its answers projected for the rules.
+    """
+    workflow_id = get_uuid()
+    step_ids = [get_uuid() for _ in range(3)]
+    workflow = WorkflowInstanceModel(
+        **make_workflow_instance(
+            id=workflow_id,
+            patient_id=PATIENT_ID,
+            steps=[
+                make_workflow_instance_step(
+                    id=step_id, workflow_instance_id=workflow_id
+                )
+                for step_id in step_ids
+            ],
+        )
+    )
+    WorkflowService.upsert_workflow_instance(workflow)
+    form_template = FormTemplateOrmV2(
+        id=get_uuid(),
+        classification=FormClassificationOrmV2(
+            id=get_uuid(), name_string_id=get_uuid()
+        ),
+    )
+    question = FormQuestionTemplateOrmV2(
+        id=get_uuid(),
+        template=form_template,
+        order=0,
+        question_type=QuestionTypeEnum.INTEGER,
+        user_question_id="heart_rate",
+    )
+    crud.create(form_template)
+
+    form_id = get_uuid()
+    new_step_id = get_uuid()
+    try:
+        workflow = WorkflowService.get_workflow_instance(workflow_id)
+        workflow.steps[1].status = "Completed"
+        workflow.steps.append(
+            WorkflowInstanceStepModel(
+                **make_workflow_instance_step(
+                    id=new_step_id,
+                    workflow_instance_id=workflow_id,
+                    form_id=form_id,
+                    form={
+                        "id": form_id,
+                        "form_template_id": form_template.id,
+                        "patient_id": PATIENT_ID,
+                        "answers": [
+                            {
+                                "id": get_uuid(),
+                                "question_id": question.id,
+                                "answer": {"number": 72},
+                            }
+                        ],
+                    },
+                )
+            )
+        )
+
+        statements = []
+
+        def record_statement(_conn, _cursor, statement, parameters, *_args):
+            if "workflow_instance_step" in statement:
+                statements.append(str(parameters))
+
+        engine = crud.db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            WorkflowService.upsert_workflow_instance(workflow)
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+        written = " ".join(statements)
+        assert step_ids[1] in written
+        assert new_step_id in written
+        assert step_ids[0] not in written
+        assert step_ids[2] not in written
+
+        crud.db_session.expire_all()
+        saved = WorkflowService.get_workflow_instance(workflow_id)
+        assert saved.steps[1].status == "Completed"
+        new_step = saved.get_instance_step(new_step_id)
+        assert new_step.form_id == form_id
+        assert crud.read(FormSubmissionOrmV2, id=form_id) is not None
+        assert crud.read_form_answer_values([form_id]) == {form_id: {"heart_rate": 72}}
+    finally:
+        crud.delete_workflow(WorkflowInstanceOrm, id=workflow_id)
+        crud.delete_all(FormAnswerValueOrmV2, form_submission_id=form_id)
+        crud.delete_all(FormAnswerOrmV2, form_submission_id=form_id)
+        crud.delete_all(FormSubmissionOrmV2, id=form_id)
+        crud.delete_all(FormQuestionTemplateOrmV2, id=question.id)
+        crud.delete_all(FormTemplateOrmV2, id=form_template.id)
+        crud.delete_all(
+            FormClassificationOrmV2, id=form_template.form_classification_id
+        )
+
+
 @pytest.fixture
 def conditional_workflow_template():
     """
@@ -47,3 +47,26 @@ def test_patients_for_vht(user_factory, facility_factory, patient_factory):
     assoc.associate(p2, f, u2)
 
     assert filter.patients_for_vht(u1) == [p1]
+
+
+def test_annotated_global_patient_list(user_factory, facility_factory, patient_factory):
+    f1 = facility_factory.create(name="F1")
+    f2 = facility_factory.create(name="F2")
+    u1 = user_factory.create(email="u1@a", health_facility_name="F1")
+    u2 = user_factory.create(email="u2@a", health_facility_name="F2")
+    p1 = patient_factory.create(id="9001", name="Search Match")
+    p2 = patient_factory.create(id="9002", name="Search Match")
+    patient_factory.create(id="9003", name="Other")
+
+    assoc.associate(p1, f1, u1)
+    assoc.associate(p1, f2, u2)
+    assoc.associate(p2, f2, u2)
+
+    results = filter.annotated_global_patient_list(u1, "SEARCH")
+    assert [(r.id, bool(r.is_added)) for r in results] == [
+        ("9001", True),
+        ("9002", False),
+    ]
+
+    paged = filter.annotated_global_patient_list(u1, "SEARCH", limit=1, page=2)
+    assert [r.id for r in paged] == ["9002"]
@@ -0,0 +1,122 @@
+import flask
+import pytest
+
+from common import cache_utils
+from common.cache_utils import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the monotonic clock used by the caches with a controllable one."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_utils.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=10)
+    # A per-entry ttl cannot extend past the cache's own
+    cache.set("c", 3, ttl=600)
+
+    clock[0] += 30
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock[0] += 31
+    assert cache.get("a", "missing") == "missing"
+    assert cache.get("c") is None
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=-5)
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted_when_full():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    cache.set("c", 4)
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+
+    # Reading "a" makes "c" the least recently used entry
+    cache.get("a")
+    cache.set("d", 5)
+    assert cache.get("c") is None
+    assert cache.get("a") == 3
+
+
+def test_remove_where_and_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    for i in range(4):
+        cache.set(i, {"id": i % 2})
+    cache.remove_where(lambda _, value: value["id"] == 1)
+    assert [cache.get(i) for i in range(4)] == [{"id": 0}, None, {"id": 0}, None]
+
+    cache.pop(0)
+    assert cache.get(0) is None
+    cache.clear()
+    assert cache.get(2) is None
+
+
+def test_set_skips_values_loaded_before_a_removal():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.set("a", 1, generation=generation)
+    assert cache.get("a") == 1
+
+    generation = cache.generation
+    # Another request invalidates an entry while this one loads its value
+    cache.pop("b")
+    cache.set("b", 2, generation=generation)
+    assert cache.get("b") is None
+
+    cache.set("b", 3, generation=cache.generation)
+    assert cache.get("b") == 3
+
+
+def test_invalidate_user_data():
+    cache_utils.user_data_cache.clear()
+    cache_utils.user_data_cache.set("vht", {"id": 1, "phone_numbers": ["+1"]})
+    cache_utils.user_data_cache.set("cho", {"id": 2, "phone_numbers": []})
+
+    # Cached data is copied so changes made by one request do not leak to others
+    user_data = cache_utils.get_cached_user_data("vht")
+    user_data["phone_numbers"].append("+2")
+    assert cache_utils.get_cached_user_data("vht")["phone_numbers"] == ["+1"]
+
+    app = flask.Flask(__name__)
+    with app.test_request_context("/"):
+        flask.g.current_user = {"id": 1}
+        cache_utils.invalidate_user_data(2)
+        assert flask.g.current_user == {"id": 1}
+        assert cache_utils.get_cached_user_data("cho") is None
+
+        cache_utils.invalidate_user_data(1)
+        assert "current_user" not in flask.g
+        assert cache_utils.get_cached_user_data("vht") is None
+
+
+def test_invalidate_supervised_vhts():
+    cache = cache_utils.supervision_cache
+    cache.clear()
+    cache.set(1, frozenset({10, 11}))
+    cache.set(2, frozenset({12}))
+
+    cache_utils.invalidate_supervised_vhts(1)
+    assert cache.get(1) is None
+    assert cache.get(2) == frozenset({12})
+
+    cache_utils.invalidate_supervised_vhts()
+    assert cache.get(2) is None
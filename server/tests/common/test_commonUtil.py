@@ -25,3 +25,18 @@ valid_nested_list_with_int_none_dict = {"k": "v", "list": [1, 2, 3, None]}
 )
 def test_encryptor_wrong_key(json, expected):
     assert expected == commonUtil.filterNestedAttributeWithValueNone(json)
+
+
+@pytest.mark.parametrize(
+    "last_edited, id",
+    [(0, "a"), (1700000000, "8f7c6a1e-4a7b-4c1d-9d0e-3f1b2c3d4e5f"), (42, 17)],
+)
+def test_sync_cursor_round_trip(last_edited, id):
+    cursor = commonUtil.encode_sync_cursor(last_edited, id)
+    assert commonUtil.decode_sync_cursor(cursor) == (last_edited, id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "WzEsMiwzXQ==", "WyJ4IiwiYSJd"])
+def test_decode_sync_cursor_rejects_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        commonUtil.decode_sync_cursor(cursor)
@@ -0,0 +1,184 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Importing form_utils loads the app config, which requires database settings
+for key, value in {
+    "DB_USERNAME": "user",
+    "DB_PASSWORD": "password",
+    "DB_HOSTNAME": "localhost",
+    "DB_PORT": "3306",
+    "DB_NAME": "testdb",
+}.items():
+    os.environ.setdefault(key, value)
+
+# form_utils and the serializers import each other, so the serializers load first
+import data.orm_serializer  # noqa: E402, F401
+from common import form_utils  # noqa: E402
+from data.db_operations import unit_of_work  # noqa: E402
+
+TRANSLATIONS = {
+    ("name", "English"): "Intake",
+    ("name", "French"): "Admission",
+    ("q1", "English"): "Heart rate?",
+    ("q1", "French"): "Fréquence cardiaque ?",
+    ("q2", "English"): "Symptoms?",
+    ("opt1", "English"): "Yes",
+    ("opt1", "French"): "Oui",
+}
+
+
+@pytest.fixture
+def lang_versions():
+    """Patch the database with TRANSLATIONS and return the mocked session."""
+    form_utils.translation_cache.clear()
+
+    def query(_model):
+        chain = MagicMock()
+        chain.filter.return_value.all.side_effect = lambda: [
+            SimpleNamespace(string_id=string_id, lang=lang, text=text)
+            for (string_id, lang), text in TRANSLATIONS.items()
+        ]
+        return chain
+
+    with patch.object(form_utils, "crud") as mock_crud:
+        mock_crud.db_session.query.side_effect = query
+        yield mock_crud.db_session
+    form_utils.translation_cache.clear()
+
+
+def test_format_template_resolves_translations_with_one_query(lang_versions):
+    template = {
+        "id": "ft1",
+        "form_classification_id": "fc1",
+        "classification": {"id": "fc1", "name_string_id": "name"},
+        "questions": [
+            {"question_string_id": "q1", "question_type": "INTEGER"},
+            {
+                "question_string_id": "q2",
+                "question_type": "MULTIPLE_CHOICE",
+                "mc_options": ["opt1"],
+            },
+        ],
+    }
+
+    formatted = form_utils.format_template(template, ["English", "French"])
+
+    assert lang_versions.query.call_count == 1
+    assert "form_classification_id" not in formatted
+    assert formatted["classification"]["name"] == {
+        "English": "Intake",
+        "French": "Admission",
+    }
+    q1, q2 = formatted["questions"]
+    assert q1["question_text"] == {
+        "English": "Heart rate?",
+        "French": "Fréquence cardiaque ?",
+    }
+    assert q2["question_text"] == {"English": "Symptoms?", "French": None}
+    assert q2["mc_options"] == [
+        {"string_id": "opt1", "translations": {"English": "Yes", "French": "Oui"}}
+    ]
+
+    # Every translation, including missing ones, is now served from the cache
+    assert form_utils.format_template(template, ["English", "French"]) == formatted
+    assert lang_versions.query.call_count == 1
+
+
+def test_resolve_string_text_cache_and_invalidation(lang_versions):
+    assert form_utils.resolve_string_text("q1") == "Heart rate?"
+    assert form_utils.resolve_string_text("q1", "english") == "Heart rate?"
+    assert form_utils.resolve_string_text("q1") == "Heart rate?"
+    assert form_utils.resolve_string_text(None) is None
+    assert lang_versions.query.call_count == 2
+
+    TRANSLATIONS[("q1", "English")] = "Pulse?"
+    try:
+        form_utils.invalidate_translations("q1")
+        assert form_utils.resolve_string_text("q1") == "Pulse?"
+        assert lang_versions.query.call_count == 3
+    finally:
+        TRANSLATIONS[("q1", "English")] = "Heart rate?"
+
+
+def test_writes_invalidate_translations_once_committed(lang_versions, monkeypatch):
+    session = MagicMock(info={})
+    session.in_transaction.return_value = True
+    monkeypatch.setattr(form_utils, "object_session", lambda _: session)
+    form_utils.resolve_string_text("q1")
+
+    for string_id in ("q1", "q1", "q2"):
+        form_utils._invalidate_translations_after_commit(  # noqa: SLF001
+            None, None, SimpleNamespace(string_id=string_id)
+        )
+    # Until the transaction ends, other requests still read the committed text
+    form_utils.resolve_string_text("q1")
+    assert lang_versions.query.call_count == 1
+
+    unit_of_work._run_after_commit_callbacks(  # noqa: SLF001
+        session, SimpleNamespace(parent=None)
+    )
+    form_utils.resolve_string_text("q1")
+    assert lang_versions.query.call_count == 2
+
+
+@pytest.fixture
+def template_cache_dir(tmp_path, monkeypatch):
+    """Keep rendered templates on disk under a temporary directory."""
+    form_utils.rendered_template_cache.clear()
+    monkeypatch.setattr(form_utils, "FORM_TEMPLATE_CACHE_DIR", str(tmp_path))
+    yield tmp_path
+    form_utils.rendered_template_cache.clear()
+
+
+def test_rendered_templates_are_cached_with_etag(template_cache_dir):
+    body = {"id": "ft1", "questions": [{"order": 0, "question_text": "Heart rate?"}]}
+    rendered = form_utils.cache_rendered_form_template("ft1", "English", body)
+    assert rendered.body is body
+    assert form_utils.read_rendered_form_template("ft1", "English") is rendered
+    assert form_utils.read_rendered_form_template("ft1", None) is None
+
+    # The ETag depends on the content only
+    other = form_utils.cache_rendered_form_template("ft2", "English", dict(body))
+    assert other.etag == rendered.etag
+    changed = form_utils.cache_rendered_form_template("ft1", None, {"id": "ft1"})
+    assert changed.etag != rendered.etag
+
+    # Another worker, or this one after a restart, reads the copy kept on disk
+    form_utils.rendered_template_cache.clear()
+    assert form_utils.read_rendered_form_template("ft1", "English") == rendered
+
+
+def test_invalidate_rendered_templates(template_cache_dir):
+    for template_id in ("ft1", "ft2"):
+        for lang in ("English", None):
+            form_utils.cache_rendered_form_template(template_id, lang, {"id": 1})
+
+    form_utils.invalidate_rendered_form_templates("ft1")
+    assert form_utils.read_rendered_form_template("ft1", "English") is None
+    assert form_utils.read_rendered_form_template("ft1", None) is None
+    assert form_utils.read_rendered_form_template("ft2", None) is not None
+    assert len(list(template_cache_dir.glob("*.json"))) == 2
+
+    form_utils.invalidate_rendered_form_templates()
+    assert form_utils.read_rendered_form_template("ft2", "English") is None
+    assert list(template_cache_dir.iterdir()) == []
+
+
+def test_memory_copy_follows_invalidation_by_another_worker(template_cache_dir):
+    rendered = form_utils.cache_rendered_form_template("ft1", None, {"id": "ft1"})
+    assert form_utils.read_rendered_form_template("ft1", None) is rendered
+
+    # Another worker invalidates the template: its file is deleted
+    for path in template_cache_dir.glob("*.json"):
+        path.unlink()
+    assert form_utils.read_rendered_form_template("ft1", None) is None
+
+    # ... and another worker renders it again: its file is replaced
+    form_utils.cache_rendered_form_template("ft1", None, {"id": "ft1"})
+    form_utils.rendered_template_cache.set(("ft1", None), (rendered, -1))
+    reread = form_utils.read_rendered_form_template("ft1", None)
+    assert reread is not rendered
+    assert reread == rendered
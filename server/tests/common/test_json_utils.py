@@ -0,0 +1,85 @@
+import dataclasses
+import datetime
+import json
+
+import pytest
+from flask import Flask
+from humps import camelize
+
+from common.json_utils import CamelCaseJSONProvider, camelize_keys
+
+BODY = {
+    "patient_id": "1",
+    "readings": [
+        {"systolic_blood_pressure": 120, "urine_test": {"leukocytes": "+"}},
+        {"systolic_blood_pressure": 130, "urine_test": None},
+    ],
+    "next_cursor": None,
+    "_private_key": 1,
+    "ALL_CAPS": 2,
+    "already_camelCase": 3,
+    "nested": [[{"a_b": {"c_d": ["e_f"]}}]],
+}
+
+
+@dataclasses.dataclass
+class _Point:
+    x_value: int
+    y_value: int
+
+
+def test_camelize_keys_matches_humps():
+    assert camelize_keys(BODY) == camelize(BODY)
+
+
+def test_camelize_keys_leaves_values_and_non_str_keys():
+    body = {1: {"snake_key": "snake_value"}, "items": ("a_b", _Point(1, 2))}
+    assert camelize_keys(body) == {
+        1: {"snakeKey": "snake_value"},
+        "items": ["a_b", {"xValue": 1, "yValue": 2}],
+    }
+
+
+@pytest.fixture
+def respond():
+    app = Flask(__name__)
+    app.json = CamelCaseJSONProvider(app)
+
+    def respond(rv, path="/"):
+        """Build the response a view at ``path`` returning ``rv`` would send."""
+        with app.test_request_context(path):
+            return app.make_response(rv)
+
+    return respond
+
+
+def test_response_is_camel_case(respond):
+    response = respond(BODY)
+    assert response.mimetype == "application/json"
+    assert response.is_camel_case
+    assert json.loads(response.data) == camelize(BODY)
+
+    response = respond([{"first_name": "a"}, {"first_name": "b"}])
+    assert json.loads(response.data) == [{"firstName": "a"}, {"firstName": "b"}]
+
+
+def test_response_serializes_extra_types(respond):
+    response = respond(
+        {
+            "tag_set": {"x"},
+            "created_at": datetime.datetime(
+                2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc
+            ),
+            "big_number": 2**70,
+        }
+    )
+    assert json.loads(response.data) == {
+        "tagSet": ["x"],
+        "createdAt": "2024-01-02 03:04:05+00:00",
+        "bigNumber": 2**70,
+    }
+
+
+def test_openapi_response_is_not_converted(respond):
+    response = respond({"snake_case": True}, path="/openapi/openapi.json")
+    assert json.loads(response.data) == {"snake_case": True}
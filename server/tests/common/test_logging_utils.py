@@ -0,0 +1,120 @@
+import io
+import json
+import logging
+import logging.handlers
+import threading
+
+import pytest
+from pythonjsonlogger.jsonlogger import JsonFormatter
+
+from common import logging_utils
+from common.logging_utils import SamplingFilter
+
+
+class RecordingHandler(logging.Handler):
+    """Keeps the records it handles with the name of the thread handling them."""
+
+    records: list = []
+
+    def emit(self, record):
+        RecordingHandler.records.append((record, threading.current_thread().name))
+
+
+class TagFilter(logging.Filter):
+    """Tags records with the name of the thread which logged them."""
+
+    def filter(self, record):
+        record.logged_on = threading.current_thread().name
+        return True
+
+
+def _record(name, level=logging.INFO):
+    return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    logging_utils._stop_listeners()  # noqa: SLF001
+    root.handlers = handlers
+    root.setLevel(level)
+
+
+def test_sampling_filter_uses_rate_of_closest_listed_logger(monkeypatch):
+    sampling_filter = SamplingFilter({"service": 0.5, "service.workflow": 0.0})
+
+    monkeypatch.setattr(logging_utils.random, "random", lambda: 0.25)
+    assert sampling_filter.filter(_record("service.stats"))
+    assert not sampling_filter.filter(_record("service.workflow.planner"))
+    assert sampling_filter.filter(_record("api.resources"))
+
+    monkeypatch.setattr(logging_utils.random, "random", lambda: 0.75)
+    assert not sampling_filter.filter(_record("service.stats"))
+
+
+def test_sampling_filter_keeps_warnings():
+    sampling_filter = SamplingFilter({"service": 0.0})
+
+    assert not sampling_filter.filter(_record("service", logging.DEBUG))
+    assert sampling_filter.filter(_record("service", logging.WARNING))
+    assert sampling_filter.filter(_record("service", logging.ERROR))
+
+
+def test_configure_logging_writes_records_from_listener_thread(restore_logging):
+    RecordingHandler.records = []
+    config = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {"recording": {"()": RecordingHandler, "level": "INFO"}},
+        "loggers": {"": {"handlers": ["recording"], "level": "DEBUG"}},
+    }
+    logging_utils.configure_logging(
+        config, [TagFilter(), SamplingFilter({"noisy": 0.0})]
+    )
+    assert [type(h) for h in logging.getLogger().handlers] == [
+        logging_utils.FormattedQueueHandler
+    ]
+
+    logger = logging.getLogger("tests.logging")
+    logger.info("written")
+    logger.debug("below the handler's level")
+    logging.getLogger("noisy").info("sampled out")
+    # Stopping the listener writes the records still queued
+    logging_utils._stop_listeners()  # noqa: SLF001
+
+    assert [record.getMessage() for record, _ in RecordingHandler.records] == [
+        "written"
+    ]
+    record, handled_on = RecordingHandler.records[0]
+    assert record.logged_on == threading.current_thread().name
+    assert handled_on != threading.current_thread().name
+
+
+def test_configure_logging_keeps_traceback_out_of_json_message(restore_logging):
+    stream = io.StringIO()
+    config = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"json": {"()": JsonFormatter}},
+        "handlers": {
+            "stream": {
+                "class": "logging.StreamHandler",
+                "formatter": "json",
+                "stream": stream,
+            }
+        },
+        "loggers": {"": {"handlers": ["stream"], "level": "INFO"}},
+    }
+    logging_utils.configure_logging(config)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("tests.logging").exception("failed %s", "request")
+    logging_utils._stop_listeners()  # noqa: SLF001
+
+    logged = json.loads(stream.getvalue())
+    assert logged["message"] == "failed request"
+    assert "ValueError: boom" in logged["exc_info"]
@@ -0,0 +1,21 @@
+from unittest.mock import MagicMock
+
+from common import cache_utils, phone_number_utils
+
+
+def test_add_user_phone_number_invalidates_user_data_after_commit(monkeypatch):
+    monkeypatch.setattr(phone_number_utils, "crud", MagicMock())
+    callbacks = []
+    monkeypatch.setattr(
+        phone_number_utils.unit_of_work, "after_commit", callbacks.append
+    )
+    cache_utils.user_data_cache.clear()
+    cache_utils.user_data_cache.set("vht", {"id": 1, "phone_numbers": []})
+
+    phone_number_utils.add_user_phone_number(1, "+16045550100")
+
+    # The new number is only flushed, so the cached data stays until the commit
+    assert cache_utils.get_cached_user_data("vht") is not None
+    for callback in callbacks:
+        callback()
+    assert cache_utils.get_cached_user_data("vht") is None
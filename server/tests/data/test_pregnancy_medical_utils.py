@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from data.db_operations import pregnancy_medical_utils
+from models import PregnancyOrm
+
+PATIENT_ID = "p-1"
+
+
+@pytest.fixture
+def sql_session(monkeypatch):
+    """A session on an in-memory database holding only the pregnancy table."""
+    engine = create_engine("sqlite://")
+    PregnancyOrm.__table__.create(engine)
+    session = Session(engine)
+    monkeypatch.setattr(pregnancy_medical_utils, "db_session", session)
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize(
+    ("existing", "start_date", "end_date", "pregnancy_id", "expected"),
+    [
+        # Open-ended pregnancy against a closed one
+        ((100, 200), 300, None, None, False),
+        ((100, 200), 150, None, None, True),
+        ((100, 200), 200, None, None, True),
+        # Open-ended pregnancy against another open-ended one
+        ((100, None), 300, None, None, True),
+        # Overlapping and contained closed pregnancies
+        ((100, 200), 150, 250, None, True),
+        ((100, 200), 50, 150, None, True),
+        ((120, 180), 100, 200, None, True),
+        ((100, 200), 120, 180, None, True),
+        # Adjacent closed pregnancies; the bounds are inclusive
+        ((100, 200), 200, 300, None, True),
+        ((100, 199), 200, 300, None, False),
+        ((301, 400), 200, 300, None, False),
+        # Closed pregnancy against an open-ended one
+        ((100, None), 150, 250, None, True),
+        ((200, None), 100, 250, None, True),
+        ((300, None), 100, 250, None, False),
+        # The pregnancy being updated does not conflict with itself
+        ((100, 200), 150, 250, 1, False),
+        ((100, None), 300, None, 1, False),
+        ((100, 200), 150, 250, 2, True),
+    ],
+)
+def test_has_conflicting_pregnancy_matches_sql_predicate(
+    sql_session, existing, start_date, end_date, pregnancy_id, expected
+):
+    other_start, other_end = existing
+    row = {
+        "id": 1,
+        "patient_id": PATIENT_ID,
+        "start_date": other_start,
+        "end_date": other_end,
+        "last_edited": 0,
+    }
+    sql_session.add(PregnancyOrm(**row))
+    sql_session.flush()
+    pregnancies = [PregnancyOrm(**row)]
+
+    in_memory = pregnancy_medical_utils.has_conflicting_pregnancy(
+        pregnancies, start_date, end_date, pregnancy_id
+    )
+    in_sql = pregnancy_medical_utils.has_conflicting_pregnancy_record(
+        PATIENT_ID, start_date, end_date, pregnancy_id
+    )
+
+    assert in_memory == in_sql == expected
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask, abort
+
+from data.db_operations import unit_of_work
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    session = MagicMock()
+    monkeypatch.setattr(unit_of_work, "db_session", session)
+    return session
+
+
+@pytest.fixture
+def app(db_session):
+    app = Flask(__name__)
+    unit_of_work.init_app(app)
+
+    @app.route("/write/<int:status>")
+    def write(status):
+        unit_of_work.commit()
+        return "", status
+
+    return app
+
+
+def _get(app, path):
+    with app.test_request_context(path):
+        return app.full_dispatch_request()
+
+
+def test_commit_outside_of_request_commits(db_session):
+    unit_of_work.commit()
+
+    db_session.commit.assert_called_once()
+    db_session.flush.assert_not_called()
+
+
+def test_request_commits_once_at_its_end(app, db_session):
+    response = _get(app, "/write/200")
+
+    assert response.status_code == 200
+    db_session.flush.assert_called_once()
+    db_session.commit.assert_called_once()
+    db_session.rollback.assert_not_called()
+
+
+def test_client_error_rolls_back(app, db_session):
+    _get(app, "/write/404")
+
+    db_session.flush.assert_called_once()
+    db_session.commit.assert_not_called()
+    db_session.rollback.assert_called_once()
+
+
+def test_abort_after_flushed_write_rolls_back(app, db_session):
+    @app.route("/conflict")
+    def conflict():
+        unit_of_work.commit()
+        abort(409)
+
+    response = _get(app, "/conflict")
+
+    assert response.status_code == 409
+    db_session.flush.assert_called_once()
+    db_session.commit.assert_not_called()
+    db_session.rollback.assert_called_once()
+
+
+def test_server_error_rolls_back(app, db_session):
+    _get(app, "/write/500")
+
+    db_session.flush.assert_called_once()
+    db_session.commit.assert_not_called()
+    db_session.rollback.assert_called_once()
+
+
+def test_after_commit_runs_callback_once_transaction_ends(monkeypatch):
+    session = MagicMock()
+    session.info = {}
+    monkeypatch.setattr(unit_of_work, "db_session", lambda: session)
+    calls = []
+
+    session.in_transaction.return_value = True
+    unit_of_work.after_commit(lambda: calls.append("pending"))
+    assert calls == []
+
+    run_callbacks = unit_of_work._run_after_commit_callbacks  # noqa: SLF001
+    # A savepoint ending does not end the transaction
+    run_callbacks(session, SimpleNamespace(parent=object()))
+    assert calls == []
+    run_callbacks(session, SimpleNamespace(parent=None))
+    assert calls == ["pending"]
+
+    session.in_transaction.return_value = False
+    unit_of_work.after_commit(lambda: calls.append("immediate"))
+    assert calls == ["pending", "immediate"]
@@ -101,7 +101,7 @@ def isolate_marshal_and_capture_schema_loads(
 
     # Kill DB side-effects during unmarshal of readings.
     monkeypatch.setattr(
-        marshal_mod.invariant, "resolve_reading_invariants", lambda _x: None
+        marshal_mod.invariant, "resolve_reading_invariants", lambda _x, **_kwargs: None
     )
 
     # Make schema_load_calls visible to tests via the helper fixture below
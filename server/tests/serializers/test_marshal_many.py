@@ -0,0 +1,67 @@
+from data import orm_serializer
+from models import ReadingOrm
+from tests.orm_helpers import (
+    make_patient_orm,
+    make_pregnancy_orm,
+    make_reading_orm,
+    make_urine_test_orm,
+)
+
+
+class _CustomReadingOrm(ReadingOrm):
+    """Subclass used to check that marshallers are inherited from registered bases."""
+
+
+class _PlainObject:
+    def __init__(self, id):
+        self.id = id
+        self._private = "hidden"
+
+
+def test_marshal_many_matches_marshal_for_each_object():
+    """
+    Test that marshal_many returns the same dictionaries, in the same order, as
+    calling marshal on each object, including for lists mixing several types.
+    """
+    reading = make_reading_orm(id="r-1", symptoms="headache,fatigue")
+    make_urine_test_orm(id=5, reading=reading)
+    objs = [
+        reading,
+        make_reading_orm(id="r-2", symptoms=None),
+        make_patient_orm(id="p-1"),
+        make_pregnancy_orm(id=3),
+        make_reading_orm(id="r-3", symptoms="fever"),
+    ]
+
+    for shallow in (False, True):
+        expected = [orm_serializer.marshal(obj, shallow=shallow) for obj in objs]
+        assert orm_serializer.marshal_many(objs, shallow=shallow) == expected
+
+    assert orm_serializer.marshal_many([]) == []
+
+
+def test_marshal_many_accepts_iterators():
+    readings = (make_reading_orm(id=f"r-{i}", symptoms=None) for i in range(3))
+
+    result = orm_serializer.marshal_many(readings, shallow=True)
+
+    assert [r["id"] for r in result] == ["r-0", "r-1", "r-2"]
+
+
+def test_subclass_uses_marshaller_of_registered_base():
+    """
+    Test that instances of a subclass of a registered model are marshalled like the
+    model itself, both by marshal and marshal_with_type.
+    """
+    reading = _CustomReadingOrm(id="r-sub", symptoms="headache")
+
+    assert orm_serializer.marshal(reading)["symptoms"] == ["headache"]
+    result = orm_serializer.marshal_with_type(reading, shallow=True)
+    assert result["type"] == "reading"
+    assert result["symptoms"] == ["headache"]
+
+
+def test_unregistered_objects_fall_back_to_public_attributes():
+    result = orm_serializer.marshal_many([_PlainObject("a"), _PlainObject("b")])
+
+    assert result == [{"id": "a"}, {"id": "b"}]
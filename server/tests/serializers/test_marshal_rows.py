@@ -0,0 +1,80 @@
+from sqlalchemy import inspect
+
+from data import orm_serializer
+from enums import TrafficLightEnum
+from models import AssessmentOrm, ReferralOrm, UrineTestOrm
+from tests.orm_helpers import make_reading_orm, make_urine_test_orm
+
+
+def _row(*models):
+    """Build a row of the columns of each model in mapper order, as a query would."""
+    row = []
+    for model in models:
+        row.extend(
+            getattr(model, attr.key) for attr in inspect(type(model)).column_attrs
+        )
+    return tuple(row)
+
+
+def _urine_test_columns():
+    """Columns of a reading's outer joined urine test, when it has none."""
+    return (None,) * len(inspect(UrineTestOrm).column_attrs)
+
+
+def test_marshal_reading_rows_matches_marshalled_readings():
+    """
+    Test that rows of reading and urine test columns marshal to the same dicts as
+    the reading (shallow) with its marshalled urine test, and that a reading without
+    a urine test gets ``urine_tests`` None.
+    """
+    reading = make_reading_orm(
+        id="r-1",
+        symptoms="headache,fatigue",
+        traffic_light_status=TrafficLightEnum.YELLOW_UP,
+    )
+    urine_test = make_urine_test_orm(id=9, protein="+", reading_id="r-1")
+    plain = make_reading_orm(id="r-2", symptoms="")
+
+    rows = [
+        _row(reading, urine_test),
+        _row(plain) + _urine_test_columns(),
+    ]
+    result = orm_serializer.marshal_reading_rows(rows)
+
+    expected = orm_serializer.marshal(reading, shallow=True)
+    expected["urine_tests"] = orm_serializer.marshal(urine_test)
+    assert result[0] == expected
+    assert result[0]["traffic_light_status"] == TrafficLightEnum.YELLOW_UP.value
+    assert result[0]["symptoms"] == ["headache", "fatigue"]
+
+    expected = orm_serializer.marshal(plain, shallow=True)
+    expected["urine_tests"] = None
+    assert result[1] == expected
+    assert result[1]["symptoms"] == []
+
+
+def test_marshal_rows_matches_marshal_for_referrals_and_assessments():
+    referral = ReferralOrm(
+        id="ref-1",
+        date_referred=1_700_000_000,
+        comment=None,
+        is_assessed=False,
+        last_edited=1_700_000_100,
+        patient_id="p-1",
+        health_facility_name="H0000",
+    )
+    assessment = AssessmentOrm(
+        id="a-1",
+        follow_up_needed=True,
+        diagnosis="Preeclampsia",
+        date_assessed=1_700_000_200,
+        patient_id="p-1",
+    )
+
+    assert orm_serializer.marshal_rows(ReferralOrm, [_row(referral)]) == [
+        orm_serializer.marshal(referral)
+    ]
+    assert orm_serializer.marshal_rows(AssessmentOrm, [_row(assessment)]) == [
+        orm_serializer.marshal(assessment)
+    ]
+    assert orm_serializer.marshal_rows(ReferralOrm, []) == []
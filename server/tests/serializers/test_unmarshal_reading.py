@@ -0,0 +1,28 @@
+import importlib
+
+from models import ReadingOrm
+
+
+def test_unmarshal_reading_resolves_invariants_without_committing(
+    marshal_mod, monkeypatch
+):
+    # The reading is loaded through utils, whose schema lookup the conftest stub
+    # does not reach
+    monkeypatch.setattr(
+        importlib.import_module("data.orm_serializer.utils"),
+        "get_schema_for_model",
+        marshal_mod.get_schema_for_model,
+    )
+    calls = []
+    monkeypatch.setattr(
+        marshal_mod.invariant,
+        "resolve_reading_invariants",
+        lambda _reading, **kwargs: calls.append(kwargs),
+    )
+
+    marshal_mod.unmarshal(
+        ReadingOrm,
+        {"id": "r-1", "patient_id": "p-1", "symptoms": ["HEADACHE", "BLURRED VISION"]},
+    )
+
+    assert calls == [{"autocommit": False}]
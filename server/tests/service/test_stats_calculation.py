@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from enums import TrafficLightEnum
+from service.statsCalculation import ReadingStats
+
+
+def _reading(year, month, systolic, diastolic=80, heart_rate=70, status=None):
+    return SimpleNamespace(
+        date_taken=int(datetime(year, month, 15, 12, tzinfo=timezone.utc).timestamp()),
+        systolic_blood_pressure=systolic,
+        diastolic_blood_pressure=diastolic,
+        heart_rate=heart_rate,
+        traffic_light_status=status or TrafficLightEnum.GREEN,
+    )
+
+
+READINGS = [
+    _reading(2024, 3, 110),
+    _reading(2023, 11, 120, status=TrafficLightEnum.YELLOW_UP),
+    _reading(2024, 3, 130, heart_rate=None),
+    _reading(2023, 3, 140, status=TrafficLightEnum.RED_DOWN),
+    _reading(2024, 5, 150),
+    # Taken after the current month, so only in the calendar year buckets
+    _reading(2024, 9, 160, status=TrafficLightEnum.RED_DOWN),
+]
+
+
+def test_monthly_buckets_values_of_current_year_in_reading_order():
+    stats = ReadingStats(READINGS)
+
+    systolic = stats.monthly("systolic_blood_pressure", 2024)
+
+    assert len(systolic) == 12
+    assert systolic[2] == [110, 130]
+    assert systolic[4] == [150]
+    assert systolic[8] == [160]
+    assert sum(len(bucket) for bucket in systolic) == 4
+    assert stats.monthly("heart_rate", 2024)[2] == [70, None]
+
+
+def test_last_twelve_months_ends_with_current_month():
+    stats = ReadingStats(READINGS)
+
+    systolic = stats.last_twelve_months("systolic_blood_pressure", 2024, 5)
+
+    # June 2023 to May 2024; March 2023 and September 2024 are outside the window
+    assert systolic[11] == [150]
+    assert systolic[9] == [110, 130]
+    assert systolic[5] == [120]
+    assert sum(len(bucket) for bucket in systolic) == 4
+
+
+def test_aggregate_summarizes_present_values():
+    stats = ReadingStats(READINGS)
+
+    summaries = stats.last_twelve_months("heart_rate", 2024, 5, aggregate=True)
+    assert summaries[9] == {"count": 1, "mean": 70.0, "min": 70, "max": 70}
+    assert summaries[0] is None
+
+    summaries = stats.monthly("systolic_blood_pressure", 2024, aggregate=True)
+    assert summaries[2] == {"count": 2, "mean": 120.0, "min": 110, "max": 130}
+
+
+def test_traffic_light_counts_from_day_one():
+    assert ReadingStats(READINGS).traffic_light_counts() == [3, 1, 0, 0, 2]
+
+
+def test_no_readings():
+    stats = ReadingStats([])
+
+    assert stats.monthly("heart_rate", 2024) == [[] for _ in range(12)]
+    assert (
+        stats.last_twelve_months("heart_rate", 2024, 1, aggregate=True) == [None] * 12
+    )
+    assert stats.traffic_light_counts() == [0, 0, 0, 0, 0]
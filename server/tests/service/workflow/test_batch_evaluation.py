@@ -0,0 +1,148 @@
+"""Batch evaluation loads patient collections once for many workflow instances."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from service.workflow.datasourcing.data_catalogue import (
+    get_catalogue,
+    prefetch_collections,
+)
+from service.workflow.evaluate.rule_evaluator import get_collection_namespaces
+from service.workflow.workflow_service import WorkflowService
+from tests import helpers
+from validation.workflow_models import WorkflowTemplateModel
+
+HIGH_BP_RULE = '{">": [{"var": "vitals[latest].systolic_blood_pressure"}, 140]}'
+NORMAL_BP_RULE = '{"<=": [{"var": "vitals[latest].systolic_blood_pressure"}, 140]}'
+
+VITALS = {
+    "p1": [{"systolic_blood_pressure": 150}, {"systolic_blood_pressure": 120}],
+    "p2": [{"systolic_blood_pressure": 110}],
+}
+
+
+def _bulk_vitals(patient_ids):
+    return {pid: VITALS.get(pid, []) for pid in patient_ids}
+
+
+def _make_template() -> WorkflowTemplateModel:
+    branches = [
+        helpers.make_workflow_template_branch(
+            id=branch_id,
+            step_id="st-1",
+            target_step_id="st-2",
+            condition_id=f"rg-{branch_id}",
+            condition={"id": f"rg-{branch_id}", "rule": rule},
+        )
+        for branch_id, rule in (("b-high", HIGH_BP_RULE), ("b-normal", NORMAL_BP_RULE))
+    ]
+    template = helpers.make_workflow_template(
+        id="wt-1",
+        starting_step_id="st-1",
+        steps=[
+            helpers.make_workflow_template_step(
+                id="st-1", workflow_template_id="wt-1", branches=branches
+            ),
+            helpers.make_workflow_template_step(id="st-2", workflow_template_id="wt-1"),
+        ],
+    )
+    return WorkflowTemplateModel(**template)
+
+
+def _make_instance(instance_id: str, patient_id: str, current_step_id=None) -> dict:
+    step_id = f"{instance_id}-s1"
+    return helpers.make_workflow_instance(
+        id=instance_id,
+        workflow_template_id="wt-1",
+        patient_id=patient_id,
+        current_step_id=current_step_id if current_step_id is not None else step_id,
+        steps=[
+            helpers.make_workflow_instance_step(
+                id=step_id,
+                workflow_instance_id=instance_id,
+                workflow_template_step_id="st-1",
+            )
+        ],
+    )
+
+
+def test_get_collection_namespaces():
+    rules = [
+        HIGH_BP_RULE,
+        '{"and": [{"var": "forms[-2].q1"}, {">": [{"var": "patient.age"}, 18]}]}',
+        None,
+    ]
+    assert get_collection_namespaces(rules) == {"vitals", "forms"}
+
+
+def test_prefetch_collections_loads_all_patients_at_once():
+    bulk_query = MagicMock(side_effect=_bulk_vitals)
+    with patch.dict(get_catalogue()["vitals"], {"bulk_query": bulk_query}):
+        catalogue = prefetch_collections(["vitals"], ["p1", "p2", "p3"])
+
+    bulk_query.assert_called_once_with({"p1", "p2", "p3"})
+    assert catalogue["vitals"]["query"]("p1") == VITALS["p1"]
+    assert catalogue["vitals"]["query"]("p3") == []
+    assert catalogue["vitals"]["query"]("unknown") == []
+    # Entries which were not prefetched are left untouched
+    assert catalogue["pregnancies"] is get_catalogue()["pregnancies"]
+    assert get_catalogue()["vitals"]["query"] is not catalogue["vitals"]["query"]
+
+
+def test_evaluate_workflow_instances():
+    instances = {
+        "wi-1": _make_instance("wi-1", "p1"),
+        "wi-2": _make_instance("wi-2", "p2"),
+        "wi-3": _make_instance("wi-3", "p1"),
+        # Not started, so there is no current step to evaluate
+        "wi-4": _make_instance("wi-4", "p2", current_step_id=""),
+    }
+    instance_orms = [
+        SimpleNamespace(
+            id=instance["id"],
+            patient_id=instance["patient_id"],
+            current_step_id=instance["current_step_id"],
+            workflow_template_id=instance["workflow_template_id"],
+        )
+        for instance in instances.values()
+    ]
+    bulk_query = MagicMock(side_effect=_bulk_vitals)
+
+    with (
+        patch("service.workflow.workflow_service.crud") as mock_crud,
+        patch(
+            "service.workflow.workflow_service.orm_serializer.marshal",
+            side_effect=lambda orm: instances[orm.id],
+        ),
+        patch.object(
+            WorkflowService, "get_workflow_template", return_value=_make_template()
+        ) as get_template,
+        patch.dict(get_catalogue()["vitals"], {"bulk_query": bulk_query}),
+    ):
+        mock_crud.read_workflow_instances.return_value = instance_orms
+        evaluations = WorkflowService.evaluate_workflow_instances(
+            workflow_template_id="wt-1"
+        )
+
+    assert mock_crud.read_workflow_instances.call_args.kwargs["with_steps"] is True
+    get_template.assert_called_once_with("wt-1")
+    bulk_query.assert_called_once_with({"p1", "p2"})
+
+    # Results are grouped by patient
+    selected = {
+        evaluation.workflow_instance_id: (
+            evaluation.workflow_instance_step_id,
+            evaluation.step_evaluation.selected_branch_id,
+        )
+        for evaluation in evaluations
+    }
+    assert [evaluation.workflow_instance_id for evaluation in evaluations] == [
+        "wi-1",
+        "wi-3",
+        "wi-2",
+    ]
+    assert selected == {
+        "wi-1": ("wi-1-s1", "b-high"),
+        "wi-2": ("wi-2-s1", "b-normal"),
+        "wi-3": ("wi-3-s1", "b-high"),
+    }
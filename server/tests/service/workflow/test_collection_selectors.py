@@ -0,0 +1,117 @@
+# ruff: noqa: SLF001
+"""Collection selectors are resolved with per-item queries when a catalogue entry supports them."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from service.workflow.datasourcing import data_sourcing
+from service.workflow.datasourcing.data_sourcing import MISSING, VariablePath
+
+CONTEXT = {"patient_id": "p1"}
+
+# Newest first
+VITALS = [
+    {"systolic_blood_pressure": 150, "urine_test": {"protein": "+"}},
+    {"systolic_blood_pressure": 130},
+    {"systolic_blood_pressure": 110},
+]
+
+
+def _item_query(patient_id, newest_first, offset, fields):
+    items = VITALS if newest_first else list(reversed(VITALS))
+    return items[offset] if offset < len(items) else None
+
+
+def _make_catalogue():
+    query = MagicMock(return_value=VITALS)
+    count_query = MagicMock(return_value=len(VITALS))
+    item_query = MagicMock(side_effect=_item_query)
+    catalogue = {
+        "vitals": {
+            "query": query,
+            "collection": True,
+            "count_query": count_query,
+            "item_query": item_query,
+        }
+    }
+    return catalogue, query, count_query, item_query
+
+
+def _paths(*variables):
+    return [VariablePath.from_string(variable) for variable in variables]
+
+
+@pytest.mark.parametrize("index", ["latest", -1, -2, -3, -4, 0, 1, 2, 3, 4, "x"])
+def test_item_position_matches_in_memory_selection(index):
+    position = data_sourcing._collection_item_position(index)
+    expected = data_sourcing._select_collection_item(VITALS, index)
+
+    item = None if position is None else _item_query("p1", *position, None)
+    assert (MISSING if item is None else item) is expected
+
+
+def test_selectors_load_only_referenced_items():
+    catalogue, query, count_query, item_query = _make_catalogue()
+    paths = _paths(
+        "vitals[latest].systolic_blood_pressure",
+        "vitals[latest].urine_test.protein",
+        "vitals[-2].systolic_blood_pressure",
+        "vitals[1]",
+        "vitals[-9].systolic_blood_pressure",
+        "vitals.size",
+    )
+
+    resolved = data_sourcing.resolve_collection_variables(
+        context=CONTEXT, variable_paths=paths, catalogue=catalogue
+    )
+
+    assert resolved == {
+        "vitals[latest].systolic_blood_pressure": 150,
+        "vitals[latest].urine_test.protein": "+",
+        "vitals[-2].systolic_blood_pressure": 130,
+        "vitals[1]": VITALS[-1],
+        "vitals[-9].systolic_blood_pressure": None,
+        "vitals.size": 3,
+    }
+    query.assert_not_called()
+    count_query.assert_called_once_with("p1")
+
+    # One query per referenced item, with the union of the fields referenced on it
+    calls = {call.args[1:3]: call.args[3] for call in item_query.call_args_list}
+    assert item_query.call_count == len(calls) == 4
+    assert calls == {
+        (True, 0): {"systolic_blood_pressure", "urine_test"},
+        (True, 1): {"systolic_blood_pressure"},
+        (False, 0): None,
+        (True, 8): {"systolic_blood_pressure"},
+    }
+
+
+def test_selector_results_match_whole_collection():
+    catalogue, *_ = _make_catalogue()
+    paths = _paths(
+        "vitals[latest].systolic_blood_pressure",
+        "vitals[2].systolic_blood_pressure",
+        "vitals[latest].missing_field",
+        "vitals.size",
+    )
+    whole_collection = {"vitals": {"query": lambda _: VITALS, "collection": True}}
+
+    for use_missing_sentinel in (True, False):
+        assert data_sourcing.resolve_collection_variables(
+            CONTEXT, paths, catalogue, use_missing_sentinel
+        ) == data_sourcing.resolve_collection_variables(
+            CONTEXT, paths, whole_collection, use_missing_sentinel
+        )
+
+
+def test_selector_query_error_resolves_to_missing():
+    catalogue, *_ = _make_catalogue()
+    catalogue["vitals"]["count_query"].side_effect = RuntimeError("db down")
+
+    resolved = data_sourcing.resolve_collection_variables(
+        CONTEXT, _paths("vitals.size"), catalogue, use_missing_sentinel=True
+    )
+
+    assert resolved == {"vitals.size": MISSING}
@@ -1,13 +1,16 @@
 """
-Tests for __query_forms_collection in data_catalogue.py.
+Tests for __query_forms_collection in data_catalogue.py, reading answers decoded into
+the form_answer_value_v2 projection by data.db_operations.form_answer_values.
 """
 
 from __future__ import annotations
 
+import itertools
 import json
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from data.db_operations import form_answer_values
 from enums import QuestionTypeEnum
 from models import FormQuestionTemplateOrmV2, FormSubmissionOrmV2, LangVersionOrmV2
 from service.workflow.datasourcing import data_catalogue
@@ -16,6 +19,8 @@ _query_forms = data_catalogue.get_catalogue()["forms"]["query"]
 
 PATIENT_ID = "patient-test-1"
 
+_submission_ids = itertools.count(1)
+
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -31,6 +36,7 @@ def _make_answer(question_id: str, answer_json: dict) -> SimpleNamespace:
 
 def _make_submission(answers: list, date_submitted: int = 1_000) -> SimpleNamespace:
     s = SimpleNamespace()
+    s.id = f"submission-{next(_submission_ids)}"
     s.patient_id = PATIENT_ID
     s.date_submitted = date_submitted
     s.answers = answers
@@ -82,8 +88,8 @@ def _build_session_mock(
     lv_chain = MagicMock()
     lv_chain.filter.return_value.all.return_value = lang_versions
 
-    def _side_effect(model):
-        if model is FormSubmissionOrmV2:
+    def _side_effect(model, *_columns):
+        if model is FormSubmissionOrmV2 or model is FormSubmissionOrmV2.id:
             return sub_chain
         if model is FormQuestionTemplateOrmV2:
             return q_chain
@@ -95,25 +101,43 @@ def _build_session_mock(
     return session
 
 
+def _query_forms_from(
+    submissions: list,
+    questions: list,
+    lang_versions: list | None = None,
+) -> list:
+    """
+    Decode the answers of the submissions into projection rows, as when they are
+    written, then query the forms collection, which reads those rows back.
+    """
+    session = _build_session_mock(submissions, questions, lang_versions)
+    with patch.object(form_answer_values, "db_session", session):
+        rows = [
+            SimpleNamespace(**row)
+            for row in form_answer_values.decode_form_answer_values(submissions)
+        ]
+
+    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
+        mock_crud.db_session = session
+        mock_crud.read_form_answer_values.side_effect = (
+            lambda ids: form_answer_values.flatten_form_answer_values(rows, list(ids))
+        )
+        return _query_forms(PATIENT_ID)
+
+
 # ---------------------------------------------------------------------------
 # Empty / no-data cases
 # ---------------------------------------------------------------------------
 
 
 def test_no_submissions_returns_empty_list():
-    session = _build_session_mock(submissions=[], questions=[])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from(submissions=[], questions=[])
     assert result == []
 
 
 def test_submission_with_no_answers_returns_empty_dict():
     submission = _make_submission(answers=[])
-    session = _build_session_mock([submission], questions=[])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], questions=[])
     assert result == [{}]
 
 
@@ -127,10 +151,7 @@ def test_integer_answer():
     submission = _make_submission([answer])
     question = _make_question("q1", "heart_rate", QuestionTypeEnum.INTEGER)
 
-    session = _build_session_mock([submission], [question])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question])
 
     assert result == [{"heart_rate": 72}]
 
@@ -140,23 +161,36 @@ def test_decimal_answer():
     submission = _make_submission([answer])
     question = _make_question("q1", "temperature", QuestionTypeEnum.DECIMAL)
 
-    session = _build_session_mock([submission], [question])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question])
 
     assert result == [{"temperature": 98.6}]
 
 
+def test_integer_answer_read_back_from_number_column_is_int():
+    """number_value is a floating point column, so INTEGER answers read back as floats."""
+    row = SimpleNamespace(
+        form_submission_id="submission",
+        user_question_id="heart_rate",
+        question_type=QuestionTypeEnum.INTEGER,
+        number_value=72.0,
+        text_value=None,
+        date_value=None,
+        option_text=None,
+        selected_options=None,
+    )
+
+    result = form_answer_values.flatten_form_answer_values([row], ["submission"])
+
+    assert result == {"submission": {"heart_rate": 72}}
+    assert isinstance(result["submission"]["heart_rate"], int)
+
+
 def test_string_answer():
     answer = _make_answer("q1", {"text": "some notes"})
     submission = _make_submission([answer])
     question = _make_question("q1", "clinical_notes", QuestionTypeEnum.STRING)
 
-    session = _build_session_mock([submission], [question])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question])
 
     assert result == [{"clinical_notes": "some notes"}]
 
@@ -166,10 +200,7 @@ def test_date_answer():
     submission = _make_submission([answer])
     question = _make_question("q1", "appointment_date", QuestionTypeEnum.DATE)
 
-    session = _build_session_mock([submission], [question])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question])
 
     assert result == [{"appointment_date": "2024-01-15"}]
 
@@ -179,10 +210,7 @@ def test_datetime_answer():
     submission = _make_submission([answer])
     question = _make_question("q1", "event_time", QuestionTypeEnum.DATETIME)
 
-    session = _build_session_mock([submission], [question])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question])
 
     assert result == [{"event_time": "2024-01-15T10:30:00"}]
 
@@ -200,10 +228,7 @@ def test_mc_answer_resolves_to_english_text():
     )
     lang_version = _make_lang_version(yes_id, "Yes")
 
-    session = _build_session_mock([submission], [question], [lang_version])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question], [lang_version])
 
     assert result == [{"step_response": "Yes"}]
 
@@ -224,10 +249,7 @@ def test_mc_answer_resolves_non_first_option():
         _make_lang_version(no_id, "No"),
     ]
 
-    session = _build_session_mock([submission], [question], lang_versions)
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question], lang_versions)
 
     assert result == [{"step_response": "No"}]
 
@@ -243,10 +265,7 @@ def test_mc_answer_missing_translation_excluded():
         mc_options=["str-uuid-1"],
     )
 
-    session = _build_session_mock([submission], [question], lang_versions=[])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question], lang_versions=[])
 
     assert result == [{}]
 
@@ -268,10 +287,7 @@ def test_multiple_select_single_selection():
         _make_lang_version(cough_id, "Cough"),
     ]
 
-    session = _build_session_mock([submission], [question], lang_versions)
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question], lang_versions)
 
     assert result == [{"symptoms_Fever": True}]
 
@@ -293,10 +309,7 @@ def test_multiple_select_multiple_selections():
         _make_lang_version(cough_id, "Cough"),
     ]
 
-    session = _build_session_mock([submission], [question], lang_versions)
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question], lang_versions)
 
     assert result == [{"symptoms_Fever": True, "symptoms_Cough": True}]
 
@@ -315,10 +328,7 @@ def test_multiple_select_missing_translation_excluded():
     )
     lang_versions = [_make_lang_version(fever_id, "Fever")]
 
-    session = _build_session_mock([submission], [question], lang_versions)
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [question], lang_versions)
 
     assert result == [{"symptoms_Fever": True}]
 
@@ -336,10 +346,7 @@ def test_multiple_questions_in_one_submission():
     q1 = _make_question("q1", "heart_rate", QuestionTypeEnum.INTEGER)
     q2 = _make_question("q2", "clinical_notes", QuestionTypeEnum.STRING)
 
-    session = _build_session_mock([submission], [q1, q2])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([submission], [q1, q2])
 
     assert result == [{"heart_rate": 72, "clinical_notes": "notes here"}]
 
@@ -353,10 +360,7 @@ def test_multiple_submissions_newest_first_order_preserved():
     question = _make_question("q1", "score", QuestionTypeEnum.INTEGER)
 
     # Mock returns newest-first, matching the real ORDER BY DESC query
-    session = _build_session_mock([new_sub, old_sub], [question])
-    with patch("service.workflow.datasourcing.data_catalogue.crud") as mock_crud:
-        mock_crud.db_session = session
-        result = _query_forms(PATIENT_ID)
+    result = _query_forms_from([new_sub, old_sub], [question])
 
     assert len(result) == 2
     assert result[0]["score"] == 2  # newest
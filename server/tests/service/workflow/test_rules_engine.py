@@ -2,9 +2,12 @@
 Unit tests for Rule Engine
 """
 
+import pytest
+
 from service.workflow.evaluate.rules_engine import (
     RulesEngineFacade,
     RuleStatus,
+    compile_rule,
     evaluate_branches,
 )
 
@@ -199,3 +202,32 @@ class TestEvaluateBranches:
 
         assert result["status"] == RuleStatus.TRUE
         assert result["branch"]["id"] == "A"
+
+
+class TestCompileRule:
+    def test_same_rule_text_is_compiled_once(self):
+        rule = '{"and": [{">": [{"var": "patient.age"}, 18]}, {"var": "wf.consent"}]}'
+
+        first = compile_rule(rule)
+        second = compile_rule(rule)
+
+        assert first is second
+        assert first.variables == {"patient.age", "wf.consent"}
+
+    def test_compiled_rule_strips_metadata(self):
+        compiled = compile_rule('{"==": [{"var": "age"}, 18], "name": "isAdult"}')
+
+        assert compiled.rule == {"==": [{"var": "age"}, 18]}
+        assert compiled.evaluate({"age": 18}).status == RuleStatus.TRUE
+
+    def test_compiled_rule_reports_missing_variables(self):
+        compiled = compile_rule('{"==": [{"var": "patient.age"}, 18]}')
+
+        result = compiled.evaluate({"patient.name": "Jane"})
+
+        assert result.status == RuleStatus.NOT_ENOUGH_DATA
+        assert result.missing_variables == {"patient.age"}
+
+    def test_invalid_rule_raises(self):
+        with pytest.raises(ValueError):
+            compile_rule("{not json")
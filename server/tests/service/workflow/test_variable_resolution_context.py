@@ -0,0 +1,125 @@
+"""VariableResolutionContext resolves each datasource once per evaluation scope."""
+
+import threading
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from service.workflow.datasourcing.data_sourcing import MISSING
+from service.workflow.evaluate.rule_evaluator import (
+    RuleEvaluator,
+    VariableResolutionContext,
+)
+from service.workflow.evaluate.rules_engine import RuleStatus
+
+VITALS = {"vitals[latest].systolic_blood_pressure": 150}
+PATIENT = {"patient.age": 30}
+
+RULES = [
+    '{">": [{"var": "vitals[latest].systolic_blood_pressure"}, 160]}',
+    '{"and": [{">": [{"var": "vitals[latest].systolic_blood_pressure"}, 140]},'
+    ' {"<": [{"var": "patient.age"}, 18]}]}',
+    '{"and": [{">": [{"var": "vitals[latest].systolic_blood_pressure"}, 140]},'
+    ' {">=": [{"var": "patient.age"}, 18]}]}',
+]
+
+
+ENGINE = create_engine("sqlite://")
+
+
+def _execute_statement():
+    with ENGINE.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def _resolve_from(values):
+    """
+    Build a resolver stub returning the given values for the requested paths, after
+    executing one SQL statement as a datasource lookup would.
+    """
+
+    def resolve(context, variable_paths, catalogue, use_missing_sentinel):
+        _execute_statement()
+        return {
+            vp.to_string(): values[vp.to_string()]
+            for vp in variable_paths
+            if vp.to_string() in values
+        }
+
+    return resolve
+
+
+def test_branches_share_resolved_variables():
+    with (
+        patch(
+            "service.workflow.evaluate.rule_evaluator.resolve_collection_variables",
+            side_effect=_resolve_from(VITALS),
+        ) as resolve_collections,
+        patch(
+            "service.workflow.evaluate.rule_evaluator.resolve_object_variable_paths",
+            side_effect=_resolve_from(PATIENT),
+        ) as resolve_objects,
+    ):
+        evaluator = RuleEvaluator()
+        context = VariableResolutionContext(
+            "p1", catalogue=evaluator.catalogue, rules=RULES
+        )
+        statuses = [
+            evaluator.evaluate_rule(rule, "p1", context=context)[0] for rule in RULES
+        ]
+
+    assert statuses == [RuleStatus.FALSE, RuleStatus.FALSE, RuleStatus.TRUE]
+    assert resolve_collections.call_count == 1
+    assert resolve_objects.call_count == 1
+    assert context.query_count == 2
+
+
+def test_rules_outside_the_scope_are_resolved_on_demand():
+    with patch(
+        "service.workflow.evaluate.rule_evaluator.resolve_object_variable_paths",
+        side_effect=_resolve_from(PATIENT),
+    ) as resolve_objects:
+        evaluator = RuleEvaluator()
+        context = VariableResolutionContext("p1", catalogue=evaluator.catalogue)
+        rule = '{">=": [{"var": "patient.age"}, 18]}'
+
+        first, _ = evaluator.evaluate_rule(rule, "p1", context=context)
+        second, _ = evaluator.evaluate_rule(rule, "p1", context=context)
+
+    assert first == second == RuleStatus.TRUE
+    assert resolve_objects.call_count == 1
+    assert context.query_count == 1
+
+
+def test_statements_of_other_threads_are_not_counted():
+    def resolve(context, variable_paths, catalogue, use_missing_sentinel):
+        other_thread = threading.Thread(target=_execute_statement)
+        other_thread.start()
+        other_thread.join()
+        return _resolve_from(PATIENT)(
+            context, variable_paths, catalogue, use_missing_sentinel
+        )
+
+    with patch(
+        "service.workflow.evaluate.rule_evaluator.resolve_object_variable_paths",
+        side_effect=resolve,
+    ):
+        context = VariableResolutionContext("p1")
+        context.resolve(["patient.age"])
+
+    assert context.query_count == 1
+
+
+def test_variable_left_out_by_resolver_is_missing():
+    with patch(
+        "service.workflow.evaluate.rule_evaluator.resolve_object_variable_paths",
+        side_effect=_resolve_from({}),
+    ):
+        evaluator = RuleEvaluator()
+        context = VariableResolutionContext("p1", catalogue=evaluator.catalogue)
+        status, _ = evaluator.evaluate_rule(
+            '{">=": [{"var": "patient.age"}, 18]}', "p1", context=context
+        )
+
+    assert status == RuleStatus.NOT_ENOUGH_DATA
+    assert context.resolve(["patient.age"]) == {"patient.age": MISSING}
@@ -0,0 +1,121 @@
+"""wf.* variables are read from a per-request snapshot of the workflow instance."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import flask
+
+from enums import WorkflowInstanceDataFieldTypeEnum
+from service.workflow.datasourcing.data_sourcing import (
+    VariablePath,
+    invalidate_workflow_instance_snapshot,
+    resolve_workflow_namespace_variables,
+)
+from service.workflow.workflow_service import WorkflowService
+
+CONTEXT = {"patient_id": "p1", "workflow_instance_id": "wi-1"}
+
+INSTANCE = SimpleNamespace(
+    id="wi-1",
+    patient_id="p1",
+    status="Active",
+    start_date=100,
+    current_step_id="s1",
+    name="Screening",
+    description="",
+    completion_date=None,
+    workflow_template_id="wt-1",
+    last_edited=200,
+)
+
+
+def _rows(**values):
+    return [
+        SimpleNamespace(field_tag=tag, field_value=value)
+        for tag, value in values.items()
+    ]
+
+
+def _paths(*variables):
+    return [VariablePath.from_string(variable) for variable in variables]
+
+
+def _resolve(*variables):
+    return resolve_workflow_namespace_variables(CONTEXT, _paths(*variables))
+
+
+def test_snapshot_is_loaded_once_per_request():
+    app = flask.Flask(__name__)
+    with (
+        patch("service.workflow.datasourcing.data_sourcing.crud") as mock_crud,
+        app.test_request_context("/"),
+    ):
+        mock_crud.read_workflow_instance.return_value = INSTANCE
+        mock_crud.read_workflow_instance_data_for_instance.return_value = _rows(
+            consent="true", group='{"arm": "B"}', broken="{"
+        )
+
+        assert _resolve("wf.consent", "wf.group.arm", "wf.info.status") == {
+            "wf.consent": True,
+            "wf.group.arm": "B",
+            "wf.info.status": "Active",
+        }
+        assert _resolve("wf.broken", "wf.unknown", "wf.group.missing") == {
+            "wf.broken": None,
+            "wf.unknown": None,
+            "wf.group.missing": None,
+        }
+        mock_crud.read_workflow_instance.assert_called_once_with("wi-1")
+        mock_crud.read_workflow_instance_data_for_instance.assert_called_once_with(
+            "wi-1"
+        )
+        mock_crud.read_workflow_instance_data_by_field_tag.assert_not_called()
+
+        # Writes drop the snapshot so later rules see the new values
+        mock_crud.read_workflow_instance_data_for_instance.return_value = _rows(
+            consent="false"
+        )
+        invalidate_workflow_instance_snapshot("wi-1")
+        assert _resolve("wf.consent") == {"wf.consent": False}
+        assert mock_crud.read_workflow_instance.call_count == 2
+
+
+def test_snapshot_is_not_cached_outside_requests():
+    with patch("service.workflow.datasourcing.data_sourcing.crud") as mock_crud:
+        mock_crud.read_workflow_instance.return_value = INSTANCE
+        mock_crud.read_workflow_instance_data_for_instance.return_value = _rows(a="1")
+
+        assert _resolve("wf.a") == _resolve("wf.a") == {"wf.a": 1}
+        assert mock_crud.read_workflow_instance.call_count == 2
+
+
+def test_missing_instance_or_other_patient():
+    with patch("service.workflow.datasourcing.data_sourcing.crud") as mock_crud:
+        mock_crud.read_workflow_instance.return_value = None
+        assert _resolve("wf.a") == {"wf.a": None}
+
+        mock_crud.read_workflow_instance.return_value = SimpleNamespace(
+            **{**vars(INSTANCE), "patient_id": "p2"}
+        )
+        mock_crud.read_workflow_instance_data_for_instance.return_value = _rows(a="1")
+        assert _resolve("wf.a") == {"wf.a": None}
+
+
+def test_upsert_items_writes_once_and_invalidates():
+    app = flask.Flask(__name__)
+    items = [
+        ("consent", WorkflowInstanceDataFieldTypeEnum.BOOLEAN, True),
+        ("score", WorkflowInstanceDataFieldTypeEnum.INTEGER, 3),
+    ]
+    with (
+        patch("service.workflow.workflow_service.crud") as mock_crud,
+        app.test_request_context("/"),
+    ):
+        flask.g.workflow_instance_snapshots = {"wi-1": object(), "wi-2": object()}
+        WorkflowService.upsert_workflow_instance_data_items("wi-1", items)
+
+        mock_crud.upsert_workflow_instance_data_rows.assert_called_once_with(
+            "wi-1", items
+        )
+        mock_crud.upsert_workflow_instance_data_row.assert_not_called()
+        assert list(flask.g.workflow_instance_snapshots) == ["wi-2"]
@@ -6,7 +6,10 @@ from service.workflow.evaluate.rules_engine import RuleStatus
 from service.workflow.workflow_errors import InvalidWorkflowActionError
 from service.workflow.workflow_service import WorkflowService
 from tests.helpers import (
+    TIMESTAMP_TOMORROW,
     get_uuid,
+    make_workflow_instance,
+    make_workflow_instance_step,
     make_workflow_template,
     make_workflow_template_step,
 )
@@ -16,6 +19,8 @@ from validation.workflow_models import (
     SkipStepActionModel,
     StartStepActionModel,
     StartWorkflowActionModel,
+    WorkflowInstanceModel,
+    WorkflowInstanceStepModel,
     WorkflowTemplateModel,
 )
 
@@ -156,3 +161,135 @@ def apply_invalid_workflow_action(sequential_workflow_view):
 
     assert e.value.action == CompleteStepActionModel(step_id="si-1")
     assert e.value.available_actions == [StartWorkflowActionModel()]
+
+
+def _loaded_workflow_instance(step_count: int) -> WorkflowInstanceModel:
+    """A workflow instance as loaded from the database, with ``step_count`` steps."""
+    steps = [
+        make_workflow_instance_step(id=f"si-{i}", workflow_instance_id="wi-1")
+        for i in range(step_count)
+    ]
+    workflow_instance = WorkflowInstanceModel(
+        **make_workflow_instance(id="wi-1", patient_id="p-1", steps=steps)
+    )
+    workflow_instance.mark_saved()
+    return workflow_instance
+
+
+@patch("service.workflow.workflow_service.invalidate_workflow_instance_snapshot")
+@patch("service.workflow.workflow_service.crud")
+def test_upsert_loaded_workflow_instance_writes_only_changes(mock_crud, _):
+    workflow_instance = _loaded_workflow_instance(step_count=30)
+    workflow_instance.current_step_id = "si-3"
+    workflow_instance.steps[3].status = "Completed"
+    new_step = WorkflowInstanceStepModel(
+        **make_workflow_instance_step(id="si-new", workflow_instance_id="wi-1")
+    )
+    workflow_instance.steps.append(new_step)
+
+    with patch(
+        "service.workflow.workflow_service.get_current_time",
+        return_value=TIMESTAMP_TOMORROW,
+    ):
+        WorkflowService.upsert_workflow_instance(workflow_instance)
+
+    mock_crud.common_crud.merge.assert_not_called()
+    instance_id, instance_changes, step_rows = (
+        mock_crud.update_workflow_instance_changes.call_args.args
+    )
+    assert instance_id == "wi-1"
+    assert instance_changes == {
+        "current_step_id": "si-3",
+        "last_edited": TIMESTAMP_TOMORROW,
+    }
+    assert [row["id"] for row in step_rows] == ["si-3", "si-new"]
+    assert step_rows[0]["status"] == "Completed"
+    assert all(row["last_edited"] == TIMESTAMP_TOMORROW for row in step_rows)
+    assert "form" not in step_rows[0]
+    assert workflow_instance.steps[0].last_edited != TIMESTAMP_TOMORROW
+
+    # The written state becomes the saved state
+    assert workflow_instance.get_changes() == {}
+    assert not any(step.get_changes() for step in workflow_instance.steps)
+
+
+@patch("service.workflow.workflow_service.invalidate_workflow_instance_snapshot")
+@patch("service.workflow.workflow_service.orm_serializer")
+@patch("service.workflow.workflow_service.crud")
+def test_upsert_loaded_workflow_instance_merges_new_step_with_form(
+    mock_crud, mock_orm_serializer, _
+):
+    workflow_instance = _loaded_workflow_instance(step_count=2)
+    workflow_instance.steps[0].status = "Completed"
+    workflow_instance.steps.append(
+        WorkflowInstanceStepModel(
+            **make_workflow_instance_step(
+                id="si-new",
+                workflow_instance_id="wi-1",
+                form_id="f-1",
+                form={"id": "f-1"},
+            )
+        )
+    )
+
+    WorkflowService.upsert_workflow_instance(workflow_instance)
+
+    _, step_dict = mock_orm_serializer.unmarshal.call_args.args
+    assert step_dict["id"] == "si-new"
+    assert step_dict["form"] == {"id": "f-1"}
+    mock_crud.common_crud.merge.assert_called_once_with(
+        mock_orm_serializer.unmarshal.return_value, autocommit=False
+    )
+    # The answers of the step's form are projected before the changes are committed
+    mock_crud.refresh_form_answer_values.assert_called_once_with(["f-1"])
+    _, _, step_rows = mock_crud.update_workflow_instance_changes.call_args.args
+    assert [row["id"] for row in step_rows] == ["si-0"]
+
+
+@patch("service.workflow.workflow_service.invalidate_workflow_instance_snapshot")
+@patch("service.workflow.workflow_service.unit_of_work")
+@patch("service.workflow.workflow_service.orm_serializer")
+@patch("service.workflow.workflow_service.crud")
+def test_upsert_new_workflow_instance_merges_whole_instance(
+    mock_crud, mock_orm_serializer, mock_unit_of_work, _
+):
+    workflow_instance = WorkflowInstanceModel(
+        **make_workflow_instance(
+            id="wi-1",
+            patient_id="p-1",
+            steps=[make_workflow_instance_step(id="si-1", workflow_instance_id="wi-1")],
+        )
+    )
+
+    WorkflowService.upsert_workflow_instance(workflow_instance)
+
+    mock_crud.update_workflow_instance_changes.assert_not_called()
+    _, workflow_instance_dict = mock_orm_serializer.unmarshal.call_args.args
+    assert [step["id"] for step in workflow_instance_dict["steps"]] == ["si-1"]
+    mock_crud.common_crud.merge.assert_called_once_with(
+        mock_orm_serializer.unmarshal.return_value, autocommit=False
+    )
+    mock_crud.refresh_form_answer_values.assert_not_called()
+    mock_unit_of_work.commit.assert_called_once()
+    assert workflow_instance.is_saved()
+
+
+@patch("service.workflow.workflow_service.unit_of_work")
+@patch("service.workflow.workflow_service.orm_serializer")
+@patch("service.workflow.workflow_service.crud")
+def test_upsert_workflow_instance_step_refreshes_form_answer_values(
+    mock_crud, mock_orm_serializer, mock_unit_of_work
+):
+    step = WorkflowInstanceStepModel(
+        **make_workflow_instance_step(
+            id="si-1", workflow_instance_id="wi-1", form_id="f-1", form={"id": "f-1"}
+        )
+    )
+
+    WorkflowService.upsert_workflow_instance_step(step)
+
+    mock_crud.common_crud.merge.assert_called_once_with(
+        mock_orm_serializer.unmarshal.return_value, autocommit=False
+    )
+    mock_crud.refresh_form_answer_values.assert_called_once_with(["f-1"])
+    mock_unit_of_work.commit.assert_called_once()
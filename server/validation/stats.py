@@ -1,5 +1,5 @@
 # Stats post requests validation
-from typing import Optional
+from typing import Optional, Union
 
 from pydantic import Field
 
@@ -35,14 +35,25 @@ class TrafficLightCounts(CradleBaseModel):
     red_down: int
 
 
+class VitalsSummary(CradleBaseModel):
+    count: int
+    mean: float
+    min: int
+    max: int
+
+
+# Per-month vitals: the values of the readings taken in each month, or their summary
+MonthlyVitals = Union[list[list[Optional[int]]], list[Optional[VitalsSummary]]]
+
+
 class PatientStats(CradleBaseModel):
-    bp_systolic_readings_monthly: list[int]
-    bp_diastolic_readings_monthly: list[int]
-    heart_rate_readings_monthly: list[int]
+    bp_systolic_readings_monthly: MonthlyVitals
+    bp_diastolic_readings_monthly: MonthlyVitals
+    heart_rate_readings_monthly: MonthlyVitals
 
-    bp_systolic_readings_last_twelve_months: list[int]
-    bp_diastolic_readings_last_twelve_months: list[int]
-    heart_rate_readings_last_twelve_months: list[int]
+    bp_systolic_readings_last_twelve_months: MonthlyVitals
+    bp_diastolic_readings_last_twelve_months: MonthlyVitals
+    heart_rate_readings_last_twelve_months: MonthlyVitals
 
     traffic_light_counts_from_day_1: TrafficLightCounts
 
@@ -10,6 +10,7 @@ from validation.workflow_models import (
     WorkflowActionModel,
     WorkflowClassificationModel,
     WorkflowCollectionModel,
+    WorkflowInstanceEvaluation,
     WorkflowInstanceModel,
     WorkflowInstanceStepModel,
     WorkflowTemplateModel,
@@ -124,6 +125,29 @@ class AdvanceWorkflowRequest(CradleBaseModel):
     target_template_step_id: Optional[str] = None
 
 
+class EvaluateWorkflowInstancesRequest(CradleBaseModel, extra="forbid"):
+    """
+    Selects the active workflow instances to re-evaluate, either every instance of a
+    template or an explicit list of instances.
+    """
+
+    workflow_template_id: Optional[str] = None
+    workflow_instance_ids: Optional[list[str]] = None
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> Self:
+        """Raise unless exactly one of the selectors is given."""
+        if (self.workflow_template_id is None) == (self.workflow_instance_ids is None):
+            raise ValueError(
+                "Exactly one of workflow_template_id or workflow_instance_ids is required"
+            )
+        return self
+
+
+class EvaluateWorkflowInstancesResponse(CradleBaseModel, extra="forbid"):
+    items: list[WorkflowInstanceEvaluation]
+
+
 class WorkflowInstanceDataUpsertItem(CradleBaseModel, extra="forbid"):
     """One dynamic field to store on a workflow instance (``workflow_instance_data``)."""
 
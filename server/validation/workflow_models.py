@@ -1,8 +1,8 @@
 import json
 from json import JSONDecodeError
-from typing import Literal, Optional, Union
+from typing import Any, ClassVar, Literal, Optional, Union
 
-from pydantic import Field, field_validator, model_validator
+from pydantic import Field, PrivateAttr, field_validator, model_validator
 from typing_extensions import Self
 
 from common.commonUtil import get_current_time
@@ -84,7 +84,41 @@ class WorkflowTemplateModel(CradleBaseModel, extra="forbid"):
         return self
 
 
-class WorkflowInstanceStepModel(CradleBaseModel, extra="forbid"):
+class SavedStateModel(CradleBaseModel):
+    """
+    A model which remembers the values of its fields as they were last loaded from or
+    saved to the database, so that only the fields changed since can be written back.
+    """
+
+    # Fields not compared with the saved state, such as nested models saved separately
+    untracked_fields: ClassVar[set[str]] = set()
+
+    _saved_state: Optional[dict[str, Any]] = PrivateAttr(default=None)
+
+    def mark_saved(self) -> None:
+        """Record the current values of the fields as those in the database."""
+        self._saved_state = self.model_dump(exclude=self.untracked_fields)
+
+    def is_saved(self) -> bool:
+        """Return True if the model was loaded from or saved to the database."""
+        return self._saved_state is not None
+
+    def get_changes(self) -> dict[str, Any]:
+        """
+        Return the fields whose values differ from the saved state, with their current
+        values; every field if the model has no saved state.
+        """
+        state = self.model_dump(exclude=self.untracked_fields)
+        if self._saved_state is None:
+            return state
+        return {
+            field: value
+            for field, value in state.items()
+            if self._saved_state.get(field) != value
+        }
+
+
+class WorkflowInstanceStepModel(SavedStateModel, extra="forbid"):
     id: str
     name: str
     description: str
@@ -139,7 +173,9 @@ class WorkflowInstanceStepModel(CradleBaseModel, extra="forbid"):
         return self
 
 
-class WorkflowInstanceModel(CradleBaseModel, extra="forbid"):
+class WorkflowInstanceModel(SavedStateModel, extra="forbid"):
+    untracked_fields: ClassVar[set[str]] = {"steps"}
+
     id: str
     name: str
     description: str
@@ -166,6 +202,12 @@ class WorkflowInstanceModel(CradleBaseModel, extra="forbid"):
 
         return self
 
+    def mark_saved(self) -> None:
+        """Record the current values of the instance and its steps as saved."""
+        super().mark_saved()
+        for step in self.steps:
+            step.mark_saved()
+
     def get_instance_step(self, step_id: str) -> Optional[WorkflowInstanceStepModel]:
         """Return the instance step with the given ID, or None if not found."""
         for step in self.steps:
@@ -216,3 +258,9 @@ class WorkflowBranchEvaluation(CradleBaseModel):
 class WorkflowStepEvaluation(CradleBaseModel):
     branch_evaluations: list[WorkflowBranchEvaluation]
     selected_branch_id: Optional[str]
+
+
+class WorkflowInstanceEvaluation(CradleBaseModel):
+    workflow_instance_id: str
+    workflow_instance_step_id: str
+    step_evaluation: WorkflowStepEvaluation